@@ -7,6 +7,8 @@ from fastapi import APIRouter
 from .post_insights import router as post_insights_router
 from .accounts import router as accounts_router
 from .account_setup import router as account_setup_router
+from .webhooks import router as webhooks_router
+from .scheduler import router as scheduler_router
 
 # v1 APIルーター
 api_v1_router = APIRouter(prefix="/api/v1")
@@ -15,6 +17,8 @@ api_v1_router = APIRouter(prefix="/api/v1")
 api_v1_router.include_router(post_insights_router)
 api_v1_router.include_router(accounts_router, prefix="/accounts")
 api_v1_router.include_router(account_setup_router, prefix="/account-setup")
+api_v1_router.include_router(webhooks_router)
+api_v1_router.include_router(scheduler_router)
 
 # 将来の拡張用エンドポイント
 # api_v1_router.include_router(analytics_router)
\ No newline at end of file
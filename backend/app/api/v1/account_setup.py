@@ -3,14 +3,21 @@ Account Setup API Endpoints
 アカウントセットアップ用のAPIエンドポイント
 """
 import logging
+import uuid
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
 from sqlalchemy.orm import Session
 
 from ...core.database import get_db
-from ...services.api.account_setup_service import create_account_setup_service, AccountSetupService
+from ...services.api.account_setup_service import (
+    create_account_setup_service,
+    run_account_setup_job_in_thread,
+    AccountSetupService
+)
 from ...services.api.account_service import create_account_service
 from ...schemas.account_setup_schema import (
+    AccountSetupJobAccepted,
+    AccountSetupJobStatus,
     AccountSetupRequest,
     AccountSetupResponse
 )
@@ -25,59 +32,96 @@ router = APIRouter(tags=["account-setup"])
 
 @router.post(
     "/",
-    response_model=AccountSetupResponse,
+    response_model=AccountSetupJobAccepted,
+    status_code=202,
     summary="アカウントセットアップ",
-    description="Instagram App ID、App Secret、短期トークンからアカウントを自動セットアップします。"
+    description="Instagram App ID、App Secret、短期トークンからアカウントを自動セットアップするジョブを登録します。"
 )
 async def setup_accounts(
     request: AccountSetupRequest,
+    background_tasks: BackgroundTasks,
+    http_request: Request,
     db: Session = Depends(get_db)
-) -> AccountSetupResponse:
+) -> AccountSetupJobAccepted:
     """
-    アカウントセットアップ
+    アカウントセットアップ（バックグラウンドジョブ）
     
-    Instagram の App ID、App Secret、短期トークンを使用して以下の処理を実行します：
+    Instagram の App ID、App Secret、短期トークンを使用して以下の処理をバックグラウンドで実行します：
     1. 短期トークンを長期トークンに変換
     2. 関連するFacebookページを取得
     3. 各ページに接続されているInstagramアカウントを発見
     4. アカウント情報をデータベースに保存
     
+    ジョブIDを即座に返すため、進捗と結果は GET /account-setup/jobs/{job_id} で確認します。
+    
     Args:
         request: セットアップリクエスト（App ID、App Secret、短期トークン）
         
     Returns:
-        AccountSetupResponse: セットアップ結果
+        AccountSetupJobAccepted: ジョブIDと状態確認URL
     """
     try:
-        logger.info("POST /account-setup - Starting account setup")
+        logger.info("POST /account-setup - Starting account setup job")
         logger.info(f"App ID: {request.app_id}, Token length: {len(request.short_token)}")
         
         account_setup_service = create_account_setup_service(db)
-        result = await account_setup_service.setup_accounts(request)
+        job_id = await account_setup_service.create_setup_job()
+        background_tasks.add_task(run_account_setup_job_in_thread, job_id, request)
         
-        # ログに結果を記録
-        if result.success:
-            logger.info(
-                f"Account setup completed successfully: "
-                f"discovered={result.accounts_discovered}, "
-                f"created={result.accounts_created}, "
-                f"updated={result.accounts_updated}"
-            )
-        else:
-            logger.warning(f"Account setup failed: {result.message}")
-            if result.errors:
-                logger.warning(f"Errors: {', '.join(result.errors)}")
-        
-        return result
+        return AccountSetupJobAccepted(
+            job_id=job_id,
+            status="pending",
+            status_url=str(http_request.url_for("get_setup_job", job_id=job_id))
+        )
         
     except Exception as e:
-        logger.error(f"Failed to setup accounts: {str(e)}", exc_info=True)
+        logger.error(f"Failed to start account setup: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=500,
             detail="Internal server error occurred during account setup"
         )
 
 
+@router.get(
+    "/jobs/{job_id}",
+    response_model=AccountSetupJobStatus,
+    summary="セットアップジョブの進捗確認",
+    description="アカウントセットアップジョブの進捗（ステップ・ページ単位）と結果を取得します。"
+)
+async def get_setup_job(
+    job_id: str,
+    db: Session = Depends(get_db)
+) -> AccountSetupJobStatus:
+    """
+    セットアップジョブの進捗確認
+    
+    Args:
+        job_id: POST /account-setup で返されたジョブID
+        
+    Returns:
+        AccountSetupJobStatus: 進捗と結果（完了後は result にセットアップ結果が入る）
+    """
+    try:
+        uuid.UUID(job_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail=f"Setup job not found: {job_id}")
+    
+    try:
+        account_setup_service = create_account_setup_service(db)
+        job_status = await account_setup_service.get_setup_job(job_id)
+        
+    except Exception as e:
+        logger.error(f"Failed to get setup job: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error occurred while fetching setup job"
+        )
+    
+    if not job_status:
+        raise HTTPException(status_code=404, detail=f"Setup job not found: {job_id}")
+    return job_status
+
+
 @router.get(
     "/status",
     summary="セットアップ状況確認",
@@ -0,0 +1,85 @@
+"""
+Scheduler API Endpoints
+常駐スケジューラーの実行状況エンドポイント
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import datetime, timezone
+import logging
+
+from ...core.database import get_db
+from ...repositories.scheduler_run_repository import SchedulerRunRepository
+from ...services.data_collection.collection_schedule import SCHEDULED_JOBS
+from ...schemas.scheduler_schema import ScheduledJobStatus, SchedulerRunResponse, SchedulerStatusResponse
+
+# ログ設定
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/scheduler", tags=["Scheduler"])
+
+
+def _run_response(run) -> SchedulerRunResponse:
+    return SchedulerRunResponse(
+        run_id=str(run.id),
+        job_name=run.job_name,
+        status=run.status,
+        host=run.host,
+        scheduled_for=run.scheduled_for,
+        started_at=run.started_at,
+        finished_at=run.finished_at,
+        duration_seconds=run.duration_seconds,
+        summary=run.summary or {},
+        error=run.error
+    )
+
+
+@router.get(
+    "/status",
+    response_model=SchedulerStatusResponse,
+    summary="スケジューラーの実行状況",
+    description="常駐スケジューラーの各ジョブについて、最新の実行結果と次回予定時刻を取得します。"
+)
+async def get_scheduler_status(db: Session = Depends(get_db)) -> SchedulerStatusResponse:
+    """ジョブ別の実行状況"""
+    try:
+        latest = await SchedulerRunRepository(db).get_latest_by_job()
+    except Exception as e:
+        logger.error(f"Failed to get scheduler status: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error occurred while fetching scheduler status")
+
+    now = datetime.now(timezone.utc)
+    jobs = []
+    for job in SCHEDULED_JOBS.values():
+        run = latest.get(job.name)
+        jobs.append(ScheduledJobStatus(
+            job_name=job.name,
+            description=job.description,
+            next_run_at=job.next_run_after(now),
+            running=run is not None and run.status == 'running',
+            last_run=_run_response(run) if run else None
+        ))
+    return SchedulerStatusResponse(jobs=jobs, checked_at=now)
+
+
+@router.get(
+    "/runs",
+    response_model=List[SchedulerRunResponse],
+    summary="スケジューラーの実行履歴",
+    description="常駐スケジューラーの直近の実行履歴（新しい順）を取得します。"
+)
+async def get_scheduler_runs(
+    job_name: Optional[str] = Query(None, description="ジョブ名で絞り込み"),
+    limit: int = Query(20, description="最大取得件数", ge=1, le=200),
+    db: Session = Depends(get_db)
+) -> List[SchedulerRunResponse]:
+    """直近の実行履歴"""
+    if job_name and job_name not in SCHEDULED_JOBS:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_name}")
+
+    try:
+        runs = await SchedulerRunRepository(db).get_recent(job_name, limit)
+    except Exception as e:
+        logger.error(f"Failed to get scheduler runs: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error occurred while fetching scheduler runs")
+    return [_run_response(run) for run in runs]
@@ -0,0 +1,76 @@
+"""
+Webhook API Endpoints
+Instagram Webhook（変更通知）の受信エンドポイント
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+import hmac
+import json
+import logging
+
+from ...core.database import get_db
+from ...core.instagram_config import instagram_config
+from ...services.data_collection.webhook_event_service import WebhookEventService, verify_signature
+
+# ログ設定
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/webhooks", tags=["Webhooks"])
+
+
+@router.get(
+    "/instagram",
+    response_class=PlainTextResponse,
+    summary="Webhook 購読確認",
+    description="アプリダッシュボードで購読を登録する際の確認リクエスト（hub.challenge をそのまま返す）"
+)
+async def verify_instagram_webhook(
+    hub_mode: str = Query(..., alias="hub.mode"),
+    hub_verify_token: str = Query(..., alias="hub.verify_token"),
+    hub_challenge: str = Query(..., alias="hub.challenge")
+):
+    """購読確認"""
+    expected = instagram_config.webhook_verify_token
+    if hub_mode != "subscribe" or not expected or not hmac.compare_digest(hub_verify_token.encode(), expected.encode()):
+        logger.warning("Webhook verification rejected: verify token mismatch")
+        raise HTTPException(status_code=403, detail="Verification failed")
+    return hub_challenge
+
+
+@router.post(
+    "/instagram",
+    summary="Webhook 通知受信",
+    description="""
+    Instagram の変更通知（comments / live_comments / story_insights）を受信し、
+    通知された投稿の取得ジョブ（webhook_media）を登録します。取得はワーカーで行います。
+    mentions（他ユーザーの投稿）は取得対象外のため無視します。
+
+    X-Hub-Signature-256 が FACEBOOK_APP_SECRET で検証できない通知は 403 で拒否します。
+    """
+)
+async def receive_instagram_webhook(request: Request, db: Session = Depends(get_db)):
+    """通知受信"""
+    body = await request.body()
+    if not verify_signature(body, request.headers.get("X-Hub-Signature-256"), instagram_config.facebook_app_secret):
+        logger.warning("Webhook rejected: invalid signature")
+        raise HTTPException(status_code=403, detail="Invalid signature")
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+
+    try:
+        result = await WebhookEventService(db).dispatch(payload)
+    except Exception as e:
+        # 2xx 以外は Meta 側で再送されるため、登録に失敗した場合は 500 を返す
+        logger.error(f"Failed to dispatch webhook events: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to queue webhook events")
+
+    return {
+        "events": result.events,
+        "jobs_queued": result.jobs_queued,
+        "ignored_changes": result.ignored_changes,
+        "unknown_accounts": result.unknown_accounts
+    }
@@ -5,10 +5,13 @@ import os
 from sqlalchemy import create_engine, MetaData, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool, QueuePool
 import logging
 from typing import Generator
 
+from app.core.metrics import instrument_engine
+from app.core.query_profiler import install_query_profiler
+
 # ログ設定
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -23,20 +26,35 @@ if not DATABASE_URL:
     logger.error("DATABASE_URL environment variable is not set")
     raise ValueError("DATABASE_URL environment variable is required")
 
+# SSLモード（ローカルのPostgresでベンチマーク等を行う場合は disable を指定）
+DATABASE_SSLMODE = os.getenv("DATABASE_SSLMODE", "require")
+
+# 接続プールのサイズ（0 の場合は NullPool。常駐プロセスでは接続を使い回すため指定する）
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "0"))
+
 # SQLAlchemy エンジンの作成
 try:
     engine = create_engine(
         DATABASE_URL,
-        poolclass=NullPool,  # Supabase向けの設定
+        **(
+            {"poolclass": QueuePool, "pool_size": DATABASE_POOL_SIZE, "max_overflow": DATABASE_POOL_SIZE}
+            if DATABASE_POOL_SIZE > 0
+            else {"poolclass": NullPool}  # Supabase向けの設定
+        ),
         echo=False,  # SQLログを出力したい場合はTrueに
         pool_pre_ping=True,  # 接続の健全性チェック
         pool_recycle=3600,   # 1時間で接続をリサイクル
         connect_args={
-            "sslmode": "require",  # SSL接続を強制
+            "sslmode": DATABASE_SSLMODE,  # デフォルトはSSL接続を強制
             "connect_timeout": 10   # 接続タイムアウト
         }
     )
     logger.info(f"Database engine created successfully")
+
+    # クエリ計測（Prometheus メトリクス）
+    instrument_engine(engine)
+    # SQLプロファイラ（SQL_PROFILING=1 の場合のみ有効）
+    install_query_profiler(engine)
 except Exception as e:
     logger.error(f"Failed to create database engine: {str(e)}")
     raise
@@ -3,6 +3,7 @@ Instagram API Configuration
 Instagram Graph API に関する設定とユーティリティ
 """
 import os
+import random
 from typing import Optional, Dict, Any
 import logging
 from datetime import datetime, timedelta
@@ -20,6 +21,11 @@ class InstagramConfig:
     # レート制限設定
     RATE_LIMIT_CALLS_PER_HOUR = 200  # 1時間あたりのAPI呼び出し制限
     RATE_LIMIT_SAFETY_MARGIN = 0.9   # 安全マージン（90%まで使用）
+    APP_RATE_LIMIT_CALLS_PER_HOUR = 4800  # アプリ全体の1時間あたりの呼び出し上限（全トークン合計）
+
+    # プロセス間で共有する呼び出し枠（api_quota_ledger、migration 013）
+    QUOTA_RESERVATION_BLOCK = 5  # 1回の予約でまとめて確保する呼び出し数
+    QUOTA_MAX_WAIT_SECONDS = 300  # 枠切れ時に次のウィンドウまで待つ上限（超える場合はエラー）
     
     # タイムアウト設定
     REQUEST_TIMEOUT_SECONDS = 30
@@ -30,15 +36,40 @@ class InstagramConfig:
     DEFAULT_POSTS_LIMIT = 25
     MAX_POSTS_LIMIT = 100
     INSIGHTS_MAX_PERIOD_DAYS = 93  # Insights API の最大期間
+    INSIGHTS_MAX_RANGE_DAYS = 30   # 1回の Insights リクエストで指定できる since〜until の最大日数
     
     # エラー処理設定
     CRITICAL_ERROR_CODES = [100, 190, 200]  # 致命的なエラーコード
-    RETRY_ERROR_CODES = [1, 2, 4, 17, 341]  # リトライ可能なエラーコード
+    RETRY_ERROR_CODES = [1, 2, 4, 17, 32, 341, 613, 80002]  # リトライ可能なエラーコード
+    RATE_LIMIT_ERROR_CODES = [4, 17, 32, 613, 80002]  # レート制限（RETRY_DELAY_BASE で待機）
+    AUTH_ERROR_CODES = [102, 190]  # トークン無効（OAuthException）
+    AUTH_FATAL_SUBCODES = [458, 460, 463, 467]  # 再試行しても回復しないトークンエラー（即時遮断）
+
+    # クライアント内リトライ設定（rate limit 以外の一時的なエラー）
+    REQUEST_RETRY_DELAY_BASE = 2  # 秒
+    REQUEST_RETRY_DELAY_MAX = 30  # 秒
+
+    # 認証エラーのサーキットブレーカー（トークン単位）
+    AUTH_CIRCUIT_FAILURE_THRESHOLD = 3  # 連続失敗でオープン
+    AUTH_CIRCUIT_COOLDOWN_SECONDS = 1800  # オープン後に1回だけ試行を許可するまでの時間
+
+    # インサイトメトリクスの取得可否キャッシュ（media_metric_capabilities、migration 015）
+    METRIC_CAPABILITY_AGE_BUCKETS_DAYS = [30, 365, 730]  # 投稿経過日数の区切り
+    METRIC_CAPABILITY_RECHECK_DAYS = 30  # 未対応と判定したメトリクスを再確認するまでの日数
+    MEDIA_INSIGHTS_UNAVAILABLE_SUBCODES = [2108006]  # 投稿単位でインサイトが存在しない（ビジネスアカウント移行前の投稿）
+
+    # Webhook（変更通知）の受信
+    WEBHOOK_MEDIA_DEBOUNCE_SECONDS = 60  # 同じ投稿への通知をまとめるため、取得ジョブの実行を遅らせる秒数
+    WEBHOOK_JOB_PRIORITY = 10  # 定期収集のジョブ（優先度 0）より先に処理する
     
     def __init__(self):
         """設定の初期化"""
         self.facebook_app_id = os.getenv("FACEBOOK_APP_ID")
         self.facebook_app_secret = os.getenv("FACEBOOK_APP_SECRET")
+        # Webhook 購読登録時の確認トークン（アプリダッシュボードの「認証トークン」と同じ値）
+        self.webhook_verify_token = os.getenv("INSTAGRAM_WEBHOOK_VERIFY_TOKEN")
+        # API_QUOTA_LEDGER_ENABLED=false でプロセス間の呼び出し枠予約を無効化（ローカル検証用）
+        self.quota_ledger_enabled = os.getenv("API_QUOTA_LEDGER_ENABLED", "true").lower() != "false"
         
         # TODO: 暗号化実装時にはここで暗号化キーを取得
         # self.encryption_key = os.getenv("ENCRYPTION_KEY")
@@ -78,6 +109,10 @@ class InstagramConfig:
         """ユーザーインサイト取得URL"""
         return f"{self.api_base_url}/{user_id}/insights"
     
+    def get_media_url(self, media_id: str) -> str:
+        """メディア情報取得URL"""
+        return f"{self.api_base_url}/{media_id}"
+    
     def get_media_insights_url(self, media_id: str) -> str:
         """メディアインサイト取得URL"""
         return f"{self.api_base_url}/{media_id}/insights"
@@ -102,7 +137,7 @@ class InstagramConfig:
     
     def get_media_fields(self) -> str:
         """メディア情報フィールド"""
-        return "id,media_type,caption,media_url,thumbnail_url,timestamp,permalink,username,like_count,comments_count,is_comment_enabled,shortcode"
+        return "id,media_type,media_product_type,caption,media_url,thumbnail_url,timestamp,permalink,username,like_count,comments_count,is_comment_enabled,shortcode"
     
     def get_available_insights_metrics(self) -> Dict[str, list]:
         """利用可能なインサイトメトリクス（検証済み）"""
@@ -131,6 +166,28 @@ class InstagramConfig:
             ]
         }
     
+    def get_media_extra_metrics(self, media_type: str) -> list:
+        """メディアタイプ固有の追加メトリクス（VIDEO/CAROUSEL_ALBUM 以外は無し）"""
+        available_metrics = self.get_available_insights_metrics()
+        if media_type == 'VIDEO':
+            return list(available_metrics["media_metrics_video"])
+        if media_type == 'CAROUSEL_ALBUM':
+            return list(available_metrics["media_metrics_carousel"])
+        return []
+    
+    def get_media_metrics_for_type(self, media_type: str) -> list:
+        """メディアタイプ別の取得メトリクス（共通 + タイプ固有）"""
+        return self.get_available_insights_metrics()["media_metrics_all"] + self.get_media_extra_metrics(media_type)
+    
+    def get_media_fields_with_insights(self) -> str:
+        """
+        メディア情報 + インサイト（フィールド展開）
+        
+        タイプ固有メトリクスは他タイプのメディアでエラーになるため、全タイプ共通のメトリクスのみ展開する
+        """
+        common_metrics = ','.join(self.get_available_insights_metrics()["media_metrics_all"])
+        return f"{self.get_media_fields()},insights.metric({common_metrics})"
+    
     def get_unavailable_metrics(self) -> list:
         """取得不可能なメトリクス（検証済み）"""
         return [
@@ -166,6 +223,22 @@ class InstagramConfig:
     def get_retry_delay(self, attempt: int) -> int:
         """リトライ待機時間計算（指数バックオフ）"""
         return min(self.RETRY_DELAY_BASE * (2 ** (attempt - 1)), 3600)
+    
+    def is_auth_error(self, error_code: Any, error_subcode: Any = None) -> bool:
+        """トークン無効エラーかどうか判定"""
+        return error_code in self.AUTH_ERROR_CODES or error_subcode in self.AUTH_FATAL_SUBCODES
+    
+    def is_fatal_auth_error(self, error_code: Any, error_subcode: Any = None) -> bool:
+        """再試行しても回復しないトークンエラーかどうか判定（期限切れ・パスワード変更等）"""
+        return self.is_auth_error(error_code) and error_subcode in self.AUTH_FATAL_SUBCODES
+    
+    def get_request_retry_delay(self, attempt: int, error_code: Any = None) -> float:
+        """クライアント内リトライの待機時間（Full Jitter 付き指数バックオフ）"""
+        if error_code in self.RATE_LIMIT_ERROR_CODES:
+            ceiling = self.get_retry_delay(attempt)
+        else:
+            ceiling = min(self.REQUEST_RETRY_DELAY_BASE * (2 ** (attempt - 1)), self.REQUEST_RETRY_DELAY_MAX)
+        return random.uniform(0, ceiling)
 
 
 # グローバル設定インスタンス
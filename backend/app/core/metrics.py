@@ -0,0 +1,240 @@
+"""
+Prometheus Metrics
+アプリケーション・収集スクリプト共通のメトリクス定義と計測ユーティリティ
+"""
+import json
+import logging
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    CONTENT_TYPE_LATEST,
+    generate_latest,
+    push_to_gateway,
+    write_to_textfile,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# ログ設定
+logger = logging.getLogger(__name__)
+
+# 専用レジストリ（プロセス既定のコレクターを含めない）
+registry = CollectorRegistry(auto_describe=True)
+
+# === HTTP リクエスト ===
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    registry=registry,
+)
+
+# === DB クエリ ===
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "Number of SQL statements executed per HTTP request",
+    ["route"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250, 500),
+    registry=registry,
+)
+DB_QUERY_TIME_PER_REQUEST = Histogram(
+    "db_query_time_per_request_seconds",
+    "Total SQL execution time per HTTP request",
+    ["route"],
+    registry=registry,
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time",
+    ["scope"],
+    registry=registry,
+)
+
+# === Instagram Graph API ===
+GRAPH_API_CALLS = Counter(
+    "instagram_api_calls_total",
+    "Instagram Graph API calls by endpoint type and outcome",
+    ["endpoint_type", "outcome"],
+    registry=registry,
+)
+GRAPH_API_DURATION = Histogram(
+    "instagram_api_call_duration_seconds",
+    "Instagram Graph API call latency by endpoint type",
+    ["endpoint_type"],
+    registry=registry,
+)
+GRAPH_API_ERRORS = Counter(
+    "instagram_api_errors_total",
+    "Instagram Graph API errors by endpoint type and error code",
+    ["endpoint_type", "error_code"],
+    registry=registry,
+)
+GRAPH_API_USAGE = Gauge(
+    "instagram_api_usage_percent",
+    "Latest rate limit usage reported by Graph API usage headers",
+    ["header", "metric"],
+    registry=registry,
+)
+
+# === 収集スクリプト ===
+COLLECTOR_RUN_DURATION = Gauge(
+    "collector_run_duration_seconds",
+    "Duration of the last collector run",
+    ["collector"],
+    registry=registry,
+)
+COLLECTOR_ACCOUNTS = Gauge(
+    "collector_accounts",
+    "Accounts processed in the last collector run by status",
+    ["collector", "status"],
+    registry=registry,
+)
+COLLECTOR_LAST_RUN = Gauge(
+    "collector_last_run_timestamp_seconds",
+    "Unix timestamp of the last collector run",
+    ["collector"],
+    registry=registry,
+)
+
+# Graph API の使用率ヘッダー
+USAGE_HEADERS = ("X-App-Usage", "X-Business-Use-Case-Usage", "X-Ad-Account-Usage")
+
+
+@dataclass
+class QueryStats:
+    """リクエスト（または収集実行）単位のクエリ統計"""
+    count: int = 0
+    total_seconds: float = 0.0
+
+
+# 現在のリクエストのクエリ統計（ミドルウェアで設定）
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """SQLAlchemy エンジンにクエリ計測リスナーを登録"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start_times = conn.info.get("query_start_time")
+        if not start_times:
+            return
+        elapsed = time.perf_counter() - start_times.pop()
+
+        stats = current_query_stats.get()
+        DB_QUERY_DURATION.labels(scope="request" if stats is not None else "background").observe(elapsed)
+        if stats is not None:
+            stats.count += 1
+            stats.total_seconds += elapsed
+
+
+def classify_graph_endpoint(url: str) -> str:
+    """Graph API URL からエンドポイント種別を判定（ラベルの種類を抑えるため）"""
+    segments = [segment for segment in urlparse(url).path.split("/") if segment]
+    # 先頭のバージョン指定（v23.0 等）を除外
+    if segments and segments[0].startswith("v") and segments[0][1:2].isdigit():
+        segments = segments[1:]
+
+    if not segments:
+        return "root"
+    if len(segments) == 1:
+        return "oauth" if segments[0] == "oauth" else "node"
+    return segments[-1] if segments[-1] in ("media", "insights", "accounts", "access_token") else "edge"
+
+
+def record_graph_api_call(
+    url: str,
+    duration_seconds: float,
+    error_code: Optional[int] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> None:
+    """Graph API 呼び出し結果を記録"""
+    endpoint_type = classify_graph_endpoint(url)
+    GRAPH_API_DURATION.labels(endpoint_type=endpoint_type).observe(duration_seconds)
+
+    if error_code is None:
+        GRAPH_API_CALLS.labels(endpoint_type=endpoint_type, outcome="success").inc()
+    else:
+        GRAPH_API_CALLS.labels(endpoint_type=endpoint_type, outcome="error").inc()
+        GRAPH_API_ERRORS.labels(endpoint_type=endpoint_type, error_code=str(error_code)).inc()
+
+    if headers:
+        record_usage_headers(headers)
+
+
+def record_usage_headers(headers: Dict[str, str]) -> None:
+    """X-App-Usage 等の使用率ヘッダーをゲージに反映"""
+    for header in USAGE_HEADERS:
+        raw = headers.get(header)
+        if not raw:
+            continue
+        try:
+            usage = json.loads(raw)
+        except ValueError:
+            continue
+
+        # X-Business-Use-Case-Usage は {business_id: [{...}]} 形式
+        if isinstance(usage, dict) and all(isinstance(v, list) for v in usage.values()):
+            entries = [entry for values in usage.values() for entry in values]
+        else:
+            entries = [usage]
+
+        for entry in entries:
+            for metric, value in entry.items():
+                if isinstance(value, (int, float)):
+                    GRAPH_API_USAGE.labels(header=header, metric=metric).set(value)
+
+
+def record_collector_run(collector: str, duration_seconds: float, successful: int, failed: int) -> None:
+    """収集スクリプトの実行結果を記録"""
+    COLLECTOR_RUN_DURATION.labels(collector=collector).set(duration_seconds)
+    COLLECTOR_ACCOUNTS.labels(collector=collector, status="success").set(successful)
+    COLLECTOR_ACCOUNTS.labels(collector=collector, status="failed").set(failed)
+    COLLECTOR_LAST_RUN.labels(collector=collector).set_to_current_time()
+
+
+def render_latest() -> bytes:
+    """/metrics 用のテキスト形式を生成"""
+    return generate_latest(registry)
+
+
+def export_metrics(job: str, textfile_dir: Path) -> Optional[str]:
+    """
+    収集スクリプト終了時のメトリクス出力
+
+    PUSHGATEWAY_URL が設定されていれば Pushgateway に送信し、
+    未設定の場合は node_exporter の textfile collector 形式で書き出す。
+
+    Returns:
+        Optional[str]: 出力先（失敗時は None）
+    """
+    pushgateway_url = os.getenv("PUSHGATEWAY_URL")
+    try:
+        if pushgateway_url:
+            push_to_gateway(pushgateway_url, job=job, registry=registry)
+            logger.info(f"Metrics pushed to Pushgateway: {pushgateway_url} (job={job})")
+            return pushgateway_url
+
+        textfile_dir.mkdir(parents=True, exist_ok=True)
+        textfile_path = textfile_dir / f"{job}.prom"
+        write_to_textfile(str(textfile_path), registry)
+        logger.info(f"Metrics written to textfile: {textfile_path}")
+        return str(textfile_path)
+    except Exception as e:
+        logger.warning(f"Failed to export metrics: {e}")
+        return None
+
@@ -0,0 +1,204 @@
+"""
+SQL Query Profiler
+SQLAlchemy のイベントリスナーでクエリ数・遅いクエリ・同一形状クエリの繰り返し（N+1）を検出する
+
+SQL_PROFILING=1 のときのみエンジンにリスナーを登録する（オプトイン）。
+リクエスト単位は main.py のミドルウェア、収集実行単位は BaseCollector から
+profile_queries() で計測範囲を指定する。
+"""
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# ログ設定
+logger = logging.getLogger(__name__)
+
+# プロファイラ設定（環境変数）
+SQL_PROFILING_ENABLED = os.getenv("SQL_PROFILING", "").lower() in ("1", "true", "yes")
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "100"))
+# 同一形状のクエリがこの回数以上実行されたら N+1 候補とみなす
+REPEATED_SHAPE_THRESHOLD = int(os.getenv("SQL_REPEATED_SHAPE_THRESHOLD", "10"))
+
+# 形状の正規化用パターン
+_IN_LIST_PATTERN = re.compile(r"\bIN\s*\((?:[^()]|\([^()]*\))*\)", re.IGNORECASE)
+_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class QueryBudgetExceededError(AssertionError):
+    """クエリ予算超過エラー（テストで失敗として扱われるよう AssertionError を継承）"""
+    pass
+
+
+@dataclass
+class SlowQuery:
+    """遅いクエリの記録"""
+    statement: str
+    duration_ms: float
+
+
+@dataclass
+class QueryProfile:
+    """計測範囲（リクエスト・収集実行）ごとのクエリプロファイル"""
+    label: str
+    count: int = 0
+    total_seconds: float = 0.0
+    slow_queries: List[SlowQuery] = field(default_factory=list)
+    shapes: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, duration_seconds: float) -> None:
+        """1ステートメントの実行結果を記録"""
+        self.count += 1
+        self.total_seconds += duration_seconds
+        self.shapes[normalize_statement(statement)] += 1
+
+        duration_ms = duration_seconds * 1000
+        if duration_ms >= SLOW_QUERY_THRESHOLD_MS:
+            self.slow_queries.append(SlowQuery(statement=statement, duration_ms=round(duration_ms, 2)))
+
+    def repeated_shapes(self, threshold: int = REPEATED_SHAPE_THRESHOLD) -> List[Tuple[str, int]]:
+        """閾値回数以上繰り返された形状（N+1 候補）を多い順に返す"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+    def summary(self) -> Dict[str, object]:
+        """レポート用の集計値"""
+        return {
+            'label': self.label,
+            'query_count': self.count,
+            'total_ms': round(self.total_seconds * 1000, 2),
+            'distinct_shapes': len(self.shapes),
+            'slow_queries': len(self.slow_queries),
+            'repeated_shapes': len(self.repeated_shapes()),
+        }
+
+    def format_report(self, max_items: int = 5) -> str:
+        """ログ出力用のレポート文字列"""
+        summary = self.summary()
+        lines = [
+            f"SQL profile [{self.label}]: {summary['query_count']} queries, "
+            f"{summary['total_ms']}ms, {summary['distinct_shapes']} distinct shapes"
+        ]
+        for shape, count in self.repeated_shapes()[:max_items]:
+            lines.append(f"  repeated x{count}: {shape[:200]}")
+        for slow in sorted(self.slow_queries, key=lambda q: q.duration_ms, reverse=True)[:max_items]:
+            lines.append(f"  slow {slow.duration_ms}ms: {_WHITESPACE_PATTERN.sub(' ', slow.statement)[:200]}")
+        return "\n".join(lines)
+
+
+# 現在の計測範囲のプロファイル
+current_profile: ContextVar[Optional[QueryProfile]] = ContextVar("current_query_profile", default=None)
+
+
+def normalize_statement(statement: str) -> str:
+    """パラメータ・リテラル・IN リストを除いたクエリの形状を返す"""
+    shape = _IN_LIST_PATTERN.sub("IN (...)", statement)
+    shape = _LITERAL_PATTERN.sub("?", shape)
+    return _WHITESPACE_PATTERN.sub(" ", shape).strip()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_profiler_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get("query_profiler_start")
+    if not start_times:
+        return
+    elapsed = time.perf_counter() - start_times.pop()
+
+    profile = current_profile.get()
+    if profile is not None:
+        profile.record(statement, elapsed)
+
+
+def install_query_profiler(engine: Engine, force: bool = False) -> bool:
+    """
+    エンジンにプロファイラのリスナーを登録
+
+    Args:
+        engine: 対象エンジン
+        force: SQL_PROFILING の設定に関わらず登録する（テストのセットアップ用）
+
+    Returns:
+        bool: リスナーが登録されている場合は True
+    """
+    if not (SQL_PROFILING_ENABLED or force):
+        return False
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return True
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    logger.info(
+        f"SQL profiler enabled (slow >= {SLOW_QUERY_THRESHOLD_MS}ms, "
+        f"repeated >= {REPEATED_SHAPE_THRESHOLD})"
+    )
+    return True
+
+
+@contextmanager
+def profile_queries(label: str) -> Iterator[QueryProfile]:
+    """
+    計測範囲内で実行されたクエリをプロファイル
+
+    asyncio.gather 等で生成したタスクにもコンテキストが引き継がれるため、
+    収集スクリプトの実行全体を1つのプロファイルにまとめられる。
+    """
+    profile = QueryProfile(label=label)
+    token = current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        current_profile.reset(token)
+
+
+def check_budget(
+    profile: QueryProfile,
+    max_queries: Optional[int] = None,
+    max_repeats: Optional[int] = None
+) -> List[str]:
+    """予算超過の内容を返す（超過なしは空リスト）"""
+    violations = []
+    if max_queries is not None and profile.count > max_queries:
+        violations.append(f"{profile.count} queries executed (budget: {max_queries})")
+    if max_repeats is not None:
+        for shape, count in profile.shapes.most_common():
+            if count <= max_repeats:
+                break
+            violations.append(f"statement repeated {count} times (budget: {max_repeats}): {shape[:200]}")
+    return violations
+
+
+@contextmanager
+def assert_query_budget(
+    label: str,
+    max_queries: Optional[int] = None,
+    max_repeats: Optional[int] = None
+) -> Iterator[QueryProfile]:
+    """
+    予算を超えたら QueryBudgetExceededError を送出する計測範囲（テスト用）
+
+    エンジンへのリスナー登録が前提（SQL_PROFILING=1 または
+    install_query_profiler(engine, force=True)）。
+
+    例:
+        with assert_query_budget("post_detector", max_repeats=1):
+            await detector.detect_new_posts(...)
+    """
+    with profile_queries(label) as profile:
+        yield profile
+
+    violations = check_budget(profile, max_queries, max_repeats)
+    if violations:
+        raise QueryBudgetExceededError(
+            f"Query budget exceeded in {label}:\n  " + "\n  ".join(violations)
+        )
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, String, Integer, Text, DateTime, func
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+import uuid
+
+from ..core.database import Base
+
+
+class AccountSetupJob(Base):
+    """
+    アカウントセットアップジョブ
+
+    セットアップはバックグラウンドで実行し、進捗（ステップ・ページ単位）と結果を保存する。
+    App Secret・トークンは保存しない。
+    """
+    __tablename__ = "account_setup_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    status = Column(String(20), nullable=False, default="pending")  # pending / running / completed / failed
+
+    # 進捗
+    current_step = Column(Integer, nullable=False, default=0)
+    total_steps = Column(Integer, nullable=False, default=4)
+    message = Column(Text)
+    pages_total = Column(Integer, nullable=False, default=0)
+    pages_processed = Column(Integer, nullable=False, default=0)
+    pages = Column(JSONB, nullable=False, default=list)  # [{page_id, page_name, status, instagram_user_id, username}]
+
+    # 結果
+    result = Column(JSONB)  # AccountSetupResponse
+    error = Column(Text)
+
+    created_at = Column(DateTime(timezone=True), default=func.now())
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
+    started_at = Column(DateTime(timezone=True))
+    completed_at = Column(DateTime(timezone=True))
+
+    def __repr__(self):
+        return f"<AccountSetupJob(id={self.id}, status={self.status}, step={self.current_step}/{self.total_steps})>"
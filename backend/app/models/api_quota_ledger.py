@@ -0,0 +1,27 @@
+from sqlalchemy import Column, String, Integer, DateTime, func
+
+from ..core.database import Base
+
+
+class ApiQuotaLedger(Base):
+    """
+    Graph API 呼び出し枠の予約台帳
+
+    1時間ウィンドウ × スコープ（app:<app_id> / token:<トークンのハッシュ>）ごとに
+    予約済み呼び出し数を持ち、同じアプリ・トークンを使う全プロセスで共有する。
+    トークンそのものは保存しない。
+    """
+    __tablename__ = "api_quota_ledger"
+
+    scope_key = Column(String(100), primary_key=True)
+    window_start = Column(DateTime(timezone=True), primary_key=True)
+    calls_limit = Column(Integer, nullable=False)
+    calls_reserved = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
+
+    @property
+    def calls_remaining(self) -> int:
+        return max(self.calls_limit - self.calls_reserved, 0)
+
+    def __repr__(self):
+        return f"<ApiQuotaLedger(scope_key={self.scope_key}, window_start={self.window_start}, reserved={self.calls_reserved}/{self.calls_limit})>"
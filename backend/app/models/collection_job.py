@@ -0,0 +1,47 @@
+from sqlalchemy import Column, String, Integer, Text, DateTime, Index, func, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+import uuid
+
+from ..core.database import Base
+
+
+class CollectionJob(Base):
+    """
+    収集ジョブ（DBベースのワークキュー）
+
+    ワーカーは SELECT ... FOR UPDATE SKIP LOCKED で pending のジョブを取得する
+    """
+    __tablename__ = "collection_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_type = Column(String(50), nullable=False)       # account_collection / post_metrics_refresh / backfill_chunk / webhook_media
+    payload = Column(JSONB, nullable=False, default=dict)
+
+    # キュー制御
+    status = Column(String(20), nullable=False, default="pending")  # pending / running / completed / failed
+    priority = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime(timezone=True), nullable=False, default=func.now())
+    dedupe_key = Column(String(255))
+
+    # ワーカー情報
+    locked_by = Column(String(100))
+    locked_at = Column(DateTime(timezone=True))
+    last_error = Column(Text)
+    result = Column(JSONB)
+
+    created_at = Column(DateTime(timezone=True), default=func.now())
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
+    completed_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index('idx_collection_jobs_claim', priority.desc(), run_after, postgresql_where=text("status = 'pending'")),
+        Index(
+            'uq_collection_jobs_active_dedupe', dedupe_key, unique=True,
+            postgresql_where=text("status IN ('pending', 'running')")
+        ),
+    )
+
+    def __repr__(self):
+        return f"<CollectionJob(id={self.id}, job_type={self.job_type}, status={self.status}, attempts={self.attempts})>"
@@ -0,0 +1,43 @@
+from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, Index, UniqueConstraint, func, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+import uuid
+
+from ..core.database import Base
+
+
+class FailedCollectionItem(Base):
+    """
+    収集失敗項目の再試行キュー
+
+    投稿メトリクス・新規投稿・アカウント単位の失敗を (item_type, item_key) で1行に集約し、
+    失敗のたびに attempts と次回試行可能時刻（指数バックオフ）を更新する。
+    再試行に成功した行は削除する。
+    """
+    __tablename__ = "failed_collection_items"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    item_type = Column(String(50), nullable=False)      # post_metrics / new_post / account_new_posts
+    item_key = Column(String(100), nullable=False)      # instagram_post_id / instagram_user_id
+    account_id = Column(UUID(as_uuid=True), ForeignKey("instagram_accounts.id"))
+    payload = Column(JSONB, nullable=False, default=dict)
+
+    # 再試行制御
+    status = Column(String(20), nullable=False, default="pending")  # pending / abandoned
+    reason = Column(Text)
+    attempts = Column(Integer, nullable=False, default=1)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, default=func.now())
+
+    first_failed_at = Column(DateTime(timezone=True), default=func.now())
+    last_failed_at = Column(DateTime(timezone=True), default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('item_type', 'item_key', name='uq_failed_collection_items_item'),
+        Index(
+            'idx_failed_collection_items_due', account_id, item_type, next_attempt_at,
+            postgresql_where=text("status = 'pending'")
+        ),
+    )
+
+    def __repr__(self):
+        return f"<FailedCollectionItem(item_type={self.item_type}, item_key={self.item_key}, status={self.status}, attempts={self.attempts})>"
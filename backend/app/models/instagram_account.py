@@ -16,6 +16,7 @@ class InstagramAccount(Base):
     profile_picture_url = Column(Text)
     access_token_encrypted = Column(Text, nullable=False)
     token_expires_at = Column(DateTime(timezone=True))
+    user_access_token_encrypted = Column(Text)  # ページトークンの派生元の長期ユーザートークン（トークン更新用）
     facebook_page_id = Column(String(50))
     is_active = Column(Boolean, default=True, index=True)
     created_at = Column(DateTime(timezone=True), default=func.now())
@@ -17,6 +17,7 @@ class InstagramDailyStats(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     account_id = Column(UUID(as_uuid=True), ForeignKey("instagram_accounts.id"), nullable=False, index=True)
+    # 月次レンジパーティションのキー（migration 010、DB上の主キーは (id, stats_date)）
     stats_date = Column(Date, nullable=False, index=True)
 
     # === APIから直接取得する基本データ ===
@@ -31,6 +32,10 @@ class InstagramDailyStats(Base):
     total_likes = Column(Integer, default=0)                       # 当日投稿の合計いいね
     total_comments = Column(Integer, default=0)                    # 当日投稿の合計コメント
 
+    # === アカウントインサイト（Insights API の日別値、migration 012） ===
+    reach = Column(Integer, default=0)                             # 日別リーチ数
+    follower_count_change = Column(Integer, default=0)             # 日別フォロワー数変化
+
     # === メタデータ ===
     media_type_distribution = Column(Text)                         # 当日投稿タイプ分布JSON
     data_sources = Column(Text)                                    # データソース情報JSON
@@ -19,6 +19,8 @@ class InstagramPost(Base):
     permalink = Column(Text)
     posted_at = Column(DateTime(timezone=True), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), default=func.now())
+    # インサイトを取得できなかった直近の再取得試行日時（再取得スケジュール判定用）
+    metrics_refresh_attempted_at = Column(DateTime(timezone=True))
 
     # リレーション
 #    account = relationship("InstagramAccount", back_populates="posts")
@@ -33,7 +33,10 @@ class InstagramPostMetrics(Base):
     # 計算値
     engagement_rate = Column(DECIMAL(5, 2), default=0)
 
-    recorded_at = Column(DateTime(timezone=True), default=func.now(), index=True)
+    # 月次レンジパーティションのキー（migration 010、DB上の主キーは (id, recorded_at)）
+    recorded_at = Column(DateTime(timezone=True), nullable=False, default=func.now(), index=True)
+    # 同じ値を最後に確認した日時（値が変化しない間は行を追加せずこの列のみ更新）
+    last_observed_at = Column(DateTime(timezone=True), default=func.now())
 
     # リレーション（一時的にコメントアウト）
     # post = relationship("InstagramPost", back_populates="metrics")
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, String, Text, Boolean, DateTime, func
+
+from ..core.database import Base
+
+
+class MediaMetricCapability(Base):
+    """
+    インサイトメトリクスの取得可否（学習結果）
+
+    メディアタイプ × プロダクトタイプ × 投稿経過期間ごとに、メトリクスが Graph API で
+    取得できたか（is_supported）を記録する。未対応のメトリクスは一定期間リクエストから除外する。
+    """
+    __tablename__ = "media_metric_capabilities"
+
+    media_type = Column(String(20), primary_key=True)          # IMAGE / VIDEO / CAROUSEL_ALBUM
+    media_product_type = Column(String(20), primary_key=True)  # FEED / REELS / STORY / AD
+    age_bucket = Column(String(20), primary_key=True)          # 0-30d / 30-365d / 365-730d / 730d+
+    metric = Column(String(100), primary_key=True)
+    is_supported = Column(Boolean, nullable=False)
+    last_error = Column(Text)
+    checked_at = Column(DateTime(timezone=True), nullable=False, default=func.now())
+
+    def __repr__(self):
+        return (
+            f"<MediaMetricCapability({self.media_type}/{self.media_product_type}/{self.age_bucket} "
+            f"{self.metric}={'supported' if self.is_supported else 'unsupported'})>"
+        )
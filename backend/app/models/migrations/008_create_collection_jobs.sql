@@ -0,0 +1,46 @@
+-- Migration: 008_create_collection_jobs.sql
+-- Description: Create collection_jobs table (DB-backed work queue for collector workers)
+-- Created: 2025-07-20
+
+CREATE TABLE IF NOT EXISTS collection_jobs (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    job_type VARCHAR(50) NOT NULL,
+    payload JSONB NOT NULL DEFAULT '{}',
+
+    -- キュー制御
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    priority INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    run_after TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    dedupe_key VARCHAR(255),
+
+    -- ワーカー情報
+    locked_by VARCHAR(100),
+    locked_at TIMESTAMP WITH TIME ZONE,
+    last_error TEXT,
+    result JSONB,
+
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    completed_at TIMESTAMP WITH TIME ZONE,
+
+    CONSTRAINT chk_collection_jobs_type CHECK (job_type IN ('account_collection', 'post_metrics_refresh', 'backfill_chunk')),
+    CONSTRAINT chk_collection_jobs_status CHECK (status IN ('pending', 'running', 'completed', 'failed'))
+);
+
+-- インデックス: ワーカーの取得クエリ（SELECT ... FOR UPDATE SKIP LOCKED）用
+CREATE INDEX IF NOT EXISTS idx_collection_jobs_claim ON collection_jobs(priority DESC, run_after) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_collection_jobs_running ON collection_jobs(locked_at) WHERE status = 'running';
+CREATE INDEX IF NOT EXISTS idx_collection_jobs_type_status ON collection_jobs(job_type, status);
+
+-- 未完了ジョブの重複登録防止
+CREATE UNIQUE INDEX IF NOT EXISTS uq_collection_jobs_active_dedupe ON collection_jobs(dedupe_key) WHERE status IN ('pending', 'running');
+
+-- コメント
+COMMENT ON TABLE collection_jobs IS 'Work queue for collector workers (claimed with FOR UPDATE SKIP LOCKED)';
+COMMENT ON COLUMN collection_jobs.job_type IS 'account_collection / post_metrics_refresh / backfill_chunk';
+COMMENT ON COLUMN collection_jobs.payload IS 'Job parameters (instagram_user_id, target_date, date range, etc.)';
+COMMENT ON COLUMN collection_jobs.run_after IS 'Job becomes claimable after this time (used for retry backoff)';
+COMMENT ON COLUMN collection_jobs.dedupe_key IS 'Prevents enqueuing the same job twice while pending or running';
+COMMENT ON COLUMN collection_jobs.locked_by IS 'Worker identifier (host:pid:worker)';
@@ -0,0 +1,16 @@
+-- Migration: 009_add_post_metrics_last_observed_at.sql
+-- Description: Suppress unchanged post metrics snapshots (extend the latest row instead of inserting)
+-- Created: 2025-07-22
+
+-- 値が変化していない再取得では行を追加せず、最終確認日時のみ更新する
+-- スナップショットの値は recorded_at 〜 last_observed_at の期間有効
+ALTER TABLE instagram_post_metrics ADD COLUMN IF NOT EXISTS last_observed_at TIMESTAMP WITH TIME ZONE;
+
+-- 既存行は記録日時で初期化
+UPDATE instagram_post_metrics SET last_observed_at = recorded_at WHERE last_observed_at IS NULL;
+
+-- インデックス: 指定日時点で有効なスナップショットの検索用
+CREATE INDEX IF NOT EXISTS idx_post_metrics_post_recorded ON instagram_post_metrics(post_id, recorded_at DESC);
+
+-- コメント
+COMMENT ON COLUMN instagram_post_metrics.last_observed_at IS 'Last time the same values were observed (snapshot is valid from recorded_at to last_observed_at)';
@@ -0,0 +1,181 @@
+-- Migration: 010_partition_metrics_tables.sql
+-- Description: Convert instagram_post_metrics / instagram_daily_stats to monthly range partitioning
+-- Created: 2025-07-23
+--
+-- 既存テーブルは *_legacy にリネームして残す（動作確認後に手動で DROP する）
+-- ロールバック手順:
+--   ALTER TABLE instagram_post_metrics RENAME TO instagram_post_metrics_partitioned;
+--   ALTER TABLE instagram_post_metrics_legacy RENAME TO instagram_post_metrics;
+--   （instagram_daily_stats も同様）
+
+-- =====================================================
+-- パーティション管理関数
+-- =====================================================
+
+-- 指定月のパーティションを作成（既に存在する場合は何もしない）
+-- DEFAULT パーティションに該当月の行がある場合は新パーティションへ移してからアタッチする
+CREATE OR REPLACE FUNCTION create_monthly_partition(parent_table TEXT, target_month DATE)
+RETURNS TEXT AS $$
+DECLARE
+    month_start DATE := date_trunc('month', target_month)::DATE;
+    month_end DATE := (date_trunc('month', target_month) + INTERVAL '1 month')::DATE;
+    partition_name TEXT := format('%s_p%s', parent_table, to_char(month_start, 'YYYYMM'));
+    default_name TEXT := format('%s_default', parent_table);
+    key_column TEXT;
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN partition_name;
+    END IF;
+
+    SELECT a.attname INTO key_column
+    FROM pg_partitioned_table pt
+    JOIN pg_attribute a ON a.attrelid = pt.partrelid AND a.attnum = pt.partattrs[0]
+    WHERE pt.partrelid = parent_table::regclass;
+
+    IF key_column IS NULL THEN
+        RAISE EXCEPTION '% is not a partitioned table', parent_table;
+    END IF;
+
+    EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS)', partition_name, parent_table);
+
+    IF to_regclass(default_name) IS NOT NULL THEN
+        EXECUTE format(
+            'WITH moved AS (DELETE FROM %I WHERE %I >= %L AND %I < %L RETURNING *) INSERT INTO %I SELECT * FROM moved',
+            default_name, key_column, month_start, key_column, month_end, partition_name
+        );
+    END IF;
+
+    EXECUTE format(
+        'ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        parent_table, partition_name, month_start, month_end
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 当月から指定月数先までのパーティションを作成
+CREATE OR REPLACE FUNCTION ensure_monthly_partitions(parent_table TEXT, months_ahead INTEGER DEFAULT 3)
+RETURNS INTEGER AS $$
+DECLARE
+    created INTEGER := 0;
+    i INTEGER;
+    partition_name TEXT;
+BEGIN
+    FOR i IN 0..months_ahead LOOP
+        partition_name := format('%s_p%s', parent_table, to_char(date_trunc('month', CURRENT_DATE) + make_interval(months => i), 'YYYYMM'));
+        IF to_regclass(partition_name) IS NULL THEN
+            PERFORM create_monthly_partition(parent_table, (date_trunc('month', CURRENT_DATE) + make_interval(months => i))::DATE);
+            created := created + 1;
+        END IF;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- =====================================================
+-- instagram_post_metrics
+-- =====================================================
+
+ALTER TABLE instagram_post_metrics RENAME TO instagram_post_metrics_legacy;
+
+CREATE TABLE instagram_post_metrics (
+    LIKE instagram_post_metrics_legacy INCLUDING DEFAULTS INCLUDING COMMENTS
+) PARTITION BY RANGE (recorded_at);
+
+ALTER TABLE instagram_post_metrics ALTER COLUMN recorded_at SET NOT NULL;
+
+-- パーティションキーを含む主キー・一意制約
+ALTER TABLE instagram_post_metrics ADD CONSTRAINT instagram_post_metrics_partitioned_pkey PRIMARY KEY (id, recorded_at);
+ALTER TABLE instagram_post_metrics ADD CONSTRAINT uq_post_metrics_partitioned_daily UNIQUE (post_id, recorded_at);
+ALTER TABLE instagram_post_metrics ADD CONSTRAINT fk_post_metrics_partitioned_post
+    FOREIGN KEY (post_id) REFERENCES instagram_posts(id) ON DELETE CASCADE;
+
+-- インデックス（各パーティションに自動作成される）
+CREATE INDEX idx_post_metrics_part_post_recorded ON instagram_post_metrics(post_id, recorded_at DESC);
+CREATE INDEX idx_post_metrics_part_recorded_at ON instagram_post_metrics(recorded_at DESC);
+CREATE INDEX idx_post_metrics_part_engagement_rate ON instagram_post_metrics(engagement_rate DESC);
+CREATE INDEX idx_post_metrics_part_likes ON instagram_post_metrics(likes DESC);
+CREATE INDEX idx_post_metrics_part_reach ON instagram_post_metrics(reach DESC);
+
+-- 想定外の日付の行を受け止める DEFAULT パーティション
+CREATE TABLE instagram_post_metrics_default PARTITION OF instagram_post_metrics DEFAULT;
+
+-- 既存データの期間 + 3ヶ月先までの月次パーティションを作成
+DO $$
+DECLARE
+    m DATE;
+BEGIN
+    SELECT date_trunc('month', COALESCE(MIN(recorded_at), NOW()))::DATE INTO m FROM instagram_post_metrics_legacy;
+    WHILE m <= (date_trunc('month', CURRENT_DATE) + INTERVAL '3 months')::DATE LOOP
+        PERFORM create_monthly_partition('instagram_post_metrics', m);
+        m := (m + INTERVAL '1 month')::DATE;
+    END LOOP;
+END;
+$$;
+
+INSERT INTO instagram_post_metrics
+SELECT * FROM instagram_post_metrics_legacy WHERE recorded_at IS NOT NULL;
+
+-- =====================================================
+-- instagram_daily_stats
+-- =====================================================
+
+-- 旧テーブルに依存するビューを削除（新テーブルで再作成）
+DROP VIEW IF EXISTS daily_stats_summary;
+
+ALTER TABLE instagram_daily_stats RENAME TO instagram_daily_stats_legacy;
+
+CREATE TABLE instagram_daily_stats (
+    LIKE instagram_daily_stats_legacy INCLUDING DEFAULTS INCLUDING COMMENTS
+) PARTITION BY RANGE (stats_date);
+
+ALTER TABLE instagram_daily_stats ADD CONSTRAINT instagram_daily_stats_partitioned_pkey PRIMARY KEY (id, stats_date);
+ALTER TABLE instagram_daily_stats ADD CONSTRAINT uq_account_daily_stats_partitioned UNIQUE (account_id, stats_date);
+ALTER TABLE instagram_daily_stats ADD CONSTRAINT fk_daily_stats_partitioned_account
+    FOREIGN KEY (account_id) REFERENCES instagram_accounts(id) ON DELETE CASCADE;
+
+CREATE INDEX idx_daily_stats_part_account_date ON instagram_daily_stats(account_id, stats_date DESC);
+CREATE INDEX idx_daily_stats_part_date ON instagram_daily_stats(stats_date);
+CREATE INDEX idx_daily_stats_part_followers ON instagram_daily_stats(followers_count);
+
+CREATE TABLE instagram_daily_stats_default PARTITION OF instagram_daily_stats DEFAULT;
+
+DO $$
+DECLARE
+    m DATE;
+BEGIN
+    SELECT date_trunc('month', COALESCE(MIN(stats_date), CURRENT_DATE))::DATE INTO m FROM instagram_daily_stats_legacy;
+    WHILE m <= (date_trunc('month', CURRENT_DATE) + INTERVAL '3 months')::DATE LOOP
+        PERFORM create_monthly_partition('instagram_daily_stats', m);
+        m := (m + INTERVAL '1 month')::DATE;
+    END LOOP;
+END;
+$$;
+
+INSERT INTO instagram_daily_stats
+SELECT * FROM instagram_daily_stats_legacy;
+
+-- データ確認用のビュー（現行カラムで再作成）
+CREATE VIEW daily_stats_summary AS
+SELECT
+    ds.stats_date,
+    acc.username,
+    ds.followers_count,
+    ds.following_count,
+    ds.media_count,
+    ds.posts_count,
+    ds.total_likes,
+    ds.total_comments,
+    CASE
+        WHEN ds.posts_count > 0 THEN ROUND(ds.total_likes::DECIMAL / ds.posts_count, 2)
+        ELSE 0
+    END as avg_likes_per_post_calculated,
+    ds.created_at
+FROM instagram_daily_stats ds
+JOIN instagram_accounts acc ON ds.account_id = acc.id
+ORDER BY ds.stats_date DESC, acc.username;
+
+-- コメント
+COMMENT ON TABLE instagram_post_metrics IS 'Instagram post performance metrics (monthly range partitions on recorded_at)';
+COMMENT ON TABLE instagram_daily_stats IS 'Instagram アカウントの日次統計データ（stats_date による月次レンジパーティション）';
+COMMENT ON FUNCTION ensure_monthly_partitions(TEXT, INTEGER) IS 'Create monthly partitions from the current month up to N months ahead';
@@ -0,0 +1,34 @@
+-- Migration: 011_create_account_setup_jobs.sql
+-- Description: Create account_setup_jobs table (background account setup with progress polling)
+-- Created: 2025-07-24
+
+CREATE TABLE IF NOT EXISTS account_setup_jobs (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+
+    -- 進捗
+    current_step INTEGER NOT NULL DEFAULT 0,
+    total_steps INTEGER NOT NULL DEFAULT 4,
+    message TEXT,
+    pages_total INTEGER NOT NULL DEFAULT 0,
+    pages_processed INTEGER NOT NULL DEFAULT 0,
+    pages JSONB NOT NULL DEFAULT '[]',
+
+    -- 結果（AccountSetupResponse）
+    result JSONB,
+    error TEXT,
+
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    started_at TIMESTAMP WITH TIME ZONE,
+    completed_at TIMESTAMP WITH TIME ZONE,
+
+    CONSTRAINT chk_account_setup_jobs_status CHECK (status IN ('pending', 'running', 'completed', 'failed'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_account_setup_jobs_created_at ON account_setup_jobs(created_at DESC);
+
+-- コメント
+COMMENT ON TABLE account_setup_jobs IS 'Background account setup jobs (App Secret / tokens are never stored)';
+COMMENT ON COLUMN account_setup_jobs.pages IS 'Per-page progress: [{page_id, page_name, status, instagram_user_id, username}]';
+COMMENT ON COLUMN account_setup_jobs.result IS 'AccountSetupResponse of the finished job';
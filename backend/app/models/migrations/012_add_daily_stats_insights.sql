@@ -0,0 +1,13 @@
+-- Migration: 012_add_daily_stats_insights.sql
+-- Description: Restore account insights columns on instagram_daily_stats for ranged insights backfills
+-- Created: 2025-07-24
+
+-- 007 で削除した reach / follower_count_change を復活する
+-- （collect_historical_insights.py が Insights API の日別値を保存する先）
+-- パーティション化された親テーブル（migration 010）への ALTER は全パーティションに反映される
+ALTER TABLE instagram_daily_stats ADD COLUMN IF NOT EXISTS reach INTEGER DEFAULT 0;
+ALTER TABLE instagram_daily_stats ADD COLUMN IF NOT EXISTS follower_count_change INTEGER DEFAULT 0;
+
+-- コメント
+COMMENT ON COLUMN instagram_daily_stats.reach IS 'Daily account reach (Insights API, period=day)';
+COMMENT ON COLUMN instagram_daily_stats.follower_count_change IS 'Daily follower count change (Insights API follower_count, period=day)';
@@ -0,0 +1,23 @@
+-- Migration: 013_create_api_quota_ledger.sql
+-- Description: Create api_quota_ledger table (Graph API call budget shared across processes)
+-- Created: 2025-07-25
+
+-- 1時間ウィンドウ × スコープ（アプリ / トークン）ごとの予約済み呼び出し数
+-- 収集ワークフロー・バックフィルスクリプト等の全プロセスが API 呼び出し前にここから予約する
+CREATE TABLE IF NOT EXISTS api_quota_ledger (
+    scope_key VARCHAR(100) NOT NULL,             -- app:<app_id> / token:<sha256 先頭16桁>
+    window_start TIMESTAMP WITH TIME ZONE NOT NULL,
+    calls_limit INTEGER NOT NULL,
+    calls_reserved INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+
+    PRIMARY KEY (scope_key, window_start),
+    CONSTRAINT chk_api_quota_ledger_reserved CHECK (calls_reserved >= 0)
+);
+
+CREATE INDEX IF NOT EXISTS idx_api_quota_ledger_window_start ON api_quota_ledger(window_start DESC);
+
+-- コメント
+COMMENT ON TABLE api_quota_ledger IS 'Hourly Graph API call reservations per app / access token, shared by all collector processes';
+COMMENT ON COLUMN api_quota_ledger.scope_key IS 'app:<app_id> or token:<first 16 hex chars of sha256(access_token)>';
+COMMENT ON COLUMN api_quota_ledger.calls_reserved IS 'Calls reserved in this window (unused reservations are released when a client closes)';
@@ -0,0 +1,37 @@
+-- Migration: 014_create_failed_collection_items.sql
+-- Description: Create failed_collection_items table (durable retry queue for failed posts / accounts)
+-- Created: 2025-07-26
+
+-- 収集に失敗した投稿・アカウント単位の再試行キュー
+-- 収集処理は実行の最初に再試行可能（next_attempt_at 到来済み）な項目を処理し、成功した項目は削除する
+CREATE TABLE IF NOT EXISTS failed_collection_items (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    item_type VARCHAR(50) NOT NULL,
+    item_key VARCHAR(100) NOT NULL,                -- instagram_post_id / instagram_user_id
+    account_id UUID REFERENCES instagram_accounts(id) ON DELETE CASCADE,
+    payload JSONB NOT NULL DEFAULT '{}',           -- 再試行に必要な情報（media_type, check_from, 投稿データ等）
+
+    -- 再試行制御
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    reason TEXT,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    next_attempt_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+
+    first_failed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    last_failed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+
+    CONSTRAINT uq_failed_collection_items_item UNIQUE (item_type, item_key),
+    CONSTRAINT chk_failed_collection_items_type CHECK (item_type IN ('post_metrics', 'new_post', 'account_new_posts')),
+    CONSTRAINT chk_failed_collection_items_status CHECK (status IN ('pending', 'abandoned'))
+);
+
+-- インデックス: 再試行対象の取得（アカウント単位）用
+CREATE INDEX IF NOT EXISTS idx_failed_collection_items_due ON failed_collection_items(account_id, item_type, next_attempt_at) WHERE status = 'pending';
+
+-- コメント
+COMMENT ON TABLE failed_collection_items IS 'Retry queue for posts / accounts whose collection failed (rows are deleted once the retry succeeds)';
+COMMENT ON COLUMN failed_collection_items.item_type IS 'post_metrics / new_post / account_new_posts';
+COMMENT ON COLUMN failed_collection_items.attempts IS 'Number of failed attempts so far';
+COMMENT ON COLUMN failed_collection_items.next_attempt_at IS 'Item becomes eligible for retry after this time (exponential backoff)';
+COMMENT ON COLUMN failed_collection_items.status IS 'abandoned after max_attempts failures (kept for inspection, no longer retried)';
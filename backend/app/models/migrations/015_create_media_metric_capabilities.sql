@@ -0,0 +1,21 @@
+-- Migration: 015_create_media_metric_capabilities.sql
+-- Description: Create media_metric_capabilities table (learned per-media-type insights metric support)
+-- Created: 2025-07-27
+
+-- メディアタイプ × プロダクトタイプ × 投稿経過期間ごとに、各インサイトメトリクスが取得可能かを記録する
+-- get_post_insights の成功・失敗レスポンスと scripts/explore_metric_capabilities.py の探索結果から更新される
+CREATE TABLE IF NOT EXISTS media_metric_capabilities (
+    media_type VARCHAR(20) NOT NULL,             -- IMAGE / VIDEO / CAROUSEL_ALBUM
+    media_product_type VARCHAR(20) NOT NULL,     -- FEED / REELS / STORY / AD
+    age_bucket VARCHAR(20) NOT NULL,             -- 0-30d / 30-365d / 365-730d / 730d+
+    metric VARCHAR(100) NOT NULL,
+    is_supported BOOLEAN NOT NULL,
+    last_error TEXT,
+    checked_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+
+    PRIMARY KEY (media_type, media_product_type, age_bucket, metric)
+);
+
+-- コメント
+COMMENT ON TABLE media_metric_capabilities IS 'Learned insights metric support per media type / product type / post age (unsupported entries are rechecked after METRIC_CAPABILITY_RECHECK_DAYS)';
+COMMENT ON COLUMN media_metric_capabilities.last_error IS 'Graph API error message that marked the metric unsupported';
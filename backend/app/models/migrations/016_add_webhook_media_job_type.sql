@@ -0,0 +1,11 @@
+-- Migration: 016_add_webhook_media_job_type.sql
+-- Description: Allow webhook_media jobs in collection_jobs (targeted fetches queued by the Instagram webhook receiver)
+-- Created: 2025-07-28
+
+-- Webhook（comments / mentions / story_insights 等）で変更が通知された投稿のみを取得するジョブ
+ALTER TABLE collection_jobs DROP CONSTRAINT IF EXISTS chk_collection_jobs_type;
+ALTER TABLE collection_jobs ADD CONSTRAINT chk_collection_jobs_type
+    CHECK (job_type IN ('account_collection', 'post_metrics_refresh', 'backfill_chunk', 'webhook_media'));
+
+-- コメント
+COMMENT ON COLUMN collection_jobs.job_type IS 'account_collection / post_metrics_refresh / backfill_chunk / webhook_media';
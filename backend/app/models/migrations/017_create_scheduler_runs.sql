@@ -0,0 +1,28 @@
+-- Migration: 017_create_scheduler_runs.sql
+-- Description: Create scheduler_runs table (run history of the resident scheduler daemon)
+-- Created: 2025-07-29
+
+-- 常駐スケジューラー（scripts/github_actions/scheduler_daemon.py）のジョブ実行履歴
+-- API（/api/v1/scheduler/status）は各ジョブの最新の実行と次回予定時刻を返す
+CREATE TABLE IF NOT EXISTS scheduler_runs (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    job_name VARCHAR(50) NOT NULL,                 -- new_posts / daily_insights / metrics_refresh
+    status VARCHAR(20) NOT NULL DEFAULT 'running',
+    host VARCHAR(100),                             -- 実行したデーモン（ホスト名:PID）
+    scheduled_for TIMESTAMP WITH TIME ZONE,        -- 予定時刻（手動・起動時実行は NULL）
+    started_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMP WITH TIME ZONE,
+    duration_seconds DOUBLE PRECISION,
+    summary JSONB NOT NULL DEFAULT '{}',           -- 収集結果の件数（アカウント数・API 呼び出し数等）
+    error TEXT,
+
+    CONSTRAINT chk_scheduler_runs_status CHECK (status IN ('running', 'succeeded', 'failed', 'interrupted'))
+);
+
+-- インデックス: ジョブ別の最新実行の取得用
+CREATE INDEX IF NOT EXISTS idx_scheduler_runs_job_started ON scheduler_runs(job_name, started_at DESC);
+
+-- コメント
+COMMENT ON TABLE scheduler_runs IS 'Run history of the resident scheduler daemon';
+COMMENT ON COLUMN scheduler_runs.status IS 'running / succeeded / failed / interrupted (daemon stopped or restarted mid-run)';
+COMMENT ON COLUMN scheduler_runs.summary IS 'Collector result counts (accounts, posts, API calls, errors)';
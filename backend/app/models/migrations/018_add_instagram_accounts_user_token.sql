@@ -0,0 +1,10 @@
+-- Migration: 018_add_instagram_accounts_user_token.sql
+-- Description: Store the long-lived user token that page tokens were derived from (token refresh exchanges it once per user)
+-- Created: 2025-07-29
+
+-- ページアクセストークン（access_token_encrypted）はページごとに異なるため、
+-- 同じユーザーから登録したアカウントをまとめて更新できるよう、派生元の長期ユーザートークンを保存する
+ALTER TABLE instagram_accounts ADD COLUMN IF NOT EXISTS user_access_token_encrypted TEXT;
+
+-- コメント
+COMMENT ON COLUMN instagram_accounts.user_access_token_encrypted IS 'Long-lived user token the page access token was derived from (NULL for accounts set up before migration 018)';
@@ -0,0 +1,10 @@
+-- Migration: 019_add_instagram_posts_metrics_refresh_attempted_at.sql
+-- Description: Record the last metrics refresh attempt so posts without insights are rescheduled by interval instead of every run
+-- Created: 2025-07-29
+
+-- インサイトを取得できない投稿（未対応・全て0）はスナップショットが保存されないため、
+-- 再取得を試みた日時を記録し、次回以降は通常の再取得間隔で判定する
+ALTER TABLE instagram_posts ADD COLUMN IF NOT EXISTS metrics_refresh_attempted_at TIMESTAMPTZ;
+
+-- コメント
+COMMENT ON COLUMN instagram_posts.metrics_refresh_attempted_at IS 'Last metrics refresh attempt that returned no insights (NULL when no such attempt has been recorded)';
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, String, Text, DateTime, Float, Index, func
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+import uuid
+
+from ..core.database import Base
+
+
+class SchedulerRun(Base):
+    """
+    常駐スケジューラーのジョブ実行履歴
+
+    デーモンが実行の開始時に running で登録し、終了時に結果の件数と状態を更新する。
+    """
+    __tablename__ = "scheduler_runs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_name = Column(String(50), nullable=False)       # new_posts / daily_insights / metrics_refresh
+    status = Column(String(20), nullable=False, default="running")  # running / succeeded / failed / interrupted
+    host = Column(String(100))
+    scheduled_for = Column(DateTime(timezone=True))
+    started_at = Column(DateTime(timezone=True), nullable=False, default=func.now())
+    finished_at = Column(DateTime(timezone=True))
+    duration_seconds = Column(Float)
+    summary = Column(JSONB, nullable=False, default=dict)
+    error = Column(Text)
+
+    __table_args__ = (
+        Index('idx_scheduler_runs_job_started', job_name, started_at.desc()),
+    )
+
+    def __repr__(self):
+        return f"<SchedulerRun(job_name={self.job_name}, status={self.status}, started_at={self.started_at})>"
@@ -0,0 +1,80 @@
+"""
+Account Setup Job Repository
+AccountSetupJob モデル専用のデータアクセス層
+"""
+from typing import List, Optional, Dict, Any
+from sqlalchemy.orm import Session
+from sqlalchemy import and_
+from datetime import datetime, timedelta, timezone
+
+from ..models.account_setup_job import AccountSetupJob
+
+
+class AccountSetupJobRepository:
+    """アカウントセットアップジョブ専用リポジトリ"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def create(self) -> AccountSetupJob:
+        """ジョブ作成"""
+        job = AccountSetupJob(status='pending', message="セットアップを受け付けました", pages=[])
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    async def get_by_id(self, job_id: str) -> Optional[AccountSetupJob]:
+        """ID でジョブ取得"""
+        return self.db.query(AccountSetupJob).filter(AccountSetupJob.id == job_id).first()
+
+    async def get_recent(self, limit: int = 10) -> List[AccountSetupJob]:
+        """最近のジョブ取得"""
+        return (
+            self.db.query(AccountSetupJob)
+            .order_by(AccountSetupJob.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+
+    async def update_progress(self, job_id: str, progress: Dict[str, Any]) -> None:
+        """
+        進捗更新
+
+        Args:
+            progress: 更新するカラムと値（status / current_step / message / pages 等）
+        """
+        values = dict(progress)
+        values['updated_at'] = datetime.now(timezone.utc)
+        if values.get('status') == 'running':
+            values.setdefault('started_at', datetime.now(timezone.utc))
+        if values.get('status') in ('completed', 'failed'):
+            values.setdefault('completed_at', datetime.now(timezone.utc))
+
+        self.db.query(AccountSetupJob).filter(AccountSetupJob.id == job_id).update(
+            values, synchronize_session=False
+        )
+        self.db.commit()
+
+    async def fail_stale(self, timeout_minutes: int = 15) -> int:
+        """更新が止まった実行中ジョブ（プロセス再起動等）を失敗にする"""
+        cutoff = datetime.now(timezone.utc) - timedelta(minutes=timeout_minutes)
+        updated = (
+            self.db.query(AccountSetupJob)
+            .filter(
+                and_(
+                    AccountSetupJob.status.in_(('pending', 'running')),
+                    AccountSetupJob.updated_at < cutoff
+                )
+            )
+            .update(
+                {
+                    AccountSetupJob.status: 'failed',
+                    AccountSetupJob.error: 'Setup job stopped responding',
+                    AccountSetupJob.completed_at: datetime.now(timezone.utc),
+                },
+                synchronize_session=False
+            )
+        )
+        self.db.commit()
+        return updated
@@ -0,0 +1,110 @@
+"""
+API Quota Ledger Repository
+ApiQuotaLedger モデル専用のデータアクセス層
+"""
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from datetime import datetime, timezone
+
+from ..models.api_quota_ledger import ApiQuotaLedger
+
+
+class ApiQuotaLedgerRepository:
+    """API 呼び出し枠の予約台帳リポジトリ"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def reserve(self, scope_limits: Dict[str, int], window_start: datetime, calls: int) -> int:
+        """
+        全スコープから同じ数の呼び出し枠を予約（1トランザクション）
+
+        各スコープの行を FOR UPDATE でロックし、残り枠の最小値まで予約する。
+        ロック順はスコープキー順に固定してデッドロックを避ける。
+
+        Args:
+            scope_limits: スコープキー → ウィンドウあたりの上限
+            window_start: 1時間ウィンドウの開始時刻
+            calls: 予約したい呼び出し数
+
+        Returns:
+            int: 予約できた呼び出し数（0 = いずれかのスコープが上限に到達）
+        """
+        from sqlalchemy.dialects.postgresql import insert
+
+        scope_keys = sorted(scope_limits.keys())
+        try:
+            self.db.execute(
+                insert(ApiQuotaLedger)
+                .values([
+                    {
+                        'scope_key': key,
+                        'window_start': window_start,
+                        'calls_limit': scope_limits[key],
+                        'calls_reserved': 0
+                    }
+                    for key in scope_keys
+                ])
+                .on_conflict_do_nothing(index_elements=['scope_key', 'window_start'])
+            )
+
+            rows = (
+                self.db.query(ApiQuotaLedger)
+                .filter(
+                    ApiQuotaLedger.scope_key.in_(scope_keys),
+                    ApiQuotaLedger.window_start == window_start
+                )
+                .order_by(ApiQuotaLedger.scope_key)
+                .with_for_update()
+                .all()
+            )
+
+            granted = min([calls] + [row.calls_remaining for row in rows])
+            if granted > 0:
+                for row in rows:
+                    row.calls_reserved += granted
+                    row.updated_at = datetime.now(timezone.utc)
+            self.db.commit()
+            return granted
+
+        except Exception as e:
+            self.db.rollback()
+            raise e
+
+    async def release(self, scope_keys: List[str], window_start: datetime, calls: int) -> None:
+        """使わなかった予約枠を返却"""
+        if calls <= 0 or not scope_keys:
+            return
+        (
+            self.db.query(ApiQuotaLedger)
+            .filter(
+                ApiQuotaLedger.scope_key.in_(scope_keys),
+                ApiQuotaLedger.window_start == window_start
+            )
+            .update(
+                {
+                    ApiQuotaLedger.calls_reserved: func.greatest(ApiQuotaLedger.calls_reserved - calls, 0),
+                    ApiQuotaLedger.updated_at: datetime.now(timezone.utc),
+                },
+                synchronize_session=False
+            )
+        )
+        self.db.commit()
+
+    async def get_windows(self, since: datetime, scope_prefix: Optional[str] = None) -> List[ApiQuotaLedger]:
+        """指定時刻以降のウィンドウ一覧取得（新しい順）"""
+        query = self.db.query(ApiQuotaLedger).filter(ApiQuotaLedger.window_start >= since)
+        if scope_prefix:
+            query = query.filter(ApiQuotaLedger.scope_key.like(f"{scope_prefix}%"))
+        return query.order_by(ApiQuotaLedger.window_start.desc(), ApiQuotaLedger.scope_key).all()
+
+    async def prune(self, before: datetime) -> int:
+        """古いウィンドウを削除"""
+        deleted = (
+            self.db.query(ApiQuotaLedger)
+            .filter(ApiQuotaLedger.window_start < before)
+            .delete(synchronize_session=False)
+        )
+        self.db.commit()
+        return deleted
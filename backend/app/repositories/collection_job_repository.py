@@ -0,0 +1,213 @@
+"""
+Collection Job Repository
+CollectionJob モデル（収集ワークキュー）専用のデータアクセス層
+"""
+from typing import List, Optional, Dict, Any
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, desc, asc, func, text
+from sqlalchemy.dialects.postgresql import insert
+from datetime import datetime, timedelta, timezone
+import uuid
+
+from ..models.collection_job import CollectionJob
+
+# ジョブ種別
+JOB_TYPE_ACCOUNT_COLLECTION = "account_collection"
+JOB_TYPE_POST_METRICS_REFRESH = "post_metrics_refresh"
+JOB_TYPE_BACKFILL_CHUNK = "backfill_chunk"
+JOB_TYPE_WEBHOOK_MEDIA = "webhook_media"
+JOB_TYPES = (JOB_TYPE_ACCOUNT_COLLECTION, JOB_TYPE_POST_METRICS_REFRESH, JOB_TYPE_BACKFILL_CHUNK, JOB_TYPE_WEBHOOK_MEDIA)
+
+
+class CollectionJobRepository:
+    """収集ジョブ専用リポジトリ"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        priority: int = 0,
+        max_attempts: int = 3,
+        run_after: Optional[datetime] = None,
+        dedupe_key: Optional[str] = None
+    ) -> bool:
+        """
+        ジョブ登録
+
+        Returns:
+            bool: 登録した場合は True（同じ dedupe_key の未完了ジョブがある場合は False）
+        """
+        return await self.enqueue_many([{
+            'job_type': job_type,
+            'payload': payload,
+            'priority': priority,
+            'max_attempts': max_attempts,
+            'run_after': run_after,
+            'dedupe_key': dedupe_key,
+        }]) == 1
+
+    async def enqueue_many(self, jobs: List[Dict[str, Any]]) -> int:
+        """
+        ジョブ一括登録（未完了の同一 dedupe_key はスキップ）
+
+        Returns:
+            int: 登録件数
+        """
+        if not jobs:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                'id': uuid.uuid4(),
+                'job_type': job['job_type'],
+                'payload': job.get('payload') or {},
+                'priority': job.get('priority', 0),
+                'max_attempts': job.get('max_attempts', 3),
+                'run_after': job.get('run_after') or now,
+                'dedupe_key': job.get('dedupe_key'),
+                'status': 'pending',
+            }
+            for job in jobs
+        ]
+
+        stmt = insert(CollectionJob).values(rows).on_conflict_do_nothing(
+            index_elements=['dedupe_key'],
+            index_where=text("status IN ('pending', 'running')")
+        )
+        result = self.db.execute(stmt)
+        self.db.commit()
+        return result.rowcount
+
+    async def claim(
+        self,
+        worker_id: str,
+        job_types: Optional[List[str]] = None,
+        limit: int = 1
+    ) -> List[CollectionJob]:
+        """
+        実行可能なジョブを取得してロック
+
+        SELECT ... FOR UPDATE SKIP LOCKED により、複数ワーカー・複数プロセス・
+        複数ホストから同時に呼び出しても同じジョブは1つのワーカーにのみ渡される。
+        """
+        now = datetime.now(timezone.utc)
+        query = (
+            self.db.query(CollectionJob)
+            .filter(
+                and_(
+                    CollectionJob.status == 'pending',
+                    CollectionJob.run_after <= now
+                )
+            )
+        )
+        if job_types:
+            query = query.filter(CollectionJob.job_type.in_(job_types))
+
+        jobs = (
+            query
+            .order_by(desc(CollectionJob.priority), asc(CollectionJob.run_after))
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+        for job in jobs:
+            job.status = 'running'
+            job.locked_by = worker_id
+            job.locked_at = now
+            job.attempts += 1
+
+        self.db.commit()
+        return jobs
+
+    async def complete(self, job_id: str, result: Optional[Dict[str, Any]] = None) -> None:
+        """ジョブ完了"""
+        job = self.db.query(CollectionJob).filter(CollectionJob.id == job_id).first()
+        if not job:
+            return
+
+        job.status = 'completed'
+        job.result = result
+        job.last_error = None
+        job.completed_at = datetime.now(timezone.utc)
+        self.db.commit()
+
+    async def fail(self, job_id: str, error: str, retry_delay_seconds: int = 60) -> str:
+        """
+        ジョブ失敗（試行回数が残っていれば指数バックオフで再登録）
+
+        Returns:
+            str: 更新後のステータス（pending / failed）
+        """
+        job = self.db.query(CollectionJob).filter(CollectionJob.id == job_id).first()
+        if not job:
+            return 'failed'
+
+        job.last_error = error[:2000]
+        job.locked_by = None
+        job.locked_at = None
+
+        if job.attempts < job.max_attempts:
+            job.status = 'pending'
+            job.run_after = datetime.now(timezone.utc) + timedelta(
+                seconds=retry_delay_seconds * (2 ** (job.attempts - 1))
+            )
+        else:
+            job.status = 'failed'
+            job.completed_at = datetime.now(timezone.utc)
+
+        self.db.commit()
+        return job.status
+
+    async def requeue_stale(self, lock_timeout_minutes: int = 60) -> Dict[str, int]:
+        """
+        ロックしたまま停止したワーカーのジョブを回収
+
+        試行回数が上限に達したジョブ（ワーカーを毎回停止させるジョブ）は failed にし、残りを pending に戻す。
+        """
+        now = datetime.now(timezone.utc)
+        stale = and_(
+            CollectionJob.status == 'running',
+            CollectionJob.locked_at < now - timedelta(minutes=lock_timeout_minutes)
+        )
+
+        failed = (
+            self.db.query(CollectionJob)
+            .filter(and_(stale, CollectionJob.attempts >= CollectionJob.max_attempts))
+            .update(
+                {
+                    CollectionJob.status: 'failed',
+                    CollectionJob.locked_by: None,
+                    CollectionJob.locked_at: None,
+                    CollectionJob.completed_at: now,
+                    CollectionJob.last_error: 'Worker lock timed out (max attempts reached)',
+                },
+                synchronize_session=False
+            )
+        )
+        requeued = (
+            self.db.query(CollectionJob)
+            .filter(and_(stale, CollectionJob.attempts < CollectionJob.max_attempts))
+            .update(
+                {
+                    CollectionJob.status: 'pending',
+                    CollectionJob.locked_by: None,
+                    CollectionJob.locked_at: None,
+                    CollectionJob.last_error: 'Worker lock timed out',
+                },
+                synchronize_session=False
+            )
+        )
+        self.db.commit()
+        return {'requeued': requeued, 'failed': failed}
+
+    async def count_by_status(self, job_type: Optional[str] = None) -> Dict[str, int]:
+        """ステータス別件数"""
+        query = self.db.query(CollectionJob.status, func.count(CollectionJob.id))
+        if job_type:
+            query = query.filter(CollectionJob.job_type == job_type)
+        return {status: count for status, count in query.group_by(CollectionJob.status).all()}
@@ -0,0 +1,141 @@
+"""
+Failed Collection Item Repository
+FailedCollectionItem モデル（収集失敗項目の再試行キュー）専用のデータアクセス層
+"""
+from typing import List, Optional, Dict, Any, Iterable
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, asc, case, func, literal, DateTime
+from sqlalchemy.dialects.postgresql import insert
+from datetime import datetime, timedelta, timezone
+import uuid
+
+from ..models.failed_collection_item import FailedCollectionItem
+
+# 項目種別
+ITEM_TYPE_POST_METRICS = "post_metrics"            # 投稿メトリクス（item_key = instagram_post_id）
+ITEM_TYPE_NEW_POST = "new_post"                    # 新規投稿の保存・インサイト（item_key = instagram_post_id）
+ITEM_TYPE_ACCOUNT_NEW_POSTS = "account_new_posts"  # アカウント単位の新規投稿検出（item_key = instagram_user_id）
+ITEM_TYPES = (ITEM_TYPE_POST_METRICS, ITEM_TYPE_NEW_POST, ITEM_TYPE_ACCOUNT_NEW_POSTS)
+
+# 再試行間隔（base * 2^(attempts-1)、上限あり）
+DEFAULT_RETRY_DELAY_SECONDS = 1800
+DEFAULT_RETRY_DELAY_MAX_SECONDS = 86400
+DEFAULT_MAX_ATTEMPTS = 5
+
+
+class FailedCollectionItemRepository:
+    """収集失敗項目の再試行キューリポジトリ"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def record_failure(
+        self,
+        item_type: str,
+        item_key: str,
+        reason: str,
+        account_id: Optional[str] = None,
+        payload: Optional[Dict[str, Any]] = None,
+        retry_delay_seconds: int = DEFAULT_RETRY_DELAY_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    ) -> None:
+        """
+        失敗の記録（既存の行は attempts を加算して次回試行時刻を指数バックオフで延ばす）
+
+        max_attempts に達した項目は abandoned とし、以降は再試行しない。
+        """
+        now = datetime.now(timezone.utc)
+        stmt = insert(FailedCollectionItem).values(
+            id=uuid.uuid4(),
+            item_type=item_type,
+            item_key=str(item_key),
+            account_id=account_id,
+            payload=payload or {},
+            status='pending' if max_attempts > 1 else 'abandoned',
+            reason=reason[:2000],
+            attempts=1,
+            max_attempts=max_attempts,
+            next_attempt_at=now + timedelta(seconds=retry_delay_seconds),
+            first_failed_at=now,
+            last_failed_at=now
+        )
+
+        attempts = FailedCollectionItem.attempts + 1
+        delay_seconds = func.least(
+            retry_delay_seconds * func.power(2, FailedCollectionItem.attempts),
+            DEFAULT_RETRY_DELAY_MAX_SECONDS
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint='uq_failed_collection_items_item',
+            set_={
+                'attempts': attempts,
+                'reason': stmt.excluded.reason,
+                'payload': stmt.excluded.payload,
+                'account_id': func.coalesce(stmt.excluded.account_id, FailedCollectionItem.account_id),
+                'last_failed_at': now,
+                'next_attempt_at': (
+                    literal(now, DateTime(timezone=True))
+                    + func.make_interval(0, 0, 0, 0, 0, 0, delay_seconds)
+                ),
+                'status': case(
+                    (attempts >= FailedCollectionItem.max_attempts, 'abandoned'),
+                    else_='pending'
+                ),
+            }
+        )
+        self.db.execute(stmt)
+        self.db.commit()
+
+    async def get_due(
+        self,
+        item_type: str,
+        account_id: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[FailedCollectionItem]:
+        """次回試行時刻を過ぎた再試行対象の取得（古い順）"""
+        query = self.db.query(FailedCollectionItem).filter(
+            and_(
+                FailedCollectionItem.item_type == item_type,
+                FailedCollectionItem.status == 'pending',
+                FailedCollectionItem.next_attempt_at <= datetime.now(timezone.utc)
+            )
+        )
+        if account_id:
+            query = query.filter(FailedCollectionItem.account_id == account_id)
+
+        query = query.order_by(asc(FailedCollectionItem.next_attempt_at))
+        if limit:
+            query = query.limit(limit)
+        return query.all()
+
+    async def get_queued_keys(self, item_type: str, account_id: Optional[str] = None) -> List[str]:
+        """キューに載っている項目キー（バックオフ中・abandoned を含む）"""
+        query = self.db.query(FailedCollectionItem.item_key).filter(FailedCollectionItem.item_type == item_type)
+        if account_id:
+            query = query.filter(FailedCollectionItem.account_id == account_id)
+        return [item_key for (item_key,) in query.all()]
+
+    async def resolve(self, item_type: str, item_keys: Iterable[str]) -> int:
+        """再試行に成功した項目の削除"""
+        keys = [str(key) for key in item_keys]
+        if not keys:
+            return 0
+        deleted = (
+            self.db.query(FailedCollectionItem)
+            .filter(
+                and_(
+                    FailedCollectionItem.item_type == item_type,
+                    FailedCollectionItem.item_key.in_(keys)
+                )
+            )
+            .delete(synchronize_session=False)
+        )
+        self.db.commit()
+        return deleted
+
+    async def count_by_status(self, item_type: Optional[str] = None) -> Dict[str, int]:
+        """ステータス別件数"""
+        query = self.db.query(FailedCollectionItem.status, func.count(FailedCollectionItem.id))
+        if item_type:
+            query = query.filter(FailedCollectionItem.item_type == item_type)
+        return {status: count for status, count in query.group_by(FailedCollectionItem.status).all()}
@@ -2,7 +2,7 @@
 Instagram Account Repository
 InstagramAccount モデル専用のデータアクセス層
 """
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 from datetime import datetime
@@ -44,6 +44,16 @@ class InstagramAccountRepository:
             .first()
         )
     
+    async def get_by_instagram_user_ids(self, instagram_user_ids: List[str]) -> List[InstagramAccount]:
+        """Instagram User ID の一覧でアカウント一括取得"""
+        if not instagram_user_ids:
+            return []
+        return (
+            self.db.query(InstagramAccount)
+            .filter(InstagramAccount.instagram_user_id.in_(instagram_user_ids))
+            .all()
+        )
+    
     async def get_by_username(self, username: str) -> Optional[InstagramAccount]:
         """ユーザーネームによるアカウント取得"""
         return (
@@ -60,6 +70,44 @@ class InstagramAccountRepository:
         self.db.refresh(account)
         return account
     
+    async def bulk_upsert(self, accounts_data: List[Dict[str, Any]]) -> List[InstagramAccount]:
+        """
+        アカウント一括作成・更新（instagram_user_id で重複判定、1回の INSERT ... ON CONFLICT）
+        
+        Args:
+            accounts_data: アカウントデータのリスト（instagram_user_id は一意であること）
+            
+        Returns:
+            List[InstagramAccount]: 作成・更新後のアカウント
+        """
+        if not accounts_data:
+            return []
+        
+        from sqlalchemy.dialects.postgresql import insert
+        
+        stmt = insert(InstagramAccount).values(accounts_data)
+        update_columns = {
+            key: stmt.excluded[key]
+            for key in accounts_data[0].keys()
+            if key not in ('id', 'instagram_user_id', 'created_at')
+        }
+        update_columns['updated_at'] = datetime.now()
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[InstagramAccount.instagram_user_id],
+            set_=update_columns
+        )
+        
+        try:
+            self.db.execute(stmt)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise e
+        
+        return await self.get_by_instagram_user_ids(
+            [account_data['instagram_user_id'] for account_data in accounts_data]
+        )
+    
     async def update(self, account_id: str, account_data: dict) -> Optional[InstagramAccount]:
         """アカウント情報更新"""
         account = await self.get_by_id(account_id)
@@ -122,6 +170,39 @@ class InstagramAccountRepository:
         self.db.refresh(account)
         return account
     
+    async def bulk_update_tokens(self, token_updates: List[Dict[str, Any]]) -> int:
+        """
+        複数アカウントのアクセストークン一括更新（1回のコミット）
+        
+        Args:
+            token_updates: {'id', 'access_token_encrypted', 'token_expires_at', 'user_access_token_encrypted'} のリスト
+                （token_expires_at / user_access_token_encrypted は省略可）
+        """
+        if not token_updates:
+            return 0
+        
+        now = datetime.now()
+        mappings = []
+        for token_update in token_updates:
+            mapping = {
+                'id': token_update['id'],
+                'access_token_encrypted': token_update['access_token_encrypted'],
+                'updated_at': now
+            }
+            if token_update.get('token_expires_at'):
+                mapping['token_expires_at'] = token_update['token_expires_at']
+            if token_update.get('user_access_token_encrypted'):
+                mapping['user_access_token_encrypted'] = token_update['user_access_token_encrypted']
+            mappings.append(mapping)
+        
+        try:
+            self.db.bulk_update_mappings(InstagramAccount, mappings)
+            self.db.commit()
+            return len(mappings)
+        except Exception as e:
+            self.db.rollback()
+            raise e
+    
     async def deactivate(self, account_id: str) -> Optional[InstagramAccount]:
         """アカウント非アクティブ化"""
         account = await self.get_by_id(account_id)
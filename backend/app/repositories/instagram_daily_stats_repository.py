@@ -2,7 +2,7 @@
 Instagram Daily Stats Repository
 InstagramDailyStats モデル専用のデータアクセス層
 """
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, desc, asc, func
 from datetime import datetime, date
@@ -239,4 +239,43 @@ class InstagramDailyStatsRepository:
         for stats in created_stats:
             self.db.refresh(stats)
         
-        return created_stats
\ No newline at end of file
+        return created_stats
+    
+    async def bulk_upsert(
+        self,
+        stats_list: List[Dict[str, Any]],
+        update_columns: Optional[List[str]] = None
+    ) -> int:
+        """
+        日次統計一括作成・更新（account_id + stats_date で重複判定、1回の INSERT ... ON CONFLICT）
+        
+        Args:
+            stats_list: 日次統計データのリスト（account_id + stats_date は一意であること）
+            update_columns: 既存行で更新するカラム（未指定時は渡されたキー全て）
+            
+        Returns:
+            int: 作成・更新した行数
+        """
+        if not stats_list:
+            return 0
+        
+        from sqlalchemy.dialects.postgresql import insert
+        
+        stmt = insert(InstagramDailyStats).values(stats_list)
+        columns = update_columns or [
+            key for key in stats_list[0].keys()
+            if key not in ('id', 'account_id', 'stats_date', 'created_at')
+        ]
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[InstagramDailyStats.account_id, InstagramDailyStats.stats_date],
+            set_={column: stmt.excluded[column] for column in columns}
+        )
+        
+        try:
+            self.db.execute(stmt)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise e
+        
+        return len(stats_list)
@@ -2,13 +2,19 @@
 Instagram Post Metrics Repository
 InstagramPostMetrics モデル専用のデータアクセス層
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, desc, asc, func
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 
 from ..models.instagram_post_metrics import InstagramPostMetrics
 
+# スナップショットの同一判定に使う計測値
+SNAPSHOT_COUNTER_FIELDS = (
+    'likes', 'comments', 'saved', 'shares', 'views', 'reach', 'total_interactions',
+    'follows', 'profile_visits', 'profile_activity', 'video_view_total_time', 'avg_watch_time',
+)
+
 
 class InstagramPostMetricsRepository:
     """Instagram 投稿メトリクス専用リポジトリ"""
@@ -57,14 +63,20 @@ class InstagramPostMetricsRepository:
         start_date: date,
         end_date: date
     ) -> List[InstagramPostMetrics]:
-        """日付範囲によるメトリクス取得"""
+        """
+        日付範囲によるメトリクス取得
+
+        値が変化しない間は行を追加しないため、期間の開始前に記録され
+        期間内も有効（last_observed_at が期間内）なスナップショットも含める。
+        recorded_at は関数で包まず範囲比較する（パーティションプルーニングのため）。
+        """
         return (
             self.db.query(InstagramPostMetrics)
             .filter(
                 and_(
                     InstagramPostMetrics.post_id == post_id,
-                    func.date(InstagramPostMetrics.recorded_at) >= start_date,
-                    func.date(InstagramPostMetrics.recorded_at) <= end_date
+                    InstagramPostMetrics.recorded_at < end_date + timedelta(days=1),
+                    self._observed_until() >= start_date
                 )
             )
             .order_by(desc(InstagramPostMetrics.recorded_at))
@@ -72,43 +84,120 @@ class InstagramPostMetricsRepository:
         )
     
     async def get_by_specific_date(self, post_id: str, target_date: date) -> Optional[InstagramPostMetrics]:
-        """特定日のメトリクス取得"""
+        """特定日のメトリクス取得（その日に有効なスナップショット）"""
+        return (
+            self.db.query(InstagramPostMetrics)
+            .filter(
+                and_(
+                    InstagramPostMetrics.post_id == post_id,
+                    InstagramPostMetrics.recorded_at < target_date + timedelta(days=1),
+                    self._observed_until() >= target_date
+                )
+            )
+            .order_by(desc(InstagramPostMetrics.recorded_at))
+            .first()
+        )
+    
+    async def get_daily_series(
+        self,
+        post_id: str,
+        start_date: date,
+        end_date: date
+    ) -> Dict[date, Optional[InstagramPostMetrics]]:
+        """
+        日別メトリクス系列の復元
+
+        各日に有効なスナップショットを割り当てる（取得していない日は None）。
+        """
+        snapshots = sorted(
+            await self.get_by_date_range(post_id, start_date, end_date),
+            key=lambda m: m.recorded_at
+        )
+
+        series: Dict[date, Optional[InstagramPostMetrics]] = {}
+        current = start_date
+        while current <= end_date:
+            series[current] = None
+            for snapshot in reversed(snapshots):
+                observed_until = snapshot.last_observed_at or snapshot.recorded_at
+                if snapshot.recorded_at.date() <= current <= observed_until.date():
+                    series[current] = snapshot
+                    break
+            current += timedelta(days=1)
+        return series
+    
+    async def _get_recorded_on(self, post_id: str, target_date: date) -> Optional[InstagramPostMetrics]:
+        """指定日に記録された行の取得（更新対象の特定用）"""
         return (
             self.db.query(InstagramPostMetrics)
             .filter(
                 and_(
                     InstagramPostMetrics.post_id == post_id,
-                    func.date(InstagramPostMetrics.recorded_at) == target_date
+                    InstagramPostMetrics.recorded_at >= target_date,
+                    InstagramPostMetrics.recorded_at < target_date + timedelta(days=1)
                 )
             )
             .first()
         )
     
+    async def _get_snapshot_at(self, post_id: str, observed_at: Any) -> Optional[InstagramPostMetrics]:
+        """指定時点で最新のスナップショット取得"""
+        query = self.db.query(InstagramPostMetrics).filter(InstagramPostMetrics.post_id == post_id)
+        if observed_at is not None:
+            query = query.filter(InstagramPostMetrics.recorded_at <= observed_at)
+        return query.order_by(desc(InstagramPostMetrics.recorded_at)).first()
+    
     async def create(self, metrics_data: dict) -> InstagramPostMetrics:
         """新規メトリクス作成"""
         # エンゲージメント率を計算
         if 'engagement_rate' not in metrics_data or metrics_data['engagement_rate'] == 0:
             metrics_data['engagement_rate'] = self._calculate_engagement_rate(metrics_data)
         
+        if metrics_data.get('recorded_at') is not None:
+            metrics_data.setdefault('last_observed_at', metrics_data['recorded_at'])
+        
         metrics = InstagramPostMetrics(**metrics_data)
         self.db.add(metrics)
         self.db.commit()
         self.db.refresh(metrics)
         return metrics
     
+    async def create_if_changed(self, metrics_data: dict) -> Tuple[InstagramPostMetrics, bool]:
+        """
+        直前のスナップショットから値が変化した場合のみ新規作成
+
+        変化がない場合は行を追加せず、直前のスナップショットの last_observed_at を延長する。
+
+        Returns:
+            Tuple[InstagramPostMetrics, bool]: (有効なスナップショット, 新規作成したか)
+        """
+        observed_at = metrics_data.get('recorded_at')
+        previous = await self._get_snapshot_at(metrics_data['post_id'], observed_at)
+        
+        if previous and self._is_unchanged(previous, metrics_data):
+            await self._extend_observation(previous, observed_at)
+            return previous, False
+        
+        return await self.create(metrics_data), True
+    
     async def create_or_update_daily(self, metrics_data: dict) -> InstagramPostMetrics:
-        """日別メトリクス作成または更新"""
+        """日別メトリクス作成または更新（値が変化していない場合は既存行を延長）"""
         post_id = metrics_data['post_id']
         today = date.today()
         
-        existing_metrics = await self.get_by_specific_date(post_id, today)
+        existing_metrics = await self._get_recorded_on(post_id, today)
         
         if existing_metrics:
+            if self._is_unchanged(existing_metrics, metrics_data):
+                await self._extend_observation(existing_metrics, metrics_data.get('recorded_at'))
+                return existing_metrics
             # 今日のメトリクスが既に存在する場合は更新
+            metrics_data['last_observed_at'] = metrics_data.get('recorded_at') or datetime.now()
             return await self.update(existing_metrics.id, metrics_data)
         else:
-            # 存在しない場合は新規作成
-            return await self.create(metrics_data)
+            # 存在しない場合は直前のスナップショットと比較して作成
+            metrics, _ = await self.create_if_changed(metrics_data)
+            return metrics
     
     async def update(self, metrics_id: str, metrics_data: dict) -> Optional[InstagramPostMetrics]:
         """メトリクス更新"""
@@ -220,6 +309,221 @@ class InstagramPostMetricsRepository:
             'avg_engagement_rate': round(avg_engagement_rate, 2)
         }
     
+    async def get_refresh_snapshots(
+        self,
+        account_ids: Optional[List[str]] = None,
+        posted_after: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        再取得スケジュール判定用に、投稿ごとの直近2件のメトリクスを取得
+
+        メトリクス未取得の投稿も含めて1クエリで返す（snapshots は新しい順、最大2件）。
+        refresh_attempted_at はインサイトを取得できなかった直近の再取得試行日時。
+        """
+        from ..models.instagram_post import InstagramPost
+
+        target_posts = self.db.query(InstagramPost.id)
+        if account_ids:
+            target_posts = target_posts.filter(InstagramPost.account_id.in_(account_ids))
+        if posted_after:
+            target_posts = target_posts.filter(InstagramPost.posted_at >= posted_after)
+
+        ranked = (
+            self.db.query(
+                InstagramPostMetrics.post_id,
+                InstagramPostMetrics.recorded_at,
+                InstagramPostMetrics.last_observed_at,
+                InstagramPostMetrics.likes,
+                InstagramPostMetrics.comments,
+                InstagramPostMetrics.saved,
+                InstagramPostMetrics.shares,
+                InstagramPostMetrics.reach,
+                func.row_number().over(
+                    partition_by=InstagramPostMetrics.post_id,
+                    order_by=desc(InstagramPostMetrics.recorded_at)
+                ).label('rn')
+            )
+            .filter(InstagramPostMetrics.post_id.in_(target_posts.subquery().select()))
+            .subquery()
+        )
+
+        query = (
+            self.db.query(
+                InstagramPost.id,
+                InstagramPost.account_id,
+                InstagramPost.instagram_post_id,
+                InstagramPost.media_type,
+                InstagramPost.posted_at,
+                InstagramPost.metrics_refresh_attempted_at,
+                ranked.c.recorded_at,
+                ranked.c.last_observed_at,
+                ranked.c.likes,
+                ranked.c.comments,
+                ranked.c.saved,
+                ranked.c.shares,
+                ranked.c.reach
+            )
+            .outerjoin(ranked, and_(ranked.c.post_id == InstagramPost.id, ranked.c.rn <= 2))
+        )
+        if account_ids:
+            query = query.filter(InstagramPost.account_id.in_(account_ids))
+        if posted_after:
+            query = query.filter(InstagramPost.posted_at >= posted_after)
+
+        posts: Dict[Any, Dict[str, Any]] = {}
+        for row in query.order_by(InstagramPost.id, desc(ranked.c.recorded_at)).all():
+            post = posts.setdefault(row.id, {
+                'post_id': row.id,
+                'account_id': row.account_id,
+                'instagram_post_id': row.instagram_post_id,
+                'media_type': row.media_type,
+                'posted_at': row.posted_at,
+                'refresh_attempted_at': row.metrics_refresh_attempted_at,
+                'snapshots': [],
+            })
+            if row.recorded_at is not None:
+                post['snapshots'].append({
+                    'recorded_at': row.recorded_at,
+                    'last_observed_at': row.last_observed_at or row.recorded_at,
+                    'likes': row.likes or 0,
+                    'comments': row.comments or 0,
+                    'saved': row.saved or 0,
+                    'shares': row.shares or 0,
+                    'reach': row.reach or 0,
+                })
+        return list(posts.values())
+
+    async def get_post_ids_with_snapshots_before(
+        self,
+        cutoff: datetime,
+        after_post_id: Optional[Any] = None,
+        limit: int = 500
+    ) -> List[Any]:
+        """指定日時より前のスナップショットを持つ投稿IDを取得（post_id 順のキーセットページング）"""
+        query = (
+            self.db.query(InstagramPostMetrics.post_id)
+            .filter(InstagramPostMetrics.recorded_at < cutoff)
+        )
+        if after_post_id is not None:
+            query = query.filter(InstagramPostMetrics.post_id > after_post_id)
+        rows = query.distinct().order_by(InstagramPostMetrics.post_id).limit(limit).all()
+        return [row.post_id for row in rows]
+    
+    async def get_snapshots_before(self, post_ids: List[Any], cutoff: datetime) -> List[InstagramPostMetrics]:
+        """指定投稿の、指定日時より前のスナップショットを取得（投稿・記録日時順）"""
+        if not post_ids:
+            return []
+        return (
+            self.db.query(InstagramPostMetrics)
+            .filter(
+                and_(
+                    InstagramPostMetrics.post_id.in_(post_ids),
+                    InstagramPostMetrics.recorded_at < cutoff
+                )
+            )
+            .order_by(InstagramPostMetrics.post_id, asc(InstagramPostMetrics.recorded_at))
+            .all()
+        )
+    
+    async def apply_compaction(self, compactions: List[Dict[str, Any]]) -> int:
+        """
+        スナップショットの間引きを1トランザクションで適用
+
+        Args:
+            compactions: keep_id / delete_ids / recorded_at / last_observed_at の辞書リスト
+                （残す行を期間の代表として recorded_at 〜 last_observed_at に付け替える）
+
+        Returns:
+            int: 削除件数
+        """
+        delete_ids = [row_id for c in compactions for row_id in c['delete_ids']]
+        if not delete_ids:
+            return 0
+        
+        try:
+            # 一意制約 (post_id, recorded_at) のため、削除してから付け替える
+            deleted = (
+                self.db.query(InstagramPostMetrics)
+                .filter(InstagramPostMetrics.id.in_(delete_ids))
+                .delete(synchronize_session=False)
+            )
+            for compaction in compactions:
+                (
+                    self.db.query(InstagramPostMetrics)
+                    .filter(InstagramPostMetrics.id == compaction['keep_id'])
+                    .update(
+                        {
+                            InstagramPostMetrics.recorded_at: compaction['recorded_at'],
+                            InstagramPostMetrics.last_observed_at: compaction['last_observed_at'],
+                        },
+                        synchronize_session=False
+                    )
+                )
+            self.db.commit()
+            return deleted
+        except Exception:
+            self.db.rollback()
+            raise
+    
+    async def restore_snapshots(self, rows: List[Dict[str, Any]], replaced_ids: List[Any]) -> int:
+        """
+        アーカイブしたスナップショットの復元
+
+        間引き後の代表行（replaced_ids）を削除し、元の行を再作成する。
+
+        Returns:
+            int: 復元件数
+        """
+        from sqlalchemy.dialects.postgresql import insert
+        
+        if not rows:
+            return 0
+        
+        try:
+            if replaced_ids:
+                (
+                    self.db.query(InstagramPostMetrics)
+                    .filter(InstagramPostMetrics.id.in_(replaced_ids))
+                    .delete(synchronize_session=False)
+                )
+            # 主キーはパーティション化の有無で (id) / (id, recorded_at) となるため競合対象は指定しない
+            result = self.db.execute(
+                insert(InstagramPostMetrics).values(rows).on_conflict_do_nothing()
+            )
+            self.db.commit()
+            return result.rowcount
+        except Exception:
+            self.db.rollback()
+            raise
+    
+    @staticmethod
+    def _observed_until():
+        """スナップショットの有効期間の終端（未設定の行は記録日時）"""
+        return func.coalesce(InstagramPostMetrics.last_observed_at, InstagramPostMetrics.recorded_at)
+    
+    @staticmethod
+    def _is_unchanged(existing: InstagramPostMetrics, metrics_data: dict) -> bool:
+        """計測値が既存スナップショットと同一か（渡された項目のみ比較）"""
+        return all(
+            int(getattr(existing, field) or 0) == int(metrics_data.get(field) or 0)
+            for field in SNAPSHOT_COUNTER_FIELDS
+            if field in metrics_data
+        )
+    
+    async def _extend_observation(self, metrics: InstagramPostMetrics, observed_at: Any = None) -> None:
+        """同じ値を確認した日時で last_observed_at を延長（過去日の再取得では短縮しない）"""
+        observed_at = observed_at or func.now()
+        (
+            self.db.query(InstagramPostMetrics)
+            .filter(InstagramPostMetrics.id == metrics.id)
+            .update(
+                {InstagramPostMetrics.last_observed_at: func.greatest(self._observed_until(), observed_at)},
+                synchronize_session=False
+            )
+        )
+        self.db.commit()
+        self.db.refresh(metrics)
+    
     def _calculate_engagement_rate(self, metrics_data: dict) -> float:
         """エンゲージメント率計算"""
         likes = metrics_data.get('likes', 0) or 0
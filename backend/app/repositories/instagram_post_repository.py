@@ -188,7 +188,19 @@ class InstagramPostRepository:
             .order_by(desc(InstagramPost.posted_at))
             .all()
         )
-    
+
+    async def mark_metrics_refresh_attempted(self, post_ids: List[str], attempted_at: datetime) -> int:
+        """インサイトを取得できなかった投稿の再取得試行日時を記録（一括更新）"""
+        if not post_ids:
+            return 0
+        updated = (
+            self.db.query(InstagramPost)
+            .filter(InstagramPost.id.in_(post_ids))
+            .update({InstagramPost.metrics_refresh_attempted_at: attempted_at}, synchronize_session=False)
+        )
+        self.db.commit()
+        return updated
+
     async def get_latest_by_account(self, account_id: str) -> Optional[InstagramPost]:
         """アカウントの最新投稿取得"""
         return (
@@ -198,6 +210,14 @@ class InstagramPostRepository:
             .first()
         )
     
+    async def get_oldest_posted_at(self, account_id: str) -> Optional[datetime]:
+        """アカウントの保存済み投稿のうち最も古い投稿日時"""
+        return (
+            self.db.query(func.min(InstagramPost.posted_at))
+            .filter(InstagramPost.account_id == account_id)
+            .scalar()
+        )
+    
     async def count_by_account(self, account_id: str) -> int:
         """アカウント別投稿数カウント"""
         return (
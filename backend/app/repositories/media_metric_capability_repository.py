@@ -0,0 +1,56 @@
+"""
+Media Metric Capability Repository
+MediaMetricCapability モデル専用のデータアクセス層
+"""
+from typing import Any, Dict, List
+from sqlalchemy.orm import Session
+from sqlalchemy import asc
+from sqlalchemy.dialects.postgresql import insert
+
+from ..models.media_metric_capability import MediaMetricCapability
+
+
+class MediaMetricCapabilityRepository:
+    """インサイトメトリクス取得可否リポジトリ"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def get_all(self) -> List[MediaMetricCapability]:
+        """全件取得（件数はメディアタイプ × プロダクトタイプ × 期間 × メトリクス数で上限がある）"""
+        return (
+            self.db.query(MediaMetricCapability)
+            .order_by(
+                asc(MediaMetricCapability.media_type),
+                asc(MediaMetricCapability.media_product_type),
+                asc(MediaMetricCapability.age_bucket),
+                asc(MediaMetricCapability.metric)
+            )
+            .all()
+        )
+
+    async def upsert_many(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        取得可否の一括登録・更新
+
+        Args:
+            rows: media_type / media_product_type / age_bucket / metric / is_supported / last_error / checked_at
+
+        Returns:
+            int: 登録・更新件数
+        """
+        if not rows:
+            return 0
+
+        stmt = insert(MediaMetricCapability).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['media_type', 'media_product_type', 'age_bucket', 'metric'],
+            set_={
+                'is_supported': stmt.excluded.is_supported,
+                'last_error': stmt.excluded.last_error,
+                'checked_at': stmt.excluded.checked_at,
+            }
+        )
+        result = self.db.execute(stmt)
+        self.db.commit()
+        return result.rowcount
@@ -0,0 +1,97 @@
+"""
+Scheduler Run Repository
+SchedulerRun モデル（常駐スケジューラーの実行履歴）専用のデータアクセス層
+"""
+from typing import List, Optional, Dict, Any
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, desc, func
+from datetime import datetime, timezone
+import uuid
+
+from ..models.scheduler_run import SchedulerRun
+
+
+class SchedulerRunRepository:
+    """スケジューラー実行履歴リポジトリ"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    async def start(self, job_name: str, host: str, scheduled_for: Optional[datetime] = None) -> uuid.UUID:
+        """実行開始の記録"""
+        run = SchedulerRun(
+            id=uuid.uuid4(),
+            job_name=job_name,
+            status='running',
+            host=host,
+            scheduled_for=scheduled_for,
+            started_at=datetime.now(timezone.utc),
+            summary={}
+        )
+        self.db.add(run)
+        self.db.commit()
+        return run.id
+
+    async def finish(
+        self,
+        run_id: uuid.UUID,
+        status: str,
+        summary: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ) -> None:
+        """実行終了の記録"""
+        run = self.db.query(SchedulerRun).filter(SchedulerRun.id == run_id).first()
+        if not run:
+            return
+        now = datetime.now(timezone.utc)
+        run.status = status
+        run.finished_at = now
+        run.duration_seconds = (now - run.started_at).total_seconds()
+        run.summary = summary or {}
+        run.error = error[:2000] if error else None
+        self.db.commit()
+
+    async def mark_interrupted(self, host_prefix: str) -> int:
+        """同じホストで running のまま残った実行（前回のデーモンが途中で停止した分）を interrupted に更新"""
+        updated = (
+            self.db.query(SchedulerRun)
+            .filter(
+                and_(
+                    SchedulerRun.status == 'running',
+                    SchedulerRun.host.like(f"{host_prefix}%")
+                )
+            )
+            .update(
+                {'status': 'interrupted', 'finished_at': datetime.now(timezone.utc)},
+                synchronize_session=False
+            )
+        )
+        self.db.commit()
+        return updated
+
+    async def get_latest_by_job(self) -> Dict[str, SchedulerRun]:
+        """ジョブ別の最新の実行"""
+        latest = (
+            self.db.query(SchedulerRun.job_name, func.max(SchedulerRun.started_at).label('started_at'))
+            .group_by(SchedulerRun.job_name)
+            .subquery()
+        )
+        runs = (
+            self.db.query(SchedulerRun)
+            .join(
+                latest,
+                and_(
+                    SchedulerRun.job_name == latest.c.job_name,
+                    SchedulerRun.started_at == latest.c.started_at
+                )
+            )
+            .all()
+        )
+        return {run.job_name: run for run in runs}
+
+    async def get_recent(self, job_name: Optional[str] = None, limit: int = 20) -> List[SchedulerRun]:
+        """直近の実行（新しい順）"""
+        query = self.db.query(SchedulerRun)
+        if job_name:
+            query = query.filter(SchedulerRun.job_name == job_name)
+        return query.order_by(desc(SchedulerRun.started_at)).limit(limit).all()
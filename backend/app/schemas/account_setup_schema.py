@@ -82,15 +82,6 @@ class TokenExchangeResult(BaseModel):
     error_message: Optional[str] = Field(None, description="Error message if failed")
 
 
-class FacebookPageInfo(BaseModel):
-    """Facebookページ情報"""
-    page_id: str = Field(..., description="Facebook Page ID")
-    page_name: str = Field(..., description="Facebook Page name")
-    page_access_token: str = Field(..., description="Page access token")
-    category: Optional[str] = Field(None, description="Page category")
-    instagram_account_id: Optional[str] = Field(None, description="Connected Instagram account ID")
-
-
 class InstagramAccountDetails(BaseModel):
     """Instagramアカウント詳細"""
     instagram_user_id: str = Field(..., description="Instagram User ID")
@@ -104,6 +95,16 @@ class InstagramAccountDetails(BaseModel):
     account_type: Optional[str] = Field(None, description="Account type")
 
 
+class FacebookPageInfo(BaseModel):
+    """Facebookページ情報"""
+    page_id: str = Field(..., description="Facebook Page ID")
+    page_name: str = Field(..., description="Facebook Page name")
+    page_access_token: str = Field(..., description="Page access token")
+    category: Optional[str] = Field(None, description="Page category")
+    instagram_account_id: Optional[str] = Field(None, description="Connected Instagram account ID")
+    instagram_account: Optional[InstagramAccountDetails] = Field(None, description="Connected Instagram account details (field expansion)")
+
+
 class AccountSetupStep(BaseModel):
     """セットアップステップ情報"""
     step_name: str = Field(..., description="Step name")
@@ -145,4 +146,41 @@ class AccountSetupProgress(BaseModel):
     @property
     def is_failed(self) -> bool:
         """失敗しているかどうか"""
-        return self.overall_status == "failed"
\ No newline at end of file
+        return self.overall_status == "failed"
+
+class AccountSetupJobAccepted(BaseModel):
+    """セットアップジョブ受付レスポンス（202）"""
+    job_id: str = Field(..., description="Setup job ID")
+    status: str = Field(..., description="Job status")
+    status_url: str = Field(..., description="URL to poll for job progress")
+
+
+class AccountSetupPageProgress(BaseModel):
+    """ページ単位の進捗"""
+    page_id: str = Field(..., description="Facebook Page ID")
+    page_name: Optional[str] = Field(None, description="Facebook Page name")
+    status: str = Field(..., description="Page status: pending, resolved, no_instagram")
+    instagram_user_id: Optional[str] = Field(None, description="Connected Instagram account ID")
+    username: Optional[str] = Field(None, description="Instagram username")
+
+
+class AccountSetupJobStatus(BaseModel):
+    """セットアップジョブの状態"""
+    job_id: str = Field(..., description="Setup job ID")
+    status: str = Field(..., description="Job status: pending, running, completed, failed")
+    current_step: int = Field(0, description="Current step number")
+    total_steps: int = Field(4, description="Total number of steps")
+    message: Optional[str] = Field(None, description="Current step message")
+    pages_total: int = Field(0, description="Number of Facebook pages found")
+    pages_processed: int = Field(0, description="Number of pages resolved")
+    pages: List[AccountSetupPageProgress] = Field(default_factory=list, description="Per-page progress")
+    result: Optional[AccountSetupResponse] = Field(None, description="Setup result (when finished)")
+    error: Optional[str] = Field(None, description="Error message if failed")
+    created_at: Optional[datetime] = Field(None, description="Job creation time")
+    started_at: Optional[datetime] = Field(None, description="Job start time")
+    completed_at: Optional[datetime] = Field(None, description="Job completion time")
+    
+    @property
+    def is_finished(self) -> bool:
+        """完了または失敗しているかどうか"""
+        return self.status in ('completed', 'failed')
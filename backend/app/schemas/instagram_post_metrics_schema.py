@@ -59,6 +59,7 @@ class InstagramPostMetricsResponse(InstagramPostMetricsBase):
     id: uuid.UUID = Field(..., description="Metrics UUID")
     post_id: uuid.UUID = Field(..., description="Post UUID")
     recorded_at: datetime = Field(..., description="Recording timestamp")
+    last_observed_at: Optional[datetime] = Field(None, description="Last timestamp the same values were observed")
     
     class Config:
         from_attributes = True
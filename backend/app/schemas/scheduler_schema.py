@@ -0,0 +1,36 @@
+"""
+Scheduler Schema
+常駐スケジューラーの実行状況用のPydanticスキーマ
+"""
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+
+class SchedulerRunResponse(BaseModel):
+    """ジョブ実行1回分"""
+    run_id: str = Field(..., description="Run ID")
+    job_name: str = Field(..., description="Job name: new_posts, daily_insights, metrics_refresh")
+    status: str = Field(..., description="Run status: running, succeeded, failed, interrupted")
+    host: Optional[str] = Field(None, description="Daemon that executed the run (hostname:pid)")
+    scheduled_for: Optional[datetime] = Field(None, description="Scheduled time (null for manual / startup runs)")
+    started_at: datetime = Field(..., description="Run start time")
+    finished_at: Optional[datetime] = Field(None, description="Run finish time")
+    duration_seconds: Optional[float] = Field(None, description="Run duration in seconds")
+    summary: Dict[str, Any] = Field(default_factory=dict, description="Collector result counts")
+    error: Optional[str] = Field(None, description="Error message if failed")
+
+
+class ScheduledJobStatus(BaseModel):
+    """ジョブ別の実行状況"""
+    job_name: str = Field(..., description="Job name")
+    description: str = Field(..., description="Job description")
+    next_run_at: datetime = Field(..., description="Next scheduled run time")
+    running: bool = Field(False, description="Whether the latest run is still running")
+    last_run: Optional[SchedulerRunResponse] = Field(None, description="Latest run")
+
+
+class SchedulerStatusResponse(BaseModel):
+    """スケジューラーの実行状況"""
+    jobs: List[ScheduledJobStatus] = Field(default_factory=list, description="Per-job status")
+    checked_at: datetime = Field(..., description="Status check time")
@@ -2,15 +2,19 @@
 Account Setup Service
 アカウントセットアップのビジネスロジック
 """
+import asyncio
 import logging
 import requests
-from typing import List, Optional, Tuple
-from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
+
+from ...core.database import SessionLocal
 
 from ...models.instagram_account import InstagramAccount
 from ...schemas.account_setup_schema import (
+    AccountSetupJobStatus,
+    AccountSetupPageProgress,
     AccountSetupRequest,
     AccountSetupResponse,
     DiscoveredAccount,
@@ -19,10 +23,22 @@ from ...schemas.account_setup_schema import (
     InstagramAccountDetails
 )
 from ...schemas.instagram_account_schema import InstagramAccountCreate, InstagramAccountResponse
+from ...repositories.account_setup_job_repository import AccountSetupJobRepository
 from ...repositories.instagram_account_repository import InstagramAccountRepository
 
 logger = logging.getLogger(__name__)
 
+# ページ一覧取得時のフィールド（接続中の Instagram アカウントはフィールド展開で同時に取得）
+PAGE_FIELDS = 'id,name,access_token,category,category_list'
+INSTAGRAM_ACCOUNT_FIELDS = 'id,username,name,profile_picture_url'
+# フィールド展開で取得できなかったページを個別に問い合わせる際の同時実行数
+DISCOVERY_CONCURRENCY = 10
+# 更新が止まったセットアップジョブを失敗とみなすまでの時間（分）
+SETUP_JOB_STALE_MINUTES = 15
+
+# 進捗通知（AccountSetupJob の更新カラムと値）
+ProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
 
 class AccountSetupService:
     """アカウントセットアップサービス"""
@@ -30,13 +46,55 @@ class AccountSetupService:
     def __init__(self, db: Session):
         self.db = db
         self.account_repository = InstagramAccountRepository(db)
+        self.job_repository = AccountSetupJobRepository(db)
+    
+    async def create_setup_job(self) -> str:
+        """セットアップジョブを作成（実行は run_account_setup_job）"""
+        # 更新が止まったジョブ（プロセス再起動等）の整理は新しいジョブの開始時に行う
+        await self.job_repository.fail_stale(SETUP_JOB_STALE_MINUTES)
+        job = await self.job_repository.create()
+        logger.info(f"Account setup job created: {job.id}")
+        return str(job.id)
+    
+    async def get_setup_job(self, job_id: str) -> Optional[AccountSetupJobStatus]:
+        """セットアップジョブの状態取得（ポーリングされるため更新は行わない）"""
+        job = await self.job_repository.get_by_id(job_id)
+        if not job:
+            return None
+        
+        # 更新が止まった実行中ジョブは失敗として返す（DB の更新は次のジョブ開始時）
+        status, error = job.status, job.error
+        stale_cutoff = datetime.now(timezone.utc) - timedelta(minutes=SETUP_JOB_STALE_MINUTES)
+        if status in ('pending', 'running') and job.updated_at and job.updated_at < stale_cutoff:
+            status, error = 'failed', 'Setup job stopped responding'
+        
+        return AccountSetupJobStatus(
+            job_id=str(job.id),
+            status=status,
+            current_step=job.current_step,
+            total_steps=job.total_steps,
+            message=job.message,
+            pages_total=job.pages_total,
+            pages_processed=job.pages_processed,
+            pages=[AccountSetupPageProgress(**page) for page in job.pages or []],
+            result=AccountSetupResponse(**job.result) if job.result else None,
+            error=error,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            completed_at=job.completed_at
+        )
     
-    async def setup_accounts(self, request: AccountSetupRequest) -> AccountSetupResponse:
+    async def setup_accounts(
+        self,
+        request: AccountSetupRequest,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> AccountSetupResponse:
         """
         アカウントセットアップのメイン処理
         
         Args:
             request: セットアップリクエスト
+            on_progress: 進捗通知（ステップ・ページ単位）
             
         Returns:
             AccountSetupResponse: セットアップ結果
@@ -46,9 +104,14 @@ class AccountSetupService:
             message="アカウントセットアップを開始します"
         )
         
+        async def report(**progress):
+            if on_progress:
+                await on_progress(progress)
+        
         try:
             # Step 1: 短期トークンを長期トークンに変換
             logger.info("Step 1: Converting short token to long-term token")
+            await report(current_step=1, message="長期トークンを取得しています")
             token_result = await self._exchange_token(
                 request.app_id, 
                 request.app_secret, 
@@ -61,70 +124,50 @@ class AccountSetupService:
             
             # Step 2: Facebookページ一覧を取得
             logger.info("Step 2: Fetching Facebook pages")
-            pages = await self._get_facebook_pages(token_result.long_term_token)
+            await report(current_step=2, message="Facebookページを取得しています")
+            pages, instagram_expanded = await self._get_facebook_pages(token_result.long_term_token)
             
             if not pages:
                 response.errors.append("Facebookページが見つかりませんでした")
                 return response
             
-            # Step 3: 各ページのInstagramアカウントを取得
-            logger.info("Step 3: Fetching Instagram accounts for each page")
-            discovered_accounts = []
+            # Step 3: 各ページのInstagramアカウントを取得（未展開のページのみ並列に個別取得）
+            logger.info("Step 3: Resolving Instagram accounts for each page")
+            await report(current_step=3, message=f"{len(pages)}個のページからInstagramアカウントを取得しています")
+            discovered_accounts = await self._discover_accounts(pages, instagram_expanded, report)
             
-            for page in pages:
-                instagram_account = await self._get_instagram_account_for_page(page)
-                if instagram_account:
-                    # Instagramアカウントの詳細情報を取得（失敗してもフォールバック）
-                    account_details = await self._get_instagram_account_details(
-                        instagram_account, 
-                        page.page_access_token
-                    )
-                    
-                    # account_detailsは常に何らかの値を返すように修正済み
-                    discovered_account = DiscoveredAccount(
-                        instagram_user_id=account_details.instagram_user_id,
-                        username=account_details.username or f"user_{instagram_account[-8:]}",
-                        account_name=account_details.name or page.page_name,  # フォールバック
-                        profile_picture_url=account_details.profile_picture_url,
-                        facebook_page_id=page.page_id,
-                        facebook_page_name=page.page_name,
-                        access_token=page.page_access_token,
-                        is_new=True  # 後で既存チェック
-                    )
-                    discovered_accounts.append(discovered_account)
-                    logger.info(f"Successfully processed Instagram account {account_details.instagram_user_id} for page {page.page_name}")
-            
-            # Step 4: データベースに保存
+            # Step 4: データベースに一括保存
             logger.info("Step 4: Saving accounts to database")
+            await report(current_step=4, message=f"{len(discovered_accounts)}個のアカウントを保存しています")
             created_accounts = []
             updated_count = 0
             
-            for discovered in discovered_accounts:
-                try:
-                    # 既存アカウントチェック
-                    existing_account = await self.account_repository.get_by_instagram_user_id(
-                        discovered.instagram_user_id
+            try:
+                existing_ids = {
+                    account.instagram_user_id
+                    for account in await self.account_repository.get_by_instagram_user_ids(
+                        [discovered.instagram_user_id for discovered in discovered_accounts]
                     )
-                    
-                    if existing_account:
-                        # 既存アカウントを更新
-                        discovered.is_new = False
-                        await self._update_existing_account(existing_account, discovered, token_result)
+                }
+                token_expires_at = self._calculate_token_expiry(token_result)
+                saved_accounts = await self.account_repository.bulk_upsert([
+                    self._to_account_data(discovered, token_expires_at, token_result.long_term_token)
+                    for discovered in discovered_accounts
+                ])
+                
+                for account in saved_accounts:
+                    if account.instagram_user_id in existing_ids:
                         updated_count += 1
-                        response.warnings.append(
-                            f"既存のアカウント @{discovered.username} を更新しました"
-                        )
+                        response.warnings.append(f"既存のアカウント @{account.username} を更新しました")
                     else:
-                        # 新規アカウントを作成
-                        new_account = await self._create_new_account(discovered, token_result)
-                        if new_account:
-                            created_accounts.append(new_account)
-                        
-                except Exception as e:
-                    logger.error(f"Failed to save account {discovered.username}: {str(e)}")
-                    response.errors.append(
-                        f"アカウント @{discovered.username} の保存に失敗: {str(e)}"
-                    )
+                        created_accounts.append(self._to_account_response(account))
+                for discovered in discovered_accounts:
+                    discovered.is_new = discovered.instagram_user_id not in existing_ids
+                    
+            except Exception as e:
+                logger.error(f"Failed to save accounts: {str(e)}")
+                response.errors.append(f"アカウントの保存に失敗: {str(e)}")
+                return response
             
             # 結果をまとめる
             response.success = len(discovered_accounts) > 0
@@ -160,7 +203,7 @@ class AccountSetupService:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = await asyncio.to_thread(requests.get, url, params=params, timeout=30)
             response.raise_for_status()
             
             data = response.json()
@@ -185,13 +228,29 @@ class AccountSetupService:
                 error_message=f"トークン交換に失敗: {str(e)}"
             )
     
-    async def _get_facebook_pages(self, access_token: str) -> List[FacebookPageInfo]:
-        """Facebookページ一覧を取得（ページネーション対応）"""
+    async def _get_facebook_pages(
+        self,
+        access_token: str,
+        expand_instagram: bool = True
+    ) -> Tuple[List[FacebookPageInfo], bool]:
+        """
+        Facebookページ一覧を取得（ページネーション対応）
+        
+        expand_instagram の場合は接続中の Instagram アカウントもフィールド展開で同時に取得し、
+        展開に失敗した場合は展開なしで取得し直す。
+        
+        Returns:
+            Tuple[List[FacebookPageInfo], bool]: ページ一覧, Instagram アカウントを展開取得できたか
+        """
         url = "https://graph.facebook.com/v21.0/me/accounts"
         
+        fields = PAGE_FIELDS
+        if expand_instagram:
+            fields += f",instagram_business_account{{{INSTAGRAM_ACCOUNT_FIELDS}}}"
+        
         params = {
             'access_token': access_token,
-            'fields': 'id,name,access_token,category,category_list',
+            'fields': fields,
             'limit': 100  # 一度に取得する最大件数
         }
         
@@ -203,7 +262,7 @@ class AccountSetupService:
                 page_count += 1
                 logger.info(f"Fetching Facebook pages - page {page_count}")
                 
-                response = requests.get(url, params=params, timeout=30)
+                response = await asyncio.to_thread(requests.get, url, params=params, timeout=30)
                 response.raise_for_status()
                 
                 data = response.json()
@@ -219,6 +278,15 @@ class AccountSetupService:
                         page_access_token=page_data['access_token'],
                         category=page_data.get('category')
                     )
+                    instagram_data = page_data.get('instagram_business_account')
+                    if instagram_data:
+                        page.instagram_account_id = instagram_data['id']
+                        page.instagram_account = InstagramAccountDetails(
+                            instagram_user_id=instagram_data['id'],
+                            username=instagram_data.get('username'),
+                            name=instagram_data.get('name'),
+                            profile_picture_url=instagram_data.get('profile_picture_url')
+                        )
                     pages.append(page)
                 
                 # 次のページのURLを取得
@@ -232,11 +300,82 @@ class AccountSetupService:
                     logger.info(f"No more pages, pagination complete")
             
             logger.info(f"Total Facebook pages retrieved: {len(pages)}")
-            return pages
+            return pages, expand_instagram
             
         except requests.exceptions.RequestException as e:
+            if expand_instagram:
+                logger.warning(f"Failed to get Facebook pages with Instagram field expansion, retrying without: {str(e)}")
+                return await self._get_facebook_pages(access_token, expand_instagram=False)
             logger.error(f"Failed to get Facebook pages: {str(e)}")
-            return []
+            return [], False
+    
+    async def _discover_accounts(
+        self,
+        pages: List[FacebookPageInfo],
+        instagram_expanded: bool,
+        report: Callable[..., Awaitable[None]]
+    ) -> List[DiscoveredAccount]:
+        """
+        ページ一覧から Instagram アカウントを解決
+        
+        フィールド展開で取得済みのページは追加の API 呼び出しなし、
+        未取得のページのみ同時実行数を制限して並列に問い合わせる。
+        """
+        semaphore = asyncio.Semaphore(DISCOVERY_CONCURRENCY)
+        page_progress = {
+            page.page_id: {'page_id': page.page_id, 'page_name': page.page_name, 'status': 'pending'}
+            for page in pages
+        }
+        processed = 0
+        
+        async def mark(page: FacebookPageInfo, details: Optional[InstagramAccountDetails]):
+            nonlocal processed
+            processed += 1
+            page_progress[page.page_id].update(
+                status='resolved' if details else 'no_instagram',
+                instagram_user_id=details.instagram_user_id if details else None,
+                username=details.username if details else None
+            )
+            await report(pages_processed=processed, pages=[dict(entry) for entry in page_progress.values()])
+        
+        await report(pages_total=len(pages), pages_processed=0, pages=[dict(entry) for entry in page_progress.values()])
+        
+        async def resolve(page: FacebookPageInfo) -> Optional[DiscoveredAccount]:
+            details = page.instagram_account
+            if not (details and details.username):
+                async with semaphore:
+                    instagram_account_id = page.instagram_account_id
+                    if not instagram_account_id and not instagram_expanded:
+                        instagram_account_id = await self._get_instagram_account_for_page(page)
+                    if not instagram_account_id:
+                        await mark(page, None)
+                        return None
+                    details = await self._get_instagram_account_details(
+                        instagram_account_id,
+                        page.page_access_token
+                    )
+            
+            await mark(page, details)
+            logger.info(f"Successfully processed Instagram account {details.instagram_user_id} for page {page.page_name}")
+            return DiscoveredAccount(
+                instagram_user_id=details.instagram_user_id,
+                username=details.username or f"user_{details.instagram_user_id[-8:]}",
+                account_name=details.name or page.page_name,  # フォールバック
+                profile_picture_url=details.profile_picture_url,
+                facebook_page_id=page.page_id,
+                facebook_page_name=page.page_name,
+                access_token=page.page_access_token,
+                is_new=True  # 保存時に既存チェック
+            )
+        
+        resolved = await asyncio.gather(*(resolve(page) for page in pages))
+        
+        # 同じ Instagram アカウントが複数ページに接続されている場合は最初のページを採用
+        discovered_accounts: Dict[str, DiscoveredAccount] = {}
+        for account in resolved:
+            if account and account.instagram_user_id not in discovered_accounts:
+                discovered_accounts[account.instagram_user_id] = account
+        return list(discovered_accounts.values())
     
     async def _get_instagram_account_for_page(self, page: FacebookPageInfo) -> Optional[str]:
         """ページに接続されているInstagramアカウントIDを取得"""
@@ -248,7 +387,7 @@ class AccountSetupService:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = await asyncio.to_thread(requests.get, url, params=params, timeout=30)
             response.raise_for_status()
             
             data = response.json()
@@ -286,7 +425,7 @@ class AccountSetupService:
             
             try:
                 logger.info(f"Trying to get Instagram account {instagram_account_id} with fields: {fields}")
-                response = requests.get(url, params=params, timeout=30)
+                response = await asyncio.to_thread(requests.get, url, params=params, timeout=30)
                 response.raise_for_status()
                 
                 data = response.json()
@@ -325,87 +464,105 @@ class AccountSetupService:
             account_type=None
         )
     
-    async def _create_new_account(self, discovered: DiscoveredAccount, token_result: TokenExchangeResult) -> Optional[InstagramAccountResponse]:
-        """新規アカウントを作成"""
-        try:
-            # トークン有効期限を計算
-            token_expires_at = None
-            if token_result.expires_in:
-                token_expires_at = datetime.now() + timedelta(seconds=token_result.expires_in)
-                logger.info(f"Token expires in {token_result.expires_in} seconds, expires at: {token_expires_at}")
-            else:
-                # 長期トークンのデフォルト有効期限（60日）
-                token_expires_at = datetime.now() + timedelta(days=60)
-                logger.info(f"Using default 60-day expiration: {token_expires_at}")
-            
-            # 辞書形式でデータを準備
-            account_data = {
-                'instagram_user_id': discovered.instagram_user_id,
-                'username': discovered.username,
-                'account_name': discovered.account_name,
-                'profile_picture_url': discovered.profile_picture_url,
-                'access_token_encrypted': discovered.access_token,  # 暗号化は未実装
-                'token_expires_at': token_expires_at,
-                'facebook_page_id': discovered.facebook_page_id,
-                'is_active': True
-            }
-            
-            created_account = await self.account_repository.create(account_data)
-            
-            # レスポンス用にマッピング
-            return InstagramAccountResponse(
-                id=created_account.id,
-                instagram_user_id=created_account.instagram_user_id,
-                username=created_account.username,
-                account_name=created_account.account_name,
-                profile_picture_url=created_account.profile_picture_url,
-                facebook_page_id=created_account.facebook_page_id,
-                is_active=created_account.is_active,
-                token_expires_at=created_account.token_expires_at,
-                created_at=created_account.created_at,
-                updated_at=created_account.updated_at,
-                is_token_valid=True,
-                days_until_expiry=(token_expires_at - datetime.now()).days if token_expires_at else None
-            )
-            
-        except IntegrityError as e:
-            logger.error(f"Integrity error creating account {discovered.username}: {str(e)}")
-            self.db.rollback()
-            return None
-        except Exception as e:
-            logger.error(f"Error creating account {discovered.username}: {str(e)}")
-            self.db.rollback()
-            return None
+    @staticmethod
+    def _calculate_token_expiry(token_result: TokenExchangeResult) -> datetime:
+        """トークン有効期限を計算"""
+        if token_result.expires_in:
+            token_expires_at = datetime.now() + timedelta(seconds=token_result.expires_in)
+            logger.info(f"Token expires in {token_result.expires_in} seconds, expires at: {token_expires_at}")
+        else:
+            # 長期トークンのデフォルト有効期限（60日）
+            token_expires_at = datetime.now() + timedelta(days=60)
+            logger.info(f"Using default 60-day expiration: {token_expires_at}")
+        return token_expires_at
     
-    async def _update_existing_account(self, existing_account: InstagramAccount, discovered: DiscoveredAccount, token_result: TokenExchangeResult) -> None:
-        """既存アカウントを更新"""
-        try:
-            # トークン有効期限を計算
-            token_expires_at = None
-            if token_result.expires_in:
-                token_expires_at = datetime.now() + timedelta(seconds=token_result.expires_in)
-                logger.info(f"Updating existing account with token expires in {token_result.expires_in} seconds")
-            else:
-                # 長期トークンのデフォルト有効期限（60日）
-                token_expires_at = datetime.now() + timedelta(days=60)
-                logger.info(f"Updating existing account with default 60-day expiration")
-            
-            # 必要なフィールドを更新
-            existing_account.username = discovered.username
-            existing_account.account_name = discovered.account_name
-            existing_account.profile_picture_url = discovered.profile_picture_url
-            existing_account.access_token_encrypted = discovered.access_token
-            existing_account.token_expires_at = token_expires_at
-            existing_account.facebook_page_id = discovered.facebook_page_id
-            existing_account.is_active = True
-            existing_account.updated_at = datetime.now()
-            
-            self.db.commit()
-            
-        except Exception as e:
-            logger.error(f"Error updating account {discovered.username}: {str(e)}")
-            self.db.rollback()
-            raise
+    @staticmethod
+    def _to_account_data(
+        discovered: DiscoveredAccount,
+        token_expires_at: datetime,
+        user_access_token: Optional[str]
+    ) -> Dict[str, Any]:
+        """発見したアカウントを保存用の辞書に変換（トークン更新用に派生元の長期ユーザートークンも保存）"""
+        return {
+            'instagram_user_id': discovered.instagram_user_id,
+            'username': discovered.username,
+            'account_name': discovered.account_name,
+            'profile_picture_url': discovered.profile_picture_url,
+            'access_token_encrypted': discovered.access_token,  # 暗号化は未実装
+            'user_access_token_encrypted': user_access_token,
+            'token_expires_at': token_expires_at,
+            'facebook_page_id': discovered.facebook_page_id,
+            'is_active': True
+        }
+    
+    @staticmethod
+    def _to_account_response(account: InstagramAccount) -> InstagramAccountResponse:
+        """レスポンス用にマッピング"""
+        return InstagramAccountResponse(
+            id=account.id,
+            instagram_user_id=account.instagram_user_id,
+            username=account.username,
+            account_name=account.account_name,
+            profile_picture_url=account.profile_picture_url,
+            facebook_page_id=account.facebook_page_id,
+            is_active=account.is_active,
+            token_expires_at=account.token_expires_at,
+            created_at=account.created_at,
+            updated_at=account.updated_at,
+            is_token_valid=True,
+            days_until_expiry=(account.token_expires_at.replace(tzinfo=None) - datetime.now()).days if account.token_expires_at else None
+        )
+
+
+def run_account_setup_job_in_thread(job_id: str, request: AccountSetupRequest) -> None:
+    """
+    セットアップジョブの実行（BackgroundTasks から呼び出し）
+    
+    同期関数として登録するとスレッドプールで実行されるため、ジョブ内の DB 操作や
+    API 呼び出しが API サーバーのイベントループ（ジョブ状態のポーリング等）を止めない。
+    """
+    asyncio.run(run_account_setup_job(job_id, request))
+
+
+async def run_account_setup_job(job_id: str, request: AccountSetupRequest) -> None:
+    """
+    セットアップジョブの実行
+    
+    リクエストのセッションはレスポンス返却後に閉じられるため、専用のセッションを使用する。
+    """
+    db = SessionLocal()
+    job_repository = AccountSetupJobRepository(db)
+    
+    async def on_progress(progress: Dict[str, Any]):
+        await job_repository.update_progress(job_id, progress)
+    
+    try:
+        await job_repository.update_progress(job_id, {'status': 'running', 'message': "セットアップを開始しました"})
+        result = await AccountSetupService(db).setup_accounts(request, on_progress=on_progress)
+        
+        # ページアクセストークンはジョブ結果として保存しない
+        stored_result = result.model_dump(mode='json')
+        for discovered in stored_result['discovered_accounts']:
+            discovered['access_token'] = ''
+        
+        await job_repository.update_progress(job_id, {
+            'status': 'completed' if result.success else 'failed',
+            'message': result.message,
+            'result': stored_result,
+            'error': ', '.join(result.errors) or None
+        })
+        logger.info(f"Account setup job {job_id} finished: success={result.success}")
+        
+    except Exception as e:
+        logger.error(f"Account setup job {job_id} failed: {str(e)}", exc_info=True)
+        db.rollback()
+        await job_repository.update_progress(job_id, {
+            'status': 'failed',
+            'error': f"セットアップ中にエラーが発生しました: {str(e)}"
+        })
+        
+    finally:
+        db.close()
 
 
 def create_account_setup_service(db: Session) -> AccountSetupService:
@@ -0,0 +1,193 @@
+"""
+API Quota Ledger
+プロセス間で共有する Graph API 呼び出し枠の予約
+
+新規投稿・日次インサイトのワークフローやバックフィルスクリプトは同じアプリ・トークンで
+同時に動くため、各プロセスが自分の呼び出し数だけを数えても合計で上限を超えてしまう。
+全プロセスが API 呼び出し前に api_quota_ledger（Postgres）から枠を予約し、
+1時間ウィンドウ × スコープ（アプリ全体 / トークン）の上限を共同で守る。
+
+予約は QUOTA_RESERVATION_BLOCK 件ずつまとめて行い、使わなかった分はプロセス内で予約を使うクライアントが
+なくなった時点（最後のクライアント終了時、常駐プロセスでは共有セッションを閉じる停止時）に返却する。
+台帳に接続できない場合（マイグレーション未実行・DB なしのローカル実行等）は予約なしで続行し、
+LEDGER_RETRY_SECONDS 後に再び台帳を使う（一時的な DB エラーで常駐プロセスの調整が止まらないように）。
+"""
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from ...core.database import SessionLocal
+from ...core.instagram_config import instagram_config
+from ...repositories.api_quota_ledger_repository import ApiQuotaLedgerRepository
+
+# ログ設定
+logger = logging.getLogger(__name__)
+
+# 台帳が使えなかった場合に予約なしで続行する期間（秒）
+LEDGER_RETRY_SECONDS = 60
+
+
+class QuotaExhaustedError(Exception):
+    """呼び出し枠切れ（次のウィンドウまでの待機が上限を超える）"""
+    def __init__(self, message: str, retry_after_seconds: float):
+        super().__init__(message)
+        self.retry_after_seconds = retry_after_seconds
+
+
+def token_fingerprint(access_token: Optional[str]) -> Optional[str]:
+    """トークンそのものは保持せず sha256 の先頭16桁で識別する"""
+    if not access_token:
+        return None
+    return hashlib.sha256(access_token.encode()).hexdigest()[:16]
+
+
+def current_window_start(now: Optional[datetime] = None) -> datetime:
+    """1時間ウィンドウの開始時刻（UTC の正時）"""
+    now = now or datetime.now(timezone.utc)
+    return now.replace(minute=0, second=0, microsecond=0)
+
+
+@dataclass
+class _Reservation:
+    """プロセス内に確保済みの呼び出し枠"""
+    window_start: datetime
+    scope_keys: List[str]
+    remaining: int = 0
+
+
+class ApiQuotaLedger:
+    """Graph API 呼び出し枠の予約（プロセス内で共有）"""
+
+    def __init__(
+        self,
+        block_size: int = instagram_config.QUOTA_RESERVATION_BLOCK,
+        max_wait_seconds: int = instagram_config.QUOTA_MAX_WAIT_SECONDS,
+        enabled: bool = instagram_config.quota_ledger_enabled
+    ):
+        self.block_size = max(block_size, 1)
+        self.max_wait_seconds = max_wait_seconds
+        self.enabled = enabled
+        self._disabled_until: Optional[datetime] = None
+        self._reservations: Dict[str, _Reservation] = {}
+        self._holders = 0
+        self._lock = asyncio.Lock()
+
+    def scope_limits(self, access_token: Optional[str]) -> Dict[str, int]:
+        """呼び出しが消費するスコープと各スコープの1時間あたりの上限"""
+        margin = instagram_config.RATE_LIMIT_SAFETY_MARGIN
+        limits = {
+            f"app:{instagram_config.facebook_app_id or 'default'}":
+                int(instagram_config.APP_RATE_LIMIT_CALLS_PER_HOUR * margin)
+        }
+        fingerprint = token_fingerprint(access_token)
+        if fingerprint:
+            limits[f"token:{fingerprint}"] = int(instagram_config.RATE_LIMIT_CALLS_PER_HOUR * margin)
+        return limits
+
+    async def acquire(self, access_token: Optional[str]) -> None:
+        """
+        API 呼び出し1回分の枠を確保
+
+        手元の予約が残っていればそれを使い、なければ台帳からブロック単位で予約する。
+        上限に達している場合は次のウィンドウまで待つ（max_wait_seconds を超える場合は QuotaExhaustedError）。
+        """
+        if not self.enabled or self._backing_off():
+            return
+
+        reservation_key = token_fingerprint(access_token) or 'app'
+        while True:
+            async with self._lock:
+                window_start = current_window_start()
+                reservation = self._reservations.get(reservation_key)
+                if reservation and reservation.window_start == window_start and reservation.remaining > 0:
+                    reservation.remaining -= 1
+                    return
+
+                scope_limits = self.scope_limits(access_token)
+                try:
+                    granted = await self._reserve(scope_limits, window_start)
+                except Exception as e:
+                    # 台帳が使えない場合はしばらく予約なしで続行（LEDGER_RETRY_SECONDS 後に再試行）
+                    logger.warning(
+                        f"API quota ledger unavailable, continuing without reservations "
+                        f"for {LEDGER_RETRY_SECONDS}s: {e}"
+                    )
+                    self._disabled_until = datetime.now(timezone.utc) + timedelta(seconds=LEDGER_RETRY_SECONDS)
+                    return
+
+                if granted > 0:
+                    self._reservations[reservation_key] = _Reservation(
+                        window_start=window_start,
+                        scope_keys=list(scope_limits.keys()),
+                        remaining=granted - 1
+                    )
+                    return
+
+            wait_seconds = (window_start + timedelta(hours=1) - datetime.now(timezone.utc)).total_seconds() + 1
+            if wait_seconds > self.max_wait_seconds:
+                raise QuotaExhaustedError(
+                    f"API quota exhausted for {', '.join(sorted(scope_limits))} "
+                    f"(next window in {wait_seconds:.0f}s)",
+                    retry_after_seconds=wait_seconds
+                )
+            logger.warning(f"API quota exhausted, waiting {wait_seconds:.0f}s for the next window")
+            await asyncio.sleep(wait_seconds)
+
+    def attach(self) -> None:
+        """予約を使う利用者（クライアント・共有セッション）の登録"""
+        self._holders += 1
+
+    async def detach(self) -> None:
+        """利用者の登録解除（最後の利用者が抜けた時点で未使用の予約を返却）"""
+        self._holders = max(self._holders - 1, 0)
+        if self._holders == 0:
+            await self.release_unused()
+
+    async def release_unused(self) -> None:
+        """手元に残った当該ウィンドウの予約を台帳に返却"""
+        if not self.enabled or not self._reservations:
+            return
+
+        window_start = current_window_start()
+        async with self._lock:
+            reservations = [
+                reservation for reservation in self._reservations.values()
+                if reservation.window_start == window_start and reservation.remaining > 0
+            ]
+            self._reservations.clear()
+            if not reservations:
+                return
+
+            db = SessionLocal()
+            try:
+                repo = ApiQuotaLedgerRepository(db)
+                for reservation in reservations:
+                    await repo.release(reservation.scope_keys, reservation.window_start, reservation.remaining)
+            except Exception as e:
+                logger.warning(f"Failed to release unused API quota reservations: {e}")
+                db.rollback()
+            finally:
+                db.close()
+
+    def _backing_off(self) -> bool:
+        """台帳のエラー後、再試行までの期間中か"""
+        if self._disabled_until is None:
+            return False
+        if datetime.now(timezone.utc) < self._disabled_until:
+            return True
+        self._disabled_until = None
+        return False
+
+    async def _reserve(self, scope_limits: Dict[str, int], window_start: datetime) -> int:
+        db = SessionLocal()
+        try:
+            return await ApiQuotaLedgerRepository(db).reserve(scope_limits, window_start, self.block_size)
+        finally:
+            db.close()
+
+
+# プロセス内で共有（コレクターは処理単位でクライアントを作り直すため）
+api_quota_ledger = ApiQuotaLedger()
@@ -0,0 +1,396 @@
+"""
+Collection Planner
+過去データ収集（collect_historical_data.py / collect_historical_insights.py）の実行計画
+
+保存済みの media_count・投稿・日次統計と設定済みのレート制限から、
+フェーズごとの Graph API 呼び出し数・所要時間・1時間あたりの枠の消費を見積もり、
+枠に収まらない場合は期間の分割・アカウント単位の並列実行を提案する。
+API は呼び出さない（api_quota_ledger から現在の残り枠のみ参照する）。
+"""
+import logging
+import math
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from ...core.instagram_config import instagram_config
+from ...repositories.api_quota_ledger_repository import ApiQuotaLedgerRepository
+from ...repositories.instagram_account_repository import InstagramAccountRepository
+from ...repositories.instagram_daily_stats_repository import InstagramDailyStatsRepository
+from ...repositories.instagram_post_repository import InstagramPostRepository
+from .api_quota_ledger import current_window_start, token_fingerprint
+
+# ログ設定
+logger = logging.getLogger(__name__)
+
+# 1回の API 呼び出しの平均所要時間（秒）
+AVG_API_CALL_SECONDS = 0.6
+
+# 各スクリプトの待機・バッチ設定（HistoricalCollectorService / collect_historical_data.py と揃える）
+POSTS_PAGE_SIZE = 100
+POSTS_PAGE_SLEEP_SECONDS = 1
+METRICS_CHUNK_SIZE = 50
+METRICS_CHUNK_SLEEP_SECONDS = 2
+METRICS_CALL_SLEEP_SECONDS = 0.5
+MISSING_METRICS_DAYS_BACK = 30
+MISSING_METRICS_SLEEP_SECONDS = 1
+ACCOUNT_SWITCH_SLEEP_SECONDS = 10
+
+
+@dataclass
+class PhaseEstimate:
+    """フェーズ単位の見積もり"""
+    name: str
+    api_calls: int = 0
+    sleep_seconds: float = 0.0
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.api_calls * AVG_API_CALL_SECONDS + self.sleep_seconds
+
+
+@dataclass
+class AccountRunPlan:
+    """アカウント単位の見積もり"""
+    instagram_user_id: str
+    username: Optional[str] = None
+    media_count: int = 0
+    posts_in_range: int = 0
+    posts_estimated: bool = False  # 保存済み投稿で期間をカバーできず推定を含む
+    existing_rows: int = 0
+    phases: List[PhaseEstimate] = field(default_factory=list)
+    quota_remaining: Optional[int] = None  # 現在のウィンドウのトークン残り枠（台帳に記録がある場合）
+    error: Optional[str] = None
+
+    @property
+    def api_calls(self) -> int:
+        return sum(phase.api_calls for phase in self.phases)
+
+    @property
+    def duration_seconds(self) -> float:
+        return sum(phase.duration_seconds for phase in self.phases)
+
+
+@dataclass
+class CollectionRunPlan:
+    """実行計画"""
+    operation: str
+    start_date: Optional[date]
+    end_date: Optional[date]
+    token_hourly_budget: int
+    app_hourly_budget: int
+    accounts: List[AccountRunPlan] = field(default_factory=list)
+    suggestions: List[str] = field(default_factory=list)
+
+    @property
+    def total_api_calls(self) -> int:
+        return sum(account.api_calls for account in self.accounts)
+
+    @property
+    def total_duration_seconds(self) -> float:
+        """順次実行時の所要時間（アカウント間の待機を含む、枠待ちは含まない）"""
+        switches = max(len(self.accounts) - 1, 0) * ACCOUNT_SWITCH_SLEEP_SECONDS
+        return sum(account.duration_seconds for account in self.accounts) + switches
+
+    @property
+    def hour_windows_needed(self) -> int:
+        """トークン・アプリの1時間枠に収めるために必要なウィンドウ数"""
+        per_token = max((account.api_calls for account in self.accounts), default=0)
+        return max(
+            math.ceil(per_token / self.token_hourly_budget) if self.token_hourly_budget else 1,
+            math.ceil(self.total_api_calls / self.app_hourly_budget) if self.app_hourly_budget else 1,
+            1
+        )
+
+    @property
+    def expected_duration_seconds(self) -> float:
+        """枠待ちを含む所要時間の目安"""
+        return max(self.total_duration_seconds, (self.hour_windows_needed - 1) * 3600)
+
+
+class CollectionPlanner:
+    """過去データ収集の実行計画"""
+
+    def __init__(self, db):
+        self.db = db
+        self.account_repo = InstagramAccountRepository(db)
+        self.post_repo = InstagramPostRepository(db)
+        self.daily_stats_repo = InstagramDailyStatsRepository(db)
+        self.token_hourly_budget = int(
+            instagram_config.RATE_LIMIT_CALLS_PER_HOUR * instagram_config.RATE_LIMIT_SAFETY_MARGIN
+        )
+        self.app_hourly_budget = int(
+            instagram_config.APP_RATE_LIMIT_CALLS_PER_HOUR * instagram_config.RATE_LIMIT_SAFETY_MARGIN
+        )
+
+    async def plan_historical_posts(
+        self,
+        instagram_user_ids: List[str],
+        start_date: Optional[date],
+        end_date: Optional[date],
+        include_metrics: bool = True,
+        include_daily_stats: bool = True,
+        posts: bool = True,
+        inline_insights: bool = True,
+        missing_metrics: bool = False
+    ) -> CollectionRunPlan:
+        """
+        collect_historical_data.py の見積もり
+
+        Args:
+            posts: 投稿一覧の取得を行うか（--daily-stats-only では False）
+            include_metrics: 投稿メトリクスを取得するか（--posts-only では False）
+            include_daily_stats: 日次統計を作成するか（--posts-only では False）
+            inline_insights: メトリクスを投稿一覧のフィールド展開で取得するか
+            missing_metrics: --missing-metrics（メトリクス未取得投稿のみ）
+        """
+        operation = "missing_metrics" if missing_metrics else "historical_posts"
+        plan = self._new_plan(operation, start_date, end_date)
+        quota_remaining = await self._get_quota_remaining()
+
+        for instagram_user_id in instagram_user_ids:
+            account_plan = AccountRunPlan(instagram_user_id=instagram_user_id)
+            plan.accounts.append(account_plan)
+
+            account = await self.account_repo.get_by_instagram_user_id(instagram_user_id)
+            if not account:
+                account_plan.error = "Account not found"
+                continue
+            account_plan.username = account.username
+            account_plan.quota_remaining = quota_remaining.get(token_fingerprint(account.access_token_encrypted))
+            account_plan.media_count = await self._get_media_count(account)
+
+            if missing_metrics:
+                cutoff = (datetime.now() - timedelta(days=MISSING_METRICS_DAYS_BACK)).date()
+                pending = await self.post_repo.get_posts_without_metrics(account.id, cutoff)
+                account_plan.posts_in_range = len(pending)
+                account_plan.phases.append(PhaseEstimate(
+                    name="missing metrics",
+                    api_calls=len(pending),
+                    sleep_seconds=len(pending) * MISSING_METRICS_SLEEP_SECONDS
+                ))
+                continue
+
+            pages = max(math.ceil(account_plan.media_count / POSTS_PAGE_SIZE), 1)
+            account_plan.posts_in_range, account_plan.posts_estimated = await self._estimate_posts_in_range(
+                account, account_plan.media_count, start_date, end_date
+            )
+            account_plan.existing_rows = await self.post_repo.count_by_date_range(account.id, start_date, end_date)
+
+            if posts:
+                # 投稿一覧は期間に関わらず全ページを辿る
+                account_plan.phases.append(PhaseEstimate(
+                    name="posts pages",
+                    api_calls=pages,
+                    sleep_seconds=(pages - 1) * POSTS_PAGE_SLEEP_SECONDS
+                ))
+                if include_metrics:
+                    account_plan.phases.append(
+                        await self._estimate_metrics_phase(account, account_plan.posts_in_range, inline_insights)
+                    )
+
+            if include_daily_stats:
+                # 基本データ1回 + 全投稿の再取得
+                account_plan.phases.append(PhaseEstimate(
+                    name="daily stats",
+                    api_calls=1 + pages,
+                    sleep_seconds=(pages - 1) * POSTS_PAGE_SLEEP_SECONDS
+                ))
+
+        self._add_suggestions(plan)
+        return plan
+
+    async def plan_account_insights(
+        self,
+        instagram_user_ids: List[str],
+        start_date: date,
+        end_date: date
+    ) -> CollectionRunPlan:
+        """collect_historical_insights.py の見積もり（INSIGHTS_MAX_RANGE_DAYS ごとに1回）"""
+        plan = self._new_plan("account_insights", start_date, end_date)
+        quota_remaining = await self._get_quota_remaining()
+        days = (end_date - start_date).days + 1
+        windows = math.ceil(days / instagram_config.INSIGHTS_MAX_RANGE_DAYS)
+
+        for instagram_user_id in instagram_user_ids:
+            account_plan = AccountRunPlan(instagram_user_id=instagram_user_id)
+            plan.accounts.append(account_plan)
+
+            account = await self.account_repo.get_by_instagram_user_id(instagram_user_id)
+            if not account:
+                account_plan.error = "Account not found"
+                continue
+            account_plan.username = account.username
+            account_plan.quota_remaining = quota_remaining.get(token_fingerprint(account.access_token_encrypted))
+            account_plan.existing_rows = len(
+                await self.daily_stats_repo.get_by_date_range(account.id, start_date, end_date)
+            )
+            account_plan.phases.append(PhaseEstimate(name="insights windows", api_calls=windows))
+
+        self._add_suggestions(plan)
+        return plan
+
+    def _new_plan(self, operation: str, start_date: Optional[date], end_date: Optional[date]) -> CollectionRunPlan:
+        return CollectionRunPlan(
+            operation=operation,
+            start_date=start_date,
+            end_date=end_date,
+            token_hourly_budget=self.token_hourly_budget,
+            app_hourly_budget=self.app_hourly_budget
+        )
+
+    async def _get_media_count(self, account) -> int:
+        """保存済みの media_count（最新の日次統計）、なければ保存済み投稿数"""
+        latest_stats = await self.daily_stats_repo.get_latest_by_account(account.id)
+        if latest_stats and latest_stats.media_count:
+            return latest_stats.media_count
+        return await self.post_repo.count_by_account(account.id)
+
+    async def _estimate_posts_in_range(
+        self,
+        account,
+        media_count: int,
+        start_date: date,
+        end_date: date
+    ) -> Tuple[int, bool]:
+        """
+        期間内の投稿数（保存済み投稿の範囲外は保存済み期間の投稿頻度で推定）
+
+        Returns:
+            (投稿数, 推定を含むか)
+        """
+        stored_in_range = await self.post_repo.count_by_date_range(account.id, start_date, end_date)
+        stored_total = await self.post_repo.count_by_account(account.id)
+        oldest = await self.post_repo.get_oldest_posted_at(account.id)
+
+        if oldest is None:
+            # 保存済み投稿なし: 期間の投稿数は分からないため全投稿を上限とする
+            return media_count, True
+
+        oldest_date = oldest.date()
+        if oldest_date <= start_date:
+            return stored_in_range, False
+
+        stored_days = max((datetime.now().date() - oldest_date).days, 1)
+        uncovered_days = (min(end_date, oldest_date) - start_date).days
+        estimated = stored_in_range + round(stored_total / stored_days * max(uncovered_days, 0))
+        unstored = max(media_count - stored_total, 0)
+        return min(estimated, stored_in_range + unstored), True
+
+    async def _estimate_metrics_phase(self, account, posts_in_range: int, inline_insights: bool) -> PhaseEstimate:
+        """メトリクス取得フェーズ（インライン時は VIDEO/CAROUSEL の追加メトリクスのみ個別取得）"""
+        if inline_insights:
+            distribution = await self.post_repo.get_media_type_distribution(account.id)
+            total = sum(distribution.values())
+            extra = sum(
+                count for media_type, count in distribution.items()
+                if instagram_config.get_media_extra_metrics(media_type)
+            )
+            # 分布が分からない場合は全投稿を個別取得と見なす
+            share = extra / total if total else 1.0
+            calls = math.ceil(posts_in_range * share)
+        else:
+            calls = posts_in_range
+
+        chunks = math.ceil(posts_in_range / METRICS_CHUNK_SIZE)
+        return PhaseEstimate(
+            name="post metrics (inline)" if inline_insights else "post metrics",
+            api_calls=calls,
+            sleep_seconds=calls * METRICS_CALL_SLEEP_SECONDS + max(chunks - 1, 0) * METRICS_CHUNK_SLEEP_SECONDS
+        )
+
+    async def _get_quota_remaining(self) -> Dict[str, int]:
+        """現在のウィンドウのトークン別残り枠（台帳が使えない場合は空）"""
+        try:
+            rows = await ApiQuotaLedgerRepository(self.db).get_windows(current_window_start(), scope_prefix="token:")
+        except Exception as e:
+            logger.warning(f"API quota ledger unavailable, planning without current usage: {e}")
+            self.db.rollback()
+            return {}
+        return {row.scope_key.split(':', 1)[1]: row.calls_remaining for row in rows}
+
+    def _add_suggestions(self, plan: CollectionRunPlan) -> None:
+        """期間分割・並列実行の提案"""
+        budget = plan.token_hourly_budget
+        for account in plan.accounts:
+            if account.error or account.api_calls <= budget:
+                if account.quota_remaining is not None and account.api_calls > account.quota_remaining:
+                    plan.suggestions.append(
+                        f"@{account.username}: only {account.quota_remaining} calls left in the current hour "
+                        f"(needs {account.api_calls}) - start after the next window"
+                    )
+                continue
+
+            # 期間に比例しない呼び出し（投稿一覧・日次統計）は分割しても減らない
+            fixed = sum(phase.api_calls for phase in account.phases if phase.name in ("posts pages", "daily stats"))
+            variable = account.api_calls - fixed
+            if variable <= 0 or fixed >= budget:
+                plan.suggestions.append(
+                    f"@{account.username}: {account.api_calls} calls exceed the hourly budget ({budget}) "
+                    f"and cannot be split by date range - run --posts-only and --daily-stats-only in separate hours"
+                )
+                continue
+
+            chunks = math.ceil(variable / (budget - fixed))
+            if plan.start_date and plan.end_date:
+                days = (plan.end_date - plan.start_date).days + 1
+                plan.suggestions.append(
+                    f"@{account.username}: {account.api_calls} calls exceed the hourly budget ({budget}) - "
+                    f"split into {chunks} runs of ~{math.ceil(days / chunks)} days, one per hour"
+                )
+
+        if len(plan.accounts) > 1 and plan.total_duration_seconds > 3600:
+            # アカウントごとにトークンが異なるため、アプリ全体の枠内で並列実行できる
+            shards = min(len(plan.accounts), math.ceil(plan.total_duration_seconds / 3600))
+            hourly_calls = plan.total_api_calls / max(plan.total_duration_seconds / 3600, 1) * shards
+            if hourly_calls > plan.app_hourly_budget:
+                shards = max(int(shards * plan.app_hourly_budget / hourly_calls), 1)
+            if shards > 1:
+                plan.suggestions.append(
+                    f"Sequential run takes ~{plan.total_duration_seconds / 3600:.1f}h - "
+                    f"run {shards} processes in parallel with disjoint --account lists"
+                )
+
+
+def format_run_plan(plan: CollectionRunPlan) -> str:
+    """実行計画の表示用テキスト"""
+    lines = [
+        "=" * 60,
+        f"🧮 RUN PLAN ({plan.operation})",
+        "=" * 60,
+    ]
+    if plan.start_date and plan.end_date:
+        lines.append(f"📅 Period: {plan.start_date} - {plan.end_date} ({(plan.end_date - plan.start_date).days + 1} days)")
+    lines.append(f"🎯 Accounts: {len(plan.accounts)}")
+
+    for account in plan.accounts:
+        name = f"@{account.username}" if account.username else account.instagram_user_id
+        if account.error:
+            lines.append(f"   ❌ {name}: {account.error}")
+            continue
+        if plan.operation == "account_insights":
+            lines.append(f"   {name}: existing_rows={account.existing_rows}")
+        else:
+            posts = f"~{account.posts_in_range}" if account.posts_estimated else str(account.posts_in_range)
+            lines.append(
+                f"   {name}: media_count={account.media_count} posts_in_range={posts} "
+                f"existing_rows={account.existing_rows}"
+            )
+        for phase in account.phases:
+            lines.append(
+                f"      - {phase.name:<22} {phase.api_calls:>6} calls  ~{phase.duration_seconds / 60:6.1f} min"
+            )
+        quota = f" (current hour remaining: {account.quota_remaining})" if account.quota_remaining is not None else ""
+        lines.append(f"      = {account.api_calls} calls / {plan.token_hourly_budget} per hour{quota}")
+
+    lines.extend([
+        f"📞 Total API calls: {plan.total_api_calls} (app budget {plan.app_hourly_budget}/h)",
+        f"🕐 Hour windows needed: {plan.hour_windows_needed}",
+        f"⏱️ Expected duration: ~{plan.expected_duration_seconds / 60:.1f} min "
+        f"(sequential work ~{plan.total_duration_seconds / 60:.1f} min)",
+    ])
+    if plan.suggestions:
+        lines.append("💡 Suggestions:")
+        lines.extend(f"   {suggestion}" for suggestion in plan.suggestions)
+    lines.append("=" * 60)
+    return "\n".join(lines)
@@ -0,0 +1,67 @@
+"""
+Collection Schedule
+常駐スケジューラーで実行する収集ジョブの実行時刻
+
+GitHub Actions の schedule（cron）と同じ時刻で実行する。
+デーモン（scripts/github_actions/scheduler_daemon.py）が実行に使い、
+API（/api/v1/scheduler/status）が次回予定時刻の表示に使う。
+"""
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+JST = timezone(timedelta(hours=9))
+
+JOB_NEW_POSTS = "new_posts"
+JOB_DAILY_INSIGHTS = "daily_insights"
+JOB_METRICS_REFRESH = "metrics_refresh"
+
+
+@dataclass(frozen=True)
+class ScheduledJob:
+    """
+    収集ジョブの実行時刻
+
+    daily_times（JST の時刻）か hourly_minute（毎時の分）のどちらかを指定する。
+    """
+    name: str
+    description: str
+    daily_times: Tuple[time, ...] = ()
+    hourly_minute: Optional[int] = None
+
+    def next_run_after(self, after: datetime) -> datetime:
+        """after より後の最初の実行時刻（タイムゾーン付き）"""
+        if after.tzinfo is None:
+            after = after.replace(tzinfo=timezone.utc)
+
+        if self.hourly_minute is not None:
+            candidate = after.replace(minute=self.hourly_minute, second=0, microsecond=0)
+            if candidate <= after:
+                candidate += timedelta(hours=1)
+            return candidate
+
+        local = after.astimezone(JST)
+        for days in (0, 1):
+            day = local.date() + timedelta(days=days)
+            for run_time in sorted(self.daily_times):
+                candidate = datetime.combine(day, run_time, tzinfo=JST)
+                if candidate > local:
+                    return candidate
+        raise ValueError(f"Schedule {self.name} has no run times")
+
+
+# .github/workflows の cron と同じ時刻
+SCHEDULED_JOBS: Dict[str, ScheduledJob] = {
+    JOB_NEW_POSTS: ScheduledJob(
+        JOB_NEW_POSTS, "新規投稿の検出・収集 (new-posts-detection.yml)",
+        daily_times=(time(6, 0), time(18, 0))
+    ),
+    JOB_DAILY_INSIGHTS: ScheduledJob(
+        JOB_DAILY_INSIGHTS, "アカウント日次統計の収集 (daily-account-insights.yml)",
+        daily_times=(time(9, 0),)
+    ),
+    JOB_METRICS_REFRESH: ScheduledJob(
+        JOB_METRICS_REFRESH, "投稿メトリクスの再取得 (metrics-refresh.yml)",
+        hourly_minute=15
+    ),
+}
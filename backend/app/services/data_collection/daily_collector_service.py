@@ -385,7 +385,9 @@ class DailyCollectorService:
                 return await api_client.get_post_insights(
                     post_data.get('id'),
                     access_token,
-                    post_data.get('media_type', 'IMAGE')
+                    post_data.get('media_type', 'IMAGE'),
+                    media_product_type=post_data.get('media_product_type'),
+                    posted_at=post_data.get('timestamp')
                 )
         except Exception as e:
             logger.warning(f"Failed to collect post metrics for {post_data.get('id')}: {str(e)}")
@@ -0,0 +1,72 @@
+"""
+Historical Collection Checkpoint Store
+過去データ収集のチェックポイント（再開用の状態ファイル）管理
+
+チャンク処理ごとにページネーションカーソル・最終処理チャンク・
+処理済み投稿IDを状態ファイルへ書き出し、中断した収集を途中から再開できるようにする。
+"""
+import json
+import logging
+import os
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# ログ設定
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_DIR = (
+    Path(__file__).parent.parent.parent.parent / "data" / "execution_state" / "historical_checkpoints"
+)
+
+
+class HistoricalCheckpointStore:
+    """過去データ収集チェックポイントの保存先（JSON 状態ファイル）"""
+
+    def __init__(self, checkpoint_dir: Optional[Path] = None):
+        self.checkpoint_dir = checkpoint_dir or DEFAULT_CHECKPOINT_DIR
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(
+        account_id: str,
+        collection_type: str,
+        start_date: Optional[date],
+        end_date: Optional[date]
+    ) -> str:
+        """アカウント・収集種別・期間からチェックポイントキーを生成"""
+        start = start_date.isoformat() if start_date else "all"
+        end = end_date.isoformat() if end_date else "latest"
+        return f"{account_id}_{collection_type}_{start}_{end}"
+
+    def _path(self, key: str) -> Path:
+        return self.checkpoint_dir / f"{key}.json"
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """チェックポイント読み込み（存在しない場合は None）"""
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load checkpoint {path}: {e}")
+            return None
+
+    def save(self, key: str, checkpoint: Dict[str, Any]) -> None:
+        """チェックポイント保存（一時ファイル経由で置き換え、書き込み途中の破損を防ぐ）"""
+        checkpoint['updated_at'] = datetime.now().isoformat()
+        path = self._path(key)
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, indent=2, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+        logger.debug(f"Checkpoint saved: {path}")
+
+    def clear(self, key: str) -> None:
+        """チェックポイント削除（収集完了時）"""
+        path = self._path(key)
+        if path.exists():
+            path.unlink()
+            logger.info(f"Checkpoint cleared: {path}")
@@ -5,7 +5,7 @@ Historical Data Collection Service
 import asyncio
 import logging
 from datetime import date, datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass
 import json
 
@@ -13,8 +13,13 @@ from ...core.database import get_db_sync
 from ...repositories.instagram_account_repository import InstagramAccountRepository
 from ...repositories.instagram_post_repository import InstagramPostRepository
 from ...repositories.instagram_post_metrics_repository import InstagramPostMetricsRepository
+from ...repositories.failed_collection_item_repository import (
+    FailedCollectionItemRepository,
+    ITEM_TYPE_POST_METRICS,
+)
 from .instagram_api_client import InstagramAPIClient, InstagramAPIError
 from .data_aggregator_service import DataAggregatorService
+from .historical_checkpoint import HistoricalCheckpointStore
 
 # ログ設定
 logger = logging.getLogger(__name__)
@@ -47,6 +52,9 @@ class PostCollectionStats:
     failed_posts: int = 0
     metrics_collected: int = 0
     metrics_failed: int = 0
+    inline_metrics: int = 0  # フィールド展開で投稿と同時に取得したメトリクス数
+    retry_attempts: int = 0  # 再試行キューから取り直した投稿数
+    metrics_retried: int = 0  # 再試行キューから再取得できたメトリクス数
 
 class HistoricalCollectorService:
     """過去データ収集サービス"""
@@ -57,7 +65,9 @@ class HistoricalCollectorService:
         self.account_repo = None
         self.post_repo = None
         self.post_metrics_repo = None
+        self.retry_repo = None
         self.aggregator = DataAggregatorService()
+        self.checkpoint_store = HistoricalCheckpointStore()
     
     def _init_repositories(self):
         """リポジトリ初期化"""
@@ -66,6 +76,7 @@ class HistoricalCollectorService:
             self.account_repo = InstagramAccountRepository(self.db)
             self.post_repo = InstagramPostRepository(self.db)
             self.post_metrics_repo = InstagramPostMetricsRepository(self.db)
+            self.retry_repo = FailedCollectionItemRepository(self.db)
             logger.info("Historical collector repositories initialized")
     
     async def collect_historical_posts(
@@ -75,11 +86,20 @@ class HistoricalCollectorService:
         end_date: Optional[date] = None,
         max_posts: Optional[int] = None,
         include_metrics: bool = True,
-        chunk_size: int = 100
+        chunk_size: int = 100,
+        resume: bool = False,
+        inline_insights: bool = True
     ) -> HistoricalCollectionResult:
         """
         過去投稿データの一括収集
         
+        ページ単位で投稿を取得しながらチャンク処理し、チャンクごとに
+        チェックポイント（カーソル・最終チャンク・処理済み投稿ID）を保存する。
+        
+        inline_insights の場合は media{insights.metric(...)} のフィールド展開で
+        投稿とメトリクスを同じページで取得し、投稿ごとのインサイト取得を省略する
+        （タイプ固有メトリクスのみ VIDEO / CAROUSEL_ALBUM で個別取得）。
+        
         Args:
             account_id: アカウントID (instagram_user_id)
             start_date: 開始日付（未指定時は制限なし）
@@ -87,12 +107,17 @@ class HistoricalCollectorService:
             max_posts: 最大投稿数
             include_metrics: メトリクス取得フラグ
             chunk_size: バッチサイズ
+            resume: 前回のチェックポイントから再開
+            inline_insights: メトリクスを投稿一覧と同時に取得（include_metrics 時のみ）
             
         Returns:
             HistoricalCollectionResult: 収集結果
         """
         started_at = datetime.now()
+        inline_insights = inline_insights and include_metrics
         collection_type = "both" if include_metrics else "posts"
+        checkpoint_key = self.checkpoint_store.make_key(account_id, collection_type, start_date, end_date)
+        checkpoint = None
         
         logger.info(f"Starting historical collection for account: {account_id}")
         logger.info(f"  Date range: {start_date} to {end_date}")
@@ -107,63 +132,145 @@ class HistoricalCollectorService:
             if not account:
                 raise ValueError(f"Account not found: {account_id}")
             
+            # チェックポイント読み込み
+            checkpoint = self.checkpoint_store.load(checkpoint_key) if resume else None
+            if checkpoint:
+                logger.info(
+                    f"Resuming from checkpoint: {checkpoint['pages_completed']} pages completed, "
+                    f"{len(checkpoint['completed_post_ids'])} posts done"
+                )
+            else:
+                if resume:
+                    logger.info("No checkpoint found - starting from the first page")
+                checkpoint = {
+                    'account_id': account_id,
+                    'collection_type': collection_type,
+                    'start_date': start_date,
+                    'end_date': end_date,
+                    'after_cursor': None,  # 処理中ページの取得カーソル
+                    'pages_completed': 0,
+                    'last_chunk': None,
+                    'completed_post_ids': []
+                }
+            completed_post_ids = set(checkpoint['completed_post_ids'])
+            
             stats = PostCollectionStats()
+            total_posts = 0
+            fetch_error = None
             
             async with InstagramAPIClient() as api_client:
-                # 全投稿データ取得
-                logger.info("Fetching all posts from Instagram API...")
-                all_posts = await self._fetch_all_posts(
-                    api_client, 
-                    account_id, 
-                    account.access_token_encrypted
-                )
-                
-                stats.total_api_calls += 1
-                logger.info(f"Retrieved {len(all_posts)} posts from API")
-                
-                # 日付フィルタリング
-                filtered_posts = self._filter_posts_by_date(
-                    all_posts, 
-                    start_date, 
-                    end_date
-                )
-                
-                # 最大数制限
-                if max_posts and len(filtered_posts) > max_posts:
-                    filtered_posts = filtered_posts[:max_posts]
+                # 前回までに失敗した投稿メトリクスを先に再取得
+                if include_metrics:
+                    await self._retry_failed_metrics(api_client, account, stats)
                 
-                logger.info(f"Processing {len(filtered_posts)} posts after filtering")
+                logger.info("Fetching posts from Instagram API page by page...")
                 
-                # バッチ処理
-                total_posts = len(filtered_posts)
-                for i in range(0, total_posts, chunk_size):
-                    chunk = filtered_posts[i:i + chunk_size]
-                    chunk_start = i + 1
-                    chunk_end = min(i + chunk_size, total_posts)
+                while True:
+                    page_number = checkpoint['pages_completed'] + 1
+                    try:
+                        if inline_insights:
+                            try:
+                                posts, next_cursor = await self._fetch_posts_page(
+                                    api_client,
+                                    account_id,
+                                    account.access_token_encrypted,
+                                    checkpoint['after_cursor'],
+                                    inline_insights=True
+                                )
+                            except InstagramAPIError as e:
+                                # インサイトを取得できないメディアを含む場合はページ全体がエラーになるため、
+                                # 以降は投稿ごとの取得に切り替える
+                                logger.warning(
+                                    f"Inline insights failed on page {page_number}, "
+                                    f"falling back to per-post insights: {str(e)}"
+                                )
+                                stats.total_api_calls += 1
+                                inline_insights = False
+                        if not inline_insights:
+                            posts, next_cursor = await self._fetch_posts_page(
+                                api_client,
+                                account_id,
+                                account.access_token_encrypted,
+                                checkpoint['after_cursor']
+                            )
+                    except InstagramAPIError as e:
+                        # チェックポイントを残して中断（--resume で再開可能）
+                        logger.error(f"API error while fetching posts page {page_number}: {str(e)}")
+                        fetch_error = f"Failed to fetch posts page {page_number}: {str(e)}"
+                        break
                     
-                    logger.info(f"Processing batch {chunk_start}-{chunk_end}/{total_posts}")
+                    stats.total_api_calls += 1
                     
-                    # 投稿データ保存
-                    for post_data in chunk:
-                        try:
-                            await self._save_post_data(post_data, account.id, stats)
-                        except Exception as e:
-                            logger.error(f"Failed to save post {post_data.get('id')}: {str(e)}")
-                            stats.failed_posts += 1
+                    # 日付フィルタリング・処理済み投稿の除外
+                    filtered_posts = self._filter_posts_by_date(posts, start_date, end_date)
+                    pending_posts = [p for p in filtered_posts if p.get('id') not in completed_post_ids]
+                    stats.skipped_posts += len(filtered_posts) - len(pending_posts)
                     
-                    # メトリクス収集（オプション）
-                    if include_metrics:
-                        await self._collect_chunk_metrics(
-                            api_client,
-                            chunk,
-                            account.access_token_encrypted,
-                            stats
+                    # 最大数制限
+                    if max_posts is not None:
+                        pending_posts = pending_posts[:max(0, max_posts - len(completed_post_ids))]
+                    total_posts += len(pending_posts)
+                    
+                    # バッチ処理
+                    for i in range(0, len(pending_posts), chunk_size):
+                        chunk = pending_posts[i:i + chunk_size]
+                        logger.info(
+                            f"Processing page {page_number} batch {i + 1}-{i + len(chunk)}/{len(pending_posts)}"
                         )
+                        
+                        # 投稿データ保存
+                        saved_post_ids = set()
+                        for post_data in chunk:
+                            try:
+                                await self._save_post_data(post_data, account.id, stats)
+                                saved_post_ids.add(post_data.get('id'))
+                            except Exception as e:
+                                logger.error(f"Failed to save post {post_data.get('id')}: {str(e)}")
+                        
+                        # メトリクス収集（オプション）
+                        if include_metrics:
+                            done_post_ids = await self._collect_chunk_metrics(
+                                api_client,
+                                [p for p in chunk if p.get('id') in saved_post_ids],
+                                account.access_token_encrypted,
+                                stats,
+                                account_id=account.id
+                            )
+                        else:
+                            done_post_ids = saved_post_ids
+                        
+                        # チャンク単位のチェックポイント保存
+                        completed_post_ids.update(done_post_ids)
+                        checkpoint['completed_post_ids'] = sorted(completed_post_ids)
+                        checkpoint['last_chunk'] = {'page': page_number, 'offset': i, 'size': len(chunk)}
+                        self.checkpoint_store.save(checkpoint_key, checkpoint)
+                        
+                        # レート制限対応：チャンク間の待機
+                        if i + chunk_size < len(pending_posts):
+                            logger.debug("Waiting between chunks to respect rate limits...")
+                            await asyncio.sleep(2)  # 2秒待機
+                    
+                    # ページ完了：カーソルを進める
+                    checkpoint['after_cursor'] = next_cursor
+                    checkpoint['pages_completed'] = page_number
+                    self.checkpoint_store.save(checkpoint_key, checkpoint)
                     
-                    # レート制限対応：チャンク間の待機
-                    if i + chunk_size < total_posts:
-                        logger.debug("Waiting between chunks to respect rate limits...")
-                        await asyncio.sleep(2)  # 2秒待機
+                    reached_limit = max_posts is not None and len(completed_post_ids) >= max_posts
+                    if not next_cursor or reached_limit:
+                        logger.info(f"All posts retrieved - Total pages: {page_number}")
+                        break
+                    
+                    # 投稿一覧は新しい順のため、開始日より前の投稿に達したら以降のページは不要
+                    if self._page_reaches_before(posts, start_date):
+                        logger.info(f"Reached posts before {start_date} - Total pages: {page_number}")
+                        break
+                    
+                    # レート制限対応
+                    await asyncio.sleep(1)
+            
+            # 正常完了時はチェックポイントを削除
+            if fetch_error is None:
+                self.checkpoint_store.clear(checkpoint_key)
             
             completed_at = datetime.now()
             duration = (completed_at - started_at).total_seconds()
@@ -175,19 +282,23 @@ class HistoricalCollectorService:
                 start_date=start_date,
                 end_date=end_date,
                 total_items=total_posts,
-                processed_items=stats.new_posts + stats.updated_posts + stats.skipped_posts,
+                processed_items=stats.new_posts + stats.updated_posts + stats.failed_posts,
                 success_items=stats.new_posts + stats.updated_posts,
                 failed_items=stats.failed_posts,
                 duration_seconds=duration,
                 started_at=started_at,
-                completed_at=completed_at
+                completed_at=completed_at,
+                error_message=fetch_error,
+                checkpoint_data=checkpoint
             )
             
             logger.info(f"Historical collection completed:")
             logger.info(f"  Processed: {result.processed_items}/{result.total_items}")
             logger.info(f"  New posts: {stats.new_posts}")
             logger.info(f"  Updated posts: {stats.updated_posts}")
-            logger.info(f"  Metrics collected: {stats.metrics_collected}")
+            logger.info(f"  Skipped (already done): {stats.skipped_posts}")
+            logger.info(f"  Metrics collected: {stats.metrics_collected} (inline: {stats.inline_metrics}, retried: {stats.metrics_retried})")
+            logger.info(f"  API calls: {stats.total_api_calls}")
             logger.info(f"  Duration: {duration:.2f}s")
             
             return result
@@ -208,7 +319,8 @@ class HistoricalCollectorService:
                 duration_seconds=(datetime.now() - started_at).total_seconds(),
                 started_at=started_at,
                 completed_at=datetime.now(),
-                error_message=str(e)
+                error_message=str(e),
+                checkpoint_data=checkpoint
             )
         finally:
             # リソース解放
@@ -216,67 +328,65 @@ class HistoricalCollectorService:
                 self.db.close()
                 logger.debug("Database session closed")
     
-    async def _fetch_all_posts(
+    async def _fetch_posts_page(
         self,
         api_client: InstagramAPIClient,
         instagram_user_id: str,
-        access_token: str
-    ) -> List[Dict[str, Any]]:
+        access_token: str,
+        after_cursor: Optional[str] = None,
+        inline_insights: bool = False
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """
-        Instagram APIから全投稿を取得
+        Instagram APIから投稿を1ページ取得
+        
+        paging.next のURLはアクセストークンを含むため、チェックポイントには
+        カーソル（paging.cursors.after）のみを保存してURLを組み立て直す。
         
         Args:
             api_client: Instagram API クライアント
             instagram_user_id: Instagram User ID
             access_token: アクセストークン
+            after_cursor: ページネーションカーソル（初回は None）
+            inline_insights: 共通メトリクスを各投稿の insights に展開して取得
             
         Returns:
-            List[Dict[str, Any]]: 全投稿データ
+            Tuple[List[Dict[str, Any]], Optional[str]]: 投稿データと次ページのカーソル（最終ページは None）
         """
         url = api_client.config.get_user_media_url(instagram_user_id)
-        all_posts = []
-        next_url = None
-        page_count = 0
+        fields = (
+            api_client.config.get_media_fields_with_insights()
+            if inline_insights else api_client.config.get_media_fields()
+        )
+        params = {
+            'fields': fields,
+            'access_token': access_token,
+            'limit': 100  # 最大値
+        }
+        if after_cursor:
+            params['after'] = after_cursor
         
-        while True:
-            page_count += 1
-            logger.debug(f"Fetching posts page {page_count}")
-            
-            params = {
-                'fields': api_client.config.get_media_fields(),
-                'access_token': access_token,
-                'limit': 100  # 最大値
-            }
-            
-            try:
-                if next_url:
-                    # ページネーション
-                    response = await api_client._make_request(next_url, {})
-                else:
-                    # 初回リクエスト
-                    response = await api_client._make_request(url, params)
-                
-                posts = response.get('data', [])
-                all_posts.extend(posts)
-                
-                logger.debug(f"Page {page_count}: {len(posts)} posts retrieved")
-                
-                # 次ページの確認
-                paging = response.get('paging', {})
-                next_url = paging.get('next')
-                
-                if not next_url:
-                    logger.info(f"All posts retrieved - Total pages: {page_count}, Total posts: {len(all_posts)}")
-                    break
-                
-                # レート制限対応
-                await asyncio.sleep(1)
-                
-            except InstagramAPIError as e:
-                logger.error(f"API error while fetching posts page {page_count}: {str(e)}")
-                break
+        response = await api_client._make_request(url, params)
+        posts = response.get('data', [])
+        
+        paging = response.get('paging', {})
+        next_cursor = paging.get('cursors', {}).get('after') if paging.get('next') else None
         
-        return all_posts
+        logger.debug(f"Posts page retrieved: {len(posts)} posts, has next: {next_cursor is not None}")
+        return posts, next_cursor
+    
+    def _page_reaches_before(self, posts: List[Dict[str, Any]], start_date: Optional[date]) -> bool:
+        """ページ内の最も古い投稿が開始日より前か（開始日未指定時は False）"""
+        if not start_date:
+            return False
+        for post in reversed(posts):
+            timestamp_str = post.get('timestamp', '')
+            if not timestamp_str:
+                continue
+            try:
+                return datetime.fromisoformat(timestamp_str.replace('Z', '+00:00')).date() < start_date
+            except ValueError:
+                continue
+        return False
     
     def _filter_posts_by_date(
         self,
@@ -367,32 +477,63 @@ class HistoricalCollectorService:
         api_client: InstagramAPIClient,
         chunk: List[Dict[str, Any]],
         access_token: str,
-        stats: PostCollectionStats
-    ):
+        stats: PostCollectionStats,
+        account_id: Optional[str] = None
+    ) -> Set[str]:
         """
         チャンク内投稿のメトリクス収集
         
+        フィールド展開で insights を取得済みの投稿は API 呼び出しなし
+        （VIDEO / CAROUSEL_ALBUM はタイプ固有メトリクスのみ追加で取得）
+        失敗した投稿は再試行キューに登録し、次回以降の実行で再取得する。
+        
         Args:
             api_client: Instagram API クライアント
             chunk: 投稿データチャンク
             access_token: アクセストークン
             stats: 統計情報
+            account_id: アカウントID（再試行キュー登録用）
+            
+        Returns:
+            Set[str]: メトリクス収集が完了した投稿ID
         """
         logger.debug(f"Collecting metrics for {len(chunk)} posts")
+        done_post_ids = set()
         
         for post_data in chunk:
             post_id = post_data.get('id')
             media_type = post_data.get('media_type', 'IMAGE')
             
             try:
-                # 投稿メトリクス取得
-                metrics = await api_client.get_post_insights(
-                    post_id,
-                    access_token,
-                    media_type
-                )
-                
-                stats.total_api_calls += 1
+                called_api = False
+                if 'insights' in post_data:
+                    # フィールド展開で取得済みの共通メトリクス
+                    metrics = api_client.parse_insights(post_data['insights'])
+                    stats.inline_metrics += 1
+                    
+                    extra_metrics = api_client.config.get_media_extra_metrics(media_type)
+                    if extra_metrics:
+                        metrics.update(await api_client.get_post_insights(
+                            post_id,
+                            access_token,
+                            media_type,
+                            metrics=extra_metrics,
+                            media_product_type=post_data.get('media_product_type'),
+                            posted_at=post_data.get('timestamp')
+                        ))
+                        stats.total_api_calls += 1
+                        called_api = True
+                else:
+                    # 投稿メトリクス取得
+                    metrics = await api_client.get_post_insights(
+                        post_id,
+                        access_token,
+                        media_type,
+                        media_product_type=post_data.get('media_product_type'),
+                        posted_at=post_data.get('timestamp')
+                    )
+                    stats.total_api_calls += 1
+                    called_api = True
                 
                 if metrics:
                     # データベース投稿取得
@@ -410,12 +551,116 @@ class HistoricalCollectorService:
                         stats.metrics_collected += 1
                         logger.debug(f"Saved metrics for post: {post_id}")
                 
+                done_post_ids.add(post_id)
+                
                 # API呼び出し間隔
-                await asyncio.sleep(0.5)
+                if called_api:
+                    await asyncio.sleep(0.5)
                 
             except Exception as e:
                 logger.warning(f"Failed to collect metrics for post {post_id}: {str(e)}")
                 stats.metrics_failed += 1
+                await self._record_failed_metrics(post_id, account_id, media_type, str(e))
+        
+        # 再試行キューに残っていた投稿が通常の収集で取得できた場合は解消
+        await self._resolve_failed_metrics(done_post_ids)
+        return done_post_ids
+    
+    async def _retry_failed_metrics(
+        self,
+        api_client: InstagramAPIClient,
+        account,
+        stats: PostCollectionStats
+    ) -> Set[str]:
+        """
+        再試行キューの投稿メトリクス再取得（次回試行時刻を過ぎたもののみ）
+        
+        失敗した項目だけを取り直すため、再収集のコストは失敗件数に比例する。
+        再度失敗した項目は attempts を加算してバックオフを延ばす。
+        
+        Returns:
+            Set[str]: 再取得できた（キューから削除した）投稿ID
+        """
+        due_items = [
+            (item.item_key, dict(item.payload or {}))
+            for item in await self.retry_repo.get_due(ITEM_TYPE_POST_METRICS, account_id=account.id)
+        ]
+        if not due_items:
+            return set()
+        
+        logger.info(f"Retrying {len(due_items)} queued post metrics")
+        stats.retry_attempts += len(due_items)
+        resolved_post_ids = set()
+        
+        for post_id, payload in due_items:
+            media_type = payload.get('media_type', 'IMAGE')
+            try:
+                db_post = await self.post_repo.get_by_instagram_post_id(post_id)
+                if not db_post:
+                    # 投稿自体が削除済み
+                    resolved_post_ids.add(post_id)
+                    continue
+                
+                metrics = await api_client.get_post_insights(
+                    post_id,
+                    account.access_token_encrypted,
+                    db_post.media_type or media_type,
+                    posted_at=db_post.posted_at
+                )
+                stats.total_api_calls += 1
+                
+                if metrics:
+                    metrics_date = (
+                        date.fromisoformat(payload['metrics_date'])
+                        if payload.get('metrics_date') else datetime.now().date()
+                    )
+                    metrics_data = self.aggregator.extract_post_metrics(post_id, metrics, metrics_date)
+                    metrics_data['post_id'] = db_post.id
+                    await self.post_metrics_repo.create_or_update_daily(metrics_data)
+                    stats.metrics_collected += 1
+                    stats.metrics_retried += 1
+                
+                resolved_post_ids.add(post_id)
+                await asyncio.sleep(0.5)
+                
+            except Exception as e:
+                logger.warning(f"Retry failed for post metrics {post_id}: {str(e)}")
+                stats.metrics_failed += 1
+                await self._record_failed_metrics(
+                    post_id, account.id, media_type, str(e), payload.get('metrics_date')
+                )
+        
+        await self._resolve_failed_metrics(resolved_post_ids)
+        logger.info(f"Queued post metrics retried: {len(resolved_post_ids)}/{len(due_items)} resolved")
+        return resolved_post_ids
+    
+    async def _record_failed_metrics(
+        self,
+        post_id: str,
+        account_id: Optional[str],
+        media_type: str,
+        reason: str,
+        metrics_date: Optional[str] = None
+    ):
+        """メトリクス取得失敗を再試行キューに登録（キューへの書き込み失敗は収集を止めない）"""
+        payload = {'media_type': media_type}
+        if metrics_date:
+            payload['metrics_date'] = metrics_date
+        try:
+            await self.retry_repo.record_failure(
+                ITEM_TYPE_POST_METRICS, post_id, reason, account_id=account_id, payload=payload
+            )
+        except Exception as e:
+            logger.warning(f"Failed to queue post metrics retry for {post_id}: {str(e)}")
+            self.db.rollback()
+    
+    async def _resolve_failed_metrics(self, post_ids: Set[str]):
+        """取得できた投稿を再試行キューから削除"""
+        try:
+            await self.retry_repo.resolve(ITEM_TYPE_POST_METRICS, post_ids)
+        except Exception as e:
+            logger.warning(f"Failed to resolve queued post metrics: {str(e)}")
+            self.db.rollback()
     
     async def collect_missing_metrics(
         self,
@@ -443,25 +688,34 @@ class HistoricalCollectorService:
             if not account:
                 raise ValueError(f"Account not found: {account_id}")
             
-            # メトリクス未取得の投稿を検索
-            cutoff_date = datetime.now() - timedelta(days=days_back)
-            posts = await self.post_repo.get_posts_without_metrics(
-                account.id, 
-                cutoff_date.date()
-            )
-            
-            logger.info(f"Found {len(posts)} posts without metrics")
-            
             stats = PostCollectionStats()
+            cutoff_date = datetime.now() - timedelta(days=days_back)
             
             async with InstagramAPIClient() as api_client:
+                # 再試行キューの投稿を先に処理
+                retried_post_ids = await self._retry_failed_metrics(api_client, account, stats)
+                
+                # メトリクス未取得の投稿を検索（キューに残っている＝バックオフ中の投稿は除外）
+                queued_post_ids = set(await self.retry_repo.get_queued_keys(ITEM_TYPE_POST_METRICS, account.id))
+                posts = [
+                    post for post in await self.post_repo.get_posts_without_metrics(account.id, cutoff_date.date())
+                    if post.instagram_post_id not in queued_post_ids
+                    and post.instagram_post_id not in retried_post_ids
+                ]
+                
+                logger.info(
+                    f"Found {len(posts)} posts without metrics "
+                    f"({len(queued_post_ids)} waiting in retry queue)"
+                )
+                
                 for post in posts:
                     try:
                         # 投稿メトリクス取得
                         metrics = await api_client.get_post_insights(
                             post.instagram_post_id,
                             account.access_token_encrypted,
-                            post.media_type
+                            post.media_type,
+                            posted_at=post.posted_at
                         )
                         
                         stats.total_api_calls += 1
@@ -484,6 +738,13 @@ class HistoricalCollectorService:
                     except Exception as e:
                         logger.error(f"Failed to collect metrics for post {post.instagram_post_id}: {str(e)}")
                         stats.metrics_failed += 1
+                        await self._record_failed_metrics(
+                            post.instagram_post_id,
+                            account.id,
+                            post.media_type,
+                            str(e),
+                            post.posted_at.date().isoformat()
+                        )
             
             completed_at = datetime.now()
             duration = (completed_at - started_at).total_seconds()
@@ -494,7 +755,7 @@ class HistoricalCollectorService:
                 collection_type="metrics",
                 start_date=cutoff_date.date(),
                 end_date=datetime.now().date(),
-                total_items=len(posts),
+                total_items=len(posts) + stats.retry_attempts,
                 processed_items=stats.metrics_collected + stats.metrics_failed,
                 success_items=stats.metrics_collected,
                 failed_items=stats.metrics_failed,
@@ -504,7 +765,7 @@ class HistoricalCollectorService:
             )
             
             logger.info(f"Missing metrics collection completed:")
-            logger.info(f"  Metrics collected: {stats.metrics_collected}")
+            logger.info(f"  Metrics collected: {stats.metrics_collected} (retried: {stats.metrics_retried})")
             logger.info(f"  Failed: {stats.metrics_failed}")
             logger.info(f"  Duration: {duration:.2f}s")
             
@@ -6,12 +6,17 @@ verification/about-daily-stats の知見を活用した実装
 import aiohttp
 import asyncio
 import json
-from datetime import date, datetime
-from typing import Dict, Any, List, Optional
+import re
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, Optional, Union
 import logging
-from urllib.parse import urlencode
+from urllib.parse import parse_qs, urlencode, urlparse
 
 from ...core.instagram_config import instagram_config
+from ...core.metrics import record_graph_api_call
+from .api_quota_ledger import QuotaExhaustedError, api_quota_ledger, token_fingerprint
+from .metric_capability_cache import CapabilityKey, metric_capability_cache
 
 # ログ設定
 logger = logging.getLogger(__name__)
@@ -22,28 +27,144 @@ class InstagramAPIError(Exception):
         super().__init__(message)
         self.error_code = error_code
         self.error_data = error_data or {}
+    
+    @property
+    def error_subcode(self) -> Optional[int]:
+        return self.error_data.get('error_subcode')
+    
+    @property
+    def is_transient(self) -> bool:
+        """Graph API が一時的なエラーと示したか、ネットワーク・タイムアウトエラーか"""
+        return bool(self.error_data.get('is_transient')) or self.error_code in ('network', 'timeout')
+    
+    @property
+    def circuit_open(self) -> bool:
+        """サーキットブレーカーにより API を呼ばずに失敗したか"""
+        return bool(self.error_data.get('circuit_open'))
+
+
+class AuthCircuitBreaker:
+    """
+    トークン単位の認証エラー用サーキットブレーカー
+    
+    190/OAuth エラーが連続したトークンは一定時間 API を呼ばずに即座に失敗させる。
+    期限切れ等の回復しないサブコードは1回でオープンする。
+    クールダウン経過後は1回だけ試行を許可し（half-open）、成功すればクローズする。
+    """
+    
+    def __init__(self, failure_threshold: int, cooldown_seconds: int):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+    
+    @staticmethod
+    def key_for(access_token: Optional[str]) -> Optional[str]:
+        """トークンそのものは保持せずハッシュをキーにする"""
+        return token_fingerprint(access_token)
+    
+    def allow_request(self, key: Optional[str]) -> bool:
+        if key is None or key not in self._opened_at:
+            return True
+        if time.monotonic() - self._opened_at[key] >= self.cooldown_seconds:
+            # half-open: 次の1回の結果で判定する
+            self._opened_at[key] = time.monotonic()
+            return True
+        return False
+    
+    def record_success(self, key: Optional[str]):
+        if key is None:
+            return
+        self._failures.pop(key, None)
+        if self._opened_at.pop(key, None) is not None:
+            logger.info(f"Auth circuit closed for token {key}")
+    
+    def record_auth_failure(self, key: Optional[str], fatal: bool = False):
+        if key is None:
+            return
+        self._failures[key] = self._failures.get(key, 0) + 1
+        if fatal or self._failures[key] >= self.failure_threshold:
+            if key not in self._opened_at:
+                logger.warning(
+                    f"Auth circuit opened for token {key} after {self._failures[key]} failures "
+                    f"(cooldown {self.cooldown_seconds}s)"
+                )
+            self._opened_at[key] = time.monotonic()
+    
+    def is_open(self, access_token: Optional[str]) -> bool:
+        """指定トークンの回路がオープン中か（クールダウン中のみ True）"""
+        key = self.key_for(access_token)
+        return key in self._opened_at and time.monotonic() - self._opened_at[key] < self.cooldown_seconds
+    
+    def reset(self):
+        self._failures.clear()
+        self._opened_at.clear()
+
+
+# プロセス内で共有（コレクターは処理単位でクライアントを作り直すため）
+auth_circuit_breaker = AuthCircuitBreaker(
+    failure_threshold=instagram_config.AUTH_CIRCUIT_FAILURE_THRESHOLD,
+    cooldown_seconds=instagram_config.AUTH_CIRCUIT_COOLDOWN_SECONDS
+)
+
 
 class InstagramAPIClient:
     """Instagram Graph API クライアント"""
     
+    # 常駐プロセス（scheduler_daemon）で接続を使い回すための共有セッション
+    _shared_session: Optional[aiohttp.ClientSession] = None
+    
     def __init__(self):
         self.config = instagram_config
         self.session: Optional[aiohttp.ClientSession] = None
     
+    @classmethod
+    def _create_session(cls) -> aiohttp.ClientSession:
+        return aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=instagram_config.REQUEST_TIMEOUT_SECONDS),
+            headers=instagram_config.get_common_headers()
+        )
+    
+    @classmethod
+    def open_shared_session(cls) -> None:
+        """以降に作成するクライアントで共有するセッションを開く（同じイベントループ内でのみ使用可能）"""
+        if cls._shared_session is None or cls._shared_session.closed:
+            cls._shared_session = cls._create_session()
+            # 共有セッションを開いている間は呼び出し枠の予約を返却せず実行間で使い回す
+            api_quota_ledger.attach()
+            logger.info("Instagram API shared session opened")
+    
+    @classmethod
+    async def close_shared_session(cls) -> None:
+        """共有セッションを閉じる"""
+        if cls._shared_session is not None and not cls._shared_session.closed:
+            await cls._shared_session.close()
+            await api_quota_ledger.detach()
+            logger.info("Instagram API shared session closed")
+        cls._shared_session = None
+    
+    @property
+    def _owns_session(self) -> bool:
+        return self.session is not None and self.session is not InstagramAPIClient._shared_session
+    
     async def __aenter__(self):
         """非同期コンテキストマネージャー入口"""
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.config.REQUEST_TIMEOUT_SECONDS),
-            headers=self.config.get_common_headers()
-        )
-        logger.debug("Instagram API client session created")
+        shared = InstagramAPIClient._shared_session
+        if shared is not None and not shared.closed:
+            self.session = shared
+        else:
+            self.session = self._create_session()
+            logger.debug("Instagram API client session created")
+        api_quota_ledger.attach()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """非同期コンテキストマネージャー出口"""
-        if self.session:
+        if self._owns_session:
             await self.session.close()
             logger.debug("Instagram API client session closed")
+        # プロセス内で予約を使うクライアントがなくなったら、使わなかった呼び出し枠を他プロセスに返す
+        await api_quota_ledger.detach()
     
     async def _make_request(
         self, 
@@ -52,7 +173,13 @@ class InstagramAPIClient:
         method: str = "GET"
     ) -> Dict[str, Any]:
         """
-        API リクエストを実行
+        API リクエストを実行（エラーコードに応じたリトライ・認証エラーの遮断付き）
+        
+        - RETRY_ERROR_CODES / is_transient / ネットワークエラーは Full Jitter 付き指数バックオフで
+          最大 RETRY_MAX_ATTEMPTS 回まで試行（rate limit は RETRY_DELAY_BASE 基準で待機）
+        - 190/OAuth エラーはリトライせず、トークン単位のサーキットブレーカーに記録
+        - オープン中のトークンは API を呼ばずに InstagramAPIError を送出
+        - 各試行の前に api_quota_ledger からアプリ・トークンの呼び出し枠を予約
         
         Args:
             url: リクエストURL
@@ -65,17 +192,77 @@ class InstagramAPIClient:
         Raises:
             InstagramAPIError: API エラー時
         """
+        access_token = params.get('access_token')
+        if access_token is None:
+            # paging.next の URL はトークンをクエリに含む
+            access_token = (parse_qs(urlparse(url).query).get('access_token') or [None])[0]
+        circuit_key = auth_circuit_breaker.key_for(access_token)
+        
+        if not auth_circuit_breaker.allow_request(circuit_key):
+            raise InstagramAPIError(
+                "Instagram API error: skipped (auth circuit open after repeated token errors)",
+                error_code=190,
+                error_data={'circuit_open': True}
+            )
+        
+        max_attempts = max(self.config.RETRY_MAX_ATTEMPTS, 1)
+        for attempt in range(1, max_attempts + 1):
+            try:
+                await api_quota_ledger.acquire(access_token)
+            except QuotaExhaustedError as e:
+                raise InstagramAPIError(
+                    f"Instagram API error: {str(e)}",
+                    error_code="quota_exhausted",
+                    error_data={'retry_after_seconds': e.retry_after_seconds}
+                )
+            
+            try:
+                response_data = await self._send_request(url, params, method)
+                auth_circuit_breaker.record_success(circuit_key)
+                return response_data
+            
+            except InstagramAPIError as e:
+                if self.config.is_auth_error(e.error_code, e.error_subcode):
+                    auth_circuit_breaker.record_auth_failure(
+                        circuit_key,
+                        fatal=self.config.is_fatal_auth_error(e.error_code, e.error_subcode)
+                    )
+                    raise
+                
+                retryable = e.is_transient or self.config.is_retryable_error(e.error_code)
+                if not retryable or attempt == max_attempts:
+                    raise
+                
+                delay = self.config.get_request_retry_delay(attempt, e.error_code)
+                logger.warning(
+                    f"Retrying API request (attempt {attempt + 1}/{max_attempts}) in {delay:.1f}s "
+                    f"- code: {e.error_code}, subcode: {e.error_subcode}"
+                )
+                await asyncio.sleep(delay)
+    
+    async def _send_request(
+        self, 
+        url: str, 
+        params: Dict[str, Any],
+        method: str = "GET"
+    ) -> Dict[str, Any]:
+        """API リクエストを1回実行"""
         if not self.session:
             raise InstagramAPIError("API client session not initialized")
         
+        started = time.perf_counter()
+        error_code = None
+        response_headers = None
         try:
             logger.debug(f"Making {method} request to {url} with params: {list(params.keys())}")
             
             if method.upper() == "GET":
                 async with self.session.get(url, params=params) as response:
+                    response_headers = dict(response.headers)
                     response_data = await response.json()
             else:
                 async with self.session.request(method, url, params=params) as response:
+                    response_headers = dict(response.headers)
                     response_data = await response.json()
             
             # エラーレスポンスのチェック
@@ -84,7 +271,10 @@ class InstagramAPIClient:
                 error_code = error_info.get("code")
                 error_message = error_info.get("message", "Unknown API error")
                 
-                logger.error(f"Instagram API error - Code: {error_code}, Message: {error_message}")
+                logger.error(
+                    f"Instagram API error - Code: {error_code}, Subcode: {error_info.get('error_subcode')}, "
+                    f"Message: {error_message}"
+                )
                 raise InstagramAPIError(
                     f"Instagram API error: {error_message}",
                     error_code=error_code,
@@ -94,15 +284,80 @@ class InstagramAPIClient:
             logger.debug(f"API request successful - Response keys: {list(response_data.keys())}")
             return response_data
             
+        except InstagramAPIError:
+            raise
         except aiohttp.ClientError as e:
+            error_code = "network"
             logger.error(f"Network error during API request: {str(e)}")
-            raise InstagramAPIError(f"Network error: {str(e)}")
+            raise InstagramAPIError(f"Network error: {str(e)}", error_code=error_code)
+        except asyncio.TimeoutError:
+            error_code = "timeout"
+            logger.error(f"Timeout during API request to {url}")
+            raise InstagramAPIError("Request timeout", error_code=error_code)
         except json.JSONDecodeError as e:
+            error_code = "invalid_json"
             logger.error(f"JSON decode error: {str(e)}")
             raise InstagramAPIError(f"Invalid JSON response: {str(e)}")
         except Exception as e:
+            error_code = "unexpected"
             logger.error(f"Unexpected error during API request: {str(e)}")
             raise InstagramAPIError(f"Unexpected error: {str(e)}")
+        finally:
+            # Prometheus メトリクス（エンドポイント種別ごとの件数・レイテンシ・エラーコード）
+            record_graph_api_call(url, time.perf_counter() - started, error_code, response_headers)
+    
+    async def exchange_long_lived_token(self, access_token: str) -> Dict[str, Any]:
+        """
+        長期トークンの再発行（fb_exchange_token）
+        
+        Args:
+            access_token: 現在のアクセストークン（平文）
+            
+        Returns:
+            Dict[str, Any]: access_token / token_type / expires_in（無期限の場合は expires_in なし）
+        """
+        if not (self.config.facebook_app_id and self.config.facebook_app_secret):
+            raise InstagramAPIError("FACEBOOK_APP_ID and FACEBOOK_APP_SECRET are required for token exchange")
+        
+        url = f"{self.config.api_base_url}/oauth/access_token"
+        params = {
+            "grant_type": "fb_exchange_token",
+            "client_id": self.config.facebook_app_id,
+            "client_secret": self.config.facebook_app_secret,
+            "fb_exchange_token": access_token
+        }
+        
+        data = await self._make_request(url, params)
+        if not data.get("access_token"):
+            raise InstagramAPIError("Token exchange returned no access_token", error_data=data)
+        return data
+    
+    async def get_page_access_tokens(self, user_access_token: str) -> Dict[str, str]:
+        """
+        ユーザートークンから各ページのアクセストークンを再取得（me/accounts、ページネーション対応）
+        
+        Args:
+            user_access_token: 長期ユーザートークン（平文）
+            
+        Returns:
+            Dict[str, str]: Instagram User ID → ページアクセストークン（Instagram 未接続のページは含まない）
+        """
+        page_tokens: Dict[str, str] = {}
+        url = f"{self.config.api_base_url}/me/accounts"
+        params = {
+            "fields": "access_token,instagram_business_account{id}",
+            "limit": 100,
+            "access_token": user_access_token
+        }
+        while url:
+            data = await self._make_request(url, params)
+            for page in data.get("data", []):
+                instagram_account = page.get("instagram_business_account") or {}
+                if instagram_account.get("id") and page.get("access_token"):
+                    page_tokens[instagram_account["id"]] = page["access_token"]
+            # paging.next の URL はトークン・カーソルを含む
+            url, params = data.get("paging", {}).get("next"), {}
+        return page_tokens
     
     async def get_basic_account_data(
         self, 
@@ -201,7 +456,84 @@ class InstagramAPIClient:
             default_metrics = {metric: 0 for metric in available_metrics}
             logger.info(f"Returning default insights metrics: {default_metrics}")
             return default_metrics
-    
+
+    async def get_insights_metrics_range(
+        self,
+        instagram_user_id: str,
+        access_token: str,
+        since: date,
+        until: date
+    ) -> Dict[date, Dict[str, Any]]:
+        """
+        期間指定の Insights メトリクス取得（バックフィル用）
+
+        API が許す最大幅（INSIGHTS_MAX_RANGE_DAYS）ごとに1リクエストで取得し、
+        paging.next を辿って values 配列を日別に分解する。
+        values の end_time は集計期間の終了時刻のため、end_time の前日を対象日とする。
+
+        Args:
+            instagram_user_id: Instagram User ID
+            access_token: アクセストークン（平文）
+            since: 開始日付
+            until: 終了日付（含む）
+
+        Returns:
+            Dict[date, Dict[str, Any]]: 対象日 → メトリクス（値が返らなかった日は含まない）
+
+        Raises:
+            InstagramAPIError: API エラー時（get_insights_metrics と異なりデフォルト値で補完しない）
+        """
+        url = self.config.get_user_insights_url(instagram_user_id)
+        available_metrics = self.config.get_available_insights_metrics()["account_metrics"]
+        window_days = self.config.INSIGHTS_MAX_RANGE_DAYS
+
+        daily_metrics: Dict[date, Dict[str, Any]] = {}
+        window_start = since
+        while window_start <= until:
+            window_end = min(window_start + timedelta(days=window_days - 1), until)
+            params = {
+                'metric': ','.join(available_metrics),
+                'since': window_start.strftime('%Y-%m-%d'),
+                'until': (window_end + timedelta(days=1)).strftime('%Y-%m-%d'),
+                'period': 'day',
+                'access_token': access_token
+            }
+            logger.info(f"Fetching insights metrics for user: {instagram_user_id}, range: {window_start} - {window_end}")
+
+            page_url, page_params = url, params
+            while page_url:
+                data = await self._make_request(page_url, page_params)
+
+                new_values = 0
+                for metric_data in data.get('data', []):
+                    metric_name = metric_data.get('name')
+                    for value in metric_data.get('values', []):
+                        end_time = value.get('end_time')
+                        if not end_time:
+                            continue
+                        stats_date = (datetime.fromisoformat(end_time[:10]) - timedelta(days=1)).date()
+                        if not since <= stats_date <= until:
+                            continue
+                        day_metrics = daily_metrics.setdefault(stats_date, {})
+                        if metric_name not in day_metrics:
+                            new_values += 1
+                        day_metrics[metric_name] = value.get('value', 0)
+
+                # 次ページは期間外（until 以降）を指すこともあるため、
+                # ウィンドウ内に未取得の日が残り、かつ範囲内の値が増えた場合のみ辿る
+                window_complete = all(
+                    len(daily_metrics.get(window_start + timedelta(days=offset), {})) >= len(available_metrics)
+                    for offset in range((window_end - window_start).days + 1)
+                )
+                next_url = data.get('paging', {}).get('next')
+                follow_next = next_url and new_values and not window_complete
+                page_url, page_params = (next_url, {}) if follow_next else (None, None)
+
+            window_start = window_end + timedelta(days=1)
+
+        logger.info(f"Successfully fetched ranged insights metrics - {len(daily_metrics)} days retrieved")
+        return daily_metrics
+
     async def get_posts_for_date(
         self,
         instagram_user_id: str,
@@ -252,67 +584,192 @@ class InstagramAPIClient:
             logger.error(f"Failed to fetch posts for user {instagram_user_id}, date {target_date}: {str(e)}")
             # 投稿データ取得失敗時は空リストを返す
             return []
+
+    async def get_media(self, media_id: str, access_token: str) -> Dict[str, Any]:
+        """
+        投稿1件のデータ取得（Webhook で通知された投稿など）
+
+        Args:
+            media_id: Instagram Media ID
+            access_token: アクセストークン（平文）
+
+        Returns:
+            Dict[str, Any]: 投稿データ（get_media_fields のフィールド）
+        """
+        url = self.config.get_media_url(media_id)
+        params = {
+            'fields': self.config.get_media_fields(),
+            'access_token': access_token
+        }
+        return await self._make_request(url, params)
+
+    @staticmethod
+    def parse_insights(insights_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        インサイトレスポンス（{'data': [{'name', 'values': [{'value'}]}]}）をメトリクス辞書に変換
+        
+        /{media-id}/insights のレスポンスと、フィールド展開した media{insights} の両方に対応
+        """
+        metrics = {}
+        for metric_data in insights_data.get('data', []):
+            metric_name = metric_data.get('name')
+            values = metric_data.get('values', [])
+            if values:
+                metrics[metric_name] = values[0].get('value', 0)
+                logger.debug(f"Parsed post metric - {metric_name}: {metrics[metric_name]}")
+            else:
+                logger.warning(f"No values found for post metric: {metric_name}")
+                metrics[metric_name] = 0
+        return metrics
     
     async def get_post_insights(
         self,
         post_id: str,
         access_token: str,
-        media_type: str
+        media_type: str,
+        metrics: Optional[List[str]] = None,
+        media_product_type: Optional[str] = None,
+        posted_at: Optional[Union[datetime, str]] = None
     ) -> Dict[str, Any]:
         """
         投稿メトリクス取得
         
+        metric_capability_cache で未対応と学習済みのメトリクスは要求しない。
+        未対応メトリクスでエラーになった場合は、エラーから特定したメトリクスを除いて再要求する
+        （特定できない場合は1件ずつ確認する）。それ以外のエラーは既定値を返さずに送出する。
+        
         Args:
             post_id: 投稿ID
             access_token: アクセストークン（平文）
             media_type: メディアタイプ（VIDEO/CAROUSEL_ALBUM/IMAGE）
+            metrics: 取得するメトリクス（未指定時はメディアタイプ別の全メトリクス）
+            media_product_type: プロダクトタイプ（REELS/FEED/STORY、不明な場合は None）
+            posted_at: 投稿日時（datetime または ISO 8601 文字列、取得可否の期間区分に使用）
             
         Returns:
-            Dict[str, Any]: 投稿メトリクス
+            Dict[str, Any]: 投稿メトリクス（取得可能なメトリクスがない場合は空）
+            
+        Raises:
+            InstagramAPIError: メトリクス以外の理由で取得できなかった場合
         """
         url = self.config.get_media_insights_url(post_id)
+        capability_key = metric_capability_cache.key_for(media_type, media_product_type, posted_at)
         
-        # メディアタイプ別メトリクス
-        available_metrics = self.config.get_available_insights_metrics()
-        base_metrics = available_metrics["media_metrics_all"]
-        
-        metrics_to_request = base_metrics.copy()
-        
-        if media_type == 'VIDEO':
-            metrics_to_request.extend(available_metrics["media_metrics_video"])
-        elif media_type == 'CAROUSEL_ALBUM':
-            metrics_to_request.extend(available_metrics["media_metrics_carousel"])
-        
-        params = {
-            'metric': ','.join(metrics_to_request),
-            'access_token': access_token
-        }
+        # メディアタイプ別メトリクス（未対応と学習済みのものを除外）
+        requested = list(metrics) if metrics else self.config.get_media_metrics_for_type(media_type)
+        metrics_to_request = await metric_capability_cache.filter_supported(capability_key, requested)
+        if len(metrics_to_request) < len(requested):
+            logger.debug(
+                f"Skipping unsupported metrics for {'/'.join(capability_key)}: "
+                f"{sorted(set(requested) - set(metrics_to_request))}"
+            )
         
-        try:
-            logger.info(f"Fetching post insights for post: {post_id}, media_type: {media_type}")
-            data = await self._make_request(url, params)
+        logger.info(f"Fetching post insights for post: {post_id}, media_type: {media_type}")
+        while metrics_to_request:
+            try:
+                data = await self._make_request(url, {
+                    'metric': ','.join(metrics_to_request),
+                    'access_token': access_token
+                })
+            except InstagramAPIError as e:
+                if self._is_media_insights_unavailable(e):
+                    logger.warning(f"Insights unavailable for post {post_id}: {str(e)}")
+                    return {}
+                if not self._is_unsupported_metric_error(e):
+                    logger.error(f"Failed to fetch post insights for post {post_id}: {str(e)}")
+                    raise
+                
+                unsupported = self._unsupported_metrics_from_error(e, metrics_to_request)
+                if not unsupported:
+                    # どのメトリクスが原因か特定できない場合は1件ずつ確認
+                    return await self._probe_post_insights(url, access_token, capability_key, metrics_to_request)
+                
+                await metric_capability_cache.record_unsupported(capability_key, unsupported, str(e))
+                metrics_to_request = [metric for metric in metrics_to_request if metric not in unsupported]
+                logger.warning(
+                    f"Unsupported metrics for post {post_id} ({'/'.join(capability_key)}): "
+                    f"{sorted(unsupported)} - retrying with {len(metrics_to_request)} metrics"
+                )
+                continue
             
             # レスポンス解析
-            metrics = {}
-            for metric_data in data.get('data', []):
-                metric_name = metric_data.get('name')
-                values = metric_data.get('values', [])
-                if values:
-                    metrics[metric_name] = values[0].get('value', 0)
-                    logger.debug(f"Parsed post metric - {metric_name}: {metrics[metric_name]}")
-                else:
-                    logger.warning(f"No values found for post metric: {metric_name}")
-                    metrics[metric_name] = 0
+            post_metrics = self.parse_insights(data)
+            await metric_capability_cache.record_supported(capability_key, post_metrics.keys())
             
-            logger.info(f"Successfully fetched post insights - {len(metrics)} metrics retrieved")
-            return metrics
+            logger.info(f"Successfully fetched post insights - {len(post_metrics)} metrics retrieved")
+            return post_metrics
+        
+        logger.info(f"No supported metrics to request for post {post_id} ({'/'.join(capability_key)})")
+        return {}
+    
+    async def probe_post_metrics(
+        self,
+        post_id: str,
+        access_token: str,
+        capability_key: CapabilityKey,
+        candidates: List[str]
+    ) -> Dict[str, Any]:
+        """
+        メトリクスを1件ずつ要求して取得可否を確認（verification/about-post/explore_all_metrics.py と同じ探索）
+        
+        取得できたメトリクスは対応済み、未対応エラーになったメトリクスは未対応として学習する。
+        
+        Returns:
+            Dict[str, Any]: 取得できたメトリクス
+        """
+        url = self.config.get_media_insights_url(post_id)
+        return await self._probe_post_insights(url, access_token, capability_key, candidates)
+    
+    async def _probe_post_insights(
+        self,
+        url: str,
+        access_token: str,
+        capability_key: CapabilityKey,
+        candidates: List[str]
+    ) -> Dict[str, Any]:
+        post_metrics = {}
+        for metric in candidates:
+            try:
+                data = await self._make_request(url, {'metric': metric, 'access_token': access_token})
+            except InstagramAPIError as e:
+                if self._is_media_insights_unavailable(e):
+                    return {}
+                if not self._is_unsupported_metric_error(e):
+                    raise
+                await metric_capability_cache.record_unsupported(capability_key, [metric], str(e))
+                continue
             
-        except InstagramAPIError as e:
-            logger.error(f"Failed to fetch post insights for post {post_id}: {str(e)}")
-            # デフォルト値を返す
-            default_metrics = {metric: 0 for metric in metrics_to_request}
-            logger.info(f"Returning default post metrics: {list(default_metrics.keys())}")
-            return default_metrics
+            parsed = self.parse_insights(data)
+            await metric_capability_cache.record_supported(capability_key, parsed.keys())
+            post_metrics.update(parsed)
+        
+        logger.info(f"Probed {len(candidates)} metrics - {len(post_metrics)} supported for {'/'.join(capability_key)}")
+        return post_metrics
+    
+    def _is_media_insights_unavailable(self, error: InstagramAPIError) -> bool:
+        """投稿単位でインサイトが存在しない（メトリクスに関係なく取得できない）"""
+        return error.error_subcode in self.config.MEDIA_INSIGHTS_UNAVAILABLE_SUBCODES
+    
+    @staticmethod
+    def _is_unsupported_metric_error(error: InstagramAPIError) -> bool:
+        """メトリクスの指定が原因のエラー（(#100) metric[...] must be one of ... / does not support the ... metric）"""
+        return error.error_code == 100 and 'metric' in str(error).lower()
+    
+    @staticmethod
+    def _unsupported_metrics_from_error(error: InstagramAPIError, requested: List[str]) -> set:
+        """エラーメッセージから未対応のメトリクスを特定（特定できない場合は空）"""
+        message = str(error)
+        allowed_match = re.search(r"must be one of the following values: ([\w, ]+)", message)
+        if allowed_match:
+            allowed = {value.strip() for value in allowed_match.group(1).split(',')}
+            return {metric for metric in requested if metric not in allowed}
+        
+        named = set(re.findall(r"does not support the (\w+) metric", message))
+        named |= set(re.findall(r"metric (\w+) is not supported", message))
+        unsupported = {metric for metric in requested if metric in named}
+        if not unsupported and len(requested) == 1:
+            return set(requested)
+        return unsupported
     
     async def validate_access_token(
         self,
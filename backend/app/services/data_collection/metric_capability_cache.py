@@ -0,0 +1,250 @@
+"""
+Metric Capability Cache
+インサイトメトリクスの取得可否の学習キャッシュ
+
+/{media-id}/insights は1つでも対応していないメトリクスを含むとリクエスト全体がエラーになる。
+対応可否はメディアタイプ（VIDEO / CAROUSEL_ALBUM / IMAGE）だけでなくプロダクトタイプ（REELS / FEED / STORY）や
+投稿の古さでも変わるため、成功・失敗したレスポンスから (media_type, media_product_type, age_bucket) ごとに
+メトリクスの取得可否を記録し、以降のリクエストでは対応しているメトリクスのみを要求する。
+
+学習結果は media_metric_capabilities（Postgres）に保存し、プロセス・ワークフロー間で共有する。
+台帳と同様に DB に接続できない場合はプロセス内のキャッシュのみで続行し、STORE_RETRY_SECONDS 後に再接続する。
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional, Union
+
+from ...core.database import SessionLocal
+from ...core.instagram_config import instagram_config
+from ...repositories.media_metric_capability_repository import MediaMetricCapabilityRepository
+
+# ログ設定
+logger = logging.getLogger(__name__)
+
+# 保存先が使えなかった場合にプロセス内のキャッシュのみで続行する期間（秒）
+STORE_RETRY_SECONDS = 60
+
+# プロダクトタイプ・投稿日時が不明な場合のキー
+ANY_PRODUCT_TYPE = "ANY"
+ANY_AGE_BUCKET = "any"
+
+
+class CapabilityKey(NamedTuple):
+    """取得可否を共有する単位"""
+    media_type: str
+    media_product_type: str
+    age_bucket: str
+
+
+@dataclass
+class _Capability:
+    is_supported: bool
+    checked_at: datetime
+    last_error: Optional[str] = None
+
+
+def age_bucket_for(posted_at: Optional[Union[datetime, str]], now: Optional[datetime] = None) -> str:
+    """投稿経過日数の区分（0-30d / 30-365d / 365-730d / 730d+）"""
+    if posted_at is None:
+        return ANY_AGE_BUCKET
+    if isinstance(posted_at, str):
+        posted_at = datetime.fromisoformat(posted_at.replace('Z', '+00:00'))
+    if posted_at.tzinfo is None:
+        posted_at = posted_at.replace(tzinfo=timezone.utc)
+
+    age_days = ((now or datetime.now(timezone.utc)) - posted_at).days
+    lower = 0
+    for upper in instagram_config.METRIC_CAPABILITY_AGE_BUCKETS_DAYS:
+        if age_days < upper:
+            return f"{lower}-{upper}d"
+        lower = upper
+    return f"{lower}d+"
+
+
+class MetricCapabilityCache:
+    """インサイトメトリクス取得可否の学習キャッシュ（プロセス内で共有）"""
+
+    def __init__(self, recheck_days: int = instagram_config.METRIC_CAPABILITY_RECHECK_DAYS):
+        self.recheck_after = timedelta(days=recheck_days)
+        self._store_unavailable_until: Optional[datetime] = None
+        self._capabilities: Dict[CapabilityKey, Dict[str, _Capability]] = {}
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def key_for(
+        media_type: Optional[str],
+        media_product_type: Optional[str] = None,
+        posted_at: Optional[Union[datetime, str]] = None
+    ) -> CapabilityKey:
+        return CapabilityKey(
+            (media_type or 'UNKNOWN').upper(),
+            (media_product_type or ANY_PRODUCT_TYPE).upper(),
+            age_bucket_for(posted_at)
+        )
+
+    async def filter_supported(self, key: CapabilityKey, metrics: Iterable[str]) -> List[str]:
+        """未対応と学習済みのメトリクスを除外（未確認のメトリクスは要求する）"""
+        await self._ensure_loaded()
+        return [metric for metric in metrics if self.is_supported(key, metric) is not False]
+
+    def is_supported(self, key: CapabilityKey, metric: str) -> Optional[bool]:
+        """
+        メトリクスの取得可否（未確認・再確認時期を過ぎた未対応は None）
+
+        プロダクトタイプが不明なキーは、同じメディアタイプ・期間の全プロダクトタイプで
+        未対応と学習済みの場合のみ未対応とみなす。
+        """
+        if key.media_product_type != ANY_PRODUCT_TYPE:
+            return self._current(self._capabilities.get(key, {}).get(metric))
+
+        known = [
+            self._current(capabilities.get(metric))
+            for candidate, capabilities in self._capabilities.items()
+            if candidate.media_type == key.media_type and candidate.age_bucket == key.age_bucket
+        ]
+        known = [state for state in known if state is not None]
+        if not known:
+            return None
+        return any(known)
+
+    async def record_supported(self, key: CapabilityKey, metrics: Iterable[str]) -> None:
+        """レスポンスに含まれたメトリクスを対応済みとして記録（状態が変わった分のみ保存）"""
+        await self._record(key, metrics, is_supported=True)
+
+    async def record_unsupported(self, key: CapabilityKey, metrics: Iterable[str], error: str) -> None:
+        """エラーになったメトリクスを未対応として記録"""
+        await self._record(key, metrics, is_supported=False, error=error)
+
+    async def load(self) -> None:
+        """保存済みの取得可否を読み込み（未読み込みの場合のみ）"""
+        await self._ensure_loaded()
+
+    def snapshot(self) -> Dict[CapabilityKey, Dict[str, bool]]:
+        """学習済みの取得可否（表示用）"""
+        return {
+            key: {metric: capability.is_supported for metric, capability in sorted(capabilities.items())}
+            for key, capabilities in sorted(self._capabilities.items())
+        }
+
+    def _current(self, capability: Optional[_Capability]) -> Optional[bool]:
+        if capability is None:
+            return None
+        if not capability.is_supported and datetime.now(timezone.utc) - capability.checked_at >= self.recheck_after:
+            return None
+        return capability.is_supported
+
+    async def _record(
+        self,
+        key: CapabilityKey,
+        metrics: Iterable[str],
+        is_supported: bool,
+        error: Optional[str] = None
+    ) -> None:
+        # プロダクトタイプ不明のレスポンスは他のプロダクトタイプと混ざるため学習しない
+        if key.media_product_type == ANY_PRODUCT_TYPE:
+            return
+
+        await self._ensure_loaded()
+        now = datetime.now(timezone.utc)
+        capabilities = self._capabilities.setdefault(key, {})
+        changed = []
+        for metric in metrics:
+            previous = capabilities.get(metric)
+            if previous is not None and previous.is_supported == is_supported and (
+                is_supported or now - previous.checked_at < self.recheck_after
+            ):
+                continue
+            capabilities[metric] = _Capability(is_supported=is_supported, checked_at=now, last_error=error)
+            changed.append(metric)
+
+        if not changed:
+            return
+        logger.info(
+            f"Metric capability learned for {'/'.join(key)}: "
+            f"{', '.join(changed)} {'supported' if is_supported else 'unsupported'}"
+        )
+        await self._persist(key, changed, is_supported, error, now)
+
+    async def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        async with self._lock:
+            if self._loaded:
+                return
+            if not self._store_available():
+                return
+
+            db = SessionLocal()
+            try:
+                rows = await MediaMetricCapabilityRepository(db).get_all()
+                for row in rows:
+                    key = CapabilityKey(row.media_type, row.media_product_type, row.age_bucket)
+                    known = self._capabilities.setdefault(key, {}).get(row.metric)
+                    # 保存先が使えない間にプロセス内で学習した、より新しい結果は残す
+                    if known and known.checked_at >= row.checked_at:
+                        continue
+                    self._capabilities[key][row.metric] = _Capability(
+                        is_supported=row.is_supported,
+                        checked_at=row.checked_at,
+                        last_error=row.last_error
+                    )
+                self._loaded = True
+                logger.debug(f"Metric capabilities loaded: {len(rows)} entries")
+            except Exception as e:
+                self._mark_store_unavailable(e)
+            finally:
+                db.close()
+
+    async def _persist(
+        self,
+        key: CapabilityKey,
+        metrics: List[str],
+        is_supported: bool,
+        error: Optional[str],
+        checked_at: datetime
+    ) -> None:
+        if not self._store_available():
+            return
+
+        db = SessionLocal()
+        try:
+            await MediaMetricCapabilityRepository(db).upsert_many([
+                {
+                    'media_type': key.media_type,
+                    'media_product_type': key.media_product_type,
+                    'age_bucket': key.age_bucket,
+                    'metric': metric,
+                    'is_supported': is_supported,
+                    'last_error': error[:2000] if error else None,
+                    'checked_at': checked_at
+                }
+                for metric in metrics
+            ])
+        except Exception as e:
+            db.rollback()
+            self._mark_store_unavailable(e)
+        finally:
+            db.close()
+
+    def _store_available(self) -> bool:
+        """保存先のエラー後、再接続までの期間中でないか"""
+        if self._store_unavailable_until is None:
+            return True
+        if datetime.now(timezone.utc) < self._store_unavailable_until:
+            return False
+        self._store_unavailable_until = None
+        return True
+
+    def _mark_store_unavailable(self, error: Exception) -> None:
+        """保存先が使えない場合はしばらくプロセス内でのみ学習する（STORE_RETRY_SECONDS 後に再接続）"""
+        logger.warning(
+            f"Metric capability store unavailable, learning in memory only for {STORE_RETRY_SECONDS}s: {error}"
+        )
+        self._store_unavailable_until = datetime.now(timezone.utc) + timedelta(seconds=STORE_RETRY_SECONDS)
+
+
+# プロセス内で共有（コレクターは処理単位でクライアントを作り直すため）
+metric_capability_cache = MetricCapabilityCache()
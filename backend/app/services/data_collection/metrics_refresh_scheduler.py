@@ -0,0 +1,184 @@
+"""
+Metrics Refresh Scheduler
+投稿メトリクス再取得のスケジューリング（投稿経過時間・直近の伸び率ベース）
+
+投稿直後は数値が大きく動き、時間が経つほど変化しなくなるため、
+経過時間に応じて再取得間隔を広げる（1日目: 1時間ごと / 1週間まで: 1日ごと / 以降: 1週間ごと）。
+さらに直近2回のスナップショットの伸び率で間隔を補正し、1回の実行あたりの
+API 呼び出し予算の範囲で優先度の高い投稿から再取得する。
+"""
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+# ログ設定
+logger = logging.getLogger(__name__)
+
+# 経過時間別の基本再取得間隔: (投稿経過時間の上限, 再取得間隔)
+REFRESH_TIERS = [
+    (timedelta(days=1), timedelta(hours=1)),
+    (timedelta(days=7), timedelta(days=1)),
+]
+DEFAULT_REFRESH_INTERVAL = timedelta(weeks=1)
+
+# 伸び率による間隔補正
+# 基本間隔あたりの伸び率がこれ以上なら間隔を半分に、変化が無ければ倍にする
+HIGH_VELOCITY_GROWTH = 0.10
+MIN_REFRESH_INTERVAL = timedelta(hours=1)
+MAX_REFRESH_INTERVAL = timedelta(weeks=4)
+
+# 投稿1件の再取得にかかる API 呼び出し数（get_post_insights）
+API_CALLS_PER_REFRESH = 1
+
+
+def _as_utc(value: datetime) -> datetime:
+    """naive datetime は UTC として扱う"""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _observed_at(snapshot: Dict[str, Any]) -> datetime:
+    """スナップショットを最後に確認した日時（値が変化しない間は last_observed_at が延長される）"""
+    return _as_utc(snapshot.get('last_observed_at') or snapshot['recorded_at'])
+
+
+def activity_total(snapshot: Dict[str, Any]) -> int:
+    """伸び率判定に使う合計値（リーチ + エンゲージメント）"""
+    return sum(snapshot.get(key, 0) or 0 for key in ('reach', 'likes', 'comments', 'saved', 'shares'))
+
+
+@dataclass
+class RefreshDecision:
+    """投稿ごとの再取得判定"""
+    post_id: Any
+    account_id: Any
+    instagram_post_id: str
+    media_type: str
+    posted_at: datetime
+    last_observed_at: Optional[datetime]
+    interval: timedelta
+    due: bool
+    priority: float
+    growth: Optional[float] = None
+
+
+@dataclass
+class RefreshPlan:
+    """1回の実行で再取得する投稿の計画"""
+    scheduled: List[RefreshDecision] = field(default_factory=list)
+    total_posts: int = 0
+    due_posts: int = 0
+    deferred_by_budget: int = 0
+    api_budget: Optional[int] = None
+
+    @property
+    def api_calls_planned(self) -> int:
+        return len(self.scheduled) * API_CALLS_PER_REFRESH
+
+
+class MetricsRefreshScheduler:
+    """経過時間・伸び率に応じた投稿メトリクス再取得スケジューラー"""
+
+    def __init__(self, api_budget: Optional[int] = None, now: Optional[datetime] = None):
+        """
+        Args:
+            api_budget: 1回の実行で使用できる API 呼び出し数（None は無制限）
+            now: 判定基準時刻（未指定時は現在時刻）
+        """
+        self.api_budget = api_budget
+        self.now = _as_utc(now) if now else datetime.now(timezone.utc)
+
+    @staticmethod
+    def base_interval(post_age: timedelta) -> timedelta:
+        """投稿経過時間に応じた基本再取得間隔"""
+        for max_age, interval in REFRESH_TIERS:
+            if post_age < max_age:
+                return interval
+        return DEFAULT_REFRESH_INTERVAL
+
+    @staticmethod
+    def growth_per_interval(snapshots: List[Dict[str, Any]], interval: timedelta) -> Optional[float]:
+        """直近2回のスナップショットから、基本間隔あたりの伸び率を算出"""
+        if not snapshots:
+            return None
+        # 最新スナップショットが記録後も同じ値で再確認されている場合は変化なし
+        if _observed_at(snapshots[0]) > _as_utc(snapshots[0]['recorded_at']):
+            return 0.0
+        if len(snapshots) < 2:
+            return None
+        latest, previous = snapshots[0], snapshots[1]
+        elapsed = _as_utc(latest['recorded_at']) - _as_utc(previous['recorded_at'])
+        if elapsed.total_seconds() <= 0:
+            return None
+
+        delta = max(activity_total(latest) - activity_total(previous), 0)
+        base = max(activity_total(previous), 1)
+        return (delta / base) * (interval / elapsed)
+
+    def evaluate(self, post: Dict[str, Any]) -> RefreshDecision:
+        """
+        投稿1件の再取得判定
+
+        Args:
+            post: InstagramPostMetricsRepository.get_refresh_snapshots の要素
+        """
+        posted_at = _as_utc(post['posted_at'])
+        snapshots = post.get('snapshots') or []
+        interval = self.base_interval(self.now - posted_at)
+        growth = self.growth_per_interval(snapshots, interval)
+
+        if growth is not None:
+            if growth >= HIGH_VELOCITY_GROWTH:
+                interval = max(interval / 2, MIN_REFRESH_INTERVAL)
+            elif growth == 0:
+                interval = min(interval * 2, MAX_REFRESH_INTERVAL)
+
+        last_observed_at = _observed_at(snapshots[0]) if snapshots else None
+        # インサイトを取得できなかった試行も確認済みとして扱い、次の判定は通常の間隔で行う
+        last_checked_at = max(
+            (value for value in (last_observed_at, post.get('refresh_attempted_at')) if value is not None),
+            key=_as_utc,
+            default=None
+        )
+        if last_checked_at is None:
+            # 一度も取得を試みていない投稿は最優先
+            due, priority = True, float('inf')
+        else:
+            overdue_ratio = (self.now - _as_utc(last_checked_at)) / interval
+            due = overdue_ratio >= 1
+            priority = overdue_ratio * (1 + (growth or 0))
+
+        return RefreshDecision(
+            post_id=post['post_id'],
+            account_id=post['account_id'],
+            instagram_post_id=post['instagram_post_id'],
+            media_type=post['media_type'],
+            posted_at=posted_at,
+            last_observed_at=last_observed_at,
+            interval=interval,
+            due=due,
+            priority=priority,
+            growth=growth
+        )
+
+    def plan(self, posts: List[Dict[str, Any]]) -> RefreshPlan:
+        """再取得対象を優先度順に選定（API 予算を超える分は次回に回す）"""
+        decisions = [self.evaluate(post) for post in posts]
+        due = sorted((d for d in decisions if d.due), key=lambda d: d.priority, reverse=True)
+
+        limit = len(due)
+        if self.api_budget is not None:
+            limit = min(limit, max(self.api_budget, 0) // API_CALLS_PER_REFRESH)
+
+        plan = RefreshPlan(
+            scheduled=due[:limit],
+            total_posts=len(decisions),
+            due_posts=len(due),
+            deferred_by_budget=len(due) - limit,
+            api_budget=self.api_budget
+        )
+        logger.info(
+            f"Refresh plan: {len(plan.scheduled)} scheduled / {plan.due_posts} due / "
+            f"{plan.total_posts} posts (deferred by budget: {plan.deferred_by_budget})"
+        )
+        return plan
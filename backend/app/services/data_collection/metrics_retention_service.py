@@ -0,0 +1,281 @@
+"""
+Metrics Retention Service
+投稿メトリクス（instagram_post_metrics）の保持期間ポリシーと間引き（ダウンサンプリング）
+
+直近は日次、一定期間を過ぎたら週次、さらに古いものは月次の粒度に間引く。
+各期間（週・月）は最後のスナップショットの値を代表値として残し、
+recorded_at 〜 last_observed_at をその期間全体に付け替えるため、
+日別系列の復元（get_daily_series 等）は間引き後も期間内の全日で値を返す。
+
+削除対象の行は DB から削除する前にアーカイブファイル（gzip JSONL）へ書き出し、
+restore_archive で元の行に戻せる。
+"""
+import gzip
+import json
+import logging
+import os
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ...models.instagram_post_metrics import InstagramPostMetrics
+from ...repositories.instagram_post_metrics_repository import InstagramPostMetricsRepository
+
+# ログ設定
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE_DIR = Path(__file__).parent.parent.parent.parent / "data" / "archive" / "post_metrics"
+
+# 1バッチで処理する投稿数
+DEFAULT_POST_BATCH_SIZE = 500
+# 復元時の1回の INSERT 件数
+RESTORE_BATCH_SIZE = 1000
+
+
+@dataclass
+class RetentionPolicy:
+    """保持期間ポリシー（日数は記録日からの経過日数）"""
+    daily_days: int = 90
+    weekly_days: int = 365
+
+    def __post_init__(self):
+        if self.daily_days < 1 or self.weekly_days < self.daily_days:
+            raise ValueError(
+                f"Invalid retention policy: daily_days={self.daily_days}, weekly_days={self.weekly_days}"
+            )
+
+    def bucket_for(self, recorded_at: datetime, today: date) -> Optional[str]:
+        """
+        スナップショットの間引き単位を判定
+
+        Returns:
+            Optional[str]: 週次は "2025-W07"、月次は "2025-02"、日次保持期間内は None
+        """
+        age_days = (today - recorded_at.date()).days
+        if age_days < self.daily_days:
+            return None
+        if age_days < self.weekly_days:
+            iso_year, iso_week, _ = recorded_at.isocalendar()
+            return f"{iso_year}-W{iso_week:02d}"
+        return f"{recorded_at.year}-{recorded_at.month:02d}"
+
+
+@dataclass
+class CompactionSummary:
+    """間引き結果サマリー"""
+    policy: RetentionPolicy
+    started_at: datetime
+    completed_at: Optional[datetime] = None
+    dry_run: bool = False
+    export_only: bool = False
+    posts_scanned: int = 0
+    rows_scanned: int = 0
+    buckets_compacted: int = 0
+    rows_archived: int = 0
+    rows_deleted: int = 0  # ドライラン時は削除予定件数
+    archive_path: Optional[str] = None
+    errors: List[str] = field(default_factory=list)
+
+
+def _serialize_value(value: Any) -> Any:
+    """アーカイブ用に JSON 化"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def serialize_snapshot(metrics: InstagramPostMetrics) -> Dict[str, Any]:
+    """スナップショット1行をアーカイブ用の辞書に変換"""
+    return {
+        column.name: _serialize_value(getattr(metrics, column.name))
+        for column in InstagramPostMetrics.__table__.columns
+    }
+
+
+def deserialize_snapshot(row: Dict[str, Any]) -> Dict[str, Any]:
+    """アーカイブの辞書を INSERT 用の値に戻す"""
+    restored = dict(row)
+    for key in ('id', 'post_id'):
+        if restored.get(key):
+            restored[key] = uuid.UUID(restored[key])
+    for key in ('recorded_at', 'last_observed_at'):
+        if restored.get(key):
+            restored[key] = datetime.fromisoformat(restored[key])
+    if restored.get('engagement_rate') is not None:
+        restored['engagement_rate'] = Decimal(restored['engagement_rate'])
+    return restored
+
+
+class MetricsRetentionService:
+    """投稿メトリクスの間引き・アーカイブ・復元"""
+
+    def __init__(self, db, archive_dir: Optional[Path] = None):
+        self.db = db
+        self.metrics_repo = InstagramPostMetricsRepository(db)
+        self.archive_dir = archive_dir or DEFAULT_ARCHIVE_DIR
+
+    def plan_compactions(
+        self,
+        snapshots: List[InstagramPostMetrics],
+        policy: RetentionPolicy,
+        today: date
+    ) -> List[Tuple[Dict[str, Any], List[InstagramPostMetrics]]]:
+        """
+        投稿・期間ごとに間引き内容を決定
+
+        Args:
+            snapshots: 投稿・記録日時順のスナップショット
+
+        Returns:
+            (apply_compaction 用の辞書, 期間内の全行) のリスト（1行だけの期間は対象外）
+        """
+        groups: Dict[Tuple[Any, str], List[InstagramPostMetrics]] = {}
+        for snapshot in snapshots:
+            bucket = policy.bucket_for(snapshot.recorded_at, today)
+            if bucket is not None:
+                groups.setdefault((snapshot.post_id, bucket), []).append(snapshot)
+
+        compactions = []
+        for (_, bucket), rows in groups.items():
+            if len(rows) < 2:
+                continue
+            keep = rows[-1]
+            compactions.append(({
+                'keep_id': keep.id,
+                'delete_ids': [row.id for row in rows[:-1]],
+                'recorded_at': rows[0].recorded_at,
+                'last_observed_at': max(row.last_observed_at or row.recorded_at for row in rows),
+                'bucket': bucket,
+            }, rows))
+        return compactions
+
+    async def compact(
+        self,
+        policy: RetentionPolicy,
+        dry_run: bool = False,
+        export_only: bool = False,
+        batch_size: int = DEFAULT_POST_BATCH_SIZE,
+        today: Optional[date] = None
+    ) -> CompactionSummary:
+        """
+        保持期間ポリシーに従って間引きを実行
+
+        Args:
+            policy: 保持期間ポリシー
+            dry_run: 対象件数の集計のみ（アーカイブ・削除なし）
+            export_only: アーカイブの書き出しのみ（削除なし）
+            batch_size: 1バッチで処理する投稿数
+            today: 基準日（未指定時は今日）
+        """
+        today = today or date.today()
+        summary = CompactionSummary(
+            policy=policy,
+            started_at=datetime.now(),
+            dry_run=dry_run,
+            export_only=export_only
+        )
+        cutoff = datetime.combine(today - timedelta(days=policy.daily_days), datetime.min.time(), tzinfo=timezone.utc)
+        logger.info(f"Compacting post metrics recorded before {cutoff.date()} (policy: {policy})")
+
+        archive_file = None
+        if not dry_run:
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+            archive_path = self.archive_dir / f"post_metrics_archive_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl.gz"
+            archive_file = gzip.open(archive_path, 'wt', encoding='utf-8')
+            summary.archive_path = str(archive_path)
+
+        try:
+            after_post_id = None
+            while True:
+                post_ids = await self.metrics_repo.get_post_ids_with_snapshots_before(
+                    cutoff, after_post_id=after_post_id, limit=batch_size
+                )
+                if not post_ids:
+                    break
+                after_post_id = post_ids[-1]
+
+                snapshots = await self.metrics_repo.get_snapshots_before(post_ids, cutoff)
+                summary.posts_scanned += len(post_ids)
+                summary.rows_scanned += len(snapshots)
+
+                compactions = self.plan_compactions(snapshots, policy, today)
+                summary.buckets_compacted += len(compactions)
+
+                if dry_run or not compactions:
+                    # ドライランでは削除予定件数を集計
+                    if dry_run:
+                        summary.rows_deleted += sum(len(c['delete_ids']) for c, _ in compactions)
+                    self.db.expire_all()
+                    continue
+
+                # 削除前にアーカイブを書き出して永続化
+                for compaction, rows in compactions:
+                    for row in rows:
+                        archive_file.write(json.dumps({
+                            'row': serialize_snapshot(row),
+                            'compacted_into': str(compaction['keep_id']),
+                            'bucket': compaction['bucket'],
+                        }, ensure_ascii=False) + "\n")
+                        summary.rows_archived += 1
+                archive_file.flush()
+                os.fsync(archive_file.fileno())
+
+                if not export_only:
+                    summary.rows_deleted += await self.metrics_repo.apply_compaction(
+                        [compaction for compaction, _ in compactions]
+                    )
+                self.db.expire_all()
+
+                logger.info(
+                    f"Processed {summary.posts_scanned} posts: {summary.buckets_compacted} buckets, "
+                    f"{summary.rows_deleted} rows deleted"
+                )
+
+        except Exception as e:
+            error_msg = f"Compaction failed: {str(e)}"
+            logger.error(error_msg)
+            summary.errors.append(error_msg)
+
+        finally:
+            if archive_file:
+                archive_file.close()
+                if summary.rows_archived == 0:
+                    Path(summary.archive_path).unlink(missing_ok=True)
+                    summary.archive_path = None
+            summary.completed_at = datetime.now()
+
+        return summary
+
+    @staticmethod
+    def read_archive(archive_path: Path) -> Iterator[Dict[str, Any]]:
+        """アーカイブファイルの読み込み"""
+        with gzip.open(archive_path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    async def restore_archive(self, archive_path: Path) -> int:
+        """
+        アーカイブから間引き前の行を復元
+
+        複数回間引きした場合は新しいアーカイブから順に復元する。
+
+        Returns:
+            int: 復元件数
+        """
+        entries = list(self.read_archive(archive_path))
+        restored = 0
+        for i in range(0, len(entries), RESTORE_BATCH_SIZE):
+            batch = entries[i:i + RESTORE_BATCH_SIZE]
+            replaced_ids = list({uuid.UUID(entry['compacted_into']) for entry in batch})
+            rows = [deserialize_snapshot(entry['row']) for entry in batch]
+            restored += await self.metrics_repo.restore_snapshots(rows, replaced_ids)
+        logger.info(f"Restored {restored} rows from {archive_path}")
+        return restored
@@ -0,0 +1,196 @@
+"""
+Token Refresh Service
+期限切れが近いアクセストークンの一括更新
+
+アカウントのトークン（access_token_encrypted）はページごとに異なるページアクセストークンのため、
+セットアップ時に保存した派生元の長期ユーザートークン（user_access_token_encrypted）でまとめる。
+fb_exchange_token でユーザートークンを1回だけ交換し、新しいユーザートークンの me/accounts から
+同じユーザーの全アカウントのページトークンを取り直す。
+交換は同時実行数を制限して並列に行い、更新は InstagramAccountRepository.bulk_update_tokens で
+1回のコミットにまとめて書き込む。
+
+ユーザートークンが保存されていないアカウント（migration 018 より前のセットアップ）は交換できないため、
+アカウントセットアップの再実行を促すエラーとして報告する。
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from ...models.instagram_account import InstagramAccount
+from ...repositories.instagram_account_repository import InstagramAccountRepository
+from .instagram_api_client import InstagramAPIClient
+
+# ログ設定
+logger = logging.getLogger(__name__)
+
+# 期限切れまでの日数がこれ以下のトークンを更新対象にする
+DEFAULT_DAYS_THRESHOLD = 7
+# トークン交換の同時実行数
+DEFAULT_CONCURRENCY = 5
+# expires_in が返らない場合の有効期限（長期トークンの既定値）
+DEFAULT_TOKEN_LIFETIME = timedelta(days=60)
+
+
+@dataclass
+class TokenExchangeOutcome:
+    """ユーザートークン1件の交換結果"""
+    access_token: Optional[str] = None
+    expires_at: Optional[datetime] = None
+    page_tokens: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.access_token is not None
+
+
+@dataclass
+class TokenRefreshSummary:
+    """トークン一括更新結果"""
+    started_at: datetime
+    completed_at: Optional[datetime] = None
+    dry_run: bool = False
+    accounts_checked: int = 0
+    unique_tokens: int = 0
+    accounts_without_user_token: int = 0
+    exchanges_succeeded: int = 0
+    exchanges_failed: int = 0
+    accounts_updated: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+class TokenRefreshService:
+    """アクセストークンの一括更新"""
+
+    def __init__(self, db, concurrency: int = DEFAULT_CONCURRENCY):
+        self.db = db
+        self.account_repo = InstagramAccountRepository(db)
+        self.concurrency = max(concurrency, 1)
+
+    @staticmethod
+    def group_by_user_token(
+        accounts: List[InstagramAccount]
+    ) -> Tuple[Dict[str, List[InstagramAccount]], List[InstagramAccount]]:
+        """
+        派生元のユーザートークンが同じアカウントをまとめる（交換はユーザートークンごとに1回）
+
+        Returns:
+            Tuple: ユーザートークン → アカウント, ユーザートークンが保存されていないアカウント
+        """
+        groups: Dict[str, List[InstagramAccount]] = {}
+        without_user_token: List[InstagramAccount] = []
+        for account in accounts:
+            if account.user_access_token_encrypted:
+                groups.setdefault(account.user_access_token_encrypted, []).append(account)
+            else:
+                without_user_token.append(account)
+        return groups, without_user_token
+
+    async def _exchange(
+        self,
+        api_client: InstagramAPIClient,
+        semaphore: asyncio.Semaphore,
+        user_access_token: str
+    ) -> TokenExchangeOutcome:
+        """ユーザートークン1件の交換とページトークンの再取得（失敗時は例外を送出せず結果に記録）"""
+        async with semaphore:
+            try:
+                data = await api_client.exchange_long_lived_token(user_access_token)
+                page_tokens = await api_client.get_page_access_tokens(data['access_token'])
+            except Exception as e:
+                return TokenExchangeOutcome(error=str(e))
+
+        expires_in = data.get('expires_in')
+        lifetime = timedelta(seconds=int(expires_in)) if expires_in else DEFAULT_TOKEN_LIFETIME
+        return TokenExchangeOutcome(
+            access_token=data['access_token'],
+            expires_at=datetime.now() + lifetime,
+            page_tokens=page_tokens
+        )
+
+    async def refresh_expiring_tokens(
+        self,
+        days_threshold: int = DEFAULT_DAYS_THRESHOLD,
+        account_filter: Optional[List[str]] = None,
+        dry_run: bool = False
+    ) -> TokenRefreshSummary:
+        """
+        期限切れが近いトークンを交換して一括更新
+
+        Args:
+            days_threshold: 期限切れまでの日数閾値
+            account_filter: 対象の Instagram User ID（未指定時は全アクティブアカウント）
+            dry_run: 対象の集計のみ（API 呼び出し・更新なし）
+        """
+        summary = TokenRefreshSummary(started_at=datetime.now(), dry_run=dry_run)
+
+        try:
+            accounts = await self.account_repo.get_token_expiring_soon(days_threshold)
+            if account_filter:
+                accounts = [account for account in accounts if account.instagram_user_id in account_filter]
+            groups, without_user_token = self.group_by_user_token(accounts)
+            summary.accounts_checked = len(accounts)
+            summary.unique_tokens = len(groups)
+            summary.accounts_without_user_token = len(without_user_token)
+            logger.info(
+                f"Token refresh: {len(accounts)} accounts expiring within {days_threshold} days "
+                f"({len(groups)} unique user tokens, {len(without_user_token)} without a user token)"
+            )
+            if without_user_token:
+                usernames = ', '.join(f"@{account.username}" for account in without_user_token)
+                summary.errors.append(
+                    f"{usernames}: no user token stored (re-run account setup to enable token refresh)"
+                )
+                logger.warning(f"Accounts without a stored user token, skipping refresh: {usernames}")
+
+            if dry_run or not groups:
+                return summary
+
+            tokens = list(groups.keys())
+            semaphore = asyncio.Semaphore(self.concurrency)
+            async with InstagramAPIClient() as api_client:
+                outcomes = await asyncio.gather(
+                    *(self._exchange(api_client, semaphore, token) for token in tokens)
+                )
+
+            token_updates: List[Dict[str, Any]] = []
+            for token, outcome in zip(tokens, outcomes):
+                usernames = ', '.join(f"@{account.username}" for account in groups[token])
+                if not outcome.success:
+                    summary.exchanges_failed += 1
+                    summary.errors.append(f"{usernames}: {outcome.error}")
+                    logger.error(f"Token exchange failed for {usernames}: {outcome.error}")
+                    continue
+
+                summary.exchanges_succeeded += 1
+                for account in groups[token]:
+                    page_token = outcome.page_tokens.get(account.instagram_user_id)
+                    if not page_token:
+                        # ユーザーがページの権限を失った等（ユーザートークンのみ更新しても使えないため更新しない）
+                        summary.errors.append(f"@{account.username}: page token not returned by me/accounts")
+                        logger.error(f"Page token for @{account.username} not found after token exchange")
+                        continue
+                    token_updates.append({
+                        'id': account.id,
+                        'access_token_encrypted': page_token,
+                        'user_access_token_encrypted': outcome.access_token,
+                        'token_expires_at': outcome.expires_at
+                    })
+
+            summary.accounts_updated = await self.account_repo.bulk_update_tokens(token_updates)
+            logger.info(
+                f"Token refresh completed: {summary.accounts_updated} accounts updated, "
+                f"{summary.exchanges_failed} exchanges failed"
+            )
+
+        except Exception as e:
+            error_msg = f"Token refresh failed: {str(e)}"
+            logger.error(error_msg)
+            summary.errors.append(error_msg)
+
+        finally:
+            summary.completed_at = datetime.now()
+
+        return summary
@@ -0,0 +1,146 @@
+"""
+Webhook Event Service
+Instagram Webhook（変更通知）の検証と、通知された投稿の取得ジョブ登録
+
+新規投稿・コメントは GitHub Actions の定期実行（1日2回）でしか検出できず、最大12時間遅れる。
+Webhook で通知された投稿のみを collection_jobs（webhook_media）に登録し、ワーカーで取得する。
+定期実行は取りこぼしの補完として残す。
+
+通知は X-Hub-Signature-256（アプリシークレットによる HMAC-SHA256）で検証する。
+同じ投稿への通知は dedupe_key と実行遅延（WEBHOOK_MEDIA_DEBOUNCE_SECONDS）で1件のジョブにまとめる。
+"""
+import hashlib
+import hmac
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from ...core.instagram_config import instagram_config
+from ...repositories.collection_job_repository import CollectionJobRepository, JOB_TYPE_WEBHOOK_MEDIA
+from ...repositories.instagram_account_repository import InstagramAccountRepository
+
+# ログ設定
+logger = logging.getLogger(__name__)
+
+# 投稿IDの取り出し方（フィールド → value 内のパス）
+# mentions は他ユーザーの投稿（アカウントをメンションした投稿）の ID のため対象外
+# （アカウントのトークンでは取得できず、取得できてもアカウント自身の投稿として保存してしまう）
+MEDIA_ID_PATHS = {
+    'comments': ('media', 'id'),
+    'live_comments': ('media', 'id'),
+    'story_insights': ('media_id',),
+}
+
+
+@dataclass
+class WebhookMediaEvent:
+    """投稿に関する変更通知1件"""
+    instagram_user_id: str
+    media_id: str
+    field: str
+
+
+@dataclass
+class WebhookDispatchResult:
+    """通知の処理結果"""
+    events: int = 0
+    jobs_queued: int = 0
+    ignored_changes: int = 0
+    unknown_accounts: List[str] = field(default_factory=list)
+
+
+def verify_signature(body: bytes, signature_header: Optional[str], app_secret: Optional[str]) -> bool:
+    """X-Hub-Signature-256（sha256=<hex>）の検証"""
+    if not app_secret or not signature_header or not signature_header.startswith('sha256='):
+        return False
+    expected = hmac.new(app_secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature_header[len('sha256='):])
+
+
+def sign_payload(body: bytes, app_secret: str) -> str:
+    """X-Hub-Signature-256 ヘッダー値の生成（ローカル再送用）"""
+    return 'sha256=' + hmac.new(app_secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def extract_media_events(payload: Dict[str, Any]) -> List[WebhookMediaEvent]:
+    """
+    通知ペイロードから投稿単位の変更を取り出す
+
+    対象外のフィールド（messages 等）や投稿IDを含まない変更は無視する。
+    """
+    if payload.get('object') != 'instagram':
+        return []
+
+    events = []
+    for entry in payload.get('entry', []):
+        instagram_user_id = str(entry.get('id', ''))
+        for change in entry.get('changes', []):
+            path = MEDIA_ID_PATHS.get(change.get('field'))
+            if not path or not instagram_user_id:
+                continue
+
+            value = change.get('value') or {}
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            if value:
+                events.append(WebhookMediaEvent(instagram_user_id, str(value), change['field']))
+    return events
+
+
+class WebhookEventService:
+    """変更通知から投稿の取得ジョブを登録"""
+
+    def __init__(self, db):
+        self.db = db
+        self.account_repo = InstagramAccountRepository(db)
+        self.job_repo = CollectionJobRepository(db)
+
+    async def dispatch(self, payload: Dict[str, Any]) -> WebhookDispatchResult:
+        """通知された投稿ごとに webhook_media ジョブを登録（登録済みアカウントのみ）"""
+        events = extract_media_events(payload)
+        result = WebhookDispatchResult(
+            events=len(events),
+            ignored_changes=sum(len(entry.get('changes', [])) for entry in payload.get('entry', [])) - len(events)
+        )
+        if not events:
+            return result
+
+        accounts = await self.account_repo.get_by_instagram_user_ids(
+            sorted({event.instagram_user_id for event in events})
+        )
+        active_ids = {account.instagram_user_id for account in accounts if account.is_active}
+        result.unknown_accounts = sorted({
+            event.instagram_user_id for event in events if event.instagram_user_id not in active_ids
+        })
+
+        # 同じ投稿への複数の通知は1件にまとめる（フィールドは和集合）
+        fields_by_media: Dict[str, Dict[str, Any]] = {}
+        for event in events:
+            if event.instagram_user_id not in active_ids:
+                continue
+            entry = fields_by_media.setdefault(
+                event.media_id, {'instagram_user_id': event.instagram_user_id, 'media_id': event.media_id, 'fields': []}
+            )
+            if event.field not in entry['fields']:
+                entry['fields'].append(event.field)
+
+        run_after = datetime.now(timezone.utc) + timedelta(seconds=instagram_config.WEBHOOK_MEDIA_DEBOUNCE_SECONDS)
+        result.jobs_queued = await self.job_repo.enqueue_many([
+            {
+                'job_type': JOB_TYPE_WEBHOOK_MEDIA,
+                'payload': job_payload,
+                'priority': instagram_config.WEBHOOK_JOB_PRIORITY,
+                'run_after': run_after,
+                'dedupe_key': f"{JOB_TYPE_WEBHOOK_MEDIA}:{media_id}",
+            }
+            for media_id, job_payload in fields_by_media.items()
+        ])
+
+        logger.info(
+            f"Webhook dispatched: {result.events} events, {result.jobs_queued} jobs queued "
+            f"({len(fields_by_media) - result.jobs_queued} already pending)"
+        )
+        if result.unknown_accounts:
+            logger.warning(f"Webhook events for unregistered or inactive accounts: {result.unknown_accounts}")
+        return result
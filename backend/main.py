@@ -1,9 +1,26 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, Response
+import logging
 import re
+import time
 
 from app.api.v1 import api_v1_router
+from app.core.metrics import (
+    CONTENT_TYPE_LATEST,
+    DB_QUERIES_PER_REQUEST,
+    DB_QUERY_TIME_PER_REQUEST,
+    HTTP_REQUEST_DURATION,
+    QueryStats,
+    current_query_stats,
+    render_latest,
+)
+from app.core.query_profiler import (
+    SQL_PROFILING_ENABLED,
+    profile_queries,
+)
+
+profile_logger = logging.getLogger("sql_profiler")
 
 app = FastAPI(
     title="Instagram Analysis API",
@@ -56,6 +73,45 @@ async def force_https(request: Request, call_next):
         response = await call_next(request)
         return response
 
+# リクエスト計測ミドルウェア（Prometheus）
+@app.middleware("http")
+async def collect_request_metrics(request: Request, call_next):
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        elapsed = time.perf_counter() - started
+        current_query_stats.reset(token)
+
+        # パスパラメータを含まないルートテンプレートでラベル付け
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", "unmatched")
+        if route_path != "/metrics":
+            HTTP_REQUEST_DURATION.labels(
+                method=request.method, route=route_path, status=str(status_code)
+            ).observe(elapsed)
+            DB_QUERIES_PER_REQUEST.labels(route=route_path).observe(stats.count)
+            DB_QUERY_TIME_PER_REQUEST.labels(route=route_path).observe(stats.total_seconds)
+
+# SQLプロファイラ（SQL_PROFILING=1 の場合のみ）
+if SQL_PROFILING_ENABLED:
+    @app.middleware("http")
+    async def profile_request_queries(request: Request, call_next):
+        with profile_queries(f"{request.method} {request.url.path}") as profile:
+            response = await call_next(request)
+
+        response.headers["X-SQL-Query-Count"] = str(profile.count)
+        response.headers["X-SQL-Query-Time-Ms"] = f"{profile.total_seconds * 1000:.1f}"
+        response.headers["X-SQL-Repeated-Shapes"] = str(len(profile.repeated_shapes()))
+        if profile.repeated_shapes() or profile.slow_queries:
+            profile_logger.warning(profile.format_report())
+        return response
+
 # API ルーター統合
 app.include_router(api_v1_router)
 
@@ -70,6 +126,12 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus スクレイプ用エンドポイント"""
+    return Response(content=render_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
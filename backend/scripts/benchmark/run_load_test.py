@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+HTTP Load Test Runner
+ダッシュボード相当の同時アクセスでAPIエンドポイントの負荷試験を行うスクリプト
+
+seed_benchmark_data.py でシードしたローカルDBに接続したアプリに対し、
+同時接続数を段階的に増やしながら各エンドポイントのレイテンシ（p50/p90/p99）、
+スループット、エラー率を計測する。スループットが頭打ちになった同時接続数を
+飽和点として報告する。
+
+Usage:
+    # 起動済みサーバーに対して実行
+    uvicorn main:app --port 8000 --workers 2
+    python scripts/benchmark/run_load_test.py --base-url http://localhost:8000 --concurrency 1,5,10,25,50
+
+    # アプリをプロセス内で起動して実行（ASGI直接呼び出し）
+    python scripts/benchmark/run_load_test.py --in-process --concurrency 1,10,50 --duration 20
+"""
+
+import asyncio
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+logger = logging.getLogger(__name__)
+
+# ダッシュボード操作を想定したエンドポイントと重み
+# (名前, パス, 重み, アカウントIDをクエリに付与するか)
+SCENARIO: List[Tuple[str, str, int, bool]] = [
+    ("posts_insights", "/api/v1/posts/insights", 6, True),
+    ("accounts", "/api/v1/accounts", 3, False),
+    ("accounts_health_tokens", "/api/v1/accounts/health/tokens", 1, False),
+]
+
+# スループットの伸びがこの比率未満になった時点を飽和とみなす
+SATURATION_GAIN_THRESHOLD = 0.05
+
+
+@dataclass
+class EndpointStats:
+    """エンドポイント別計測値"""
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+    status_codes: Dict[int, int] = field(default_factory=dict)
+
+
+@dataclass
+class EndpointReport:
+    """エンドポイント別レポート"""
+    endpoint: str
+    concurrency: int
+    requests: int
+    errors: int
+    error_rate: float
+    throughput_rps: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+    status_codes: Dict[int, int]
+
+
+@dataclass
+class LevelReport:
+    """同時接続数ごとのレポート"""
+    concurrency: int
+    duration_seconds: float
+    total_requests: int
+    total_errors: int
+    throughput_rps: float
+    endpoints: List[EndpointReport]
+
+
+def _percentile(ordered: List[float], percentile: float) -> float:
+    """ソート済みリストのパーセンタイル値"""
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(len(ordered) * percentile)) - 1))
+    return round(ordered[index], 2)
+
+
+async def _discover_account_ids(client: httpx.AsyncClient, limit: int) -> List[str]:
+    """アカウント一覧APIから計測対象のInstagram User IDを取得"""
+    response = await client.get("/api/v1/accounts", params={"active_only": "true"})
+    response.raise_for_status()
+    accounts = response.json().get("accounts", [])
+    return [account["instagram_user_id"] for account in accounts[:limit]]
+
+
+async def _virtual_user(
+    client: httpx.AsyncClient,
+    account_ids: List[str],
+    deadline: float,
+    stats: Dict[str, EndpointStats],
+    rng: random.Random
+):
+    """仮想ユーザー: 期限までシナリオに従ってリクエストを送り続ける"""
+    names = [name for name, _, _, _ in SCENARIO]
+    weights = [weight for _, _, weight, _ in SCENARIO]
+    routes = {name: (path, needs_account) for name, path, _, needs_account in SCENARIO}
+
+    while time.perf_counter() < deadline:
+        name = rng.choices(names, weights=weights)[0]
+        path, needs_account = routes[name]
+        params = {"account_id": rng.choice(account_ids)} if needs_account and account_ids else None
+
+        started = time.perf_counter()
+        try:
+            response = await client.get(path, params=params)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            endpoint_stats = stats[name]
+            endpoint_stats.latencies_ms.append(elapsed_ms)
+            endpoint_stats.status_codes[response.status_code] = endpoint_stats.status_codes.get(response.status_code, 0) + 1
+            if response.status_code >= 400:
+                endpoint_stats.errors += 1
+        except httpx.HTTPError as e:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            stats[name].latencies_ms.append(elapsed_ms)
+            stats[name].errors += 1
+            logger.debug(f"Request error on {name}: {e}")
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    account_ids: List[str],
+    concurrency: int,
+    duration: float,
+    seed: int
+) -> LevelReport:
+    """指定の同時接続数で一定時間負荷をかける"""
+    stats = {name: EndpointStats() for name, _, _, _ in SCENARIO}
+    started = time.perf_counter()
+    deadline = started + duration
+
+    await asyncio.gather(*[
+        _virtual_user(client, account_ids, deadline, stats, random.Random(seed + i))
+        for i in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - started
+
+    endpoint_reports = []
+    for name, endpoint_stats in stats.items():
+        ordered = sorted(endpoint_stats.latencies_ms)
+        count = len(ordered)
+        endpoint_reports.append(EndpointReport(
+            endpoint=name,
+            concurrency=concurrency,
+            requests=count,
+            errors=endpoint_stats.errors,
+            error_rate=round(endpoint_stats.errors / count, 4) if count else 0.0,
+            throughput_rps=round(count / elapsed, 2),
+            p50_ms=_percentile(ordered, 0.50),
+            p90_ms=_percentile(ordered, 0.90),
+            p99_ms=_percentile(ordered, 0.99),
+            max_ms=round(ordered[-1], 2) if ordered else 0.0,
+            status_codes=endpoint_stats.status_codes,
+        ))
+
+    total_requests = sum(r.requests for r in endpoint_reports)
+    total_errors = sum(r.errors for r in endpoint_reports)
+    return LevelReport(
+        concurrency=concurrency,
+        duration_seconds=round(elapsed, 2),
+        total_requests=total_requests,
+        total_errors=total_errors,
+        throughput_rps=round(total_requests / elapsed, 2),
+        endpoints=endpoint_reports,
+    )
+
+
+def find_saturation_point(levels: List[LevelReport]) -> Optional[int]:
+    """スループットの伸びが閾値未満になった同時接続数を返す"""
+    for previous, current in zip(levels, levels[1:]):
+        if previous.throughput_rps <= 0:
+            continue
+        gain = (current.throughput_rps - previous.throughput_rps) / previous.throughput_rps
+        if gain < SATURATION_GAIN_THRESHOLD:
+            return previous.concurrency
+    return None
+
+
+def print_report(levels: List[LevelReport], saturation: Optional[int]):
+    """計測結果の表示"""
+    print(f"\n{'='*100}")
+    print("🚦 HTTP LOAD TEST RESULT")
+    print(f"{'='*100}")
+    print(f"{'conc':>5}  {'endpoint':<26} {'reqs':>7} {'rps':>8} {'err%':>7} {'p50':>8} {'p90':>8} {'p99':>8}")
+    for level in levels:
+        for report in level.endpoints:
+            print(
+                f"{level.concurrency:>5}  {report.endpoint:<26} {report.requests:>7} "
+                f"{report.throughput_rps:>8.2f} {report.error_rate * 100:>6.2f}% "
+                f"{report.p50_ms:>8.1f} {report.p90_ms:>8.1f} {report.p99_ms:>8.1f}"
+            )
+        print(f"{level.concurrency:>5}  {'TOTAL':<26} {level.total_requests:>7} {level.throughput_rps:>8.2f}")
+        print("-" * 100)
+
+    if saturation is not None:
+        print(f"📈 Saturation point: ~{saturation} concurrent users (throughput gain < {SATURATION_GAIN_THRESHOLD:.0%})")
+    else:
+        print("📈 Saturation point not reached in the tested range")
+    print(f"{'='*100}")
+
+
+def parse_arguments():
+    """コマンドライン引数の解析"""
+    parser = argparse.ArgumentParser(description='HTTP Load Test Runner')
+    target_group = parser.add_mutually_exclusive_group()
+    target_group.add_argument('--base-url', default='http://localhost:8000', help='対象サーバーURL')
+    target_group.add_argument('--in-process', action='store_true', help='アプリをプロセス内で起動して計測')
+    parser.add_argument('--concurrency', default='1,5,10,25,50', help='同時接続数（カンマ区切り）')
+    parser.add_argument('--duration', type=float, default=30.0, help='各同時接続数での計測時間（秒）')
+    parser.add_argument('--accounts', type=int, default=20, help='posts/insights で使うアカウント数')
+    parser.add_argument('--timeout', type=float, default=30.0, help='リクエストタイムアウト（秒）')
+    parser.add_argument('--seed', type=int, default=42, help='乱数シード')
+    parser.add_argument('--output', type=Path, help='計測結果のJSON出力先')
+    return parser.parse_args()
+
+
+async def main() -> int:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    args = parse_arguments()
+    levels_to_run = [int(c.strip()) for c in args.concurrency.split(',') if c.strip()]
+
+    if args.in_process:
+        from main import app
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://loadtest"
+    else:
+        transport = None
+        base_url = args.base_url
+
+    limits = httpx.Limits(max_connections=max(levels_to_run), max_keepalive_connections=max(levels_to_run))
+    async with httpx.AsyncClient(
+        base_url=base_url, transport=transport, timeout=args.timeout, limits=limits
+    ) as client:
+        account_ids = await _discover_account_ids(client, args.accounts)
+        if not account_ids:
+            print("❌ No accounts found. Seed the database with seed_benchmark_data.py first.")
+            return 1
+        logger.info(f"Using {len(account_ids)} accounts for posts/insights")
+
+        levels = []
+        for concurrency in levels_to_run:
+            logger.info(f"Running load level: concurrency={concurrency}, duration={args.duration}s")
+            levels.append(await run_level(client, account_ids, concurrency, args.duration, args.seed))
+
+    saturation = find_saturation_point(levels)
+    print_report(levels, saturation)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(
+                {'levels': [asdict(level) for level in levels], 'saturation_concurrency': saturation},
+                f, indent=2, ensure_ascii=False
+            )
+        print(f"📁 結果を保存しました: {args.output}")
+
+    return 1 if any(level.total_errors for level in levels) else 0
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Repository Benchmark Runner
+リポジトリ・サービス層のクエリ性能をデータ規模別に計測するスクリプト
+
+各スケール（投稿メトリクスのスナップショット総数）ごとにシードデータを投入し直し、
+対象メソッドの実行時間を計測する。計測結果は保存済みベースラインと比較し、
+閾値を超えて遅くなったメソッドを回帰として報告する。
+
+Usage:
+    # 1万 / 10万 / 100万スナップショットで計測
+    python scripts/benchmark/run_repository_benchmark.py --scales 10000,100000,1000000
+
+    # 計測結果をベースラインとして保存
+    python scripts/benchmark/run_repository_benchmark.py --update-baseline
+
+    # 既存データを使って計測（再シードしない）
+    python scripts/benchmark/run_repository_benchmark.py --scales 1000000 --no-reseed
+"""
+
+import asyncio
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from dataclasses import dataclass, asdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.core.database import SessionLocal
+from app.models.instagram_account import InstagramAccount
+from app.models.instagram_post import InstagramPost
+from app.repositories.instagram_post_metrics_repository import InstagramPostMetricsRepository
+from app.repositories.instagram_daily_stats_repository import InstagramDailyStatsRepository
+from app.services.api.post_insight_service import PostInsightService
+
+from seed_benchmark_data import (
+    BENCH_ACCOUNT_PREFIX,
+    cleanup_dataset,
+    ensure_local_database,
+    seed_dataset,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASELINE_FILE = Path(__file__).parent / "baseline" / "repository_benchmark_baseline.json"
+
+# スケールごとのアカウント数・投稿数（残りは日数で調整）
+DEFAULT_ACCOUNTS = 200
+DEFAULT_POSTS_PER_ACCOUNT = 50
+
+
+@dataclass
+class BenchmarkResult:
+    """ベンチマーク計測結果"""
+    name: str
+    scale: int
+    iterations: int
+    min_ms: float
+    median_ms: float
+    p95_ms: float
+    max_ms: float
+    baseline_median_ms: Optional[float] = None
+    regression: bool = False
+
+
+def _scale_layout(scale: int) -> Dict[str, int]:
+    """スナップショット総数からアカウント数・投稿数・日数を決定"""
+    accounts = min(DEFAULT_ACCOUNTS, max(1, scale // 1000))
+    posts_per_account = DEFAULT_POSTS_PER_ACCOUNT
+    days = max(1, scale // (accounts * posts_per_account))
+    return {'accounts': accounts, 'posts_per_account': posts_per_account, 'days': days}
+
+
+async def _time_call(
+    func_factory: Callable[[], Awaitable[Any]],
+    iterations: int,
+    warmup: int = 1
+) -> List[float]:
+    """非同期呼び出しの実行時間（ミリ秒）を計測"""
+    for _ in range(warmup):
+        await func_factory()
+
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await func_factory()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def _summarize(name: str, scale: int, timings: List[float]) -> BenchmarkResult:
+    """計測値を集計"""
+    ordered = sorted(timings)
+    p95_index = max(0, int(round(len(ordered) * 0.95)) - 1)
+    return BenchmarkResult(
+        name=name,
+        scale=scale,
+        iterations=len(ordered),
+        min_ms=round(ordered[0], 2),
+        median_ms=round(statistics.median(ordered), 2),
+        p95_ms=round(ordered[p95_index], 2),
+        max_ms=round(ordered[-1], 2),
+    )
+
+
+async def run_benchmarks_for_scale(scale: int, iterations: int) -> List[BenchmarkResult]:
+    """現在のシードデータに対して各メソッドを計測"""
+    db = SessionLocal()
+    try:
+        # 計測対象アカウント（ベンチマークデータ内で最初のアカウント）
+        account = (
+            db.query(InstagramAccount)
+            .filter(InstagramAccount.instagram_user_id.like(f"{BENCH_ACCOUNT_PREFIX}%"))
+            .order_by(InstagramAccount.instagram_user_id)
+            .first()
+        )
+        if not account:
+            raise RuntimeError("Benchmark dataset not found. Run seed_benchmark_data.py first.")
+
+        post_ids = [
+            str(row.id) for row in
+            db.query(InstagramPost.id).filter(InstagramPost.account_id == account.id).all()
+        ]
+        end_date = date.today()
+        start_date = end_date - timedelta(days=89)
+
+        metrics_repo = InstagramPostMetricsRepository(db)
+        daily_stats_repo = InstagramDailyStatsRepository(db)
+        post_insight_service = PostInsightService(db)
+
+        benchmarks: Dict[str, Callable[[], Awaitable[Any]]] = {
+            'post_metrics.get_metrics_summary': lambda: metrics_repo.get_metrics_summary(post_ids),
+            'post_metrics.get_top_performing_posts[account]': lambda: metrics_repo.get_top_performing_posts(
+                account_id=account.id, metric='engagement_rate', limit=10
+            ),
+            'post_metrics.get_top_performing_posts[all]': lambda: metrics_repo.get_top_performing_posts(
+                metric='engagement_rate', limit=10
+            ),
+            'daily_stats.calculate_growth_metrics': lambda: daily_stats_repo.calculate_growth_metrics(
+                account.id, start_date, end_date
+            ),
+            'post_insight_service.get_post_insights': lambda: post_insight_service.get_post_insights(
+                account.instagram_user_id
+            ),
+        }
+
+        results = []
+        for name, call in benchmarks.items():
+            timings = await _time_call(call, iterations)
+            result = _summarize(name, scale, timings)
+            logger.info(f"[{scale}] {name}: median={result.median_ms}ms p95={result.p95_ms}ms")
+            results.append(result)
+            # セッションキャッシュの影響を避ける
+            db.expire_all()
+
+        return results
+    finally:
+        db.close()
+
+
+def load_baseline(baseline_file: Path) -> Dict[str, Dict[str, float]]:
+    """ベースライン読み込み（{scale: {name: median_ms}}）"""
+    if not baseline_file.exists():
+        return {}
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        return json.load(f).get('results', {})
+
+
+def save_baseline(baseline_file: Path, results: List[BenchmarkResult]):
+    """計測結果をベースラインとして保存（既存スケールは上書き）"""
+    baseline = load_baseline(baseline_file)
+    for result in results:
+        baseline.setdefault(str(result.scale), {})[result.name] = result.median_ms
+
+    baseline_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(baseline_file, 'w', encoding='utf-8') as f:
+        json.dump(
+            {'updated_at': datetime.now().isoformat(), 'results': baseline},
+            f, indent=2, ensure_ascii=False
+        )
+    logger.info(f"Baseline saved: {baseline_file}")
+
+
+def compare_with_baseline(
+    results: List[BenchmarkResult],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float
+) -> List[BenchmarkResult]:
+    """ベースラインと比較し、回帰したメソッドを返す"""
+    regressions = []
+    for result in results:
+        baseline_median = baseline.get(str(result.scale), {}).get(result.name)
+        if baseline_median is None:
+            continue
+        result.baseline_median_ms = baseline_median
+        if result.median_ms > baseline_median * (1 + threshold):
+            result.regression = True
+            regressions.append(result)
+    return regressions
+
+
+def print_report(results: List[BenchmarkResult], threshold: float):
+    """計測結果の表示"""
+    print(f"\n{'='*100}")
+    print("⏱️ REPOSITORY BENCHMARK RESULT")
+    print(f"{'='*100}")
+    print(f"{'scale':>9}  {'benchmark':<48} {'median':>9} {'p95':>9} {'baseline':>9}  status")
+    for result in results:
+        baseline = f"{result.baseline_median_ms:.2f}" if result.baseline_median_ms is not None else "-"
+        status = f"❌ REGRESSION (>{threshold:.0%})" if result.regression else "✅"
+        print(
+            f"{result.scale:>9}  {result.name:<48} {result.median_ms:>9.2f} "
+            f"{result.p95_ms:>9.2f} {baseline:>9}  {status}"
+        )
+    print(f"{'='*100}")
+
+
+def parse_arguments():
+    """コマンドライン引数の解析"""
+    parser = argparse.ArgumentParser(description='Repository Benchmark Runner')
+    parser.add_argument('--scales', default='10000,100000,1000000',
+                        help='スナップショット総数（カンマ区切り）')
+    parser.add_argument('--iterations', type=int, default=10, help='メソッドごとの計測回数')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='回帰とみなす中央値の悪化率（0.2 = 20%%）')
+    parser.add_argument('--baseline-file', type=Path, default=DEFAULT_BASELINE_FILE,
+                        help='ベースラインJSONファイル')
+    parser.add_argument('--update-baseline', action='store_true', help='計測結果をベースラインとして保存')
+    parser.add_argument('--no-reseed', action='store_true', help='既存のシードデータで計測')
+    parser.add_argument('--keep-data', action='store_true', help='計測後にシードデータを残す')
+    parser.add_argument('--output', type=Path, help='計測結果のJSON出力先')
+    parser.add_argument('--allow-remote', action='store_true', help='ローカル以外のDBでの実行を許可')
+    return parser.parse_args()
+
+
+async def main() -> int:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    args = parse_arguments()
+
+    try:
+        ensure_local_database(args.allow_remote)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+
+    scales = [int(s.strip()) for s in args.scales.split(',') if s.strip()]
+    all_results: List[BenchmarkResult] = []
+
+    for scale in scales:
+        if not args.no_reseed:
+            layout = _scale_layout(scale)
+            logger.info(f"Seeding dataset for scale {scale}: {layout}")
+            db = SessionLocal()
+            try:
+                cleanup_dataset(db)
+                seed_dataset(db, **layout)
+            finally:
+                db.close()
+
+        all_results.extend(await run_benchmarks_for_scale(scale, args.iterations))
+
+    if not args.keep_data and not args.no_reseed:
+        db = SessionLocal()
+        try:
+            cleanup_dataset(db)
+        finally:
+            db.close()
+
+    baseline = load_baseline(args.baseline_file)
+    regressions = compare_with_baseline(all_results, baseline, args.threshold)
+    print_report(all_results, args.threshold)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump([asdict(r) for r in all_results], f, indent=2, ensure_ascii=False)
+
+    if args.update_baseline:
+        save_baseline(args.baseline_file, all_results)
+        print(f"📁 Baseline updated: {args.baseline_file}")
+        return 0
+
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) detected")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
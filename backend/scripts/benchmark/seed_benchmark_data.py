@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Benchmark Dataset Seeder
+ベンチマーク用のシードデータをローカルPostgresに投入するスクリプト
+
+アカウント・投稿・投稿メトリクス（日次スナップショット）・日次統計を
+乱数シード固定で生成する。投入データは instagram_user_id が "bench_" で始まる
+アカウントに紐付くため、--cleanup で実データに影響なく削除できる。
+
+Usage:
+    # 200アカウント × 50投稿 × 100日 = 100万スナップショット
+    python scripts/benchmark/seed_benchmark_data.py --accounts 200 --posts-per-account 50 --days 100
+
+    # ベンチマークデータの削除
+    python scripts/benchmark/seed_benchmark_data.py --cleanup
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List, Any
+
+from sqlalchemy import insert, delete, select
+from sqlalchemy.orm import Session
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.core.database import SessionLocal, engine
+from app.models.instagram_account import InstagramAccount
+from app.models.instagram_post import InstagramPost
+from app.models.instagram_post_metrics import InstagramPostMetrics
+from app.models.instagram_daily_stats import InstagramDailyStats
+
+logger = logging.getLogger(__name__)
+
+# ベンチマークデータ識別用プレフィックス
+BENCH_ACCOUNT_PREFIX = "bench_"
+
+# 一括INSERTのバッチサイズ
+INSERT_BATCH_SIZE = 10000
+
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+MEDIA_TYPES = ["IMAGE", "VIDEO", "CAROUSEL_ALBUM"]
+
+
+def ensure_local_database(allow_remote: bool = False) -> None:
+    """接続先がローカルDBであることを確認（本番DBへの誤投入防止）"""
+    host = engine.url.host or "localhost"
+    if host not in LOCAL_HOSTS and not allow_remote:
+        raise RuntimeError(
+            f"Refusing to seed benchmark data into non-local database host: {host}. "
+            "Set DATABASE_URL to a local Postgres or pass --allow-remote."
+        )
+
+
+def _deterministic_uuid(rng: random.Random) -> uuid.UUID:
+    """シード固定の乱数からUUIDを生成"""
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _flush(db: Session, model, rows: List[Dict[str, Any]]) -> int:
+    """バッファ済みの行を一括INSERT"""
+    if not rows:
+        return 0
+    db.execute(insert(model.__table__), rows)
+    db.commit()
+    count = len(rows)
+    rows.clear()
+    return count
+
+
+def seed_dataset(
+    db: Session,
+    accounts: int,
+    posts_per_account: int,
+    days: int,
+    seed: int = 42,
+    end_date: date = None
+) -> Dict[str, int]:
+    """
+    ベンチマーク用データセットを生成・投入
+
+    Args:
+        db: データベースセッション
+        accounts: 生成アカウント数
+        posts_per_account: アカウントあたりの投稿数
+        days: 投稿あたりのメトリクススナップショット日数（日次統計の日数も同じ）
+        seed: 乱数シード
+        end_date: データ期間の最終日（未指定時は今日）
+
+    Returns:
+        Dict[str, int]: テーブル別の投入件数
+    """
+    rng = random.Random(seed)
+    end_date = end_date or date.today()
+    start_date = end_date - timedelta(days=days - 1)
+
+    counts = {'accounts': 0, 'posts': 0, 'post_metrics': 0, 'daily_stats': 0}
+    account_rows: List[Dict[str, Any]] = []
+    post_rows: List[Dict[str, Any]] = []
+    metrics_rows: List[Dict[str, Any]] = []
+    daily_rows: List[Dict[str, Any]] = []
+
+    for account_index in range(accounts):
+        account_id = _deterministic_uuid(rng)
+        account_rows.append({
+            'id': account_id,
+            'instagram_user_id': f"{BENCH_ACCOUNT_PREFIX}{account_index:06d}",
+            'username': f"bench_user_{account_index}",
+            'account_name': f"Benchmark Account {account_index}",
+            'access_token_encrypted': "bench_token",
+            'token_expires_at': datetime.now(timezone.utc) + timedelta(days=rng.randint(-5, 60)),
+            'is_active': True,
+        })
+
+        # 日次統計
+        followers = rng.randint(500, 50000)
+        for day_offset in range(days):
+            followers += rng.randint(-20, 60)
+            daily_rows.append({
+                'id': _deterministic_uuid(rng),
+                'account_id': account_id,
+                'stats_date': start_date + timedelta(days=day_offset),
+                'followers_count': max(followers, 0),
+                'following_count': rng.randint(100, 1000),
+                'media_count': posts_per_account,
+                'posts_count': rng.randint(0, 2),
+                'total_likes': rng.randint(0, 2000),
+                'total_comments': rng.randint(0, 200),
+                'media_type_distribution': '{}',
+                'data_sources': '["benchmark_seed"]',
+            })
+
+        # 投稿とメトリクススナップショット
+        for post_index in range(posts_per_account):
+            post_id = _deterministic_uuid(rng)
+            posted_at = datetime.combine(
+                start_date, time(hour=rng.randint(0, 23)), tzinfo=timezone.utc
+            ) - timedelta(days=rng.randint(0, 30))
+            media_type = rng.choice(MEDIA_TYPES)
+            post_rows.append({
+                'id': post_id,
+                'account_id': account_id,
+                'instagram_post_id': f"{BENCH_ACCOUNT_PREFIX}{account_index:06d}_{post_index:05d}",
+                'media_type': media_type,
+                'caption': "benchmark post",
+                'media_url': "https://example.com/media.jpg",
+                'thumbnail_url': None,
+                'permalink': "https://example.com/p/bench",
+                'posted_at': posted_at,
+            })
+
+            likes = comments = saved = shares = views = reach = 0
+            for day_offset in range(days):
+                # 累積値は単調増加し、時間とともに伸びが鈍化する
+                growth = max(1, 50 - day_offset)
+                likes += rng.randint(0, growth)
+                comments += rng.randint(0, max(1, growth // 10))
+                saved += rng.randint(0, max(1, growth // 5))
+                shares += rng.randint(0, max(1, growth // 8))
+                reach += rng.randint(growth, growth * 10)
+                views += rng.randint(growth, growth * 15) if media_type == "VIDEO" else 0
+                engagement_rate = min(round((likes + comments + saved + shares) / reach * 100, 2), 999.99)
+
+                metrics_rows.append({
+                    'id': _deterministic_uuid(rng),
+                    'post_id': post_id,
+                    'likes': likes,
+                    'comments': comments,
+                    'saved': saved,
+                    'shares': shares,
+                    'views': views,
+                    'reach': reach,
+                    'total_interactions': likes + comments + saved + shares,
+                    'engagement_rate': engagement_rate,
+                    'recorded_at': datetime.combine(
+                        start_date + timedelta(days=day_offset), time(hour=12), tzinfo=timezone.utc
+                    ),
+                })
+
+                if len(metrics_rows) >= INSERT_BATCH_SIZE:
+                    # 外部キー制約を満たすため親テーブルを先に投入
+                    counts['accounts'] += _flush(db, InstagramAccount, account_rows)
+                    counts['posts'] += _flush(db, InstagramPost, post_rows)
+                    counts['post_metrics'] += _flush(db, InstagramPostMetrics, metrics_rows)
+
+        if len(daily_rows) >= INSERT_BATCH_SIZE:
+            counts['accounts'] += _flush(db, InstagramAccount, account_rows)
+            counts['daily_stats'] += _flush(db, InstagramDailyStats, daily_rows)
+
+        if (account_index + 1) % 10 == 0:
+            logger.info(f"Seeded {account_index + 1}/{accounts} accounts ({counts['post_metrics']} snapshots so far)")
+
+    counts['accounts'] += _flush(db, InstagramAccount, account_rows)
+    counts['posts'] += _flush(db, InstagramPost, post_rows)
+    counts['post_metrics'] += _flush(db, InstagramPostMetrics, metrics_rows)
+    counts['daily_stats'] += _flush(db, InstagramDailyStats, daily_rows)
+
+    logger.info(f"Benchmark dataset seeded: {counts}")
+    return counts
+
+
+def cleanup_dataset(db: Session) -> int:
+    """ベンチマークデータを削除（削除したアカウント数を返す）"""
+    bench_accounts = select(InstagramAccount.id).where(
+        InstagramAccount.instagram_user_id.like(f"{BENCH_ACCOUNT_PREFIX}%")
+    )
+    bench_posts = select(InstagramPost.id).where(InstagramPost.account_id.in_(bench_accounts))
+
+    db.execute(delete(InstagramPostMetrics).where(InstagramPostMetrics.post_id.in_(bench_posts)))
+    db.execute(delete(InstagramPost).where(InstagramPost.account_id.in_(bench_accounts)))
+    db.execute(delete(InstagramDailyStats).where(InstagramDailyStats.account_id.in_(bench_accounts)))
+    result = db.execute(
+        delete(InstagramAccount).where(InstagramAccount.instagram_user_id.like(f"{BENCH_ACCOUNT_PREFIX}%"))
+    )
+    db.commit()
+
+    logger.info(f"Benchmark dataset removed: {result.rowcount} accounts")
+    return result.rowcount
+
+
+def parse_arguments():
+    """コマンドライン引数の解析"""
+    parser = argparse.ArgumentParser(description='Benchmark Dataset Seeder')
+    parser.add_argument('--accounts', type=int, default=200, help='生成アカウント数')
+    parser.add_argument('--posts-per-account', type=int, default=50, help='アカウントあたりの投稿数')
+    parser.add_argument('--days', type=int, default=100, help='投稿あたりのメトリクス日数')
+    parser.add_argument('--seed', type=int, default=42, help='乱数シード')
+    parser.add_argument('--cleanup', action='store_true', help='ベンチマークデータを削除して終了')
+    parser.add_argument('--allow-remote', action='store_true', help='ローカル以外のDBへの投入を許可')
+    return parser.parse_args()
+
+
+def main() -> int:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    args = parse_arguments()
+
+    try:
+        ensure_local_database(args.allow_remote)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+
+    db = SessionLocal()
+    try:
+        cleanup_dataset(db)
+        if args.cleanup:
+            print("🧹 Benchmark dataset removed")
+            return 0
+
+        started_at = datetime.now()
+        counts = seed_dataset(db, args.accounts, args.posts_per_account, args.days, args.seed)
+        duration = (datetime.now() - started_at).total_seconds()
+
+        print(f"\n{'='*60}")
+        print("🌱 BENCHMARK DATASET SEEDED")
+        print(f"{'='*60}")
+        for table, count in counts.items():
+            print(f"   {table}: {count}")
+        print(f"⏱️ Duration: {duration:.1f}s")
+        print(f"{'='*60}")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,6 +18,12 @@ Usage:
 
     # 日次統計のみ収集（新機能）
     python scripts/collect_historical_data.py --account 17841435735142253 --from 2025-01-01 --to 2025-07-01 --daily-stats-only
+
+    # 中断した収集を前回のチェックポイントから再開
+    python scripts/collect_historical_data.py --account 17841435735142253 --from 2025-01-01 --to 2025-07-01 --resume
+
+    # API 呼び出し数・所要時間の見積もりのみ（収集しない）
+    python scripts/collect_historical_data.py --all-accounts --from 2025-01-01 --to 2025-07-01 --plan
 """
 
 import asyncio
@@ -42,6 +48,7 @@ from app.core.database import test_connection, get_db_sync
 from app.repositories.instagram_account_repository import InstagramAccountRepository
 from app.repositories.instagram_daily_stats_repository import InstagramDailyStatsRepository
 from app.services.data_collection.instagram_api_client import InstagramAPIClient
+from app.services.data_collection.collection_planner import CollectionPlanner, format_run_plan
 
 # ログ設定
 logging.basicConfig(
@@ -72,6 +79,12 @@ Examples:
 
   # 全アカウントのメトリクス未取得投稿のみ収集
   python scripts/collect_historical_data.py --all-accounts --missing-metrics
+
+  # 中断した収集を前回のチェックポイントから再開
+  python scripts/collect_historical_data.py --account 17841435735142253 --from 2025-01-01 --to 2025-07-01 --resume
+
+  # API 呼び出し数・所要時間の見積もりのみ（収集しない）
+  python scripts/collect_historical_data.py --all-accounts --from 2025-01-01 --to 2025-07-01 --plan
         """
     )
     
@@ -138,6 +151,24 @@ Examples:
         help='日次統計のみ作成（投稿データは既存データから集約）'
     )
     
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='前回中断した投稿収集をチェックポイントから再開'
+    )
+    
+    parser.add_argument(
+        '--no-inline-insights',
+        action='store_true',
+        help='メトリクスを投稿一覧のフィールド展開で取得せず、投稿ごとに取得'
+    )
+    
+    parser.add_argument(
+        '--plan',
+        action='store_true',
+        help='API 呼び出し数・所要時間・枠の消費を見積もって表示のみ（収集しない）'
+    )
+    
     return parser.parse_args()
 
 def validate_date(date_string: str) -> date:
@@ -219,6 +250,9 @@ def print_collection_plan(args, target_accounts: List[str]):
         print(f"📅 期間: {args.from_date} から {args.to_date}")
         print(f"🔄 処理: 投稿データ収集 → メトリクス取得 → 日次統計作成")
     
+    if args.resume and not (args.missing_metrics or args.daily_stats_only):
+        print(f"⏯️ 再開: 前回のチェックポイントから投稿収集を再開")
+    
     print("="*60)
 
 def generate_output_filename(operation_type: str, account_info: str = None) -> str:
@@ -324,6 +358,11 @@ def format_single_result(result, operation_type: str, execution_time: float) ->
                 "completed_successfully": result.error_message is None,
                 "error_message": result.error_message
             },
+            "checkpoint": {
+                "pages_completed": result.checkpoint_data.get('pages_completed'),
+                "last_chunk": result.checkpoint_data.get('last_chunk'),
+                "completed_posts": len(result.checkpoint_data.get('completed_post_ids', []))
+            } if result.checkpoint_data else None,
             "additional_data": getattr(result, 'additional_data', None)
         }
 
@@ -430,6 +469,24 @@ def print_result_summary(result_data: Dict[str, Any]):
     print(f"⏱️ 合計実行時間: {result_data['metadata']['execution_time_seconds']}s")
     print("="*60)
 
+async def build_run_plan(args, target_accounts: List[str]):
+    """--plan: 保存済みデータから実行計画を見積もる"""
+    db = get_db_sync()
+    try:
+        planner = CollectionPlanner(db)
+        return await planner.plan_historical_posts(
+            target_accounts,
+            args.from_date,
+            args.to_date,
+            include_metrics=not args.posts_only,
+            include_daily_stats=not (args.posts_only or args.missing_metrics),
+            posts=not args.daily_stats_only,
+            inline_insights=not args.no_inline_insights,
+            missing_metrics=args.missing_metrics
+        )
+    finally:
+        db.close()
+
 async def collect_daily_stats_from_posts(
     account_id: str, 
     start_date: date, 
@@ -632,7 +689,9 @@ async def collect_single_account(account_id: str, args) -> Optional[any]:
                     start_date=args.from_date,
                     end_date=args.to_date,
                     include_metrics=include_metrics,
-                    chunk_size=50
+                    chunk_size=50,
+                    resume=args.resume,
+                    inline_insights=not args.no_inline_insights
                 )
             
             # 投稿データ収集後、日次統計も作成（posts-onlyでない場合）
@@ -707,6 +766,11 @@ async def main():
         # 収集計画表示
         print_collection_plan(args, target_accounts)
         
+        # 見積もりのみ
+        if args.plan:
+            print(format_run_plan(await build_run_plan(args, target_accounts)))
+            return 0
+        
         # 確認プロンプト
         if not args.yes:
             response = input("\n過去データ収集を続行しますか？ (y/N): ")
@@ -12,6 +12,9 @@ Usage:
 
     # 単一アカウントの過去93日間のインサイト収集
     python scripts/collect_historical_insights.py --account 17841435735142253 --days-back 93
+
+    # API 呼び出し数・所要時間の見積もりのみ
+    python scripts/collect_historical_insights.py --all-accounts --days-back 93 --plan
 """
 
 import asyncio
@@ -35,6 +38,7 @@ from app.core.database import test_connection, get_db_sync
 from app.repositories.instagram_account_repository import InstagramAccountRepository
 from app.repositories.instagram_daily_stats_repository import InstagramDailyStatsRepository
 from app.services.data_collection.instagram_api_client import InstagramAPIClient, InstagramAPIError
+from app.services.data_collection.collection_planner import CollectionPlanner, format_run_plan
 
 # ログ設定
 logging.basicConfig(
@@ -62,6 +66,9 @@ Examples:
 
   # 単一アカウントの過去93日間のインサイト収集
   python scripts/collect_historical_insights.py --account 17841435735142253 --days-back 93
+
+  # API 呼び出し数・所要時間の見積もりのみ
+  python scripts/collect_historical_insights.py --all-accounts --days-back 93 --plan
         """
     )
     
@@ -118,6 +125,12 @@ Examples:
         help='確認プロンプトをスキップ'
     )
     
+    parser.add_argument(
+        '--plan',
+        action='store_true',
+        help='API 呼び出し数・所要時間・枠の消費を見積もって表示のみ（収集しない）'
+    )
+    
     return parser.parse_args()
 
 def validate_date(date_string: str) -> date:
@@ -219,6 +232,14 @@ class InsightsCollectionResult:
         self.error_message = None
         self.collected_insights = []
 
+async def build_run_plan(args, target_accounts: List[str]):
+    """--plan: 保存済みデータから実行計画を見積もる"""
+    db = get_db_sync()
+    try:
+        return await CollectionPlanner(db).plan_account_insights(target_accounts, args.from_date, args.to_date)
+    finally:
+        db.close()
+
 async def collect_account_insights(
     account_id: str,
     start_date: date,
@@ -253,56 +274,43 @@ async def collect_account_insights(
         result.total_days = len(target_dates)
         logger.info(f"   対象日数: {result.total_days} 日")
         
+        # インサイトデータ取得（最大30日幅のリクエストを日別に分解）
         async with InstagramAPIClient() as api_client:
-            for target_date in target_dates:
-                result.processed_days += 1
-                
-                try:
-                    logger.debug(f"   処理中: {target_date} ({result.processed_days}/{result.total_days})")
-                    
-                    # 既存データチェック
-                    existing_stats = await daily_stats_repo.get_by_specific_date(
-                        account.id, target_date
-                    )
-                    
-                    # インサイトデータ取得
-                    insights_data = await api_client.get_insights_metrics(
-                        account.instagram_user_id,
-                        account.access_token_encrypted,
-                        target_date
-                    )
-                    
-                    # データベース保存
-                    stats_data = {
-                        'account_id': account.id,
-                        'stats_date': target_date,
-                        'reach': insights_data.get('reach', 0),
-                        'follower_count_change': insights_data.get('follower_count', 0),
-                        'data_sources': json.dumps(['api_insights'])
-                    }
-                    
-                    if existing_stats:
-                        # 既存データの更新
-                        updated_stats = await daily_stats_repo.update(existing_stats.id, stats_data)
-                        logger.debug(f"     ✅ 更新: {target_date} - reach: {insights_data.get('reach', 0)}, follower_change: {insights_data.get('follower_count', 0)}")
-                    else:
-                        # 新規データ作成
-                        new_stats = await daily_stats_repo.create(stats_data)
-                        logger.debug(f"     ✅ 新規: {target_date} - reach: {insights_data.get('reach', 0)}, follower_change: {insights_data.get('follower_count', 0)}")
-                    
-                    result.success_days += 1
-                    result.collected_insights.append({
-                        'date': target_date.isoformat(),
-                        'reach': insights_data.get('reach', 0),
-                        'follower_count_change': insights_data.get('follower_count', 0)
-                    })
-                    
-                    # API制限対応：呼び出し間隔
-                    await asyncio.sleep(1)
-                    
-                except Exception as e:
-                    logger.warning(f"     ❌ 失敗: {target_date} - {str(e)}")
-                    result.failed_days += 1
+            daily_insights = await api_client.get_insights_metrics_range(
+                account.instagram_user_id,
+                account.access_token_encrypted,
+                start_date,
+                end_date
+            )
+        
+        # 日別の行にまとめて一括保存（既存行はインサイト列のみ更新）
+        stats_list = []
+        for target_date in target_dates:
+            result.processed_days += 1
+            insights_data = daily_insights.get(target_date)
+            if insights_data is None:
+                logger.warning(f"     ❌ 失敗: {target_date} - No insights values returned")
+                result.failed_days += 1
+                continue
+            
+            stats_list.append({
+                'account_id': account.id,
+                'stats_date': target_date,
+                'reach': insights_data.get('reach', 0),
+                'follower_count_change': insights_data.get('follower_count', 0),
+                'data_sources': json.dumps(['api_insights'])
+            })
+            result.collected_insights.append({
+                'date': target_date.isoformat(),
+                'reach': insights_data.get('reach', 0),
+                'follower_count_change': insights_data.get('follower_count', 0)
+            })
+            logger.debug(f"     ✅ {target_date} - reach: {insights_data.get('reach', 0)}, follower_change: {insights_data.get('follower_count', 0)}")
+        
+        result.success_days = await daily_stats_repo.bulk_upsert(
+            stats_list,
+            update_columns=['reach', 'follower_count_change']
+        )
         
         db.close()
         
@@ -494,6 +502,11 @@ async def main():
         # 収集計画表示
         print_collection_plan(args, target_accounts)
         
+        # 見積もりのみ
+        if args.plan:
+            print(format_run_plan(await build_run_plan(args, target_accounts)))
+            return 0
+        
         # 確認プロンプト
         if not args.yes:
             response = input("\n過去インサイト収集を続行しますか？ (y/N): ")
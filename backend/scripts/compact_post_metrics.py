@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Post Metrics Compaction Script
+instagram_post_metrics の保持期間ポリシーに従った間引き（日次 → 週次 → 月次）
+
+削除する行は事前に data/archive/post_metrics/ 配下へ gzip JSONL で書き出し、
+--restore で元に戻せる。
+
+Usage:
+    python scripts/compact_post_metrics.py --dry-run
+    python scripts/compact_post_metrics.py --daily-days 90 --weekly-days 365 -y
+    python scripts/compact_post_metrics.py --export-only
+    python scripts/compact_post_metrics.py --restore data/archive/post_metrics/post_metrics_archive_20250722_030000.jsonl.gz
+"""
+
+import asyncio
+import sys
+import argparse
+import logging
+import os
+from pathlib import Path
+
+# プロジェクトルートディレクトリをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.database import SessionLocal, test_connection
+from app.services.data_collection.metrics_retention_service import (
+    DEFAULT_ARCHIVE_DIR,
+    DEFAULT_POST_BATCH_SIZE,
+    MetricsRetentionService,
+    RetentionPolicy,
+)
+
+# ログ設定
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_arguments():
+    """コマンドライン引数の解析"""
+    parser = argparse.ArgumentParser(
+        description='Instagram Post Metrics Compaction Script',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # 間引き対象の件数を確認
+  python scripts/compact_post_metrics.py --dry-run
+
+  # 90日までは日次、1年までは週次、それ以降は月次に間引き
+  python scripts/compact_post_metrics.py --daily-days 90 --weekly-days 365 -y
+
+  # アーカイブの書き出しのみ（削除なし）
+  python scripts/compact_post_metrics.py --export-only
+
+  # アーカイブから復元
+  python scripts/compact_post_metrics.py --restore data/archive/post_metrics/post_metrics_archive_20250722_030000.jsonl.gz
+        """
+    )
+    parser.add_argument('--daily-days', type=int, default=90, help='日次粒度で保持する日数 (デフォルト: 90)')
+    parser.add_argument('--weekly-days', type=int, default=365, help='週次粒度で保持する日数、以降は月次 (デフォルト: 365)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_POST_BATCH_SIZE, help='1バッチで処理する投稿数')
+    parser.add_argument('--archive-dir', default=str(DEFAULT_ARCHIVE_DIR), help='アーカイブの出力先')
+    parser.add_argument('--dry-run', action='store_true', help='ドライラン実行（件数の集計のみ）')
+    parser.add_argument('--export-only', action='store_true', help='アーカイブの書き出しのみ（削除しない）')
+    parser.add_argument('--restore', metavar='ARCHIVE', help='アーカイブファイルから間引き前の行を復元')
+    parser.add_argument('--yes', '-y', action='store_true', help='確認プロンプトをスキップ')
+    parser.add_argument('--verbose', action='store_true', help='詳細ログ出力')
+    return parser.parse_args()
+
+
+def print_summary(summary):
+    """実行結果サマリーを表示"""
+    duration = (summary.completed_at - summary.started_at).total_seconds()
+    mode = " (DRY RUN)" if summary.dry_run else " (EXPORT ONLY)" if summary.export_only else ""
+
+    print("\n" + "="*60)
+    print(f"🗜️ POST METRICS COMPACTION SUMMARY{mode}")
+    print("="*60)
+    print(f"📐 Policy: daily {summary.policy.daily_days}d / weekly {summary.policy.weekly_days}d / monthly after")
+    print(f"🎯 Posts scanned: {summary.posts_scanned}")
+    print(f"📊 Rows scanned: {summary.rows_scanned}")
+    print(f"🧮 Buckets compacted: {summary.buckets_compacted}")
+    print(f"📦 Rows archived: {summary.rows_archived}")
+    print(f"🗑️ Rows deleted{' (planned)' if summary.dry_run else ''}: {summary.rows_deleted}")
+    if summary.archive_path:
+        print(f"💾 Archive: {summary.archive_path}")
+    if summary.errors:
+        print(f"❌ Errors ({len(summary.errors)}):")
+        for error in summary.errors[:5]:
+            print(f"   {error}")
+    print(f"⏱️  Duration: {duration:.2f} seconds")
+    print("="*60)
+
+
+async def main():
+    """メイン処理"""
+    args = parse_arguments()
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    if not os.getenv('DATABASE_URL'):
+        logger.error("Missing required environment variables: DATABASE_URL")
+        return 1
+
+    if not test_connection():
+        logger.error("Database connection failed")
+        return 1
+
+    db = SessionLocal()
+    try:
+        service = MetricsRetentionService(db, archive_dir=Path(args.archive_dir))
+
+        # 復元
+        if args.restore:
+            archive_path = Path(args.restore)
+            if not archive_path.exists():
+                print(f"❌ Archive not found: {archive_path}")
+                return 1
+            restored = await service.restore_archive(archive_path)
+            print(f"♻️ Restored {restored} rows from {archive_path}")
+            return 0
+
+        try:
+            policy = RetentionPolicy(daily_days=args.daily_days, weekly_days=args.weekly_days)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+
+        if not args.dry_run and not args.export_only and not args.yes:
+            print(f"⚠️ Snapshots older than {policy.daily_days} days will be compacted "
+                  f"(archived to {args.archive_dir} before deletion).")
+            if input("Continue? [y/N]: ").strip().lower() != 'y':
+                print("Cancelled")
+                return 0
+
+        summary = await service.compact(
+            policy,
+            dry_run=args.dry_run,
+            export_only=args.export_only,
+            batch_size=args.batch_size
+        )
+        print_summary(summary)
+        return 1 if summary.errors else 0
+
+    finally:
+        db.close()
+
+
+def cli_entry_point():
+    """CLI エントリーポイント"""
+    try:
+        exit_code = asyncio.run(main())
+        sys.exit(exit_code)
+    except KeyboardInterrupt:
+        print("\n⚠️ Interrupted by user")
+        sys.exit(130)
+
+
+if __name__ == "__main__":
+    cli_entry_point()
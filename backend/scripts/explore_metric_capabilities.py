@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Metric Capability Exploration Script
+投稿インサイトメトリクスの取得可否を1件ずつ確認し、学習キャッシュ（migration 015）に記録する
+
+verification/about-post/explore_all_metrics.py の探索を本番のアカウント・キャッシュに対して行う。
+未確認・再確認時期を過ぎたメトリクスのみ要求するため、繰り返し実行しても API 呼び出しは増えない。
+
+Usage:
+    python scripts/explore_metric_capabilities.py --show
+    python scripts/explore_metric_capabilities.py --account 17841402015304577
+    python scripts/explore_metric_capabilities.py --account 17841402015304577 --limit 20
+"""
+
+import asyncio
+import sys
+import os
+import argparse
+import logging
+from typing import Dict, List, Set
+
+# プロジェクトルートをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.database import SessionLocal
+from app.core.instagram_config import instagram_config
+from app.repositories.instagram_account_repository import InstagramAccountRepository
+from app.services.data_collection.instagram_api_client import InstagramAPIClient, InstagramAPIError
+from app.services.data_collection.metric_capability_cache import metric_capability_cache
+
+# ログ設定
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 設定済みメトリクス以外に確認する候補（保存対象外だが取得可否の把握のため）
+EXTRA_CANDIDATE_METRICS = [
+    'ig_reels_video_view_total_time',
+    'ig_reels_avg_watch_time',
+    'clips_replays_count',
+    'ig_reels_aggregated_all_plays_count',
+    'plays',
+    'navigation',
+    'replies',
+]
+
+
+def parse_arguments():
+    """コマンドライン引数の解析"""
+    parser = argparse.ArgumentParser(description='Metric Capability Exploration')
+    parser.add_argument('--account', help='探索に使うアカウントの Instagram User ID（未指定時は最初のアクティブアカウント）')
+    parser.add_argument('--limit', type=int, default=10, help='確認する投稿数 (デフォルト: 10)')
+    parser.add_argument('--show', action='store_true', help='学習済みの取得可否を表示のみ（API を呼ばない）')
+    return parser.parse_args()
+
+
+def candidate_metrics(media_type: str) -> List[str]:
+    """メディアタイプ別の確認候補（設定済みメトリクス + 追加候補）"""
+    metrics = instagram_config.get_media_metrics_for_type(media_type)
+    return metrics + [metric for metric in EXTRA_CANDIDATE_METRICS if metric not in metrics]
+
+
+def print_snapshot():
+    """学習済みの取得可否を表示"""
+    snapshot = metric_capability_cache.snapshot()
+
+    print(f"\n{'='*60}")
+    print("🧭 METRIC CAPABILITIES")
+    print(f"{'='*60}")
+    if not snapshot:
+        print("📭 No capabilities learned yet")
+    for key, metrics in snapshot.items():
+        supported = [metric for metric, is_supported in metrics.items() if is_supported]
+        unsupported = [metric for metric, is_supported in metrics.items() if not is_supported]
+        print(f"📦 {key.media_type} / {key.media_product_type} / {key.age_bucket}")
+        print(f"   ✅ {', '.join(supported) or '-'}")
+        print(f"   ❌ {', '.join(unsupported) or '-'}")
+    print(f"{'='*60}")
+
+
+async def explore(instagram_user_id: str, access_token: str, limit: int) -> Dict[str, int]:
+    """投稿ごとに未確認のメトリクスを1件ずつ要求して学習"""
+    stats = {'posts_checked': 0, 'metrics_probed': 0, 'keys_skipped': 0}
+    explored_keys: Set = set()
+
+    await metric_capability_cache.load()
+    async with InstagramAPIClient() as api_client:
+        data = await api_client._make_request(
+            instagram_config.get_user_media_url(instagram_user_id),
+            {
+                'fields': 'id,media_type,media_product_type,timestamp',
+                'access_token': access_token,
+                'limit': limit
+            }
+        )
+
+        for post in data.get('data', [])[:limit]:
+            key = metric_capability_cache.key_for(
+                post.get('media_type'), post.get('media_product_type'), post.get('timestamp')
+            )
+            # 同じ区分は1投稿で確認すれば十分
+            if key in explored_keys:
+                stats['keys_skipped'] += 1
+                continue
+            explored_keys.add(key)
+
+            unknown = [
+                metric for metric in candidate_metrics(key.media_type)
+                if metric_capability_cache.is_supported(key, metric) is None
+            ]
+            stats['posts_checked'] += 1
+            if not unknown:
+                continue
+
+            print(f"🔍 {post['id']} ({'/'.join(key)}): probing {len(unknown)} metrics")
+            metrics = await api_client.probe_post_metrics(post['id'], access_token, key, unknown)
+            stats['metrics_probed'] += len(unknown)
+            print(f"   ✅ {len(metrics)}/{len(unknown)} supported")
+
+    return stats
+
+
+async def main() -> int:
+    args = parse_arguments()
+
+    if args.show:
+        await metric_capability_cache.load()
+        print_snapshot()
+        return 0
+
+    db = SessionLocal()
+    try:
+        account_repo = InstagramAccountRepository(db)
+        if args.account:
+            account = await account_repo.get_by_instagram_user_id(args.account)
+        else:
+            accounts = await account_repo.get_active_accounts()
+            account = accounts[0] if accounts else None
+        if not account:
+            logger.error(f"❌ Account not found: {args.account or '(no active accounts)'}")
+            return 1
+        instagram_user_id, access_token = account.instagram_user_id, account.access_token_encrypted
+    finally:
+        db.close()
+
+    try:
+        stats = await explore(instagram_user_id, access_token, args.limit)
+    except InstagramAPIError as e:
+        logger.error(f"❌ Metric exploration failed: {e}")
+        return 1
+
+    print(
+        f"📊 Posts checked: {stats['posts_checked']}, metrics probed: {stats['metrics_probed']}, "
+        f"duplicate keys skipped: {stats['keys_skipped']}"
+    )
+    print_snapshot()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -7,6 +7,7 @@ Account Insights Collector for GitHub Actions
     python account_insights_collector.py --notify-slack
     python account_insights_collector.py --target-date 2025-07-01
     python account_insights_collector.py --target-accounts "123,456" --force-update
+    python account_insights_collector.py --time-budget 38
 """
 
 import asyncio
@@ -14,8 +15,9 @@ import sys
 import argparse
 import logging
 import os
+import time
 from datetime import datetime, date, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import json
 from pathlib import Path
 from dataclasses import dataclass, field
@@ -26,11 +28,12 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from app.core.database import SessionLocal
 from app.repositories.instagram_account_repository import InstagramAccountRepository
 from app.repositories.instagram_daily_stats_repository import InstagramDailyStatsRepository
-from app.services.data_collection.instagram_api_client import InstagramAPIClient
+from app.services.data_collection.instagram_api_client import InstagramAPIClient, auth_circuit_breaker
 
 from shared.base_collector import BaseCollector
+from shared.execution_tracker import ExecutionTracker
 from shared.notification_service import NotificationService
-from shared.error_handler import ErrorHandler
+from shared.time_budget import TimeBudget
 
 @dataclass
 class AccountInsightsResult:
@@ -53,6 +56,10 @@ class AccountInsightsResult:
     # エラー情報
     errors: List[str] = field(default_factory=list)
     account_results: List[Dict] = field(default_factory=list)
+    
+    # 持ち時間切れで次回に回した作業（--time-budget）
+    pending_accounts: List[Dict] = field(default_factory=list)
+    target_account_ids: List[str] = field(default_factory=list)
 
 class AccountInsightsCollector(BaseCollector):
     """アカウントインサイト収集クラス"""
@@ -60,13 +67,14 @@ class AccountInsightsCollector(BaseCollector):
     def __init__(self):
         super().__init__("account_insights")
         self.notification = NotificationService()
-        self.error_handler = ErrorHandler()
+        self.execution_tracker = ExecutionTracker("account_insights")
         
     async def collect_daily_stats(
         self,
         target_date: date,
         target_accounts: Optional[List[str]] = None,
-        force_update: bool = False
+        force_update: bool = False,
+        time_budget: Optional[float] = None
     ) -> AccountInsightsResult:
         """メイン処理: 日次統計データ収集"""
         
@@ -76,6 +84,7 @@ class AccountInsightsCollector(BaseCollector):
             target_date=target_date,
             started_at=datetime.now()
         )
+        budget = TimeBudget(time_budget)
         
         try:
             self.logger.info(f"🚀 Account insights collection started: {execution_id}")
@@ -84,16 +93,40 @@ class AccountInsightsCollector(BaseCollector):
             # データベース接続初期化
             await self._init_database()
             
-            # 対象アカウント取得
+            # 対象アカウント取得（前回の持ち越し分を優先）
             accounts = await self._get_target_accounts(target_accounts)
-            result.total_accounts = len(accounts)
+            work_items = self._build_work_items(
+                accounts, target_date, self.execution_tracker.get_pending_work()
+            )
+            # 前回持ち越した別日付の収集も1件として数える
+            result.total_accounts = len(work_items)
+            pending_accounts = []
             
-            self.logger.info(f"🎯 Target accounts: {result.total_accounts}")
+            self.logger.info(f"🎯 Target accounts: {len(accounts)} ({len(work_items) - len(accounts)} carried over)")
+            if budget.enabled:
+                self.logger.info(f"⏰ Time budget: {time_budget} minutes")
             
             # アカウント別処理
-            for account in accounts:
+            for index, (account, item_date) in enumerate(work_items):
+                # 締め切りまでに終わらない見込みなら残りを次回に回す
+                if not budget.can_start_unit():
+                    pending_accounts = [
+                        {
+                            'instagram_user_id': deferred.instagram_user_id,
+                            'username': deferred.username,
+                            'target_date': deferred_date.isoformat()
+                        }
+                        for deferred, deferred_date in work_items[index:]
+                    ]
+                    self.logger.warning(
+                        f"⏰ Time budget nearly exhausted after {budget.elapsed_seconds:.0f}s: "
+                        f"deferring {len(pending_accounts)} accounts to the next run"
+                    )
+                    break
+                
+                unit_started = time.monotonic()
                 account_result = await self._collect_account_stats(
-                    account, target_date, force_update
+                    account, item_date, force_update
                 )
                 
                 result.account_results.append(account_result)
@@ -113,9 +146,18 @@ class AccountInsightsCollector(BaseCollector):
                 
                 # アカウント間の待機（API制限対応）
                 await asyncio.sleep(5)
+                budget.record_unit(time.monotonic() - unit_started)
             
             result.completed_at = datetime.now()
             
+            # 持ち越し分は処理完了時にまとめて確定（途中で失敗した場合は前回の状態を残す）
+            result.pending_accounts = pending_accounts
+            result.target_account_ids = [account.instagram_user_id for account in accounts]
+            if not self.is_sharded:
+                self.execution_tracker.save_pending_work(
+                    result.pending_accounts, result.target_account_ids, execution_id
+                )
+            
             # 実行結果ログ
             duration = (result.completed_at - result.started_at).total_seconds()
             success_rate = (result.successful_accounts / result.total_accounts * 100) if result.total_accounts > 0 else 0
@@ -124,6 +166,8 @@ class AccountInsightsCollector(BaseCollector):
             self.logger.info(f"📊 Success rate: {success_rate:.1f}% ({result.successful_accounts}/{result.total_accounts})")
             self.logger.info(f"📝 Stats created: {result.stats_created}, updated: {result.stats_updated}")
             self.logger.info(f"📞 API calls made: {result.api_calls_made}")
+            if result.pending_accounts:
+                self.logger.info(f"⏰ Deferred to next run: {len(result.pending_accounts)} accounts")
             
             return result
             
@@ -137,6 +181,42 @@ class AccountInsightsCollector(BaseCollector):
         finally:
             await self._cleanup_database()
 
+    def _build_work_items(
+        self,
+        accounts: List,
+        target_date: date,
+        pending_items: List[Dict]
+    ) -> List[Tuple[Any, date]]:
+        """
+        処理順の決定（アカウント × 対象日付）
+
+        前回持ち越した分（別日付を含む）を先に、続いて今回の対象日付の残りのアカウントを並べる。
+        対象外・非アクティブになったアカウントの持ち越し分は破棄する。
+        """
+        accounts_by_id = {account.instagram_user_id: account for account in accounts}
+        work_items = []
+        seen = set()
+        for item in pending_items:
+            account = accounts_by_id.get(item.get('instagram_user_id'))
+            if not account:
+                continue
+            try:
+                item_date = date.fromisoformat(item['target_date']) if item.get('target_date') else target_date
+            except ValueError:
+                self.logger.warning(f"Invalid pending target date: {item.get('target_date')}")
+                continue
+            key = (account.instagram_user_id, item_date)
+            if key not in seen:
+                seen.add(key)
+                work_items.append((account, item_date))
+
+        for account in accounts:
+            key = (account.instagram_user_id, target_date)
+            if key not in seen:
+                seen.add(key)
+                work_items.append((account, target_date))
+        return work_items
+
     async def _collect_account_stats(
         self, 
         account, 
@@ -155,6 +235,11 @@ class AccountInsightsCollector(BaseCollector):
             'error': None
         }
         
+        if auth_circuit_breaker.is_open(account.access_token_encrypted):
+            account_result['error'] = "Skipped: auth circuit open after repeated token errors"
+            self.logger.warning(f"⛔ Skipping {account.username}: auth circuit open")
+            return account_result
+        
         try:
             self.logger.info(f"🔄 Processing account: {account.username}")
             
@@ -253,6 +338,9 @@ async def main():
     parser.add_argument('--target-accounts', help='対象アカウント (カンマ区切り)')
     parser.add_argument('--force-update', action='store_true', help='既存データの強制上書き')
     parser.add_argument('--notify-slack', action='store_true', help='Slack通知を送信')
+    parser.add_argument('--shard-index', type=int, default=0, help='担当シャード番号 (0始まり)')
+    parser.add_argument('--shard-count', type=int, default=1, help='シャード総数 (matrix 実行時)')
+    parser.add_argument('--time-budget', type=float, help='持ち時間 (分)。締め切り前に処理を止め、残りを次回に回す')
     parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], 
                        default='INFO', help='ログレベル')
     
@@ -278,11 +366,20 @@ async def main():
     
     # 収集実行
     collector = AccountInsightsCollector()
-    result = await collector.collect_daily_stats(
-        target_date=target_date,
-        target_accounts=target_accounts,
-        force_update=args.force_update
-    )
+    try:
+        collector.configure_shard(args.shard_index, args.shard_count)
+        if args.time_budget is not None and args.time_budget <= 0:
+            raise ValueError(f"time budget must be > 0 minutes: {args.time_budget}")
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    with collector.query_profile():
+        result = await collector.collect_daily_stats(
+            target_date=target_date,
+            target_accounts=target_accounts,
+            force_update=args.force_update,
+            time_budget=args.time_budget
+        )
     
     # 結果表示
     print(f"\n{'='*60}")
@@ -293,6 +390,8 @@ async def main():
     print(f"📝 Stats created: {result.stats_created}")
     print(f"✏️ Stats updated: {result.stats_updated}")
     print(f"📞 API calls: {result.api_calls_made}")
+    if result.pending_accounts:
+        print(f"⏰ Deferred to next run: {len(result.pending_accounts)} accounts")
     
     if result.errors:
         print(f"❌ Errors ({len(result.errors)}):")
@@ -303,8 +402,13 @@ async def main():
     print(f"⏱️ Duration: {duration:.1f}s")
     print(f"{'='*60}")
     
-    # Slack通知
-    if args.notify_slack:
+    # メトリクス出力
+    collector.export_run_metrics(duration, result.successful_accounts, result.failed_accounts)
+    
+    # Slack通知（シャード実行時は結果を保存し、統合ジョブでまとめて通知）
+    if collector.is_sharded:
+        collector.save_shard_result(result)
+    elif args.notify_slack:
         await collector.notification.send_account_insights_result(result)
     
     # 失敗があった場合は exit code 1
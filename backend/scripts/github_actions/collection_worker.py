@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+Collection Worker
+DBベースのワークキュー（collection_jobs）からジョブを取得して実行するワーカー
+
+ジョブは SELECT ... FOR UPDATE SKIP LOCKED で取得するため、1プロセス内の複数
+asyncワーカー・1ホスト内の複数プロセス・複数ホストを同時に起動できる。
+
+ジョブ種別:
+    account_collection    アカウント日次統計の収集（AccountInsightsCollector）
+    post_metrics_refresh  投稿メトリクスの再取得（PostProcessor）
+    backfill_chunk        過去投稿の期間チャンク収集（HistoricalCollectorService）
+    webhook_media         Webhook で変更が通知された投稿の取得（API の /webhooks/instagram が登録）
+
+実行例:
+    # ジョブ登録
+    python collection_worker.py enqueue --type account_collection --target-date 2025-07-01
+    python collection_worker.py enqueue --type post_metrics_refresh --days-back 30
+    python collection_worker.py enqueue --type post_metrics_refresh --scheduled --api-budget 200
+    python collection_worker.py enqueue --type backfill_chunk --from 2024-01-01 --to 2025-07-01 --chunk-days 30
+
+    # ワーカー起動（4プロセス × 各8ワーカー、キューが空になったら終了）
+    python collection_worker.py run --processes 4 --workers 8 --exit-when-empty
+
+    # キューの状態確認
+    python collection_worker.py status
+"""
+
+import asyncio
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# プロジェクトルートをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.core.database import SessionLocal
+from app.repositories.collection_job_repository import (
+    CollectionJobRepository,
+    JOB_TYPES,
+    JOB_TYPE_ACCOUNT_COLLECTION,
+    JOB_TYPE_BACKFILL_CHUNK,
+    JOB_TYPE_POST_METRICS_REFRESH,
+    JOB_TYPE_WEBHOOK_MEDIA,
+)
+from app.repositories.instagram_account_repository import InstagramAccountRepository
+from app.repositories.instagram_post_repository import InstagramPostRepository
+from app.repositories.instagram_post_metrics_repository import InstagramPostMetricsRepository
+from app.services.data_collection.historical_collector_service import create_historical_collector
+from app.services.data_collection.instagram_api_client import InstagramAPIClient
+from app.services.data_collection.metrics_refresh_scheduler import MetricsRefreshScheduler
+from app.services.data_collection.webhook_event_service import MEDIA_ID_PATHS
+
+from account_insights_collector import AccountInsightsCollector
+from shared.post_processor import PostProcessor
+
+logger = logging.getLogger("collection_worker")
+
+# ジョブが無いときのポーリング間隔（秒）
+DEFAULT_POLL_INTERVAL = 5
+# リトライ時の基本待機時間（秒、試行ごとに倍増）
+RETRY_DELAY_SECONDS = 60
+
+
+class JobFailedError(Exception):
+    """ジョブ実行失敗（リトライ対象）"""
+    pass
+
+
+# === ジョブハンドラー ===
+
+async def handle_account_collection(payload: Dict[str, Any], api_client: InstagramAPIClient) -> Dict[str, Any]:
+    """アカウント日次統計の収集"""
+    target_date = date.fromisoformat(payload['target_date']) if payload.get('target_date') else date.today()
+    collector = AccountInsightsCollector()
+    result = await collector.collect_daily_stats(
+        target_date=target_date,
+        target_accounts=[payload['instagram_user_id']],
+        force_update=payload.get('force_update', False)
+    )
+
+    if result.failed_accounts > 0 or result.successful_accounts == 0:
+        raise JobFailedError("; ".join(result.errors) or "Account not collected")
+    return {'stats_created': result.stats_created, 'stats_updated': result.stats_updated}
+
+
+async def handle_post_metrics_refresh(payload: Dict[str, Any], api_client: InstagramAPIClient) -> Dict[str, Any]:
+    """投稿メトリクスの再取得"""
+    db = SessionLocal()
+    try:
+        post = await InstagramPostRepository(db).get_by_instagram_post_id(payload['instagram_post_id'])
+        if not post:
+            raise JobFailedError(f"Post not found: {payload['instagram_post_id']}")
+        account = await InstagramAccountRepository(db).get_by_id(post.account_id)
+        if not account or not account.is_active:
+            return {'skipped': 'inactive account'}
+        post_id, instagram_post_id, media_type, posted_at = post.id, post.instagram_post_id, post.media_type, post.posted_at
+        access_token = account.access_token_encrypted
+    finally:
+        db.close()
+
+    # instagram_posts は media_product_type を保持しないため、ジョブ登録時に分かっている場合のみ渡す
+    insights = await api_client.get_post_insights(
+        instagram_post_id,
+        access_token,
+        media_type,
+        media_product_type=payload.get('media_product_type'),
+        posted_at=posted_at
+    )
+    if not insights:
+        # インサイトを取得できない投稿・対応メトリクスがない投稿は再試行しても変わらないため完了扱い
+        # （試行日時を記録し、--scheduled の判定で毎回最優先にならないようにする）
+        db = SessionLocal()
+        try:
+            await InstagramPostRepository(db).mark_metrics_refresh_attempted([post_id], datetime.now(timezone.utc))
+        finally:
+            db.close()
+        return {'metrics': 0, 'skipped': 'no insights available'}
+
+    if not await PostProcessor().save_post_insights(post_id, insights):
+        raise JobFailedError(f"Failed to save insights for post {instagram_post_id}")
+    return {'metrics': len(insights)}
+
+
+async def handle_backfill_chunk(payload: Dict[str, Any], api_client: InstagramAPIClient) -> Dict[str, Any]:
+    """過去投稿の期間チャンク収集（中断時はチェックポイントから再開）"""
+    collector = create_historical_collector()
+    result = await collector.collect_historical_posts(
+        account_id=payload['instagram_user_id'],
+        start_date=date.fromisoformat(payload['start_date']),
+        end_date=date.fromisoformat(payload['end_date']),
+        include_metrics=payload.get('include_metrics', True),
+        chunk_size=payload.get('chunk_size', 50),
+        resume=True
+    )
+
+    if result.error_message:
+        raise JobFailedError(result.error_message)
+    return {'total_items': result.total_items, 'success_items': result.success_items}
+
+
+async def handle_webhook_media(payload: Dict[str, Any], api_client: InstagramAPIClient) -> Dict[str, Any]:
+    """Webhook で通知された投稿の取得（未保存の投稿は投稿データも保存）"""
+    # 対象外のフィールド（mentions = 他ユーザーの投稿）のみの通知は取得しない
+    fields = payload.get('fields', [])
+    if fields and not any(field in MEDIA_ID_PATHS for field in fields):
+        return {'skipped': f"unsupported fields: {', '.join(fields)}"}
+
+    db = SessionLocal()
+    try:
+        account = await InstagramAccountRepository(db).get_by_instagram_user_id(payload['instagram_user_id'])
+        if not account or not account.is_active:
+            return {'skipped': 'inactive account'}
+        post = await InstagramPostRepository(db).get_by_instagram_post_id(payload['media_id'])
+        account_id, access_token = account.id, account.access_token_encrypted
+        if post:
+            post_id, media_type, posted_at = post.id, post.media_type, post.posted_at
+    finally:
+        db.close()
+
+    # 投稿データは未保存の場合のみ取得（新規投稿の即時検出）。保存済みの投稿は保存済みの値でインサイトを取得する
+    post_processor = PostProcessor()
+    media_product_type = None
+    if not post:
+        media = await api_client.get_media(payload['media_id'], access_token)
+        saved_post = await post_processor.save_post_data(account_id, media)
+        if not saved_post:
+            raise JobFailedError(f"Failed to save post {payload['media_id']}")
+        post_id = saved_post.id
+        media_type, posted_at = media.get('media_type', 'IMAGE'), media.get('timestamp')
+        media_product_type = media.get('media_product_type')
+
+    insights = await api_client.get_post_insights(
+        payload['media_id'],
+        access_token,
+        media_type,
+        media_product_type=media_product_type,
+        posted_at=posted_at
+    )
+    if insights and not await post_processor.save_post_insights(post_id, insights):
+        raise JobFailedError(f"Failed to save insights for post {payload['media_id']}")
+    return {'new_post': post is None, 'metrics': len(insights), 'fields': fields}
+
+
+JOB_HANDLERS: Dict[str, Callable[[Dict[str, Any], InstagramAPIClient], Awaitable[Dict[str, Any]]]] = {
+    JOB_TYPE_ACCOUNT_COLLECTION: handle_account_collection,
+    JOB_TYPE_POST_METRICS_REFRESH: handle_post_metrics_refresh,
+    JOB_TYPE_BACKFILL_CHUNK: handle_backfill_chunk,
+    JOB_TYPE_WEBHOOK_MEDIA: handle_webhook_media,
+}
+
+
+# === ワーカー ===
+
+async def worker_loop(
+    worker_id: str,
+    job_types: Optional[List[str]],
+    stop_event: asyncio.Event,
+    exit_when_empty: bool,
+    poll_interval: float
+) -> int:
+    """単一asyncワーカー: ジョブを1件ずつ取得・実行する"""
+    processed = 0
+    db = SessionLocal()
+    job_repo = CollectionJobRepository(db)
+
+    try:
+        async with InstagramAPIClient() as api_client:
+            while not stop_event.is_set():
+                try:
+                    jobs = await job_repo.claim(worker_id, job_types=job_types, limit=1)
+                except Exception as e:
+                    logger.error(f"[{worker_id}] Failed to claim job: {e}")
+                    db.rollback()
+                    jobs = []
+
+                if not jobs:
+                    if exit_when_empty:
+                        break
+                    try:
+                        await asyncio.wait_for(stop_event.wait(), timeout=poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                job = jobs[0]
+                job_id, job_type, payload, attempts = job.id, job.job_type, dict(job.payload or {}), job.attempts
+                logger.info(f"[{worker_id}] ▶️ {job_type} {job_id} (attempt {attempts}) {payload}")
+
+                try:
+                    result = await JOB_HANDLERS[job_type](payload, api_client)
+                    await job_repo.complete(job_id, result)
+                    logger.info(f"[{worker_id}] ✅ {job_type} {job_id} completed")
+                except Exception as e:
+                    db.rollback()
+                    status = await job_repo.fail(job_id, str(e), RETRY_DELAY_SECONDS)
+                    logger.warning(f"[{worker_id}] ❌ {job_type} {job_id} failed ({status}): {e}")
+                processed += 1
+    finally:
+        db.close()
+
+    logger.info(f"[{worker_id}] Worker stopped after {processed} jobs")
+    return processed
+
+
+async def run_process(
+    process_index: int,
+    workers: int,
+    job_types: Optional[List[str]],
+    exit_when_empty: bool,
+    poll_interval: float
+) -> int:
+    """1プロセス内で複数のasyncワーカーを起動"""
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:
+            pass
+
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+    results = await asyncio.gather(*[
+        worker_loop(f"{prefix}:{i}", job_types, stop_event, exit_when_empty, poll_interval)
+        for i in range(workers)
+    ])
+    logger.info(f"Process {process_index} finished: {sum(results)} jobs processed")
+    return sum(results)
+
+
+def _process_entry(process_index: int, workers: int, job_types, exit_when_empty: bool, poll_interval: float):
+    """子プロセスのエントリーポイント"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(processName)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    asyncio.run(run_process(process_index, workers, job_types, exit_when_empty, poll_interval))
+
+
+def run_workers(args) -> int:
+    """ワーカー起動（--processes > 1 の場合は子プロセスを起動）"""
+    job_types = [t.strip() for t in args.job_types.split(',')] if args.job_types else None
+
+    # 停止したワーカーのジョブを回収
+    db = SessionLocal()
+    try:
+        stale = asyncio.run(CollectionJobRepository(db).requeue_stale(args.lock_timeout_minutes))
+        if stale['requeued']:
+            logger.info(f"Requeued {stale['requeued']} stale jobs")
+        if stale['failed']:
+            logger.warning(f"Marked {stale['failed']} stale jobs as failed (max attempts reached)")
+    finally:
+        db.close()
+
+    logger.info(f"Starting {args.processes} process(es) × {args.workers} worker(s), job types: {job_types or 'all'}")
+
+    if args.processes <= 1:
+        asyncio.run(run_process(0, args.workers, job_types, args.exit_when_empty, args.poll_interval))
+        return 0
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(
+            target=_process_entry,
+            args=(i, args.workers, job_types, args.exit_when_empty, args.poll_interval),
+            name=f"collection-worker-{i}"
+        )
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+    return 1 if any(process.exitcode for process in processes) else 0
+
+
+# === ジョブ登録 ===
+
+async def enqueue_jobs(args) -> int:
+    """対象アカウント・投稿・期間からジョブを登録"""
+    db = SessionLocal()
+    try:
+        account_repo = InstagramAccountRepository(db)
+        if args.target_accounts:
+            accounts = []
+            for instagram_user_id in [a.strip() for a in args.target_accounts.split(',') if a.strip()]:
+                account = await account_repo.get_by_instagram_user_id(instagram_user_id)
+                if account:
+                    accounts.append(account)
+                else:
+                    logger.warning(f"Account not found: {instagram_user_id}")
+        else:
+            accounts = await account_repo.get_active_accounts()
+
+        jobs = []
+        if args.type == JOB_TYPE_ACCOUNT_COLLECTION:
+            target_date = args.target_date or date.today().isoformat()
+            for account in accounts:
+                jobs.append({
+                    'job_type': JOB_TYPE_ACCOUNT_COLLECTION,
+                    'payload': {
+                        'instagram_user_id': account.instagram_user_id,
+                        'target_date': target_date,
+                        'force_update': args.force_update,
+                    },
+                    'priority': args.priority,
+                    'dedupe_key': f"{JOB_TYPE_ACCOUNT_COLLECTION}:{account.instagram_user_id}:{target_date}",
+                })
+
+        elif args.type == JOB_TYPE_POST_METRICS_REFRESH and args.scheduled:
+            # 経過時間・伸び率で再取得が必要な投稿のみ、API 予算の範囲で登録
+            snapshots = await InstagramPostMetricsRepository(db).get_refresh_snapshots(
+                account_ids=[account.id for account in accounts]
+            )
+            plan = MetricsRefreshScheduler(api_budget=args.api_budget).plan(snapshots)
+            for decision in plan.scheduled:
+                jobs.append({
+                    'job_type': JOB_TYPE_POST_METRICS_REFRESH,
+                    'payload': {'instagram_post_id': decision.instagram_post_id},
+                    'priority': args.priority,
+                    'dedupe_key': f"{JOB_TYPE_POST_METRICS_REFRESH}:{decision.instagram_post_id}",
+                })
+            print(f"🗓️ {plan.due_posts} posts due, {plan.deferred_by_budget} deferred by API budget")
+
+        elif args.type == JOB_TYPE_POST_METRICS_REFRESH:
+            post_repo = InstagramPostRepository(db)
+            end_date = date.today()
+            start_date = end_date - timedelta(days=args.days_back)
+            for account in accounts:
+                for post in await post_repo.get_by_date_range(account.id, start_date, end_date):
+                    jobs.append({
+                        'job_type': JOB_TYPE_POST_METRICS_REFRESH,
+                        'payload': {'instagram_post_id': post.instagram_post_id},
+                        'priority': args.priority,
+                        'dedupe_key': f"{JOB_TYPE_POST_METRICS_REFRESH}:{post.instagram_post_id}",
+                    })
+
+        elif args.type == JOB_TYPE_BACKFILL_CHUNK:
+            if not args.from_date or not args.to_date:
+                print("❌ --from and --to are required for backfill_chunk")
+                return 1
+            start_date = date.fromisoformat(args.from_date)
+            end_date = date.fromisoformat(args.to_date)
+            for account in accounts:
+                chunk_start = start_date
+                while chunk_start <= end_date:
+                    chunk_end = min(chunk_start + timedelta(days=args.chunk_days - 1), end_date)
+                    jobs.append({
+                        'job_type': JOB_TYPE_BACKFILL_CHUNK,
+                        'payload': {
+                            'instagram_user_id': account.instagram_user_id,
+                            'start_date': chunk_start.isoformat(),
+                            'end_date': chunk_end.isoformat(),
+                            'include_metrics': not args.posts_only,
+                        },
+                        'priority': args.priority,
+                        'dedupe_key': f"{JOB_TYPE_BACKFILL_CHUNK}:{account.instagram_user_id}:{chunk_start}:{chunk_end}",
+                    })
+                    chunk_start = chunk_end + timedelta(days=1)
+
+        enqueued = await CollectionJobRepository(db).enqueue_many(jobs)
+        print(f"📥 Enqueued {enqueued}/{len(jobs)} {args.type} jobs ({len(jobs) - enqueued} already queued)")
+        return 0
+    finally:
+        db.close()
+
+
+async def show_status() -> int:
+    """ジョブ種別・ステータス別件数を表示"""
+    db = SessionLocal()
+    try:
+        job_repo = CollectionJobRepository(db)
+        print(f"\n{'='*60}")
+        print("📋 COLLECTION JOB QUEUE")
+        print(f"{'='*60}")
+        for job_type in JOB_TYPES:
+            counts = await job_repo.count_by_status(job_type)
+            summary = ", ".join(f"{status}: {count}" for status, count in sorted(counts.items())) or "empty"
+            print(f"   {job_type:<22} {summary}")
+        print(f"{'='*60}")
+        return 0
+    finally:
+        db.close()
+
+
+def parse_arguments():
+    """コマンドライン引数の解析"""
+    parser = argparse.ArgumentParser(description='Collection Worker')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='ワーカーを起動')
+    run_parser.add_argument('--processes', type=int, default=1, help='起動するプロセス数')
+    run_parser.add_argument('--workers', type=int, default=4, help='プロセスあたりのasyncワーカー数')
+    run_parser.add_argument('--job-types', help='処理するジョブ種別（カンマ区切り、未指定時は全種別）')
+    run_parser.add_argument('--exit-when-empty', action='store_true', help='キューが空になったら終了')
+    run_parser.add_argument('--poll-interval', type=float, default=DEFAULT_POLL_INTERVAL, help='ポーリング間隔（秒）')
+    run_parser.add_argument('--lock-timeout-minutes', type=int, default=60,
+                            help='この時間を超えてロックされたジョブを再登録（分）')
+
+    enqueue_parser = subparsers.add_parser('enqueue', help='ジョブを登録')
+    # webhook_media は /webhooks/instagram が通知ごとに登録する
+    enqueue_parser.add_argument('--type', choices=[t for t in JOB_TYPES if t != JOB_TYPE_WEBHOOK_MEDIA],
+                                required=True, help='ジョブ種別')
+    enqueue_parser.add_argument('--target-accounts', help='対象アカウント (カンマ区切り)')
+    enqueue_parser.add_argument('--priority', type=int, default=0, help='優先度（大きいほど先に実行）')
+    enqueue_parser.add_argument('--target-date', help='account_collection の対象日付 (YYYY-MM-DD)')
+    enqueue_parser.add_argument('--force-update', action='store_true', help='account_collection で既存データを上書き')
+    enqueue_parser.add_argument('--days-back', type=int, default=30, help='post_metrics_refresh の対象投稿期間（日）')
+    enqueue_parser.add_argument('--scheduled', action='store_true',
+                                help='post_metrics_refresh で経過時間・伸び率に応じて再取得が必要な投稿のみ登録')
+    enqueue_parser.add_argument('--api-budget', type=int, default=None,
+                                help='--scheduled 時に登録する再取得の API 呼び出し上限')
+    enqueue_parser.add_argument('--from', dest='from_date', help='backfill_chunk の開始日付 (YYYY-MM-DD)')
+    enqueue_parser.add_argument('--to', dest='to_date', help='backfill_chunk の終了日付 (YYYY-MM-DD)')
+    enqueue_parser.add_argument('--chunk-days', type=int, default=30, help='backfill_chunk の1ジョブあたりの日数')
+    enqueue_parser.add_argument('--posts-only', action='store_true', help='backfill_chunk でメトリクスを取得しない')
+
+    subparsers.add_parser('status', help='キューの状態を表示')
+    return parser.parse_args()
+
+
+def main() -> int:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(processName)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    args = parse_arguments()
+
+    if args.command == 'run':
+        return run_workers(args)
+    if args.command == 'enqueue':
+        return asyncio.run(enqueue_jobs(args))
+    return asyncio.run(show_status())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
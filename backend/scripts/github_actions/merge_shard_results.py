@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Shard Results Merger for GitHub Actions
+matrix 実行された各シャードの収集結果を統合し、まとめて通知する
+
+実行例:
+    python merge_shard_results.py --collector account_insights --expected-shards 4 --notify-slack
+    python merge_shard_results.py --collector new_posts --input-dir logs/github_actions/shards --notify-new-posts
+"""
+
+import asyncio
+import sys
+import argparse
+import logging
+import os
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from account_insights_collector import AccountInsightsResult
+from new_posts_collector import NewPostsResult
+from shared.execution_tracker import ExecutionTracker
+from shared.notification_service import NotificationService
+from shared.sharding import DEFAULT_SHARD_RESULT_DIR, load_shard_result, merge_shard_results, shard_result_path
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RESULT_CLASSES = {
+    'account_insights': AccountInsightsResult,
+    'new_posts': NewPostsResult,
+}
+
+
+def load_results(collector: str, input_dir: Path, expected_shards: int):
+    """シャード結果を読み込み（欠損シャードの番号も返す）"""
+    result_cls = RESULT_CLASSES[collector]
+    results = []
+    missing = []
+    for shard_index in range(expected_shards):
+        path = shard_result_path(collector, shard_index, input_dir)
+        if not path.exists():
+            missing.append(shard_index)
+            continue
+        try:
+            results.append(load_shard_result(result_cls, path))
+        except Exception as e:
+            logger.error(f"Failed to load shard result {path}: {e}")
+            missing.append(shard_index)
+    return results, missing
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Shard Results Merger')
+    parser.add_argument('--collector', required=True, choices=sorted(RESULT_CLASSES), help='統合対象のコレクター')
+    parser.add_argument('--input-dir', default=str(DEFAULT_SHARD_RESULT_DIR), help='シャード結果ディレクトリ')
+    parser.add_argument('--expected-shards', type=int, required=True, help='シャード総数')
+    parser.add_argument('--notify-slack', action='store_true', help='Slack通知を送信 (account_insights)')
+    parser.add_argument('--notify-new-posts', action='store_true', help='新規投稿をSlack通知 (new_posts)')
+
+    args = parser.parse_args()
+
+    results, missing = load_results(args.collector, Path(args.input_dir), args.expected_shards)
+    if not results:
+        print(f"❌ No shard results found in {args.input_dir}")
+        return 1
+
+    merged = merge_shard_results(results)
+    for shard_index in missing:
+        merged.errors.append(f"Shard {shard_index + 1}/{args.expected_shards}: result missing (job failed or cancelled)")
+
+    # 結果表示
+    print(f"\n{'='*60}")
+    print(f"🧩 SHARD MERGE RESULT ({args.collector})")
+    print(f"{'='*60}")
+    print(f"🧩 Shards: {len(results)}/{args.expected_shards} reported")
+    print(f"🎯 Accounts: {merged.successful_accounts}/{merged.total_accounts} succeeded")
+    print(f"📞 API calls: {merged.api_calls_made}")
+    if args.collector == 'new_posts' and merged.listings_skipped:
+        print(f"💤 Listings skipped (no media changes): {merged.listings_skipped} accounts")
+    if merged.pending_accounts:
+        print(f"⏰ Deferred to next run: {len(merged.pending_accounts)} accounts")
+
+    if merged.errors:
+        print(f"❌ Errors ({len(merged.errors)}):")
+        for error in merged.errors[:5]:
+            print(f"   {error}")
+
+    if merged.completed_at:
+        duration = (merged.completed_at - merged.started_at).total_seconds()
+        print(f"⏱️ Wall-clock duration: {duration:.1f}s")
+    print(f"{'='*60}")
+
+    # 持ち時間切れで次回に回した作業を保存（結果の揃わなかったシャードの持ち越し分は引き継ぐ）
+    ExecutionTracker(args.collector).save_pending_work(
+        merged.pending_accounts, merged.target_account_ids, merged.execution_id
+    )
+
+    notification = NotificationService()
+    if args.collector == 'account_insights':
+        if args.notify_slack:
+            await notification.send_account_insights_result(merged)
+    else:
+        # 全シャードが揃った場合のみ実行時刻を進める（欠損シャードの投稿を取りこぼさないため）
+        if not missing:
+            ExecutionTracker().update_last_execution_time(merged.started_at)
+        # 投稿数・最新投稿IDは確認できたアカウント分のみ更新（欠損シャードのアカウントは次回一覧で確認）
+        ExecutionTracker().save_media_state(merged.media_states)
+        if args.notify_new_posts and merged.new_posts_found > 0:
+            await notification.send_new_posts_notification(merged)
+
+    # 失敗・欠損があった場合は exit code 1
+    return 1 if merged.failed_accounts > 0 or missing else 0
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Metrics Refresh Collector for GitHub Actions
+投稿経過時間・伸び率に応じた投稿メトリクスの再取得
+
+投稿直後は1時間ごと、1週間までは1日ごと、それ以降は1週間ごとに再取得し、
+1回の実行あたりの API 呼び出し数は --api-budget で制限する。
+
+実行例:
+    python metrics_refresh_collector.py --api-budget 200
+    python metrics_refresh_collector.py --target-accounts "123,456" --dry-run
+"""
+
+import asyncio
+import sys
+import argparse
+import logging
+import os
+from datetime import datetime, timezone
+from typing import List, Dict, Optional
+from dataclasses import dataclass, field
+
+# プロジェクトルートをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.repositories.instagram_post_metrics_repository import InstagramPostMetricsRepository
+from app.repositories.instagram_post_repository import InstagramPostRepository
+from app.services.data_collection.instagram_api_client import InstagramAPIClient, auth_circuit_breaker
+from app.services.data_collection.metrics_refresh_scheduler import MetricsRefreshScheduler, RefreshPlan
+
+from shared.base_collector import BaseCollector
+from shared.post_processor import PostProcessor
+
+# 1回の実行あたりの API 呼び出し予算（既定値）
+DEFAULT_API_BUDGET = 200
+
+
+@dataclass
+class MetricsRefreshResult:
+    """投稿メトリクス再取得結果"""
+    execution_id: str
+    started_at: datetime
+    completed_at: Optional[datetime] = None
+    total_accounts: int = 0
+    total_posts: int = 0
+    due_posts: int = 0
+    scheduled_posts: int = 0
+    deferred_by_budget: int = 0
+    refreshed_posts: int = 0
+    no_insights_posts: int = 0
+    failed_posts: int = 0
+    api_calls_made: int = 0
+    aborted: bool = False
+    errors: List[str] = field(default_factory=list)
+
+
+class MetricsRefreshCollector(BaseCollector):
+    """投稿メトリクス再取得クラス"""
+
+    def __init__(self):
+        super().__init__("metrics_refresh")
+        self.post_processor = PostProcessor()
+
+    async def refresh(
+        self,
+        target_accounts: Optional[List[str]] = None,
+        api_budget: Optional[int] = DEFAULT_API_BUDGET,
+        dry_run: bool = False
+    ) -> MetricsRefreshResult:
+        """メイン処理: 再取得対象の選定・メトリクス取得"""
+
+        execution_id = f"metrics_refresh_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        result = MetricsRefreshResult(
+            execution_id=execution_id,
+            started_at=datetime.now(timezone.utc)
+        )
+
+        try:
+            self.logger.info(f"🚀 Metrics refresh started: {execution_id} (API budget: {api_budget})")
+
+            await self._init_database()
+            accounts = await self._get_target_accounts(target_accounts)
+            result.total_accounts = len(accounts)
+            tokens: Dict[str, str] = {str(account.id): account.access_token_encrypted for account in accounts}
+
+            # 再取得対象の選定
+            snapshots = await InstagramPostMetricsRepository(self.db).get_refresh_snapshots(
+                account_ids=[account.id for account in accounts]
+            )
+            plan = MetricsRefreshScheduler(api_budget=api_budget).plan(snapshots)
+            self._apply_plan(result, plan)
+
+            # スケジュール判定後はセッションを保持しない（保存は PostProcessor が個別に実施）
+            await self._cleanup_database()
+
+            if dry_run:
+                self.logger.info("DRY RUN MODE - No API calls will be made")
+                for decision in plan.scheduled[:20]:
+                    self.logger.info(
+                        f"   {decision.instagram_post_id} ({decision.media_type}) "
+                        f"interval={decision.interval} last={decision.last_observed_at}"
+                    )
+                return result
+
+            # インサイトを取得できなかった投稿（再取得試行日時を記録し、次回は通常の間隔で判定）
+            no_insights_post_ids = []
+
+            async with InstagramAPIClient() as api_client:
+                for decision in plan.scheduled:
+                    token = tokens[str(decision.account_id)]
+                    # 認証エラーが続いたトークンの投稿は API を呼ばずにスキップ
+                    if auth_circuit_breaker.is_open(token):
+                        result.failed_posts += 1
+                        result.errors.append(f"{decision.instagram_post_id}: skipped (auth circuit open)")
+                        continue
+
+                    try:
+                        insights = await api_client.get_post_insights(
+                            decision.instagram_post_id,
+                            token,
+                            decision.media_type,
+                            posted_at=decision.posted_at
+                        )
+                        result.api_calls_made += 1
+
+                        # 取得できるメトリクスがない・全て0の結果は実データとして保存せず、試行のみ記録する
+                        if not insights or not any(insights.values()):
+                            result.no_insights_posts += 1
+                            no_insights_post_ids.append(decision.post_id)
+                            continue
+
+                        if await self.post_processor.save_post_insights(decision.post_id, insights):
+                            result.refreshed_posts += 1
+                        else:
+                            result.failed_posts += 1
+                            result.errors.append(f"{decision.instagram_post_id}: failed to save insights")
+
+                    except Exception as e:
+                        result.failed_posts += 1
+                        result.errors.append(f"{decision.instagram_post_id}: {str(e)}")
+                        self.logger.error(f"❌ Failed to refresh {decision.instagram_post_id}: {e}")
+
+            if no_insights_post_ids:
+                await self._init_database()
+                await InstagramPostRepository(self.db).mark_metrics_refresh_attempted(
+                    no_insights_post_ids, datetime.now(timezone.utc)
+                )
+
+            self.logger.info(
+                f"✅ Metrics refresh completed: {result.refreshed_posts}/{result.scheduled_posts} refreshed"
+            )
+
+        except Exception as e:
+            error_msg = f"Metrics refresh failed: {str(e)}"
+            self.logger.error(error_msg)
+            result.errors.append(error_msg)
+            result.aborted = True
+
+        finally:
+            await self._cleanup_database()
+            result.completed_at = datetime.now(timezone.utc)
+
+        return result
+
+    @staticmethod
+    def _apply_plan(result: MetricsRefreshResult, plan: RefreshPlan):
+        """スケジュール結果を実行結果に反映"""
+        result.total_posts = plan.total_posts
+        result.due_posts = plan.due_posts
+        result.scheduled_posts = len(plan.scheduled)
+        result.deferred_by_budget = plan.deferred_by_budget
+
+
+# CLI エントリーポイント
+async def main():
+    parser = argparse.ArgumentParser(description='Metrics Refresh Collector')
+    parser.add_argument('--target-accounts', help='対象アカウント (カンマ区切り)')
+    parser.add_argument('--api-budget', type=int, default=DEFAULT_API_BUDGET,
+                        help=f'1回の実行あたりの API 呼び出し上限 (デフォルト: {DEFAULT_API_BUDGET})')
+    parser.add_argument('--dry-run', action='store_true', help='再取得対象の選定のみ実行')
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        default='INFO', help='ログレベル')
+
+    args = parser.parse_args()
+
+    target_accounts = None
+    if args.target_accounts:
+        target_accounts = [acc.strip() for acc in args.target_accounts.split(',') if acc.strip()]
+
+    logging.getLogger().setLevel(getattr(logging, args.log_level))
+
+    collector = MetricsRefreshCollector()
+    with collector.query_profile():
+        result = await collector.refresh(
+            target_accounts=target_accounts,
+            api_budget=args.api_budget,
+            dry_run=args.dry_run
+        )
+
+    # 結果表示
+    print(f"\n{'='*60}")
+    print("🔄 METRICS REFRESH RESULT")
+    print(f"{'='*60}")
+    print(f"🎯 Accounts: {result.total_accounts}")
+    print(f"📊 Posts: {result.total_posts} tracked, {result.due_posts} due")
+    print(f"🗓️ Scheduled: {result.scheduled_posts} (deferred by budget: {result.deferred_by_budget})")
+    print(f"✅ Refreshed: {result.refreshed_posts}")
+    print(f"⏭️ No insights: {result.no_insights_posts}")
+    print(f"❌ Failed: {result.failed_posts}")
+    print(f"📞 API calls: {result.api_calls_made}/{args.api_budget}")
+
+    if result.errors:
+        print(f"❌ Errors ({len(result.errors)}):")
+        for error in result.errors[:5]:
+            print(f"   {error}")
+
+    duration = (result.completed_at - result.started_at).total_seconds()
+    print(f"⏱️ Duration: {duration:.1f}s")
+    print(f"{'='*60}")
+
+    # メトリクス出力
+    collector.export_run_metrics(duration, result.refreshed_posts, result.failed_posts)
+
+    # 処理全体が中断した場合のみ exit code 1（個別投稿の失敗は次回の実行で再取得される）
+    return 1 if result.aborted else 0
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
@@ -7,6 +7,7 @@ New Posts Collector for GitHub Actions
     python new_posts_collector.py --notify-new-posts
     python new_posts_collector.py --target-accounts "123,456" --check-hours-back 6
     python new_posts_collector.py --force-reprocess
+    python new_posts_collector.py --time-budget 24
 """
 
 import asyncio
@@ -14,6 +15,7 @@ import sys
 import argparse
 import logging
 import os
+import time
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any, Optional
 import json
@@ -27,13 +29,19 @@ from app.core.database import SessionLocal
 from app.repositories.instagram_account_repository import InstagramAccountRepository
 from app.repositories.instagram_post_repository import InstagramPostRepository
 from app.repositories.instagram_post_metrics_repository import InstagramPostMetricsRepository
-from app.services.data_collection.instagram_api_client import InstagramAPIClient
+from app.repositories.failed_collection_item_repository import (
+    FailedCollectionItemRepository,
+    ITEM_TYPE_ACCOUNT_NEW_POSTS,
+    ITEM_TYPE_NEW_POST,
+)
+from app.services.data_collection.instagram_api_client import InstagramAPIClient, auth_circuit_breaker
 
 from shared.base_collector import BaseCollector
 from shared.notification_service import NotificationService
 from shared.post_detector import PostDetector
 from shared.post_processor import PostProcessor
 from shared.execution_tracker import ExecutionTracker
+from shared.time_budget import TimeBudget
 
 @dataclass
 class NewPostsResult:
@@ -52,6 +60,8 @@ class NewPostsResult:
     new_posts_found: int = 0
     new_posts_saved: int = 0
     insights_collected: int = 0
+    posts_retried: int = 0
+    listings_skipped: int = 0
     
     # API使用統計
     api_calls_made: int = 0
@@ -60,6 +70,13 @@ class NewPostsResult:
     errors: List[str] = field(default_factory=list)
     account_results: List[Dict] = field(default_factory=list)
     new_posts_details: List[Dict] = field(default_factory=list)
+    
+    # 持ち時間切れで次回に回した作業（--time-budget）
+    pending_accounts: List[Dict] = field(default_factory=list)
+    target_account_ids: List[str] = field(default_factory=list)
+    
+    # 今回確認したアカウントの media_count・最新投稿ID（次回の変更確認用）
+    media_states: List[Dict] = field(default_factory=list)
 
 class NewPostsCollector(BaseCollector):
     """新規投稿収集クラス"""
@@ -75,7 +92,8 @@ class NewPostsCollector(BaseCollector):
         self,
         target_accounts: Optional[List[str]] = None,
         check_hours_back: int = 8,
-        force_reprocess: bool = False
+        force_reprocess: bool = False,
+        time_budget: Optional[float] = None
     ) -> NewPostsResult:
         """メイン処理: 新規投稿検出・収集"""
         
@@ -84,6 +102,7 @@ class NewPostsCollector(BaseCollector):
             execution_id=execution_id,
             started_at=datetime.now(timezone.utc)
         )
+        budget = TimeBudget(time_budget)
         
         try:
             self.logger.info(f"🚀 New posts detection started: {execution_id}")
@@ -102,27 +121,85 @@ class NewPostsCollector(BaseCollector):
             # データベース接続初期化
             await self._init_database()
             
-            # 対象アカウント取得
-            accounts = await self._get_target_accounts(target_accounts)
+            # 対象アカウント取得（前回の持ち越し分・再試行キューのアカウントを優先）
+            pending_work = {
+                item['instagram_user_id']: item
+                for item in self.execution_tracker.get_pending_work()
+            }
+            await self._merge_failed_accounts(pending_work)
+            media_state = self.execution_tracker.get_media_state()
+            accounts = self._prioritize_accounts(
+                await self._get_target_accounts(target_accounts), pending_work
+            )
             result.total_accounts = len(accounts)
+            pending_accounts = []
             
             self.logger.info(f"🎯 Target accounts: {result.total_accounts}")
+            if budget.enabled:
+                self.logger.info(f"⏰ Time budget: {time_budget} minutes")
             
             # アカウント別処理
-            for account in accounts:
+            for index, account in enumerate(accounts):
+                pending = pending_work.get(account.instagram_user_id)
+                account_check_from = self._account_check_from(check_from, pending)
+                
+                # 締め切りまでに終わらない見込みなら残りを次回に回す
+                if not budget.can_start_unit():
+                    for deferred in accounts[index:]:
+                        deferred_pending = pending_work.get(deferred.instagram_user_id)
+                        pending_accounts.append(self._pending_entry(
+                            deferred,
+                            self._account_check_from(check_from, deferred_pending),
+                            (deferred_pending or {}).get('post_ids', [])
+                        ))
+                    self.logger.warning(
+                        f"⏰ Time budget nearly exhausted after {budget.elapsed_seconds:.0f}s: "
+                        f"deferring {len(accounts) - index} accounts to the next run"
+                    )
+                    break
+                
+                unit_started = time.monotonic()
                 account_result = await self._detect_account_new_posts(
-                    account, check_from, force_reprocess
+                    account,
+                    account_check_from,
+                    force_reprocess,
+                    budget=budget,
+                    priority_post_ids=(pending or {}).get('post_ids', []),
+                    # 持ち越し・再試行のアカウントは前回の確認範囲を一覧で確認し直す
+                    known_media_state=None if pending else media_state.get(account.instagram_user_id)
                 )
                 
+                if account_result['pending_post_ids']:
+                    pending_accounts.append(self._pending_entry(
+                        account, account_check_from, account_result['pending_post_ids']
+                    ))
+                
                 result.account_results.append(account_result)
                 
+                # アカウント単位の失敗は check_from を保持して再試行キューへ（成功したら解消）
+                if account_result['success']:
+                    await self._resolve_failed(ITEM_TYPE_ACCOUNT_NEW_POSTS, [account.instagram_user_id])
+                else:
+                    await self._queue_failure(
+                        ITEM_TYPE_ACCOUNT_NEW_POSTS,
+                        account.instagram_user_id,
+                        account_result['error'] or 'Unknown error',
+                        account.id,
+                        {'check_from': account_check_from.isoformat()}
+                    )
+                
                 if account_result['success']:
                     result.successful_accounts += 1
                     result.total_posts_checked += account_result['posts_checked']
                     result.new_posts_found += account_result['new_posts_found']
                     result.new_posts_saved += account_result['new_posts_saved']
                     result.insights_collected += account_result['insights_collected']
+                    result.posts_retried += account_result['posts_retried']
                     result.api_calls_made += account_result['api_calls']
+                    if account_result['listing_skipped']:
+                        result.listings_skipped += 1
+                    if account_result['media_state']:
+                        result.media_states.append(account_result['media_state'])
                     
                     # 新規投稿詳細を記録
                     for post_detail in account_result['new_posts_details']:
@@ -135,11 +212,22 @@ class NewPostsCollector(BaseCollector):
                 
                 # アカウント間の待機（API制限対応）
                 await asyncio.sleep(3)
+                budget.record_unit(time.monotonic() - unit_started)
             
             result.completed_at = datetime.now(timezone.utc)
             
-            # 実行時刻の更新
-            self.execution_tracker.update_last_execution_time(result.started_at)
+            # 持ち越し分は処理完了時にまとめて確定（途中で失敗した場合は前回の状態を残す）
+            result.pending_accounts = pending_accounts
+            result.target_account_ids = [account.instagram_user_id for account in accounts]
+            
+            # 実行状態の更新（シャード実行時は統合ジョブで更新）
+            # 持ち越したアカウントは前回の check_from を保持しているため、実行時刻は進めてよい
+            if not self.is_sharded:
+                self.execution_tracker.update_last_execution_time(result.started_at)
+                self.execution_tracker.save_pending_work(
+                    result.pending_accounts, result.target_account_ids, execution_id
+                )
+                self.execution_tracker.save_media_state(result.media_states)
             
             # 実行結果ログ
             duration = (result.completed_at - result.started_at).total_seconds()
@@ -150,7 +238,11 @@ class NewPostsCollector(BaseCollector):
             self.logger.info(f"🆕 New posts found: {result.new_posts_found}")
             self.logger.info(f"💾 New posts saved: {result.new_posts_saved}")
             self.logger.info(f"📈 Insights collected: {result.insights_collected}")
+            self.logger.info(f"🔁 Queued posts retried: {result.posts_retried}")
+            self.logger.info(f"💤 Listings skipped (no media changes): {result.listings_skipped}")
             self.logger.info(f"📞 API calls made: {result.api_calls_made}")
+            if result.pending_accounts:
+                self.logger.info(f"⏰ Deferred to next run: {len(result.pending_accounts)} accounts")
             
             return result
             
@@ -164,13 +256,87 @@ class NewPostsCollector(BaseCollector):
         finally:
             await self._cleanup_database()
 
+    def _prioritize_accounts(self, accounts: List, pending_work: Dict[str, Dict]) -> List:
+        """前回持ち越したアカウントを先頭に並べ替え（それ以外は元の順序を維持）"""
+        return sorted(accounts, key=lambda account: account.instagram_user_id not in pending_work)
+
+    async def _merge_failed_accounts(self, pending_work: Dict[str, Dict]):
+        """再試行キューのアカウント（次回試行時刻を過ぎたもの）を持ち越し分に加える"""
+        try:
+            due_items = await FailedCollectionItemRepository(self.db).get_due(ITEM_TYPE_ACCOUNT_NEW_POSTS)
+        except Exception as e:
+            self.logger.warning(f"Failed to load retry queue: {e}")
+            self.db.rollback()
+            return
+
+        for item in due_items:
+            failed_from = (item.payload or {}).get('check_from')
+            entry = pending_work.setdefault(
+                item.item_key, {'instagram_user_id': item.item_key, 'check_from': failed_from, 'post_ids': []}
+            )
+            if failed_from and (not entry.get('check_from') or failed_from < entry['check_from']):
+                entry['check_from'] = failed_from
+        if due_items:
+            self.logger.info(f"🔁 Retrying {len(due_items)} accounts from the retry queue")
+
+    async def _queue_failure(
+        self,
+        item_type: str,
+        item_key: str,
+        reason: str,
+        account_id: str,
+        payload: Dict[str, Any]
+    ):
+        """失敗を再試行キューに登録（キューへの書き込み失敗は収集を止めない）"""
+        try:
+            await FailedCollectionItemRepository(self.db).record_failure(
+                item_type, item_key, reason, account_id=account_id, payload=payload
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to queue retry for {item_type} {item_key}: {e}")
+            self.db.rollback()
+
+    async def _resolve_failed(self, item_type: str, item_keys: List[str]):
+        """成功した項目を再試行キューから削除"""
+        try:
+            await FailedCollectionItemRepository(self.db).resolve(item_type, item_keys)
+        except Exception as e:
+            self.logger.warning(f"Failed to resolve retry queue items: {e}")
+            self.db.rollback()
+
+    def _account_check_from(self, check_from: datetime, pending: Optional[Dict]) -> datetime:
+        """持ち越したアカウントは前回のチェック開始時刻から確認する"""
+        if not pending or not pending.get('check_from'):
+            return check_from
+        pending_from = datetime.fromisoformat(pending['check_from'])
+        if pending_from.tzinfo is None:
+            pending_from = pending_from.replace(tzinfo=timezone.utc)
+        return min(check_from, pending_from)
+
+    def _pending_entry(self, account, check_from: datetime, post_ids: List[str]) -> Dict[str, Any]:
+        """持ち越し作業の状態ファイル表現"""
+        return {
+            'instagram_user_id': account.instagram_user_id,
+            'username': account.username,
+            'check_from': check_from.isoformat(),
+            'post_ids': list(post_ids)
+        }
+
     async def _detect_account_new_posts(
         self, 
         account, 
         check_from: datetime,
-        force_reprocess: bool
+        force_reprocess: bool,
+        budget: Optional[TimeBudget] = None,
+        priority_post_ids: Optional[List[str]] = None,
+        known_media_state: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
-        """単一アカウントの新規投稿検出"""
+        """
+        単一アカウントの新規投稿検出
+        
+        media_count・最新投稿IDのみを取得して前回の状態（known_media_state）と比較し、
+        変化がなければ投稿一覧（最大50件の全フィールド）の取得を省略する。
+        """
         
         account_result = {
             'account_id': account.id,
@@ -181,19 +347,39 @@ class NewPostsCollector(BaseCollector):
             'new_posts_found': 0,
             'new_posts_saved': 0,
             'insights_collected': 0,
+            'posts_retried': 0,
             'api_calls': 0,
             'new_posts_details': [],
+            'pending_post_ids': [],
+            'listing_skipped': False,
+            'media_state': None,
             'error': None
         }
         
+        if auth_circuit_breaker.is_open(account.access_token_encrypted):
+            account_result['error'] = "Skipped: auth circuit open after repeated token errors"
+            self.logger.warning(f"⛔ Skipping {account.username}: auth circuit open")
+            return account_result
+        
         try:
             self.logger.info(f"🔍 Checking account: {account.username}")
             
             async with InstagramAPIClient() as api_client:
-                # 最新投稿データ取得（最大50件）
-                recent_posts = await self._fetch_recent_posts(api_client, account, limit=50)
+                # 投稿数・最新投稿IDの確認（変化がなければ一覧取得を省略）
+                media_state = await self._probe_media_state(api_client, account)
                 account_result['api_calls'] += 1
+                
+                if not force_reprocess and self._media_unchanged(media_state, known_media_state):
+                    recent_posts = []
+                    account_result['listing_skipped'] = True
+                    self.logger.info(f"💤 No media changes for {account.username} (media_count={media_state['media_count']})")
+                else:
+                    # 最新投稿データ取得（最大50件）
+                    recent_posts = await self._fetch_recent_posts(api_client, account, limit=50)
+                    account_result['api_calls'] += 1
                 account_result['posts_checked'] = len(recent_posts)
+                # 一覧の確認まで終わった場合のみ次回の比較に使う
+                account_result['media_state'] = media_state
                 
                 # 新規投稿の検出
                 new_posts = await self.post_detector.detect_new_posts(
@@ -204,33 +390,75 @@ class NewPostsCollector(BaseCollector):
                 )
                 account_result['new_posts_found'] = len(new_posts)
                 
+                # 前回までに失敗した投稿（再試行キュー）を先頭に追加
+                retry_posts = await self._get_due_failed_posts(account)
+                detected_ids = {post['id'] for post in new_posts}
+                new_posts = [post for post in retry_posts if post['id'] not in detected_ids] + new_posts
+                retry_post_ids = {post['id'] for post in retry_posts}
+                
                 if new_posts:
                     self.logger.info(f"🆕 Found {len(new_posts)} new posts for {account.username}")
                     
+                    # 前回持ち越した投稿・再試行キューの投稿を先に処理
+                    priority = set(priority_post_ids or []) | retry_post_ids
+                    if priority:
+                        new_posts.sort(key=lambda post: post['id'] not in priority)
+                    
                     # 新規投稿の処理
-                    for post_data in new_posts:
+                    for index, post_data in enumerate(new_posts):
+                        if budget and not budget.has_time_for():
+                            account_result['pending_post_ids'] = [post['id'] for post in new_posts[index:]]
+                            self.logger.warning(
+                                f"⏰ Time budget nearly exhausted: deferring "
+                                f"{len(new_posts) - index} posts of {account.username}"
+                            )
+                            break
+                        
                         try:
+                            # 再試行分は保存済み（インサイトのみ失敗）の場合がある
+                            saved_post = None
+                            if post_data['id'] in retry_post_ids:
+                                account_result['posts_retried'] += 1
+                                saved_post = await self.post_processor.get_saved_post(post_data['id'])
+                            
                             # 投稿データ保存
-                            saved_post = await self.post_processor.save_post_data(
-                                account.id, post_data
-                            )
+                            if not saved_post:
+                                saved_post = await self.post_processor.save_post_data(
+                                    account.id, post_data
+                                )
+                                if saved_post:
+                                    account_result['new_posts_saved'] += 1
+                                else:
+                                    await self._queue_failure(
+                                        ITEM_TYPE_NEW_POST, post_data['id'], "Failed to save post data",
+                                        account.id, {'post_data': post_data}
+                                    )
                             
                             if saved_post:
-                                account_result['new_posts_saved'] += 1
-                                
                                 # 投稿インサイト収集
                                 insights = await api_client.get_post_insights(
                                     post_data['id'],
                                     account.access_token_encrypted,
-                                    post_data.get('media_type', 'IMAGE')
+                                    post_data.get('media_type', 'IMAGE'),
+                                    media_product_type=post_data.get('media_product_type'),
+                                    posted_at=post_data.get('timestamp')
                                 )
                                 account_result['api_calls'] += 1
                                 
-                                if insights:
-                                    await self.post_processor.save_post_insights(
-                                        saved_post.id, insights
+                                # API エラーは例外として下で再試行キューに入る。
+                                # 空の結果（インサイトを取得できないメディア）は再試行しても変わらないため解決扱い
+                                if insights and not await self.post_processor.save_post_insights(
+                                    saved_post.id, insights
+                                ):
+                                    await self._queue_failure(
+                                        ITEM_TYPE_NEW_POST, post_data['id'], "Failed to save post insights",
+                                        account.id, {'post_data': post_data}
                                     )
-                                    account_result['insights_collected'] += 1
+                                else:
+                                    if insights:
+                                        account_result['insights_collected'] += 1
+                                    if post_data['id'] in retry_post_ids:
+                                        await self._resolve_failed(ITEM_TYPE_NEW_POST, [post_data['id']])
                                 
                                 # 新規投稿詳細を記録
                                 post_detail = {
@@ -240,7 +468,7 @@ class NewPostsCollector(BaseCollector):
                                     'timestamp': post_data.get('timestamp'),
                                     'permalink': post_data.get('permalink'),
                                     'caption_preview': (post_data.get('caption', '') or '')[:100] + '...' if post_data.get('caption') else None,
-                                    'insights_collected': insights is not None
+                                    'insights_collected': bool(insights)
                                 }
                                 account_result['new_posts_details'].append(post_detail)
                                 
@@ -255,6 +483,10 @@ class NewPostsCollector(BaseCollector):
                                 
                         except Exception as e:
                             self.logger.error(f"❌ Failed to process new post {post_data['id']}: {e}")
+                            await self._queue_failure(
+                                ITEM_TYPE_NEW_POST, post_data['id'], str(e),
+                                account.id, {'post_data': post_data}
+                            )
                             continue
                 else:
                     self.logger.info(f"📭 No new posts found for {account.username}")
@@ -267,6 +499,49 @@ class NewPostsCollector(BaseCollector):
         
         return account_result
 
+    async def _get_due_failed_posts(self, account) -> List[Dict]:
+        """再試行キューの投稿（次回試行時刻を過ぎたもの）の API 取得時データ"""
+        try:
+            due_items = await FailedCollectionItemRepository(self.db).get_due(
+                ITEM_TYPE_NEW_POST, account_id=account.id
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to load retry queue for {account.username}: {e}")
+            self.db.rollback()
+            return []
+        return [item.payload['post_data'] for item in due_items if (item.payload or {}).get('post_data')]
+
+    async def _probe_media_state(self, api_client: InstagramAPIClient, account) -> Optional[Dict[str, Any]]:
+        """media_count と最新投稿IDのみ取得（失敗時は None を返し、一覧取得で確認する）"""
+        
+        url = api_client.config.get_user_url(account.instagram_user_id)
+        params = {
+            'fields': 'media_count,media.limit(1){id}',
+            'access_token': account.access_token_encrypted
+        }
+        
+        try:
+            response = await api_client._make_request(url, params)
+        except Exception as e:
+            self.logger.warning(f"Media probe failed for {account.username}, falling back to listing: {e}")
+            return None
+        
+        latest = (response.get('media') or {}).get('data') or [{}]
+        return {
+            'instagram_user_id': account.instagram_user_id,
+            'media_count': response.get('media_count'),
+            'latest_media_id': latest[0].get('id')
+        }
+    
+    def _media_unchanged(self, media_state: Optional[Dict], known_media_state: Optional[Dict]) -> bool:
+        """最新投稿が前回と同じで投稿数が増えていなければ新規投稿なし（削除による減少は変化なしとみなす）"""
+        if not media_state or not known_media_state or media_state['media_count'] is None:
+            return False
+        return (
+            media_state['latest_media_id'] == known_media_state.get('latest_media_id')
+            and media_state['media_count'] <= (known_media_state.get('media_count') or 0)
+        )
+    
     async def _fetch_recent_posts(
         self, 
         api_client: InstagramAPIClient, 
@@ -278,21 +553,17 @@ class NewPostsCollector(BaseCollector):
         url = api_client.config.get_user_media_url(account.instagram_user_id)
         
         params = {
-            'fields': 'id,media_type,permalink,caption,timestamp,like_count,comments_count,media_url,thumbnail_url',
+            'fields': 'id,media_type,media_product_type,permalink,caption,timestamp,like_count,comments_count,media_url,thumbnail_url',
             'access_token': account.access_token_encrypted,
             'limit': min(limit, 100)  # API制限に合わせる
         }
         
-        try:
-            response = await api_client._make_request(url, params)
-            posts = response.get('data', [])
-            
-            self.logger.debug(f"Retrieved {len(posts)} recent posts for {account.username}")
-            return posts
-            
-        except Exception as e:
-            self.logger.error(f"Failed to fetch recent posts for {account.username}: {e}")
-            return []
+        # 取得失敗は「新規投稿なし」と区別するためアカウントの失敗として扱う（再試行キューで再確認）
+        response = await api_client._make_request(url, params)
+        posts = response.get('data', [])
+        
+        self.logger.debug(f"Retrieved {len(posts)} recent posts for {account.username}")
+        return posts
 
 # CLI エントリーポイント
 async def main():
@@ -301,6 +572,9 @@ async def main():
     parser.add_argument('--check-hours-back', type=int, default=8, help='遡及時間 (時間)')
     parser.add_argument('--force-reprocess', action='store_true', help='既存投稿の再処理を強制実行')
     parser.add_argument('--notify-new-posts', action='store_true', help='新規投稿をSlack通知')
+    parser.add_argument('--shard-index', type=int, default=0, help='担当シャード番号 (0始まり)')
+    parser.add_argument('--shard-count', type=int, default=1, help='シャード総数 (matrix 実行時)')
+    parser.add_argument('--time-budget', type=float, help='持ち時間 (分)。締め切り前に処理を止め、残りを次回に回す')
     parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], 
                        default='INFO', help='ログレベル')
     
@@ -316,11 +590,20 @@ async def main():
     
     # 検出・収集実行
     collector = NewPostsCollector()
-    result = await collector.detect_and_collect(
-        target_accounts=target_accounts,
-        check_hours_back=args.check_hours_back,
-        force_reprocess=args.force_reprocess
-    )
+    try:
+        collector.configure_shard(args.shard_index, args.shard_count)
+        if args.time_budget is not None and args.time_budget <= 0:
+            raise ValueError(f"time budget must be > 0 minutes: {args.time_budget}")
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    with collector.query_profile():
+        result = await collector.detect_and_collect(
+            target_accounts=target_accounts,
+            check_hours_back=args.check_hours_back,
+            force_reprocess=args.force_reprocess,
+            time_budget=args.time_budget
+        )
     
     # 結果表示
     print(f"\n{'='*60}")
@@ -331,7 +614,11 @@ async def main():
     print(f"🆕 New posts found: {result.new_posts_found}")
     print(f"💾 New posts saved: {result.new_posts_saved}")
     print(f"📈 Insights collected: {result.insights_collected}")
+    if result.posts_retried:
+        print(f"🔁 Queued posts retried: {result.posts_retried}")
     print(f"📞 API calls: {result.api_calls_made}")
+    if result.pending_accounts:
+        print(f"⏰ Deferred to next run: {len(result.pending_accounts)} accounts")
     
     # 新規投稿詳細表示
     if result.new_posts_details:
@@ -348,8 +635,13 @@ async def main():
     print(f"\n⏱️ Duration: {duration:.1f}s")
     print(f"{'='*60}")
     
-    # Slack通知（新規投稿があった場合のみ）
-    if args.notify_new_posts and result.new_posts_found > 0:
+    # メトリクス出力
+    collector.export_run_metrics(duration, result.successful_accounts, result.failed_accounts)
+    
+    # Slack通知（新規投稿があった場合のみ、シャード実行時は統合ジョブで通知）
+    if collector.is_sharded:
+        collector.save_shard_result(result)
+    elif args.notify_new_posts and result.new_posts_found > 0:
         await collector.notification.send_new_posts_notification(result)
     
     # 失敗があった場合は exit code 1
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Scheduler Daemon
+新規投稿検出・アカウント日次統計・投稿メトリクス再取得を1つの常駐プロセスで定期実行する
+
+GitHub Actions の実行は毎回依存関係のインストール・アプリの import・DB/HTTP 接続の確立から始まり、
+短い実行では大半が起動処理になる。自前のホストで API サーバーと並べて常駐させると、
+DB 接続プール（DATABASE_POOL_SIZE）・Graph API の HTTP セッション・メトリクス取得可否のキャッシュを
+実行間で使い回せる。呼び出し枠（api_quota_ledger）の予約は共有セッションを開いている間は返却せず、
+1時間ウィンドウの切り替わりで新しく予約し、未使用分はデーモン停止時に返却する。
+
+実行時刻は app/services/data_collection/collection_schedule.py（GitHub Actions の cron と同じ）。
+実行履歴は scheduler_runs（migration 017）に記録し、API の /api/v1/scheduler/status で確認できる。
+
+実行例:
+    # 全ジョブを常駐実行
+    python scheduler_daemon.py --notify-slack --notify-new-posts
+
+    # 起動直後に1回実行してから常駐
+    python scheduler_daemon.py --jobs new_posts,metrics_refresh --run-on-start
+
+    # 指定ジョブを1回だけ実行して終了（動作確認用）
+    python scheduler_daemon.py --jobs metrics_refresh --once
+"""
+
+import asyncio
+import argparse
+import logging
+import os
+import signal
+import socket
+import sys
+from dataclasses import fields
+from datetime import date, datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# 常駐プロセスでは DB 接続を使い回す（app の import 前に設定する必要がある）
+os.environ.setdefault("DATABASE_POOL_SIZE", "5")
+
+# プロジェクトルートをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.core.database import SessionLocal
+from app.repositories.scheduler_run_repository import SchedulerRunRepository
+from app.services.data_collection.collection_schedule import (
+    JOB_DAILY_INSIGHTS,
+    JOB_METRICS_REFRESH,
+    JOB_NEW_POSTS,
+    SCHEDULED_JOBS,
+)
+from app.services.data_collection.instagram_api_client import InstagramAPIClient
+
+from account_insights_collector import AccountInsightsCollector
+from metrics_refresh_collector import DEFAULT_API_BUDGET, MetricsRefreshCollector
+from new_posts_collector import NewPostsCollector
+
+logger = logging.getLogger("scheduler_daemon")
+
+# 停止時に実行中のジョブの終了を待つ上限（秒）
+DEFAULT_SHUTDOWN_TIMEOUT = 300
+
+
+def summarize_result(result) -> Dict[str, Any]:
+    """収集結果の件数（実行履歴の summary 用）"""
+    summary = {}
+    for f in fields(result):
+        value = getattr(result, f.name)
+        if isinstance(value, bool):
+            continue
+        if isinstance(value, (int, float)):
+            summary[f.name] = value
+    summary['errors'] = list(result.errors[:5])
+    summary['error_count'] = len(result.errors)
+    return summary
+
+
+# === ジョブ ===
+# 戻り値: (成功したか, 収集結果の件数)
+
+async def run_new_posts(args) -> Tuple[bool, Dict[str, Any]]:
+    """新規投稿の検出・収集（new_posts_collector.py と同じ）"""
+    collector = NewPostsCollector()
+    with collector.query_profile():
+        result = await collector.detect_and_collect(check_hours_back=args.check_hours_back)
+
+    duration = (result.completed_at - result.started_at).total_seconds()
+    collector.export_run_metrics(duration, result.successful_accounts, result.failed_accounts)
+    if args.notify_new_posts and result.new_posts_found > 0:
+        await collector.notification.send_new_posts_notification(result)
+    return result.failed_accounts == 0, summarize_result(result)
+
+
+async def run_daily_insights(args) -> Tuple[bool, Dict[str, Any]]:
+    """アカウント日次統計の収集（account_insights_collector.py と同じ）"""
+    collector = AccountInsightsCollector()
+    with collector.query_profile():
+        result = await collector.collect_daily_stats(target_date=date.today())
+
+    duration = (result.completed_at - result.started_at).total_seconds()
+    collector.export_run_metrics(duration, result.successful_accounts, result.failed_accounts)
+    if args.notify_slack:
+        await collector.notification.send_account_insights_result(result)
+    return result.failed_accounts == 0, summarize_result(result)
+
+
+async def run_metrics_refresh(args) -> Tuple[bool, Dict[str, Any]]:
+    """投稿メトリクスの再取得（metrics_refresh_collector.py と同じ）"""
+    collector = MetricsRefreshCollector()
+    with collector.query_profile():
+        result = await collector.refresh(api_budget=args.api_budget)
+
+    duration = (result.completed_at - result.started_at).total_seconds()
+    collector.export_run_metrics(duration, result.refreshed_posts, result.failed_posts)
+    return not result.aborted, summarize_result(result)
+
+
+JOB_RUNNERS: Dict[str, Callable[[Any], Awaitable[Tuple[bool, Dict[str, Any]]]]] = {
+    JOB_NEW_POSTS: run_new_posts,
+    JOB_DAILY_INSIGHTS: run_daily_insights,
+    JOB_METRICS_REFRESH: run_metrics_refresh,
+}
+
+
+# === デーモン ===
+
+class SchedulerDaemon:
+    """収集ジョブの常駐スケジューラー"""
+
+    def __init__(self, args, job_names: List[str]):
+        self.args = args
+        self.job_names = job_names
+        self.host = f"{socket.gethostname()}:{os.getpid()}"
+        self.stop_event = asyncio.Event()
+        self.tasks: Dict[str, asyncio.Task] = {}
+
+    def request_stop(self):
+        if not self.stop_event.is_set():
+            logger.info("🛑 Stop requested, waiting for running jobs to finish")
+            self.stop_event.set()
+
+    async def run(self) -> int:
+        """スケジュールに従ってジョブを実行（停止要求まで）"""
+        InstagramAPIClient.open_shared_session()
+        try:
+            await self._mark_interrupted_runs()
+
+            if self.args.once or self.args.run_on_start:
+                for name in self.job_names:
+                    self._start_job(name, scheduled_for=None)
+            if self.args.once:
+                results = await asyncio.gather(*self.tasks.values())
+                return 0 if all(results) else 1
+
+            now = datetime.now(timezone.utc)
+            next_runs = {name: SCHEDULED_JOBS[name].next_run_after(now) for name in self.job_names}
+            for name, next_run in sorted(next_runs.items(), key=lambda item: item[1]):
+                logger.info(f"🗓️ {name}: next run at {next_run.isoformat()}")
+
+            while not self.stop_event.is_set():
+                name, due = min(next_runs.items(), key=lambda item: item[1])
+                wait_seconds = (due - datetime.now(timezone.utc)).total_seconds()
+                if wait_seconds > 0:
+                    try:
+                        await asyncio.wait_for(self.stop_event.wait(), timeout=wait_seconds)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                self._start_job(name, scheduled_for=due)
+                # スリープ復帰等で予定時刻を過ぎていた場合も、取りこぼした回をまとめて実行しない
+                next_runs[name] = SCHEDULED_JOBS[name].next_run_after(max(due, datetime.now(timezone.utc)))
+                logger.info(f"🗓️ {name}: next run at {next_runs[name].isoformat()}")
+
+            await self._wait_for_running_jobs()
+            return 0
+        finally:
+            await InstagramAPIClient.close_shared_session()
+
+    def _start_job(self, name: str, scheduled_for: Optional[datetime]):
+        """ジョブを非同期タスクとして開始（同じジョブの前回の実行が終わっていなければスキップ）"""
+        running = self.tasks.get(name)
+        if running and not running.done():
+            logger.warning(f"⏭️ {name}: previous run still in progress, skipping this run")
+            return
+        self.tasks[name] = asyncio.create_task(self._execute(name, scheduled_for), name=name)
+
+    async def _execute(self, name: str, scheduled_for: Optional[datetime]) -> bool:
+        """1回分の実行と実行履歴の記録"""
+        run_id = await self._record_start(name, scheduled_for)
+        logger.info(f"▶️ {name} started")
+        status, summary, error = 'failed', {}, None
+        try:
+            success, summary = await JOB_RUNNERS[name](self.args)
+            status = 'succeeded' if success else 'failed'
+            if not success:
+                error = "; ".join(summary.get('errors', [])) or None
+        except asyncio.CancelledError:
+            status, error = 'interrupted', "Scheduler stopped before the run finished"
+            raise
+        except Exception as e:
+            error = str(e)
+            logger.error(f"❌ {name} crashed: {e}", exc_info=True)
+        finally:
+            await self._record_finish(run_id, status, summary, error)
+            logger.info(f"{'✅' if status == 'succeeded' else '❌'} {name} {status}")
+        return status == 'succeeded'
+
+    async def _wait_for_running_jobs(self):
+        """停止時に実行中のジョブを待つ（上限を過ぎたら中断）"""
+        running = [task for task in self.tasks.values() if not task.done()]
+        if not running:
+            return
+        done, pending = await asyncio.wait(running, timeout=self.args.shutdown_timeout)
+        for task in pending:
+            logger.warning(f"⛔ Cancelling {task.get_name()} after {self.args.shutdown_timeout}s")
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    # 実行履歴の記録に失敗しても収集は止めない
+
+    async def _mark_interrupted_runs(self):
+        db = SessionLocal()
+        try:
+            updated = await SchedulerRunRepository(db).mark_interrupted(f"{socket.gethostname()}:")
+            if updated:
+                logger.warning(f"⚠️ Marked {updated} runs left running by a previous daemon as interrupted")
+        except Exception as e:
+            logger.warning(f"Failed to clean up previous runs: {e}")
+        finally:
+            db.close()
+
+    async def _record_start(self, name: str, scheduled_for: Optional[datetime]):
+        db = SessionLocal()
+        try:
+            return await SchedulerRunRepository(db).start(name, self.host, scheduled_for)
+        except Exception as e:
+            logger.warning(f"Failed to record run start for {name}: {e}")
+            return None
+        finally:
+            db.close()
+
+    async def _record_finish(self, run_id, status: str, summary: Dict[str, Any], error: Optional[str]):
+        if run_id is None:
+            return
+        db = SessionLocal()
+        try:
+            await SchedulerRunRepository(db).finish(run_id, status, summary, error)
+        except Exception as e:
+            logger.warning(f"Failed to record run finish: {e}")
+        finally:
+            db.close()
+
+
+def parse_arguments():
+    """コマンドライン引数の解析"""
+    parser = argparse.ArgumentParser(description='Scheduler Daemon')
+    parser.add_argument('--jobs', help=f"実行するジョブ（カンマ区切り、未指定時は全ジョブ: {', '.join(SCHEDULED_JOBS)}）")
+    parser.add_argument('--run-on-start', action='store_true', help='起動直後に各ジョブを1回実行')
+    parser.add_argument('--once', action='store_true', help='各ジョブを1回だけ実行して終了')
+    parser.add_argument('--check-hours-back', type=int, default=8, help='new_posts の遡及時間（前回実行時刻がない場合）')
+    parser.add_argument('--api-budget', type=int, default=DEFAULT_API_BUDGET,
+                        help=f'metrics_refresh の1回あたりの API 呼び出し上限 (デフォルト: {DEFAULT_API_BUDGET})')
+    parser.add_argument('--notify-slack', action='store_true', help='daily_insights の結果をSlack通知')
+    parser.add_argument('--notify-new-posts', action='store_true', help='new_posts の新規投稿をSlack通知')
+    parser.add_argument('--shutdown-timeout', type=float, default=DEFAULT_SHUTDOWN_TIMEOUT,
+                        help='停止時に実行中のジョブを待つ上限（秒）')
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        default='INFO', help='ログレベル')
+    return parser.parse_args()
+
+
+async def main() -> int:
+    args = parse_arguments()
+    logging.basicConfig(
+        level=getattr(logging, args.log_level),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    job_names = [name.strip() for name in args.jobs.split(',') if name.strip()] if args.jobs else list(SCHEDULED_JOBS)
+    unknown = [name for name in job_names if name not in SCHEDULED_JOBS]
+    if unknown or not job_names:
+        print(f"❌ Unknown jobs: {', '.join(unknown) or '(none)'} (available: {', '.join(SCHEDULED_JOBS)})")
+        return 1
+
+    daemon = SchedulerDaemon(args, job_names)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, daemon.request_stop)
+
+    logger.info(f"🚀 Scheduler daemon started on {daemon.host}: {', '.join(job_names)}")
+    return await daemon.run()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
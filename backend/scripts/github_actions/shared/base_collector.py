@@ -5,20 +5,27 @@ GitHub Actions用の共通基底クラス
 
 import logging
 import sys
+from contextlib import contextmanager
 from pathlib import Path
 from typing import List, Optional
 from datetime import datetime
 import os
 
 from app.core.database import SessionLocal
+from app.core.metrics import export_metrics, record_collector_run
+from app.core.query_profiler import SQL_PROFILING_ENABLED, profile_queries
 from app.repositories.instagram_account_repository import InstagramAccountRepository
 
+from .sharding import filter_accounts_for_shard, save_shard_result, validate_shard_arguments
+
 class BaseCollector:
     """GitHub Actions用コレクターの基底クラス"""
     
     def __init__(self, service_name: str):
         self.service_name = service_name
         self.db = None
+        self.shard_index = 0
+        self.shard_count = 1
         self.setup_logging()
         
     def setup_logging(self):
@@ -38,6 +45,22 @@ class BaseCollector:
         )
         self.logger = logging.getLogger(self.service_name)
         
+    def configure_shard(self, shard_index: int, shard_count: int):
+        """matrix 実行時の担当シャード設定"""
+        validate_shard_arguments(shard_index, shard_count)
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        if self.is_sharded:
+            self.logger.info(f"🧩 Shard {shard_index + 1}/{shard_count}")
+
+    @property
+    def is_sharded(self) -> bool:
+        return self.shard_count > 1
+
+    def save_shard_result(self, result):
+        """シャード結果の保存（統合ジョブで読み込む）"""
+        return save_shard_result(result, self.service_name, self.shard_index)
+
     async def _init_database(self):
         """データベース接続初期化"""
         if not self.db:
@@ -78,6 +101,29 @@ class BaseCollector:
         else:
             # 全アクティブアカウント
             accounts = await account_repo.get_active_accounts()
+        
+        # シャード分割（instagram_user_id のハッシュで担当を決定）
+        if self.is_sharded:
+            total = len(accounts)
+            accounts = filter_accounts_for_shard(accounts, self.shard_index, self.shard_count)
+            self.logger.info(f"🧩 Shard {self.shard_index + 1}/{self.shard_count}: {len(accounts)}/{total} accounts")
             
         self.logger.info(f"Target accounts retrieved: {len(accounts)}")
-        return accounts
\ No newline at end of file
+        return accounts
+
+    def export_run_metrics(self, duration_seconds: float, successful: int, failed: int):
+        """実行結果メトリクスの出力（Pushgateway または textfile）"""
+        record_collector_run(self.service_name, duration_seconds, successful, failed)
+        metrics_dir = Path(__file__).parent.parent.parent.parent / "logs" / "github_actions" / "metrics"
+        job = f"{self.service_name}_shard_{self.shard_index}" if self.is_sharded else self.service_name
+        export_metrics(job, metrics_dir)
+
+    @contextmanager
+    def query_profile(self):
+        """収集実行単位のSQLプロファイル（SQL_PROFILING=1 の場合はレポートをログ出力、途中で例外が発生した場合も出力）"""
+        with profile_queries(self.service_name) as profile:
+            try:
+                yield profile
+            finally:
+                if SQL_PROFILING_ENABLED:
+                    self.logger.info(profile.format_report(max_items=10))
@@ -1,20 +1,27 @@
 """
 Execution Tracker
 実行状態管理
+
+前回実行時刻（new_posts）、持ち時間切れで処理できなかった作業（pending）、
+アカウントごとの投稿数・最新投稿ID（media_state、新規投稿の変更確認用）を
+data/execution_state/ の状態ファイルで管理する。
 """
 
 import json
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Optional
 import logging
 
 class ExecutionTracker:
     """実行状態追跡クラス"""
     
-    def __init__(self):
+    def __init__(self, service_name: str = "new_posts"):
         self.logger = logging.getLogger(__name__)
-        self.state_file = Path(__file__).parent.parent.parent.parent / "data" / "execution_state" / "new_posts_last_execution.json"
+        state_dir = Path(__file__).parent.parent.parent.parent / "data" / "execution_state"
+        self.state_file = state_dir / f"{service_name}_last_execution.json"
+        self.pending_file = state_dir / f"{service_name}_pending.json"
+        self.media_state_file = state_dir / f"{service_name}_media_state.json"
         self.state_file.parent.mkdir(parents=True, exist_ok=True)
     
     def get_last_execution_time(self) -> Optional[datetime]:
@@ -58,4 +65,100 @@ class ExecutionTracker:
             self.logger.info(f"Execution state updated: {execution_time}")
             
         except Exception as e:
-            self.logger.error(f"Failed to update execution state: {e}")
\ No newline at end of file
+            self.logger.error(f"Failed to update execution state: {e}")
+
+    def get_pending_work(self) -> List[Dict[str, Any]]:
+        """前回までに持ち時間切れで処理できなかった作業（アカウント単位）の取得"""
+        try:
+            if self.pending_file.exists():
+                with open(self.pending_file, 'r') as f:
+                    state = json.load(f)
+                return state.get('pending', [])
+            return []
+
+        except Exception as e:
+            self.logger.warning(f"Failed to load pending work: {e}")
+            return []
+
+    def save_pending_work(
+        self,
+        pending: List[Dict[str, Any]],
+        scope_account_ids: Optional[Iterable[str]] = None,
+        execution_id: Optional[str] = None
+    ):
+        """
+        未処理作業の保存
+
+        今回の実行対象（scope_account_ids）に含まれないアカウントの未処理分は引き継ぐ
+        （--target-accounts 指定時や欠損シャードの分を消さないため）。
+        scope_account_ids が None の場合は全体を置き換える。
+        """
+        try:
+            previous = self.get_pending_work()
+            if scope_account_ids is None:
+                retained = []
+            else:
+                scope = set(scope_account_ids)
+                retained = [item for item in previous if item.get('instagram_user_id') not in scope]
+            merged = retained + list(pending)
+
+            # 変化がなければ書き換えない（状態ファイルの不要なコミットを避ける）
+            if merged == previous and self.pending_file.exists():
+                return
+
+            state = {
+                'pending': merged,
+                'execution_id': execution_id,
+                'updated_at': datetime.now(timezone.utc).isoformat()
+            }
+            with open(self.pending_file, 'w') as f:
+                json.dump(state, f, indent=2, ensure_ascii=False, default=str)
+
+            self.logger.info(f"Pending work saved: {len(merged)} items ({len(retained)} carried over from other scopes)")
+
+        except Exception as e:
+            self.logger.error(f"Failed to save pending work: {e}")
+
+    def get_media_state(self) -> Dict[str, Dict[str, Any]]:
+        """前回確認時のアカウント別 media_count・最新投稿ID（instagram_user_id → 状態）"""
+        try:
+            if self.media_state_file.exists():
+                with open(self.media_state_file, 'r') as f:
+                    state = json.load(f)
+                return state.get('accounts', {})
+            return {}
+
+        except Exception as e:
+            self.logger.warning(f"Failed to load media state: {e}")
+            return {}
+
+    def save_media_state(self, states: List[Dict[str, Any]]):
+        """
+        アカウント別の media_count・最新投稿IDの保存
+
+        今回確認したアカウントのみ更新し、それ以外のアカウントの状態は引き継ぐ。
+        """
+        try:
+            previous = self.get_media_state()
+            accounts = dict(previous)
+            for item in states:
+                accounts[item['instagram_user_id']] = {
+                    'media_count': item.get('media_count'),
+                    'latest_media_id': item.get('latest_media_id')
+                }
+
+            # 変化がなければ書き換えない（状態ファイルの不要なコミットを避ける）
+            if accounts == previous and self.media_state_file.exists():
+                return
+
+            state = {
+                'accounts': accounts,
+                'updated_at': datetime.now(timezone.utc).isoformat()
+            }
+            with open(self.media_state_file, 'w') as f:
+                json.dump(state, f, indent=2, ensure_ascii=False)
+
+            self.logger.info(f"Media state saved: {len(states)} accounts checked, {len(accounts)} tracked")
+
+        except Exception as e:
+            self.logger.error(f"Failed to save media state: {e}")
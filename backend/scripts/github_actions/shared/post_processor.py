@@ -58,7 +58,20 @@ class PostProcessor:
         except Exception as e:
             self.logger.error(f"Failed to save post data {post_data.get('id', 'unknown')}: {e}")
             return None
-    
+
+    async def get_saved_post(self, instagram_post_id: str) -> Optional[Any]:
+        """保存済み投稿の取得（再試行時の再保存を避けるため）"""
+
+        from app.core.database import SessionLocal
+        db = SessionLocal()
+        try:
+            return await InstagramPostRepository(db).get_by_instagram_post_id(instagram_post_id)
+        except Exception as e:
+            self.logger.error(f"Failed to load saved post {instagram_post_id}: {e}")
+            return None
+        finally:
+            db.close()
+
     async def save_post_insights(self, post_id: str, insights_data: Dict) -> bool:
         """投稿インサイトの保存"""
         
@@ -87,9 +100,12 @@ class PostProcessor:
             db = SessionLocal()
             try:
                 metrics_repo = InstagramPostMetricsRepository(db)
-                await metrics_repo.create(metrics_data)
+                _, created = await metrics_repo.create_if_changed(metrics_data)
                 
-                self.logger.info(f"📊 Saved post insights: {post_id}")
+                if created:
+                    self.logger.info(f"📊 Saved post insights: {post_id}")
+                else:
+                    self.logger.info(f"📊 Post insights unchanged, extended latest snapshot: {post_id}")
                 return True
                 
             finally:
@@ -0,0 +1,123 @@
+"""
+Sharding Utilities
+GitHub Actions の matrix 実行向けのアカウント分割・シャード結果の保存と統合
+"""
+
+import hashlib
+import json
+import logging
+import typing
+from dataclasses import asdict, fields, is_dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, List, Optional, Type, TypeVar
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHARD_RESULT_DIR = Path(__file__).parent.parent.parent.parent / "logs" / "github_actions" / "shards"
+
+T = TypeVar("T")
+
+
+def shard_for_account(instagram_user_id: str, shard_count: int) -> int:
+    """
+    アカウントの担当シャードを決定（Rendezvous hashing）
+
+    シャード数を変更しても移動するアカウントは約 1/N に抑えられ、
+    同じシャード数であれば常に同じシャードに割り当てられる。
+    """
+    if shard_count <= 1:
+        return 0
+    return max(
+        range(shard_count),
+        key=lambda shard: hashlib.sha256(f"{shard}:{instagram_user_id}".encode("utf-8")).digest()
+    )
+
+
+def filter_accounts_for_shard(accounts: List[Any], shard_index: int, shard_count: int) -> List[Any]:
+    """担当シャードのアカウントのみ抽出"""
+    if shard_count <= 1:
+        return accounts
+    return [
+        account for account in accounts
+        if shard_for_account(str(account.instagram_user_id), shard_count) == shard_index
+    ]
+
+
+def validate_shard_arguments(shard_index: int, shard_count: int) -> None:
+    """--shard-index / --shard-count の検証"""
+    if shard_count < 1:
+        raise ValueError(f"shard count must be >= 1: {shard_count}")
+    if not 0 <= shard_index < shard_count:
+        raise ValueError(f"shard index must be in [0, {shard_count - 1}]: {shard_index}")
+
+
+def shard_result_path(service_name: str, shard_index: int, output_dir: Optional[Path] = None) -> Path:
+    """シャード結果ファイルのパス"""
+    return (output_dir or DEFAULT_SHARD_RESULT_DIR) / f"{service_name}_shard_{shard_index}.json"
+
+
+def save_shard_result(result: Any, service_name: str, shard_index: int, output_dir: Optional[Path] = None) -> Path:
+    """シャードの実行結果をJSONで保存"""
+    path = shard_result_path(service_name, shard_index, output_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(asdict(result), f, indent=2, ensure_ascii=False, default=str)
+    logger.info(f"Shard result saved: {path}")
+    return path
+
+
+def _restore_value(value: Any, field_type: Any) -> Any:
+    """JSONの値をデータクラスのフィールド型に戻す（日時のみ）"""
+    if value is None:
+        return None
+    args = typing.get_args(field_type)
+    candidates = args if args else (field_type,)
+    if datetime in candidates:
+        return datetime.fromisoformat(value)
+    if date in candidates:
+        return date.fromisoformat(value)
+    return value
+
+
+def load_shard_result(result_cls: Type[T], path: Path) -> T:
+    """シャード結果JSONをデータクラスとして読み込み"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    type_hints = typing.get_type_hints(result_cls)
+    return result_cls(**{
+        f.name: _restore_value(data.get(f.name), type_hints[f.name])
+        for f in fields(result_cls) if f.name in data
+    })
+
+
+def merge_shard_results(results: List[T]) -> T:
+    """
+    シャード結果を1つに統合
+
+    数値は合計、リストは連結、started_at は最小、completed_at は最大、
+    それ以外は先頭シャードの値を使用する。
+    """
+    if not results:
+        raise ValueError("No shard results to merge")
+    first = results[0]
+    if not is_dataclass(first):
+        raise TypeError("Shard results must be dataclass instances")
+
+    merged = {}
+    for f in fields(first):
+        values = [getattr(result, f.name) for result in results]
+        if f.name == 'started_at':
+            merged[f.name] = min(v for v in values if v is not None)
+        elif f.name == 'completed_at':
+            present = [v for v in values if v is not None]
+            merged[f.name] = max(present) if present else None
+        elif isinstance(values[0], bool):
+            merged[f.name] = values[0]
+        elif isinstance(values[0], (int, float)):
+            merged[f.name] = sum(values)
+        elif isinstance(values[0], list):
+            merged[f.name] = [item for value in values for item in value]
+        else:
+            merged[f.name] = values[0]
+    return type(first)(**merged)
@@ -0,0 +1,64 @@
+"""
+Time Budget
+収集ジョブの持ち時間管理
+
+GitHub Actions のジョブは timeout-minutes を超えると強制終了され、処理中の作業も実行状態の更新も失われる。
+--time-budget で持ち時間を指定した場合、アカウント単位の処理時間を計測し、
+次のアカウントが締め切りまでに終わらない見込みになった時点で新しい処理を始めずに止める。
+"""
+
+import time
+from typing import List, Optional
+
+# 締め切り前に残す余裕（結果保存・状態ファイル書き出し・通知の分）
+DEFAULT_SAFETY_MARGIN_SECONDS = 60
+
+# 処理時間の見積もりに使う直近の計測数
+ESTIMATE_WINDOW = 10
+
+
+class TimeBudget:
+    """収集ジョブの持ち時間（budget_minutes が None の場合は無制限）"""
+
+    def __init__(self, budget_minutes: Optional[float] = None, safety_margin_seconds: float = DEFAULT_SAFETY_MARGIN_SECONDS):
+        if budget_minutes is not None and budget_minutes <= 0:
+            raise ValueError(f"time budget must be > 0 minutes: {budget_minutes}")
+        self.budget_seconds = budget_minutes * 60 if budget_minutes is not None else None
+        self.safety_margin_seconds = safety_margin_seconds
+        self.started = time.monotonic()
+        self._unit_durations: List[float] = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget_seconds is not None
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def remaining_seconds(self) -> Optional[float]:
+        """締め切りまでの残り秒数（無制限の場合は None）"""
+        if not self.enabled:
+            return None
+        return self.budget_seconds - self.elapsed_seconds
+
+    @property
+    def estimated_unit_seconds(self) -> float:
+        """1単位（アカウント）の処理時間見積もり（直近の最大値で安全側に見積もる）"""
+        recent = self._unit_durations[-ESTIMATE_WINDOW:]
+        return max(recent) if recent else 0.0
+
+    def record_unit(self, duration_seconds: float) -> None:
+        """1単位の処理時間を記録"""
+        self._unit_durations.append(duration_seconds)
+
+    def has_time_for(self, seconds: float = 0.0) -> bool:
+        """締め切り（安全マージン込み）までに指定秒数の処理が終わる見込みか"""
+        if not self.enabled:
+            return True
+        return self.remaining_seconds - self.safety_margin_seconds >= seconds
+
+    def can_start_unit(self) -> bool:
+        """次の1単位を始めてよいか"""
+        return self.has_time_for(self.estimated_unit_seconds)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Token Refresher for GitHub Actions
+期限切れが近いアクセストークンの一括更新
+
+収集ジョブがトークン切れで止まらないよう、日次収集の前に実行する。
+同じユーザートークンから登録したアカウントは1回の交換結果を共有し、ページトークンを取り直す。
+
+実行例:
+    python token_refresher.py --days-threshold 7
+    python token_refresher.py --target-accounts "123,456" --dry-run
+"""
+
+import asyncio
+import sys
+import argparse
+import logging
+import os
+
+# プロジェクトルートをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.services.data_collection.token_refresh_service import (
+    DEFAULT_CONCURRENCY,
+    DEFAULT_DAYS_THRESHOLD,
+    TokenRefreshService,
+)
+
+from shared.base_collector import BaseCollector
+
+
+class TokenRefresher(BaseCollector):
+    """アクセストークン一括更新クラス"""
+
+    def __init__(self):
+        super().__init__("token_refresh")
+
+    async def refresh(self, days_threshold: int, concurrency: int, target_accounts=None, dry_run: bool = False):
+        """メイン処理"""
+        await self._init_database()
+        try:
+            service = TokenRefreshService(self.db, concurrency=concurrency)
+            return await service.refresh_expiring_tokens(
+                days_threshold=days_threshold,
+                account_filter=target_accounts,
+                dry_run=dry_run
+            )
+        finally:
+            await self._cleanup_database()
+
+
+# CLI エントリーポイント
+async def main():
+    parser = argparse.ArgumentParser(description='Token Refresher')
+    parser.add_argument('--target-accounts', help='対象アカウント (カンマ区切り)')
+    parser.add_argument('--days-threshold', type=int, default=DEFAULT_DAYS_THRESHOLD,
+                        help=f'期限切れまでの日数がこれ以下のトークンを更新 (デフォルト: {DEFAULT_DAYS_THRESHOLD})')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'トークン交換の同時実行数 (デフォルト: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--dry-run', action='store_true', help='更新対象の確認のみ実行')
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        default='INFO', help='ログレベル')
+
+    args = parser.parse_args()
+
+    target_accounts = None
+    if args.target_accounts:
+        target_accounts = [acc.strip() for acc in args.target_accounts.split(',') if acc.strip()]
+
+    logging.getLogger().setLevel(getattr(logging, args.log_level))
+
+    refresher = TokenRefresher()
+    summary = await refresher.refresh(
+        days_threshold=args.days_threshold,
+        concurrency=args.concurrency,
+        target_accounts=target_accounts,
+        dry_run=args.dry_run
+    )
+
+    # 結果表示
+    print(f"\n{'='*60}")
+    print(f"🔑 TOKEN REFRESH RESULT{' (DRY RUN)' if summary.dry_run else ''}")
+    print(f"{'='*60}")
+    print(f"🎯 Accounts expiring within {args.days_threshold} days: {summary.accounts_checked}")
+    print(f"🔗 Unique user tokens: {summary.unique_tokens}")
+    if summary.accounts_without_user_token:
+        print(f"⚠️ Accounts without a stored user token (re-run setup): {summary.accounts_without_user_token}")
+    print(f"✅ Exchanges succeeded: {summary.exchanges_succeeded}")
+    print(f"❌ Exchanges failed: {summary.exchanges_failed}")
+    print(f"💾 Accounts updated: {summary.accounts_updated}")
+
+    if summary.errors:
+        print(f"❌ Errors ({len(summary.errors)}):")
+        for error in summary.errors[:5]:
+            print(f"   {error}")
+
+    duration = (summary.completed_at - summary.started_at).total_seconds()
+    print(f"⏱️ Duration: {duration:.1f}s")
+    print(f"{'='*60}")
+
+    refresher.export_run_metrics(duration, summary.accounts_updated, summary.exchanges_failed)
+
+    return 1 if summary.errors else 0
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
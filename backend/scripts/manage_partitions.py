@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Partition Maintenance Script
+月次レンジパーティション（migration 010）の作成・一覧・切り離し
+
+Usage:
+    python scripts/manage_partitions.py ensure --months-ahead 3
+    python scripts/manage_partitions.py list
+    python scripts/manage_partitions.py detach --before 2024-07 --table instagram_post_metrics
+"""
+
+import sys
+import os
+import argparse
+import logging
+from datetime import date
+
+# プロジェクトルートをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import text
+
+from app.core.database import SessionLocal
+
+# ログ設定
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ('instagram_post_metrics', 'instagram_daily_stats')
+
+PARTITIONS_QUERY = text("""
+    SELECT child.relname AS partition_name,
+           pg_get_expr(child.relpartbound, child.oid) AS bounds,
+           child.reltuples::BIGINT AS estimated_rows
+    FROM pg_inherits
+    JOIN pg_class parent ON pg_inherits.inhparent = parent.oid
+    JOIN pg_class child ON pg_inherits.inhrelid = child.oid
+    WHERE parent.relname = :table
+    ORDER BY child.relname
+""")
+
+
+def ensure_partitions(db, tables, months_ahead: int) -> int:
+    """当月から指定月数先までのパーティションを作成"""
+    total = 0
+    for table in tables:
+        created = db.execute(
+            text("SELECT ensure_monthly_partitions(:table, :months_ahead)"),
+            {'table': table, 'months_ahead': months_ahead}
+        ).scalar()
+        logger.info(f"📅 {table}: {created} partitions created")
+        total += created
+    db.commit()
+    return total
+
+
+def list_partitions(db, tables):
+    """パーティション一覧を表示"""
+    print(f"\n{'='*60}")
+    print("🗂️ PARTITIONS")
+    print(f"{'='*60}")
+    for table in tables:
+        rows = db.execute(PARTITIONS_QUERY, {'table': table}).fetchall()
+        print(f"📦 {table} ({len(rows)} partitions)")
+        for row in rows:
+            print(f"   {row.partition_name:<40} ~{max(row.estimated_rows, 0):>10} rows  {row.bounds}")
+    print(f"{'='*60}")
+
+
+def detach_partitions(db, table: str, before: date, dry_run: bool = False) -> list:
+    """指定月より前の月次パーティションを切り離し（テーブルは残る）"""
+    detached = []
+    for row in db.execute(PARTITIONS_QUERY, {'table': table}).fetchall():
+        suffix = row.partition_name.rsplit('_p', 1)[-1]
+        if not (len(suffix) == 6 and suffix.isdigit()):
+            continue  # DEFAULT パーティション等
+        if date(int(suffix[:4]), int(suffix[4:]), 1) >= before:
+            continue
+        if not dry_run:
+            db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{row.partition_name}"'))
+        detached.append(row.partition_name)
+        logger.info(f"🔌 {'Would detach' if dry_run else 'Detached'} {row.partition_name}")
+    db.commit()
+    return detached
+
+
+def parse_arguments():
+    """コマンドライン引数の解析"""
+    parser = argparse.ArgumentParser(description='Partition Maintenance')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ensure_parser = subparsers.add_parser('ensure', help='将来の月次パーティションを作成')
+    ensure_parser.add_argument('--months-ahead', type=int, default=3, help='作成する先の月数 (デフォルト: 3)')
+    ensure_parser.add_argument('--table', choices=PARTITIONED_TABLES, help='対象テーブル（未指定時は全て）')
+
+    list_parser = subparsers.add_parser('list', help='パーティション一覧を表示')
+    list_parser.add_argument('--table', choices=PARTITIONED_TABLES, help='対象テーブル（未指定時は全て）')
+
+    detach_parser = subparsers.add_parser('detach', help='古い月次パーティションを切り離し')
+    detach_parser.add_argument('--table', choices=PARTITIONED_TABLES, required=True, help='対象テーブル')
+    detach_parser.add_argument('--before', required=True, help='この月より前を切り離し (YYYY-MM)')
+    detach_parser.add_argument('--dry-run', action='store_true', help='対象の表示のみ')
+
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_arguments()
+    tables = [args.table] if getattr(args, 'table', None) else list(PARTITIONED_TABLES)
+
+    db = SessionLocal()
+    try:
+        if args.command == 'ensure':
+            created = ensure_partitions(db, tables, args.months_ahead)
+            print(f"✅ {created} partitions created")
+        elif args.command == 'list':
+            list_partitions(db, tables)
+        else:
+            try:
+                year, month = (int(v) for v in args.before.split('-'))
+                before = date(year, month, 1)
+            except ValueError:
+                print(f"❌ Invalid month format: {args.before}")
+                return 1
+            detached = detach_partitions(db, args.table, before, args.dry_run)
+            print(f"✅ {len(detached)} partitions {'to detach' if args.dry_run else 'detached'}")
+        return 0
+
+    except Exception as e:
+        logger.error(f"❌ Partition maintenance failed: {e}")
+        db.rollback()
+        return 1
+
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
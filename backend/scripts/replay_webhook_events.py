@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Webhook Event Replayer
+Instagram Webhook の通知をローカルの API サーバーに再送する（受信エンドポイントの動作確認用）
+
+通知は FACEBOOK_APP_SECRET で署名（X-Hub-Signature-256）して送信するため、本番と同じ検証を通る。
+ペイロードはアプリダッシュボードの「テスト」やログから保存した JSON ファイル（1件または配列）か、
+--field / --account / --media で組み立てたサンプルを使う。
+
+Usage:
+    # 購読確認（GET hub.challenge）
+    python scripts/replay_webhook_events.py --verify
+
+    # サンプル通知（comments）を送信
+    python scripts/replay_webhook_events.py --field comments --account 17841402015304577 --media 18012345678901234
+
+    # 保存した通知を送信
+    python scripts/replay_webhook_events.py --file data/webhook_events.json
+
+    # 送信せずに取り出される投稿を確認
+    python scripts/replay_webhook_events.py --file data/webhook_events.json --dry-run
+"""
+
+import asyncio
+import sys
+import os
+import argparse
+import json
+import logging
+import secrets
+import time
+from typing import Any, Dict, List
+
+import aiohttp
+
+# プロジェクトルートをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.instagram_config import instagram_config
+from app.services.data_collection.webhook_event_service import (
+    MEDIA_ID_PATHS,
+    extract_media_events,
+    sign_payload,
+)
+
+# ログ設定
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_URL = "http://localhost:8000/api/v1/webhooks/instagram"
+
+
+def parse_arguments():
+    """コマンドライン引数の解析"""
+    parser = argparse.ArgumentParser(description='Webhook Event Replayer')
+    parser.add_argument('--url', default=DEFAULT_URL, help=f'受信エンドポイント (デフォルト: {DEFAULT_URL})')
+    parser.add_argument('--verify', action='store_true', help='購読確認リクエスト（GET）のみ送信')
+    parser.add_argument('--file', help='通知ペイロードの JSON ファイル（1件または配列）')
+    parser.add_argument('--field', choices=sorted(MEDIA_ID_PATHS), default='comments', help='サンプル通知のフィールド')
+    parser.add_argument('--account', help='サンプル通知の Instagram User ID')
+    parser.add_argument('--media', help='サンプル通知の投稿ID')
+    parser.add_argument('--app-secret', help='署名に使うアプリシークレット（未指定時は FACEBOOK_APP_SECRET）')
+    parser.add_argument('--bad-signature', action='store_true', help='不正な署名で送信（拒否されることの確認）')
+    parser.add_argument('--dry-run', action='store_true', help='送信せずに取り出される投稿を表示')
+    return parser.parse_args()
+
+
+def build_sample_payload(field: str, instagram_user_id: str, media_id: str) -> Dict[str, Any]:
+    """フィールド別のサンプル通知（Meta のドキュメントの形式）"""
+    if field in ('comments', 'live_comments'):
+        value = {
+            'id': f"sample_{secrets.token_hex(4)}",
+            'from': {'id': 'sample_user', 'username': 'sample_user'},
+            'media': {'id': media_id},
+            'text': 'sample comment'
+        }
+    else:
+        value = {'media_id': media_id, 'exits': 0, 'replies': 0, 'reach': 0, 'taps_forward': 0, 'taps_back': 0}
+
+    return {
+        'object': 'instagram',
+        'entry': [{
+            'id': instagram_user_id,
+            'time': int(time.time()),
+            'changes': [{'field': field, 'value': value}]
+        }]
+    }
+
+
+def load_payloads(args) -> List[Dict[str, Any]]:
+    """再送する通知の読み込み"""
+    if args.file:
+        with open(args.file, 'r') as f:
+            data = json.load(f)
+        return data if isinstance(data, list) else [data]
+    if not args.account or not args.media:
+        raise ValueError("--file or both --account and --media are required")
+    return [build_sample_payload(args.field, args.account, args.media)]
+
+
+async def send_verification(session: aiohttp.ClientSession, url: str) -> bool:
+    """購読確認リクエスト"""
+    challenge = secrets.token_hex(8)
+    params = {
+        'hub.mode': 'subscribe',
+        'hub.verify_token': instagram_config.webhook_verify_token or '',
+        'hub.challenge': challenge
+    }
+    async with session.get(url, params=params) as response:
+        body = await response.text()
+        ok = response.status == 200 and body == challenge
+        print(f"{'✅' if ok else '❌'} Verification: HTTP {response.status} {body[:100]}")
+        return ok
+
+
+async def send_payload(session: aiohttp.ClientSession, url: str, payload: Dict[str, Any], app_secret: str) -> bool:
+    """署名付きで通知を送信"""
+    body = json.dumps(payload).encode()
+    headers = {'Content-Type': 'application/json', 'X-Hub-Signature-256': sign_payload(body, app_secret)}
+    async with session.post(url, data=body, headers=headers) as response:
+        text = await response.text()
+        print(f"{'✅' if response.status == 200 else '❌'} HTTP {response.status} {text[:200]}")
+        return response.status == 200
+
+
+async def main() -> int:
+    args = parse_arguments()
+
+    async with aiohttp.ClientSession() as session:
+        if args.verify:
+            return 0 if await send_verification(session, args.url) else 1
+
+        try:
+            payloads = load_payloads(args)
+        except (OSError, ValueError) as e:
+            logger.error(f"❌ {e}")
+            return 1
+
+        print(f"\n{'='*60}")
+        print(f"📨 WEBHOOK REPLAY ({len(payloads)} payloads)")
+        print(f"{'='*60}")
+
+        for payload in payloads:
+            for event in extract_media_events(payload):
+                print(f"   {event.field:<15} account={event.instagram_user_id} media={event.media_id}")
+        if args.dry_run:
+            print(f"{'='*60}")
+            return 0
+
+        app_secret = args.app_secret or instagram_config.facebook_app_secret
+        if not app_secret:
+            logger.error("❌ FACEBOOK_APP_SECRET (or --app-secret) is required to sign payloads")
+            return 1
+        if args.bad_signature:
+            app_secret = secrets.token_hex(16)
+
+        results = []
+        for payload in payloads:
+            try:
+                results.append(await send_payload(session, args.url, payload, app_secret))
+            except aiohttp.ClientError as e:
+                logger.error(f"❌ Failed to reach {args.url}: {e}")
+                results.append(False)
+
+        print(f"📊 Delivered: {sum(results)}/{len(results)}")
+        print(f"{'='*60}")
+        return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Migration Runner
+app/models/migrations 配下のSQLマイグレーションを番号指定で実行する
+
+Usage:
+    python scripts/run_migration.py 008
+    python scripts/run_migration.py 008 009
+"""
+
+import re
+import sys
+import os
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import text
+
+from app.core.database import SessionLocal
+import logging
+
+# ログ設定
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).parent.parent / "app" / "models" / "migrations"
+
+
+def _split_statements(sql_content: str):
+    """SQLをステートメント単位に分割（行コメントを除去、$$ で囲まれた関数本体内の ; では分割しない）"""
+    lines = [line for line in sql_content.splitlines() if not line.strip().startswith('--')]
+
+    statements = []
+    current = []
+    in_dollar_quote = False
+    for part in re.split(r'(\$\$|;)', "\n".join(lines)):
+        if part == '$$':
+            in_dollar_quote = not in_dollar_quote
+        if part == ';' and not in_dollar_quote:
+            statements.append("".join(current).strip())
+            current = []
+            continue
+        current.append(part)
+    statements.append("".join(current).strip())
+    return [stmt for stmt in statements if stmt]
+
+
+def run_migration(number: str) -> bool:
+    """指定番号のマイグレーションを実行"""
+    matches = sorted(MIGRATIONS_DIR.glob(f"{number}_*.sql"))
+    if not matches:
+        logger.error(f"Migration file not found: {number}_*.sql")
+        return False
+    migration_file = matches[0]
+
+    with open(migration_file, 'r', encoding='utf-8') as f:
+        statements = _split_statements(f.read())
+
+    db = SessionLocal()
+    try:
+        logger.info(f"🚀 Running migration {migration_file.name}")
+
+        for i, statement in enumerate(statements, 1):
+            logger.info(f"📝 Executing statement {i}: {statement[:50]}...")
+            db.execute(text(statement))
+
+        db.commit()
+        logger.info(f"✅ Migration {migration_file.name} completed successfully")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ Migration failed: {e}")
+        db.rollback()
+        return False
+
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python scripts/run_migration.py <number> [<number> ...]")
+        sys.exit(1)
+
+    for migration_number in sys.argv[1:]:
+        if not run_migration(migration_number):
+            print(f"❌ Migration {migration_number} failed!")
+            sys.exit(1)
+
+    print("✅ Migration completed successfully!")
+    sys.exit(0)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+API Quota Ledger Script
+プロセス間で共有する Graph API 呼び出し枠（migration 013）の残量表示・古いウィンドウの削除
+
+Usage:
+    python scripts/show_api_quota.py
+    python scripts/show_api_quota.py --hours 6
+    python scripts/show_api_quota.py --prune-days 7
+"""
+
+import asyncio
+import sys
+import os
+import argparse
+import logging
+from datetime import timedelta
+from typing import Dict, List
+
+# プロジェクトルートをパスに追加
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.database import SessionLocal
+from app.repositories.api_quota_ledger_repository import ApiQuotaLedgerRepository
+from app.repositories.instagram_account_repository import InstagramAccountRepository
+from app.services.data_collection.api_quota_ledger import current_window_start, token_fingerprint
+
+# ログ設定
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def parse_arguments():
+    """コマンドライン引数の解析"""
+    parser = argparse.ArgumentParser(description='API Quota Ledger')
+    parser.add_argument('--hours', type=int, default=1, help='表示する直近のウィンドウ数 (デフォルト: 1 = 現在のウィンドウ)')
+    parser.add_argument('--prune-days', type=int, help='指定日数より古いウィンドウを削除')
+    return parser.parse_args()
+
+
+async def build_token_labels(db) -> Dict[str, str]:
+    """トークンのハッシュ → 利用アカウント名（台帳にはトークンを保存しないため逆引きする）"""
+    labels: Dict[str, List[str]] = {}
+    for account in await InstagramAccountRepository(db).get_active_accounts():
+        fingerprint = token_fingerprint(account.access_token_encrypted)
+        if fingerprint:
+            labels.setdefault(f"token:{fingerprint}", []).append(f"@{account.username}")
+    return {key: ', '.join(usernames) for key, usernames in labels.items()}
+
+
+async def main() -> int:
+    args = parse_arguments()
+
+    db = SessionLocal()
+    try:
+        repo = ApiQuotaLedgerRepository(db)
+
+        if args.prune_days is not None:
+            deleted = await repo.prune(current_window_start() - timedelta(days=args.prune_days))
+            print(f"🗑️ Deleted {deleted} ledger rows older than {args.prune_days} days")
+            return 0
+
+        since = current_window_start() - timedelta(hours=max(args.hours, 1) - 1)
+        rows = await repo.get_windows(since)
+        labels = await build_token_labels(db)
+
+        print(f"\n{'='*60}")
+        print("📒 API QUOTA LEDGER")
+        print(f"{'='*60}")
+        if not rows:
+            print("📭 No reservations in the selected windows")
+
+        current_window = None
+        for row in rows:
+            if row.window_start != current_window:
+                current_window = row.window_start
+                print(f"🕐 {current_window.strftime('%Y-%m-%d %H:%M')} UTC")
+            usage = row.calls_reserved / row.calls_limit * 100 if row.calls_limit else 0
+            label = labels.get(row.scope_key, '')
+            print(
+                f"   {row.scope_key:<24} {row.calls_reserved:>5}/{row.calls_limit:<5} "
+                f"remaining {row.calls_remaining:>5} ({usage:5.1f}%)  {label}"
+            )
+        print(f"{'='*60}")
+        return 0
+
+    except Exception as e:
+        logger.error(f"❌ Failed to read API quota ledger: {e}")
+        return 1
+
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
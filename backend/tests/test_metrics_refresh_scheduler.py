@@ -0,0 +1,59 @@
+"""
+投稿メトリクス再取得スケジューラーのテスト
+"""
+from datetime import datetime, timedelta, timezone
+
+from app.services.data_collection.metrics_refresh_scheduler import MetricsRefreshScheduler
+
+NOW = datetime(2025, 7, 10, 12, 0, tzinfo=timezone.utc)
+
+
+def _post(post_id, posted_at, snapshots=None, refresh_attempted_at=None):
+    return {
+        'post_id': post_id,
+        'account_id': 'account-1',
+        'instagram_post_id': f"ig_{post_id}",
+        'media_type': 'IMAGE',
+        'posted_at': posted_at,
+        'refresh_attempted_at': refresh_attempted_at,
+        'snapshots': snapshots or [],
+    }
+
+
+def test_never_attempted_post_is_due_first():
+    decision = MetricsRefreshScheduler(now=NOW).evaluate(_post('p1', NOW - timedelta(days=3)))
+
+    assert decision.due
+    assert decision.priority == float('inf')
+
+
+def test_post_without_insights_waits_for_interval_after_attempt():
+    """インサイトを取得できない投稿は、試行後は通常の間隔で判定される（毎回最優先にならない）"""
+    posted_at = NOW - timedelta(days=3)  # 1週間以内: 1日ごと
+    scheduler = MetricsRefreshScheduler(now=NOW)
+
+    recent = scheduler.evaluate(_post('p1', posted_at, refresh_attempted_at=NOW - timedelta(hours=2)))
+    assert not recent.due
+    assert recent.last_observed_at is None
+
+    overdue = scheduler.evaluate(_post('p1', posted_at, refresh_attempted_at=NOW - timedelta(days=2)))
+    assert overdue.due
+    assert overdue.priority == 2.0
+
+
+def test_post_without_insights_does_not_starve_budget():
+    posted_at = NOW - timedelta(days=3)
+    stale_snapshot = {
+        'recorded_at': NOW - timedelta(days=3),
+        'last_observed_at': NOW - timedelta(days=3),
+        'likes': 10, 'comments': 1, 'saved': 0, 'shares': 0, 'reach': 100,
+    }
+    posts = [
+        _post('no_insights', posted_at, refresh_attempted_at=NOW - timedelta(hours=2)),
+        _post('stale', posted_at, snapshots=[stale_snapshot]),
+    ]
+
+    plan = MetricsRefreshScheduler(api_budget=1, now=NOW).plan(posts)
+
+    assert [decision.post_id for decision in plan.scheduled] == ['stale']
+    assert plan.deferred_by_budget == 0
@@ -0,0 +1,74 @@
+"""
+SQL プロファイラ・クエリ予算のテスト（SQLite のインメモリ DB を使用）
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.core.database as database
+from app.core.query_profiler import QueryBudgetExceededError, assert_query_budget, install_query_profiler
+from app.models.instagram_account import InstagramAccount
+from app.models.instagram_post import InstagramPost
+from app.repositories.instagram_post_repository import InstagramPostRepository
+from shared import base_collector
+from shared.base_collector import BaseCollector
+from shared.post_detector import PostDetector
+
+API_POSTS = [
+    {'id': f"1800000000000000{index}", 'timestamp': '2025-07-01T10:00:00+0000'}
+    for index in range(5)
+]
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={'check_same_thread': False})
+    InstagramAccount.__table__.create(engine)
+    InstagramPost.__table__.create(engine)
+    install_query_profiler(engine, force=True)
+
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(database, 'SessionLocal', factory)
+    yield factory
+    engine.dispose()
+
+
+def test_post_detector_per_post_lookup_exceeds_repeat_budget(session_factory):
+    """投稿ごとの存在確認（N+1）は同一形状の繰り返しとして検出される"""
+    detector = PostDetector()
+    check_from = datetime(2025, 6, 30, tzinfo=timezone.utc)
+
+    with pytest.raises(QueryBudgetExceededError, match="repeated 5 times"):
+        with assert_query_budget("post_detector", max_repeats=1):
+            asyncio.run(detector.detect_new_posts(API_POSTS, check_from, account_id="account"))
+
+
+def test_repository_single_query_within_budget(session_factory):
+    db = session_factory()
+    try:
+        with assert_query_budget("post_repository", max_queries=1, max_repeats=1) as profile:
+            asyncio.run(InstagramPostRepository(db).get_all())
+    finally:
+        db.close()
+
+    assert profile.count == 1
+
+
+def test_collector_query_profile_reports_on_failure(monkeypatch, caplog):
+    """収集が例外で終了した場合もプロファイルのレポートを出力する"""
+    monkeypatch.setattr(base_collector, 'SQL_PROFILING_ENABLED', True)
+    collector = BaseCollector.__new__(BaseCollector)
+    collector.service_name = "test_collector"
+    collector.logger = logging.getLogger("test_collector")
+
+    with caplog.at_level(logging.INFO, logger="test_collector"):
+        with pytest.raises(RuntimeError):
+            with collector.query_profile():
+                raise RuntimeError("collector crashed")
+
+    assert "SQL profile [test_collector]" in caplog.text
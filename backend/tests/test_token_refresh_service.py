@@ -0,0 +1,87 @@
+"""
+トークン一括更新のテスト（ユーザートークンごとに1回の交換）
+"""
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+from app.services.data_collection import token_refresh_service
+from app.services.data_collection.token_refresh_service import TokenRefreshService
+
+
+def build_account(instagram_user_id, page_token, user_token):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        instagram_user_id=instagram_user_id,
+        username=f"user_{instagram_user_id}",
+        access_token_encrypted=page_token,
+        user_access_token_encrypted=user_token
+    )
+
+
+class FakeAccountRepository:
+    def __init__(self, accounts):
+        self.accounts = accounts
+        self.updates = []
+
+    async def get_token_expiring_soon(self, days_threshold):
+        return self.accounts
+
+    async def bulk_update_tokens(self, token_updates):
+        self.updates.extend(token_updates)
+        return len(token_updates)
+
+
+class FakeAPIClient:
+    exchanged = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+    async def exchange_long_lived_token(self, access_token):
+        FakeAPIClient.exchanged.append(access_token)
+        return {'access_token': f"new-{access_token}", 'expires_in': 5184000}
+
+    async def get_page_access_tokens(self, user_access_token):
+        return {'1': 'new-page-1', '2': 'new-page-2'}
+
+
+def run_refresh(monkeypatch, accounts):
+    FakeAPIClient.exchanged = []
+    monkeypatch.setattr(token_refresh_service, 'InstagramAPIClient', FakeAPIClient)
+    service = TokenRefreshService.__new__(TokenRefreshService)
+    service.account_repo = FakeAccountRepository(accounts)
+    service.concurrency = 5
+    return service, asyncio.run(service.refresh_expiring_tokens())
+
+
+def test_accounts_sharing_a_user_token_are_exchanged_once(monkeypatch):
+    accounts = [build_account('1', 'page-1', 'user-a'), build_account('2', 'page-2', 'user-a')]
+    service, summary = run_refresh(monkeypatch, accounts)
+
+    assert FakeAPIClient.exchanged == ['user-a']
+    assert summary.unique_tokens == 1
+    assert summary.accounts_updated == 2
+    assert {update['access_token_encrypted'] for update in service.account_repo.updates} == {'new-page-1', 'new-page-2'}
+    assert {update['user_access_token_encrypted'] for update in service.account_repo.updates} == {'new-user-a'}
+
+
+def test_accounts_without_user_token_are_reported_not_exchanged(monkeypatch):
+    accounts = [build_account('1', 'page-1', None)]
+    service, summary = run_refresh(monkeypatch, accounts)
+
+    assert FakeAPIClient.exchanged == []
+    assert summary.accounts_without_user_token == 1
+    assert summary.accounts_updated == 0
+    assert summary.errors
+
+
+def test_account_missing_from_me_accounts_is_not_updated(monkeypatch):
+    accounts = [build_account('1', 'page-1', 'user-a'), build_account('3', 'page-3', 'user-a')]
+    service, summary = run_refresh(monkeypatch, accounts)
+
+    assert [update['access_token_encrypted'] for update in service.account_repo.updates] == ['new-page-1']
+    assert any('user_3' in error for error in summary.errors)
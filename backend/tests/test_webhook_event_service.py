@@ -0,0 +1,76 @@
+"""
+Webhook 通知の振り分けのテスト
+"""
+import asyncio
+from types import SimpleNamespace
+
+import collection_worker
+from app.services.data_collection.webhook_event_service import WebhookEventService, extract_media_events
+
+ACCOUNT_ID = "17841402015304577"
+
+
+def build_payload(field, value):
+    return {
+        'object': 'instagram',
+        'entry': [{'id': ACCOUNT_ID, 'time': 0, 'changes': [{'field': field, 'value': value}]}]
+    }
+
+
+MENTIONS_PAYLOAD = build_payload('mentions', {'media_id': '18000000000000001', 'comment_id': '17900000000000001'})
+COMMENTS_PAYLOAD = build_payload('comments', {'id': '17900000000000002', 'media': {'id': '18000000000000002'}})
+
+
+class FakeAccountRepository:
+    async def get_by_instagram_user_ids(self, instagram_user_ids):
+        return [SimpleNamespace(instagram_user_id=ACCOUNT_ID, is_active=True)]
+
+
+class FakeJobRepository:
+    def __init__(self):
+        self.jobs = []
+
+    async def enqueue_many(self, jobs):
+        self.jobs.extend(jobs)
+        return len(jobs)
+
+
+def build_service():
+    service = WebhookEventService.__new__(WebhookEventService)
+    service.account_repo = FakeAccountRepository()
+    service.job_repo = FakeJobRepository()
+    return service
+
+
+def test_mentions_are_not_extracted():
+    assert extract_media_events(MENTIONS_PAYLOAD) == []
+
+
+def test_mentions_are_not_queued():
+    service = build_service()
+    result = asyncio.run(service.dispatch(MENTIONS_PAYLOAD))
+
+    assert result.jobs_queued == 0
+    assert result.ignored_changes == 1
+    assert service.job_repo.jobs == []
+
+
+def test_comments_are_queued():
+    service = build_service()
+    result = asyncio.run(service.dispatch(COMMENTS_PAYLOAD))
+
+    assert result.jobs_queued == 1
+    assert service.job_repo.jobs[0]['payload']['media_id'] == '18000000000000002'
+
+
+def test_queued_mentions_job_is_skipped_without_api_calls(monkeypatch):
+    """修正前に登録された mentions のジョブは投稿の取得・保存を行わない"""
+    def fail(*args, **kwargs):
+        raise AssertionError("must not touch the database or the API")
+
+    monkeypatch.setattr(collection_worker, 'SessionLocal', fail)
+    api_client = SimpleNamespace(_make_request=fail, get_post_insights=fail)
+    payload = {'instagram_user_id': ACCOUNT_ID, 'media_id': '18000000000000001', 'fields': ['mentions']}
+
+    result = asyncio.run(collection_worker.handle_webhook_media(payload, api_client))
+    assert 'skipped' in result
@@ -0,0 +1,34 @@
+"""
+Webhook 購読確認エンドポイントのテスト
+"""
+from fastapi.testclient import TestClient
+
+from app.core.instagram_config import instagram_config
+from main import app
+
+client = TestClient(app)
+URL = "/api/v1/webhooks/instagram"
+
+
+def verify(token):
+    return client.get(URL, params={'hub.mode': 'subscribe', 'hub.verify_token': token, 'hub.challenge': 'abc123'})
+
+
+def test_verify_token_match_returns_challenge(monkeypatch):
+    monkeypatch.setattr(instagram_config, 'webhook_verify_token', 'secret-token')
+    response = verify('secret-token')
+
+    assert response.status_code == 200
+    assert response.text == 'abc123'
+
+
+def test_verify_token_mismatch_is_rejected(monkeypatch):
+    monkeypatch.setattr(instagram_config, 'webhook_verify_token', 'secret-token')
+
+    assert verify('wrong-token').status_code == 403
+    assert verify('トークン').status_code == 403
+
+
+def test_verify_without_configured_token_is_rejected(monkeypatch):
+    monkeypatch.setattr(instagram_config, 'webhook_verify_token', None)
+    assert verify('anything').status_code == 403
@@ -8,15 +8,17 @@ import { Textarea } from "@/components/ui/textarea";
 import { Label } from "@/components/ui/label";
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card";
 import { Alert, AlertDescription } from "@/components/ui/alert";
-import { SetupFormData, SetupFormErrors, SetupStatus } from "../types/setup";
+import { Progress } from "@/components/ui/progress";
+import { SetupFormData, SetupFormErrors, SetupStatus, SetupJob } from "../types/setup";
 
 interface SetupFormProps {
   onSubmit: (data: SetupFormData) => Promise<void>;
   status: SetupStatus;
   errors: SetupFormErrors;
+  progress?: SetupJob | null;
 }
 
-export function SetupForm({ onSubmit, status, errors }: SetupFormProps) {
+export function SetupForm({ onSubmit, status, errors, progress }: SetupFormProps) {
   const [formData, setFormData] = useState<SetupFormData>({
     app_id: "",
     app_secret: "",
@@ -140,6 +142,25 @@ export function SetupForm({ onSubmit, status, errors }: SetupFormProps) {
             </p>
           </div>
 
+          {/* 進捗表示 */}
+          {isLoading && progress && (
+            <div className="space-y-2 rounded-md border p-3">
+              <div className="flex items-center justify-between text-sm">
+                <span>{progress.message || 'セットアップ中...'}</span>
+                <span className="text-muted-foreground">
+                  {progress.current_step}/{progress.total_steps}
+                </span>
+              </div>
+              <Progress value={(progress.current_step / progress.total_steps) * 100} />
+              {progress.pages_total > 0 && (
+                <p className="text-xs text-muted-foreground">
+                  ページ確認中: {progress.pages_processed}/{progress.pages_total}
+                  （Instagram接続: {progress.pages.filter(page => page.status === 'resolved').length}件）
+                </p>
+              )}
+            </div>
+          )}
+
           {/* エラーメッセージ */}
           {errors.general && (
             <Alert variant="destructive">
@@ -10,6 +10,7 @@ import {
   SetupStatus,
   AccountTableRow,
   CreatedAccount,
+  SetupJob,
 } from "./types/setup";
 
 export default function Setup() {
@@ -17,6 +18,7 @@ export default function Setup() {
   const [errors, setErrors] = useState<SetupFormErrors>({});
   const [accounts, setAccounts] = useState<AccountTableRow[]>([]);
   const [loading, setLoading] = useState(false);
+  const [progress, setProgress] = useState<SetupJob | null>(null);
 
   const loadAccounts = useCallback(async () => {
     try {
@@ -112,9 +114,10 @@ export default function Setup() {
 
       setStatus('loading');
       setErrors({});
+      setProgress(null);
 
-      // アカウントセットアップAPI呼び出し
-      const response = await setupApi.setupAccounts(data);
+      // アカウントセットアップAPI呼び出し（バックグラウンドジョブの完了までポーリング）
+      const response = await setupApi.setupAccounts(data, setProgress);
 
       if (response.success) {
         setStatus('success');
@@ -157,6 +160,8 @@ export default function Setup() {
       setErrors({
         general: error instanceof Error ? error.message : 'ネットワークエラーが発生しました'
       });
+    } finally {
+      setProgress(null);
     }
   };
 
@@ -182,6 +187,7 @@ export default function Setup() {
             onSubmit={handleFormSubmit}
             status={status}
             errors={errors}
+            progress={progress}
           />
         </div>
 
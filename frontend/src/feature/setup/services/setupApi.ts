@@ -3,10 +3,13 @@
  * アカウントセットアップ用のAPI連携サービス
  */
 
-import { SetupFormData, SetupResponse, AccountListResponse } from '../types/setup';
+import { SetupFormData, SetupResponse, SetupJob, SetupJobAccepted, AccountListResponse } from '../types/setup';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
 
+// セットアップジョブのポーリング間隔（ミリ秒）
+const SETUP_POLL_INTERVAL_MS = 1000;
+
 class SetupApiService {
   private baseURL: string;
 
@@ -15,9 +18,9 @@ class SetupApiService {
   }
 
   /**
-   * アカウントセットアップを実行
+   * アカウントセットアップジョブを登録（202 でジョブIDを返す）
    */
-  async setupAccounts(data: SetupFormData): Promise<SetupResponse> {
+  async startSetup(data: SetupFormData): Promise<SetupJobAccepted> {
     const response = await fetch(`${this.baseURL}/api/v1/account-setup/`, {
       method: 'POST',
       headers: {
@@ -34,6 +37,50 @@ class SetupApiService {
     return response.json();
   }
 
+  /**
+   * セットアップジョブの進捗を取得
+   */
+  async getSetupJob(jobId: string): Promise<SetupJob> {
+    const response = await fetch(`${this.baseURL}/api/v1/account-setup/jobs/${jobId}`, {
+      method: 'GET',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+    });
+
+    if (!response.ok) {
+      const errorData = await response.json().catch(() => ({}));
+      throw new Error(errorData.detail || `HTTP ${response.status}: ${response.statusText}`);
+    }
+
+    return response.json();
+  }
+
+  /**
+   * アカウントセットアップを実行（ジョブ登録後、完了までポーリング）
+   */
+  async setupAccounts(
+    data: SetupFormData,
+    onProgress?: (job: SetupJob) => void,
+    pollIntervalMs: number = SETUP_POLL_INTERVAL_MS
+  ): Promise<SetupResponse> {
+    const { job_id } = await this.startSetup(data);
+
+    while (true) {
+      const job = await this.getSetupJob(job_id);
+      onProgress?.(job);
+
+      if (job.status === 'completed' || job.status === 'failed') {
+        if (job.result) {
+          return job.result;
+        }
+        throw new Error(job.error || 'アカウントセットアップに失敗しました');
+      }
+
+      await new Promise(resolve => setTimeout(resolve, pollIntervalMs));
+    }
+  }
+
   /**
    * 登録済みアカウント一覧を取得
    */
@@ -108,10 +155,17 @@ export const setupApiService = new SetupApiService();
 // 型安全なAPI呼び出し関数
 export const setupApi = {
   /**
-   * アカウントセットアップ
+   * アカウントセットアップ（完了までポーリング）
+   */
+  setupAccounts: async (data: SetupFormData, onProgress?: (job: SetupJob) => void): Promise<SetupResponse> => {
+    return setupApiService.setupAccounts(data, onProgress);
+  },
+
+  /**
+   * セットアップジョブの進捗取得
    */
-  setupAccounts: async (data: SetupFormData): Promise<SetupResponse> => {
-    return setupApiService.setupAccounts(data);
+  getSetupJob: async (jobId: string): Promise<SetupJob> => {
+    return setupApiService.getSetupJob(jobId);
   },
 
   /**
@@ -50,6 +50,42 @@ export interface SetupResponse {
   warnings: string[];
 }
 
+// セットアップジョブ受付レスポンス（202）
+export interface SetupJobAccepted {
+  job_id: string;
+  status: SetupJobStatus;
+  status_url: string;
+}
+
+// セットアップジョブの状態
+export type SetupJobStatus = 'pending' | 'running' | 'completed' | 'failed';
+
+// ページ単位の進捗
+export interface SetupPageProgress {
+  page_id: string;
+  page_name?: string;
+  status: 'pending' | 'resolved' | 'no_instagram';
+  instagram_user_id?: string;
+  username?: string;
+}
+
+// セットアップジョブの進捗・結果
+export interface SetupJob {
+  job_id: string;
+  status: SetupJobStatus;
+  current_step: number;
+  total_steps: number;
+  message?: string;
+  pages_total: number;
+  pages_processed: number;
+  pages: SetupPageProgress[];
+  result?: SetupResponse;
+  error?: string;
+  created_at?: string;
+  started_at?: string;
+  completed_at?: string;
+}
+
 // アカウント一覧レスポンス
 export interface AccountListResponse {
   accounts: CreatedAccount[];